@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Durable board log benchmark.
+
+Appends N envelopes to one topic with batched fsync, then measures how long
+a restarted server takes to open the log and rebuild its history rings, and
+how fast a full replay and a seek-and-replay run.
+
+Usage:
+    python benchmarks/board_log_benchmark.py [--messages 1000000] [--dir /tmp/board-log]
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from board_log import BoardLog
+
+TOPIC = "bench"
+
+
+def _envelope(seq: int) -> str:
+    return json.dumps({
+        "type": "message",
+        "topic": TOPIC,
+        "seq": seq,
+        "from_agent": "bench-agent",
+        "timestamp": datetime.utcnow().isoformat(),
+        "content": f"Benchmark message {seq} " + "lorem ipsum " * 16,
+        "to_agent": "board",
+        "priority": "normal",
+        "metadata": {},
+    })
+
+
+def run(messages: int, directory: Path, fsync_interval: float) -> dict:
+    report = {"messages": messages, "fsync_interval": fsync_interval}
+
+    # Append, fsyncing on the same cadence as BoardLog.run()
+    log = BoardLog(str(directory), fsync_interval=fsync_interval)
+    # Envelope bodies are reused; the log trusts the seq it is given
+    payloads = [_envelope(seq) for seq in range(1, 1001)]
+    started = time.perf_counter()
+    last_sync = started
+    syncs = 0
+    for seq in range(1, messages + 1):
+        log.append(TOPIC, seq, payloads[seq % 1000])
+        now = time.perf_counter()
+        if now - last_sync >= fsync_interval:
+            log.sync()
+            syncs += 1
+            last_sync = now
+    log.close()
+    append_seconds = time.perf_counter() - started
+    report["append_seconds"] = round(append_seconds, 3)
+    report["appends_per_second"] = round(messages / append_seconds)
+    report["fsyncs"] = syncs
+    report["log_bytes"] = sum(p.stat().st_size for p in directory.rglob("*.log"))
+
+    # Startup: open every topic and rebuild the last 100 envelopes
+    started = time.perf_counter()
+    log = BoardLog(str(directory))
+    recovered = log.recover(100)
+    report["startup_seconds"] = round(time.perf_counter() - started, 4)
+    report["recovered_last_seq"] = recovered[TOPIC][0]
+
+    # Full replay of raw payloads
+    started = time.perf_counter()
+    count = sum(1 for _ in log.topic(TOPIC).iter_since(0))
+    replay_seconds = time.perf_counter() - started
+    report["replayed"] = count
+    report["replay_seconds"] = round(replay_seconds, 3)
+    report["replay_per_second"] = round(count / replay_seconds)
+
+    # Seek near the end through the sparse index, as a reconnecting agent would
+    started = time.perf_counter()
+    tail = log.read_since(TOPIC, messages - 1000)
+    report["seek_replay_1000_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    report["seek_replay_count"] = len(tail)
+
+    log.close()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the durable message board log")
+    parser.add_argument("--messages", type=int, default=1_000_000, help="Messages to append (default: 1000000)")
+    parser.add_argument("--dir", help="Log directory (default: a temporary directory, removed afterwards)")
+    parser.add_argument("--fsync-interval", type=float, default=0.05, help="Seconds between fsyncs (default: 0.05)")
+    args = parser.parse_args()
+
+    directory = Path(args.dir) if args.dir else Path(tempfile.mkdtemp(prefix="board-log-"))
+    try:
+        report = run(args.messages, directory, args.fsync_interval)
+    finally:
+        if not args.dir:
+            shutil.rmtree(directory, ignore_errors=True)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Broadcast fan-out benchmark for the WebSocket message board.
+
+Starts the board in-process, connects N fast subscribers plus one slow
+subscriber that never reads its socket, publishes M messages and reports the
+delivery latency seen by the fast subscribers.
+
+Usage:
+    python benchmarks/broadcast_benchmark.py [--subscribers 100] [--messages 200]
+    python benchmarks/broadcast_benchmark.py --serial   # old one-by-one send loop
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import os
+import socket
+import statistics
+import struct
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import websockets
+import websocket_server as board
+
+TOPIC = "bench"
+
+
+async def _serial_broadcast(message: dict, topic: str, from_agent: str):
+    """The pre-outbox broadcast: serialize and await each subscriber in turn."""
+    for agent_id in list(board.subscriptions.get(topic, set())):
+        websocket = board.clients.get(agent_id)
+        if websocket is None:
+            continue
+        envelope = {
+            "type": "message",
+            "topic": topic,
+            "from_agent": from_agent,
+            "content": message.get("content", ""),
+            "metadata": message.get("metadata", {}),
+        }
+        try:
+            await websocket.send(json.dumps(envelope))
+        except Exception:
+            pass
+
+
+async def _connect(url: str, agent_id: str, **kwargs):
+    ws = await websockets.connect(url, **kwargs)
+    await ws.send(json.dumps({"type": "register", "agent_id": agent_id}))
+    await ws.recv()
+    await ws.send(json.dumps({"type": "subscribe", "topic": TOPIC}))
+    while json.loads(await ws.recv()).get("type") != "subscribed":
+        pass
+    return ws
+
+
+def _text_frame(text: str) -> bytes:
+    """Encode a masked client text frame."""
+    payload = text.encode()
+    mask = os.urandom(4)
+    if len(payload) < 126:
+        header = struct.pack("!BB", 0x81, 0x80 | len(payload))
+    else:
+        header = struct.pack("!BBH", 0x81, 0x80 | 126, len(payload))
+    return header + mask + bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+
+
+def _connect_slow(port: int) -> socket.socket:
+    """Subscribe over a raw socket that never reads after the handshake.
+
+    With a tiny receive buffer and nobody reading, the kernel buffers fill up
+    almost immediately and every send to this client stalls.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    sock.connect(("127.0.0.1", port))
+    key = base64.b64encode(os.urandom(16)).decode()
+    sock.sendall((
+        f"GET / HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nUpgrade: websocket\r\n"
+        f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+    ).encode())
+    response = b""
+    while b"\r\n\r\n" not in response:
+        response += sock.recv(1024)
+    sock.sendall(_text_frame(json.dumps({"type": "register", "agent_id": "slow"})))
+    sock.sendall(_text_frame(json.dumps({"type": "subscribe", "topic": TOPIC})))
+    return sock
+
+
+async def _fast_subscriber(ws, expected: int, latencies: list):
+    received = 0
+    async for raw in ws:
+        data = json.loads(raw)
+        if data.get("type") != "message":
+            continue
+        latencies.append(time.perf_counter() - data["metadata"]["sent_at"])
+        received += 1
+        if received == expected:
+            return
+
+
+async def run(subscribers: int, messages: int, payload_bytes: int, serial: bool) -> dict:
+    logging.getLogger().setLevel(logging.WARNING)
+    if serial:
+        board.broadcast_message = _serial_broadcast
+    board.SEND_TIMEOUT = 2.0
+
+    async with websockets.serve(board.handler, "127.0.0.1", 0, max_size=None) as server:
+        port = server.sockets[0].getsockname()[1]
+        url = f"ws://127.0.0.1:{port}"
+
+        fast = [await _connect(url, f"fast-{i}", max_size=None) for i in range(subscribers)]
+        slow = await asyncio.to_thread(_connect_slow, port)
+        while "slow" not in board.subscriptions.get(TOPIC, set()):
+            await asyncio.sleep(0.01)
+        slow_outbox = None if serial else board.outboxes.get("slow")
+        publisher = await websockets.connect(url, max_size=None)
+        await publisher.send(json.dumps({"type": "register", "agent_id": "publisher"}))
+        await publisher.recv()
+
+        latencies: list = []
+        readers = [asyncio.create_task(_fast_subscriber(ws, messages, latencies)) for ws in fast]
+
+        content = "x" * payload_bytes
+        published = 0
+        started = time.perf_counter()
+        try:
+            for _ in range(messages):
+                await publisher.send(json.dumps({
+                    "type": "send",
+                    "topic": TOPIC,
+                    "content": content,
+                    "metadata": {"sent_at": time.perf_counter()},
+                }))
+                while json.loads(await asyncio.wait_for(publisher.recv(), timeout=10)).get("type") != "sent":
+                    pass
+                published += 1
+        except asyncio.TimeoutError:
+            # The serial loop never returns once the slow client's buffers are full
+            pass
+        publish_seconds = time.perf_counter() - started
+
+        try:
+            await asyncio.wait_for(asyncio.gather(*readers), timeout=10 if published < messages else 120)
+        except asyncio.TimeoutError:
+            pass
+        elapsed = time.perf_counter() - started
+
+        report = {
+            "mode": "serial" if serial else "outbox",
+            "subscribers": subscribers,
+            "messages": messages,
+            "published": published,
+            "payload_bytes": payload_bytes,
+            "publish_seconds": round(publish_seconds, 3),
+            "delivery_seconds": round(elapsed, 3),
+            "delivered": len(latencies),
+            "deliveries_per_second": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+            "latency_p50_ms": round(statistics.median(latencies) * 1000, 2) if latencies else None,
+            "latency_p99_ms": round(sorted(latencies)[int(len(latencies) * 0.99) - 1] * 1000, 2) if latencies else None,
+            "latency_max_ms": round(max(latencies) * 1000, 2) if latencies else None,
+            "slow_client": {
+                "connected": "slow" in board.clients,
+                "sent": slow_outbox.sent if slow_outbox else None,
+                "dropped": slow_outbox.dropped if slow_outbox else None,
+            },
+        }
+
+        for task in readers:
+            task.cancel()
+        for ws in fast + [publisher]:
+            try:
+                await asyncio.wait_for(ws.close(), timeout=1)
+            except Exception:
+                pass
+        slow.close()
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark message board broadcast fan-out")
+    parser.add_argument("--subscribers", type=int, default=100, help="Fast subscribers (default: 100)")
+    parser.add_argument("--messages", type=int, default=200, help="Messages to publish (default: 200)")
+    parser.add_argument("--payload-bytes", type=int, default=32 * 1024, help="Message content size (default: 32KiB)")
+    parser.add_argument("--serial", action="store_true", help="Benchmark the old serial send loop instead")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.subscribers, args.messages, args.payload_bytes, args.serial))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
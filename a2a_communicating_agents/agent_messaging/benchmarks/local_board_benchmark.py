@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Send and poll latency of RAGBoardTransport's local JSONL board.
+
+Fills a board with N messages spread over a handful of recipients and
+topics and measures:
+
+* send: appending one more message
+* poll: picking up what was appended since the previous poll and returning
+  the latest 25 messages for one recipient and topic
+
+It measures both the append-only ``LocalBoard`` and the previous scheme,
+which read the whole file, appended a line, trimmed it to ``--legacy-limit``
+lines and rewrote it on every send, then re-parsed the whole file on every
+poll. ``--legacy-limit 0`` disables the trim, which shows how the old scheme
+scales when the board actually keeps N messages.
+
+Usage:
+    python benchmarks/local_board_benchmark.py [--sizes 10000 100000] [--samples 200]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from local_board import LocalBoard
+
+AGENTS = ["orchestrator-agent", "coder-agent", "tester-agent", "dashboard-agent"]
+TOPICS = ["orchestrator", "code", "test", "general"]
+
+
+def _record(i: int) -> dict:
+    return {
+        "id": f"local-{uuid4()}",
+        "from_agent": AGENTS[(i + 1) % len(AGENTS)],
+        "to_agent": AGENTS[i % len(AGENTS)],
+        "topic": TOPICS[i % len(TOPICS)],
+        "priority": "normal",
+        "timestamp": datetime.utcnow().isoformat(),
+        "content": f"**From:** {AGENTS[(i + 1) % len(AGENTS)]}\n\nmessage {i} " + "x" * 200,
+    }
+
+
+def _legacy_append(path: Path, record: dict, limit: int) -> None:
+    existing = []
+    if path.exists():
+        existing = [line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+    existing.append(json.dumps(record))
+    if limit and len(existing) > limit:
+        existing = existing[-limit:]
+    path.write_text("\n".join(existing) + "\n", encoding="utf-8")
+
+
+def _legacy_poll(path: Path, agent: str, topic: str, limit: int = 25) -> list:
+    items = []
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            payload = json.loads(line)
+            if payload.get("to_agent", "").lower() != agent or payload.get("topic", "").lower() != topic:
+                continue
+            items.append(payload)
+    items.sort(key=lambda item: item["timestamp"], reverse=True)
+    return items[:limit]
+
+
+def _summary(samples: list) -> dict:
+    ordered = sorted(samples)
+    return {
+        "p50_ms": round(statistics.median(ordered) * 1000, 3),
+        "p99_ms": round(ordered[max(0, int(len(ordered) * 0.99) - 1)] * 1000, 3),
+    }
+
+
+def bench_local_board(size: int, samples: int, directory: Path) -> dict:
+    path = directory / "message_board.jsonl"
+    # Large segments so the whole board stays in the active file
+    board = LocalBoard(path, segment_bytes=1 << 40)
+    for i in range(size):
+        board.append(_record(i))
+    board.refresh()
+
+    sends, polls = [], []
+    for i in range(samples):
+        record = _record(size + i)
+        started = time.perf_counter()
+        board.append(record)
+        sends.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        board.refresh()
+        board.query(record["to_agent"], record["topic"], limit=25)
+        polls.append(time.perf_counter() - started)
+
+    opened = time.perf_counter()
+    LocalBoard(path, segment_bytes=1 << 40).close()
+    open_seconds = time.perf_counter() - opened
+    board.close()
+    return {"send": _summary(sends), "poll": _summary(polls), "open_ms": round(open_seconds * 1000, 1)}
+
+
+def bench_legacy(size: int, samples: int, directory: Path, limit: int) -> dict:
+    path = directory / "legacy_board.jsonl"
+    kept = size if not limit else min(size, limit)
+    path.write_text("".join(json.dumps(_record(i)) + "\n" for i in range(size - kept, size)), encoding="utf-8")
+
+    sends, polls = [], []
+    for i in range(samples):
+        record = _record(size + i)
+        started = time.perf_counter()
+        _legacy_append(path, record, limit)
+        sends.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        _legacy_poll(path, record["to_agent"], record["topic"])
+        polls.append(time.perf_counter() - started)
+
+    return {"send": _summary(sends), "poll": _summary(polls), "lines_kept": kept}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the local JSONL message board")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000], help="Board sizes (default: 10000 100000)")
+    parser.add_argument("--samples", type=int, default=200, help="Sends/polls measured per size (default: 200)")
+    parser.add_argument("--legacy-limit", type=int, default=200, help="Line cap of the old scheme, 0 for none (default: 200)")
+    args = parser.parse_args()
+
+    report = []
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            directory = Path(directory)
+            report.append({
+                "messages": size,
+                "local_board": bench_local_board(size, args.samples, directory),
+                "legacy": bench_legacy(size, args.samples, directory, args.legacy_limit),
+            })
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
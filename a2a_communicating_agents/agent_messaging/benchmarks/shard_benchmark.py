@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Load benchmark for the sharded message board.
+
+For each worker count, starts the board as a subprocess
+(``websocket_server.py --workers N``), then runs several load-generator
+processes. Each of them connects a group of subscribers and one publisher
+to a shared topic. Every publisher sends M messages as fast as the board
+acknowledges them, and every subscriber waits for all publishers' messages.
+The report gives the aggregate delivery rate for each worker count, plus
+how many deliveries the slow-client policy dropped.
+
+The load generators need cores of their own. Run this on a machine with
+more cores than the largest worker count, or the clients become the
+bottleneck and hide the scaling.
+
+Usage:
+    python benchmarks/shard_benchmark.py [--workers 1 2 4] [--clients 4]
+        [--subscribers 25] [--messages 500] [--payload-bytes 256]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import websockets
+
+SERVER = Path(__file__).resolve().parent.parent / "websocket_server.py"
+TOPIC = "bench"
+WINDOW = 16   # Unacknowledged sends per publisher
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Board did not start on port {port}")
+
+
+async def _connect(url: str, agent_id: str, subscribe: bool):
+    ws = await websockets.connect(url, max_size=None)
+    await ws.send(json.dumps({"type": "register", "agent_id": agent_id}))
+    await ws.recv()
+    if subscribe:
+        await ws.send(json.dumps({"type": "subscribe", "topic": TOPIC}))
+        while json.loads(await ws.recv()).get("type") != "subscribed":
+            pass
+    return ws
+
+
+async def _subscriber(ws, publishers: int) -> int:
+    """Count deliveries until every publisher's last message has arrived."""
+    received = 0
+    finished = 0
+    try:
+        while finished < publishers:
+            data = json.loads(await asyncio.wait_for(ws.recv(), timeout=10))
+            if data.get("type") == "message":
+                received += 1
+                finished += bool(data["metadata"].get("last"))
+    except asyncio.TimeoutError:
+        pass
+    return received
+
+
+async def _publisher(ws, messages: int, content: str) -> None:
+    # Pipeline sends with a bounded window, like WebSocketTransport.send_many
+    window = asyncio.Semaphore(WINDOW)
+
+    async def acks():
+        sent = 0
+        while sent < messages:
+            if json.loads(await ws.recv()).get("type") == "sent":
+                sent += 1
+                window.release()
+
+    ack_task = asyncio.create_task(acks())
+    for i in range(messages):
+        await window.acquire()
+        await ws.send(json.dumps({
+            "type": "send",
+            "topic": TOPIC,
+            "content": content,
+            "msg_id": str(i),
+            "metadata": {"last": i == messages - 1},
+        }))
+    await ack_task
+
+
+async def _load(client_id, url, subscribers, messages, publishers, payload_bytes, ready, go, results):
+    subs = [await _connect(url, f"sub-{client_id}-{i}", subscribe=True) for i in range(subscribers)]
+    pub = await _connect(url, f"pub-{client_id}", subscribe=False)
+    ready.wait()
+    await asyncio.to_thread(go.wait)
+
+    readers = [asyncio.create_task(_subscriber(ws, publishers)) for ws in subs]
+    await _publisher(pub, messages, "x" * payload_bytes)
+    counts = await asyncio.gather(*readers)
+    results.put((client_id, sum(counts), time.time()))
+
+    for ws in subs + [pub]:
+        await ws.close()
+
+
+def _load_process(*args):
+    asyncio.run(_load(*args))
+
+
+def run(workers: int, clients: int, subscribers: int, messages: int, payload_bytes: int) -> dict:
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, str(SERVER), "--port", str(port), "--workers", str(workers)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_for_port(port)
+        time.sleep(0.5 if workers > 1 else 0)   # let every shard bind the port
+
+        context = multiprocessing.get_context("spawn")
+        ready = context.Barrier(clients + 1)
+        go = context.Event()
+        results = context.Queue()
+        url = f"ws://127.0.0.1:{port}"
+        loaders = [
+            context.Process(target=_load_process,
+                            args=(i, url, subscribers, messages, clients, payload_bytes, ready, go, results))
+            for i in range(clients)
+        ]
+        for process in loaders:
+            process.start()
+
+        ready.wait()
+        started = time.time()
+        go.set()
+        finished = [results.get(timeout=180) for _ in loaders]
+        for process in loaders:
+            process.join(timeout=10)
+
+        elapsed = max(done for _, _, done in finished) - started
+        delivered = sum(count for _, count, _ in finished)
+        expected = clients * subscribers * clients * messages
+        return {
+            "workers": workers,
+            "clients": clients,
+            "subscribers": clients * subscribers,
+            "published": clients * messages,
+            "expected_deliveries": expected,
+            "delivered": delivered,
+            "dropped": expected - delivered,
+            "seconds": round(elapsed, 3),
+            "deliveries_per_second": round(delivered / elapsed, 1) if elapsed else 0.0,
+        }
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the sharded message board")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker counts to compare (default: 1 2 4)")
+    parser.add_argument("--clients", type=int, default=4, help="Load-generator processes (default: 4)")
+    parser.add_argument("--subscribers", type=int, default=25, help="Subscribers per load generator (default: 25)")
+    parser.add_argument("--messages", type=int, default=500, help="Messages per publisher (default: 500)")
+    parser.add_argument("--payload-bytes", type=int, default=256, help="Message content size (default: 256)")
+    args = parser.parse_args()
+
+    reports = [run(w, args.clients, args.subscribers, args.messages, args.payload_bytes) for w in args.workers]
+    base = reports[0]["deliveries_per_second"]
+    for report in reports:
+        report["speedup"] = round(report["deliveries_per_second"] / base, 2) if base else None
+    print(json.dumps({"cpu_count": os.cpu_count(), "runs": reports}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
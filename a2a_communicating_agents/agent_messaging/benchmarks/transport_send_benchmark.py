@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+WebSocketTransport send throughput benchmark.
+
+Starts the board in-process and sends N messages three ways:
+    sequential  - await send() per message (one request in flight, the old behaviour)
+    concurrent  - asyncio.gather over send() (acks matched by msg_id)
+    send_many   - one pipelined batch
+
+Usage:
+    python benchmarks/transport_send_benchmark.py [--messages 2000]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+import websockets
+from a2a_communicating_agents.agent_messaging import websocket_server as board
+from a2a_communicating_agents.agent_messaging.message_models import AgentMessage, ConnectionConfig
+from a2a_communicating_agents.agent_messaging.websocket_transport import WebSocketTransport
+
+
+def _messages(count: int, label: str):
+    return [
+        AgentMessage(to_agent="board", from_agent="bench", topic="bench", content=f"{label} {i}")
+        for i in range(count)
+    ]
+
+
+async def run(count: int) -> dict:
+    logging.getLogger().setLevel(logging.WARNING)
+
+    async with websockets.serve(board.handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        transport = WebSocketTransport(ConnectionConfig(url=f"ws://127.0.0.1:{port}"))
+        transport.agent_id = "bench"
+        await transport.connect()
+
+        report = {"messages": count}
+
+        started = time.perf_counter()
+        ok = [await transport.send(m) for m in _messages(count, "sequential")]
+        elapsed = time.perf_counter() - started
+        report["sequential"] = {"seconds": round(elapsed, 3), "msgs_per_second": round(count / elapsed), "acked": sum(ok)}
+
+        started = time.perf_counter()
+        ok = await asyncio.gather(*(transport.send(m) for m in _messages(count, "concurrent")))
+        elapsed = time.perf_counter() - started
+        report["concurrent"] = {"seconds": round(elapsed, 3), "msgs_per_second": round(count / elapsed), "acked": sum(ok)}
+
+        started = time.perf_counter()
+        ok = await transport.send_many(_messages(count, "send_many"))
+        elapsed = time.perf_counter() - started
+        report["send_many"] = {"seconds": round(elapsed, 3), "msgs_per_second": round(count / elapsed), "acked": sum(ok)}
+
+        await transport.disconnect()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WebSocketTransport send throughput")
+    parser.add_argument("--messages", type=int, default=2000, help="Messages per mode (default: 2000)")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.messages)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Wire encoding benchmark for message board envelopes.
+
+Measures encode + decode time and frame size for each available encoding,
+with and without deflate above the default threshold, on two typical kinds
+of traffic:
+    orchestrator - short JSON-RPC task requests
+    coder        - code results carrying a file and a diff in metadata
+
+Usage:
+    python benchmarks/wire_codec_benchmark.py [--iterations 5000]
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from wire_codec import DEFAULT_COMPRESS_THRESHOLD, WireCodec, available_encodings
+
+SAMPLE_CODE = '''def apply_discount(order, rate):
+    """Apply a percentage discount to every line item."""
+    for item in order.items:
+        item.price = round(item.price * (1 - rate), 2)
+    return order
+'''
+
+
+def _envelope(content: str, metadata: dict, seq: int = 1) -> dict:
+    return {
+        "type": "message",
+        "topic": "orchestrator",
+        "seq": seq,
+        "from_agent": "orchestrator-agent",
+        "timestamp": datetime.utcnow().isoformat(),
+        "content": content,
+        "to_agent": "coder-agent",
+        "priority": "normal",
+        "metadata": metadata,
+    }
+
+
+def orchestrator_message() -> dict:
+    request = {
+        "jsonrpc": "2.0",
+        "id": "b7f6c0d2-5d7e-4c53-9a55-8f4e0c1d2a3b",
+        "method": "agent.execute_task",
+        "params": {"description": "Add input validation to the expense import endpoint and report back"},
+    }
+    return _envelope(json.dumps(request), {"conversation_id": "conv-42", "hop": 1})
+
+
+def coder_message() -> dict:
+    code = SAMPLE_CODE * 60
+    diff = "".join(f"+    line {i}: {SAMPLE_CODE.splitlines()[i % 5]}\n" for i in range(400))
+    return _envelope(
+        "Implemented the change, tests pass.",
+        {"files": {"app/discounts.py": code}, "diff": diff, "tests": {"passed": 42, "failed": 0}},
+    )
+
+
+def measure(codec: WireCodec, message: dict, iterations: int) -> dict:
+    frame = codec.encode(message)
+    size = len(frame.encode("utf-8") if isinstance(frame, str) else frame)
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        codec.decode(codec.encode(message))
+    per_message = (time.perf_counter() - started) / iterations
+
+    return {"bytes": size, "encode_decode_us": round(per_message * 1e6, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark message board wire encodings")
+    parser.add_argument("--iterations", type=int, default=5000, help="Round trips per case (default: 5000)")
+    args = parser.parse_args()
+
+    traffic = {"orchestrator": orchestrator_message(), "coder": coder_message()}
+    report = {}
+    for name, message in traffic.items():
+        report[name] = {}
+        for encoding in available_encodings():
+            thresholds = [None] if encoding == "json" else [None, DEFAULT_COMPRESS_THRESHOLD]
+            for threshold in thresholds:
+                label = encoding if threshold is None else f"{encoding}+deflate>{threshold}"
+                report[name][label] = measure(WireCodec(encoding, threshold), message, args.iterations)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
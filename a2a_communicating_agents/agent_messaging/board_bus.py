@@ -0,0 +1,196 @@
+"""
+Local bus for running the WebSocket message board as several shards.
+
+In sharded mode N worker processes accept connections on the same port
+(``SO_REUSEPORT``) and each one keeps only its own clients and
+subscriptions. A broadcast published on one shard has to reach subscribers
+connected to the others, so every shard is also connected to a ``BusHub``
+over a Unix-domain socket.
+
+The hub is the single sequencer for the board: shards send it unsequenced
+envelopes, it stamps the next per-topic sequence number and relays the
+complete envelope to every shard, including the one that published it. All
+shards therefore see every topic in the same order with contiguous sequence
+numbers, and their history rings stay identical. The hub also owns the
+optional durable log and keeps its own ring of recent envelopes, which it
+replays to a shard when it (re)connects.
+
+Wire format, one message per line in both directions:
+
+    shard -> hub   <topic as a JSON string> TAB <envelope JSON without "seq">
+    hub -> shard   <envelope JSON including "seq">
+
+The hub never parses envelopes; it only splices the sequence number in.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, Set
+
+try:
+    from .board_log import BoardLog
+except ImportError:
+    from board_log import BoardLog
+
+logger = logging.getLogger(__name__)
+
+HUB_HISTORY = 100          # Envelopes per topic replayed to a (re)connecting shard
+LINE_LIMIT = 64 * 1024 * 1024   # Largest envelope the bus accepts
+CONNECT_RETRIES = 50       # Attempts (0.1s apart) a shard makes to reach the hub
+
+
+def default_bus_path(port: int) -> str:
+    """Unix socket path used for the board on ``port``."""
+    return os.path.join(os.environ.get("TMPDIR", "/tmp"), f"a2a_board_{port}.sock")
+
+
+class BusHub:
+    """Sequences broadcasts and relays them between board shards"""
+
+    def __init__(self, path: str, board_log: Optional[BoardLog] = None,
+                 history_size: int = HUB_HISTORY):
+        """
+        Initialize the hub.
+
+        Args:
+            path: Unix socket path to listen on
+            board_log: Durable log to append every envelope to (optional)
+            history_size: Envelopes per topic replayed to connecting shards
+        """
+        self.path = path
+        self.board_log = board_log
+        self.history_size = history_size
+        self.sequences: Dict[str, int] = {}
+        self.history: Dict[str, Deque[bytes]] = {}
+        self.shards: Set[asyncio.StreamWriter] = set()
+        self.relayed = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+        if board_log:
+            for topic, (last_seq, envelopes) in board_log.recover(history_size).items():
+                self.sequences[topic] = last_seq
+                self.history[topic] = deque(
+                    (json.dumps(envelope).encode("utf-8") + b"\n" for envelope in envelopes),
+                    maxlen=history_size
+                )
+
+    async def start(self) -> None:
+        """Start listening for shards."""
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._handle_shard, path=self.path, limit=LINE_LIMIT)
+        logger.info(f"🚌 Board bus listening on {self.path}")
+
+    async def close(self) -> None:
+        """Disconnect every shard and stop listening."""
+        for writer in list(self.shards):
+            writer.close()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def sequence(self, topic_json: bytes, body: bytes) -> bytes:
+        """Stamp the next sequence number on an envelope and record it."""
+        topic = json.loads(topic_json)
+        seq = self.sequences.get(topic, 0) + 1
+        self.sequences[topic] = seq
+
+        # body is '{...}\n'; splice "seq" in as the first key
+        line = b'{"seq": %d, ' % seq + body[1:]
+        if self.board_log:
+            self.board_log.append(topic, seq, line[:-1].decode("utf-8"))
+
+        ring = self.history.get(topic)
+        if ring is None:
+            ring = self.history[topic] = deque(maxlen=self.history_size)
+        ring.append(line)
+        return line
+
+    async def _handle_shard(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # Bring the new shard's history rings up to date before it sees live traffic
+        for ring in self.history.values():
+            writer.writelines(ring)
+        self.shards.add(writer)
+        logger.info(f"🔗 Shard connected to bus (total: {len(self.shards)})")
+
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                topic_json, sep, body = raw.partition(b"\t")
+                if not sep or not body.startswith(b"{"):
+                    logger.warning("Dropping malformed bus message")
+                    continue
+
+                line = self.sequence(topic_json, body)
+                self.relayed += 1
+                for shard in list(self.shards):
+                    shard.write(line)
+                for shard in list(self.shards):
+                    try:
+                        await shard.drain()
+                    except ConnectionError:
+                        self.shards.discard(shard)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError) as e:
+            logger.warning(f"Shard bus connection failed: {e}")
+        finally:
+            self.shards.discard(writer)
+            writer.close()
+            logger.info(f"🔌 Shard disconnected from bus (total: {len(self.shards)})")
+
+
+class BusClient:
+    """A shard's connection to the bus hub"""
+
+    def __init__(self, path: str):
+        """
+        Initialize the client.
+
+        Args:
+            path: Unix socket path of the hub
+        """
+        self.path = path
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self) -> None:
+        """Connect to the hub, waiting for it to come up."""
+        for attempt in range(CONNECT_RETRIES):
+            try:
+                self._reader, self._writer = await asyncio.open_unix_connection(self.path, limit=LINE_LIMIT)
+                return
+            except (FileNotFoundError, ConnectionRefusedError):
+                if attempt == CONNECT_RETRIES - 1:
+                    raise
+                await asyncio.sleep(0.1)
+
+    async def publish(self, topic: str, envelope: dict) -> None:
+        """Send an unsequenced envelope to the hub for every shard."""
+        self._writer.write(json.dumps(topic).encode("utf-8") + b"\t"
+                           + json.dumps(envelope).encode("utf-8") + b"\n")
+        await self._writer.drain()
+
+    async def run(self, on_envelope: Callable[[dict, str], Awaitable[None]]) -> None:
+        """
+        Deliver sequenced envelopes from the hub until the bus closes.
+
+        Args:
+            on_envelope: Called with each envelope and its JSON text
+        """
+        while True:
+            raw = await self._reader.readline()
+            if not raw:
+                raise ConnectionError("Board bus closed")
+            payload = raw[:-1].decode("utf-8")
+            await on_envelope(json.loads(payload), payload)
+
+    async def close(self) -> None:
+        """Close the connection."""
+        if self._writer:
+            self._writer.close()
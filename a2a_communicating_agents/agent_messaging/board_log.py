@@ -0,0 +1,390 @@
+"""
+Durable append-only log for the WebSocket message board.
+
+Each topic gets its own directory of segment files. A segment holds one
+serialized envelope per line, starting at the sequence number in its file
+name, so sequence numbers inside a segment are contiguous and a message can
+be located by counting lines. Every ``index_interval`` messages a sparse
+index entry (seq, byte offset) is written next to the segment, which lets
+replay seek close to any sequence number without scanning the whole topic.
+
+Writes go through buffered files and are fsynced in batches (by default
+every 50ms) rather than once per message.
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_BYTES = 64 * 1024 * 1024   # Roll to a new segment after this many bytes
+INDEX_INTERVAL = 1000              # Messages between sparse index entries
+FSYNC_INTERVAL = 0.05              # Seconds between batched fsyncs (0 = fsync every append)
+RETENTION_CHECK_INTERVAL = 60.0    # Seconds between retention sweeps
+EPOCH_FILE = "EPOCH"               # Board epoch id, kept next to the topic directories
+
+
+class TopicLog:
+    """Segmented append-only log for a single topic"""
+
+    def __init__(self, path: Path, topic: str, segment_bytes: int = SEGMENT_BYTES,
+                 index_interval: int = INDEX_INTERVAL):
+        """
+        Open (or create) the log for a topic.
+
+        Args:
+            path: Directory holding this topic's segments
+            topic: Topic name
+            segment_bytes: Size at which a new segment is started
+            index_interval: Messages between sparse index entries
+        """
+        self.path = path
+        self.topic = topic
+        self.segment_bytes = segment_bytes
+        self.index_interval = index_interval
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        self.segments: List[int] = sorted(int(p.stem) for p in self.path.glob("*.log"))
+        self.last_seq = 0
+        self._log = None
+        self._idx = None
+        self._active_size = 0
+        self._dirty = False
+        self._recover_tail()
+
+    def _segment_path(self, base: int, suffix: str = ".log") -> Path:
+        return self.path / f"{base:020d}{suffix}"
+
+    def _load_index(self, base: int, max_offset: Optional[int] = None) -> List[Tuple[int, int]]:
+        """Read a segment's sparse index, ignoring entries past ``max_offset``."""
+        entries = [(base, 0)]
+        idx_path = self._segment_path(base, ".idx")
+        if idx_path.exists():
+            with open(idx_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) != 2:
+                        break  # torn write at the end of the index
+                    seq, offset = int(parts[0]), int(parts[1])
+                    if max_offset is not None and offset > max_offset:
+                        break
+                    if seq > entries[-1][0]:
+                        entries.append((seq, offset))
+        return entries
+
+    def _recover_tail(self) -> None:
+        """Find the last sequence number and drop a partially written last line."""
+        if not self.segments:
+            return
+
+        base = self.segments[-1]
+        log_path = self._segment_path(base)
+        size = log_path.stat().st_size
+        seq, offset = self._load_index(base, max_offset=size)[-1]
+
+        good_end = offset
+        count = 0
+        with open(log_path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                good_end += len(line)
+                count += 1
+
+        if good_end < size:
+            logger.warning(f"Truncating partial record at the end of {log_path} "
+                           f"({size - good_end} bytes)")
+            with open(log_path, "r+b") as f:
+                f.truncate(good_end)
+
+        self.last_seq = seq + count - 1 if (count or seq > base) else base - 1
+        self._active_size = good_end
+
+        # Drop index entries for records that did not survive, so later
+        # appends cannot be found through stale offsets
+        full_index = self._load_index(base)
+        valid = [(s, o) for s, o in full_index[1:] if s <= self.last_seq and o < good_end]
+        if len(valid) != len(full_index) - 1:
+            with open(self._segment_path(base, ".idx"), "w", encoding="utf-8") as f:
+                f.writelines(f"{s} {o}\n" for s, o in valid)
+
+    @property
+    def first_seq(self) -> int:
+        """Oldest sequence number still on disk (0 when the log is empty)"""
+        return self.segments[0] if self.segments else 0
+
+    def _open_active(self, seq: int) -> None:
+        """Open the segment that ``seq`` will be appended to, rolling if needed."""
+        reuse = (self._log is None and self.segments and seq == self.last_seq + 1
+                 and self._active_size < self.segment_bytes)
+        if reuse:
+            base = self.segments[-1]
+        else:
+            base = seq
+            self.segments.append(base)
+            self._active_size = 0
+
+        self._log = open(self._segment_path(base), "ab")
+        self._idx = open(self._segment_path(base, ".idx"), "a", encoding="utf-8")
+
+    def append(self, seq: int, payload: str) -> None:
+        """
+        Append one serialized envelope.
+
+        Args:
+            seq: Sequence number stamped on the envelope
+            payload: JSON text of the envelope (no embedded newlines)
+        """
+        if seq <= self.last_seq:
+            raise ValueError(f"Sequence {seq} for topic '{self.topic}' is not after {self.last_seq}")
+
+        # A gap (e.g. lost messages) starts a fresh segment so that sequence
+        # numbers stay contiguous within every segment
+        if (self._log is None or self._active_size >= self.segment_bytes
+                or seq != self.last_seq + 1):
+            self.close()
+            self._open_active(seq)
+
+        base = self.segments[-1]
+        if seq != base and (seq - base) % self.index_interval == 0:
+            self._idx.write(f"{seq} {self._active_size}\n")
+
+        line = payload.encode("utf-8") + b"\n"
+        self._log.write(line)
+        self._active_size += len(line)
+        self.last_seq = seq
+        self._dirty = True
+
+    def sync(self) -> None:
+        """Flush buffered writes and fsync the active segment."""
+        if not self._dirty or self._log is None:
+            return
+        self._log.flush()
+        self._idx.flush()
+        os.fsync(self._log.fileno())
+        self._dirty = False
+
+    def iter_since(self, since_seq: int) -> Iterator[str]:
+        """
+        Yield serialized envelopes with a sequence number greater than ``since_seq``.
+
+        Messages removed by retention are silently skipped.
+        """
+        if self._dirty and self._log is not None:
+            self._log.flush()
+
+        target = since_seq + 1
+        start = max(0, bisect.bisect_right(self.segments, target) - 1)
+
+        for position in range(start, len(self.segments)):
+            base = self.segments[position]
+            log_path = self._segment_path(base)
+            if not log_path.exists():
+                continue
+
+            seq, offset = base, 0
+            if target > base:
+                index = self._load_index(base)
+                seq, offset = index[bisect.bisect_right(index, (target, float("inf"))) - 1]
+
+            with open(log_path, "rb") as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    if seq >= target:
+                        yield line[:-1].decode("utf-8")
+                    seq += 1
+
+    def read_since(self, since_seq: int, limit: Optional[int] = None) -> List[dict]:
+        """
+        Read envelopes after ``since_seq``.
+
+        Args:
+            since_seq: Return envelopes with a greater sequence number
+            limit: Return only the newest ``limit`` envelopes
+        """
+        if limit is not None:
+            since_seq = max(since_seq, self.last_seq - limit)
+        return [json.loads(payload) for payload in self.iter_since(since_seq)]
+
+    def enforce_retention(self, max_bytes: Optional[int] = None,
+                          max_age_seconds: Optional[float] = None) -> int:
+        """
+        Delete whole closed segments that exceed the size or age limits.
+
+        Returns:
+            Number of segments removed
+        """
+        if max_bytes is None and max_age_seconds is None:
+            return 0
+
+        sizes = {}
+        for base in self.segments:
+            try:
+                sizes[base] = self._segment_path(base).stat().st_size
+            except FileNotFoundError:
+                sizes[base] = 0
+        total = sum(sizes.values())
+        cutoff = time.time() - max_age_seconds if max_age_seconds is not None else None
+
+        removed = 0
+        # The active segment is never removed
+        while len(self.segments) > 1:
+            base = self.segments[0]
+            log_path = self._segment_path(base)
+            too_big = max_bytes is not None and total > max_bytes
+            too_old = cutoff is not None and log_path.exists() and log_path.stat().st_mtime < cutoff
+            if not (too_big or too_old):
+                break
+            log_path.unlink(missing_ok=True)
+            self._segment_path(base, ".idx").unlink(missing_ok=True)
+            total -= sizes[base]
+            self.segments.pop(0)
+            removed += 1
+
+        if removed:
+            logger.info(f"🧹 Removed {removed} old segment(s) from topic '{self.topic}'")
+        return removed
+
+    def close(self) -> None:
+        """Flush and close the active segment."""
+        if self._log is not None:
+            self.sync()
+            self._log.close()
+            self._idx.close()
+        self._log = None
+        self._idx = None
+
+
+class BoardLog:
+    """Durable per-topic logs for every topic on the board"""
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = SEGMENT_BYTES,
+        index_interval: int = INDEX_INTERVAL,
+        fsync_interval: float = FSYNC_INTERVAL,
+        retention_bytes: Optional[int] = None,
+        retention_seconds: Optional[float] = None
+    ):
+        """
+        Open the board log.
+
+        Args:
+            directory: Root directory; each topic gets a subdirectory
+            segment_bytes: Size at which a topic starts a new segment
+            index_interval: Messages between sparse index entries
+            fsync_interval: Seconds between batched fsyncs; 0 fsyncs every append
+            retention_bytes: Per-topic size limit, oldest segments removed first
+            retention_seconds: Remove segments last written longer ago than this
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.index_interval = index_interval
+        self.fsync_interval = fsync_interval
+        self.retention_bytes = retention_bytes
+        self.retention_seconds = retention_seconds
+
+        self.topics: Dict[str, TopicLog] = {}
+        for path in sorted(p for p in self.directory.iterdir() if p.is_dir()):
+            topic = unquote(path.name)
+            self.topics[topic] = self._open_topic(topic)
+        self.epoch = self._load_epoch()
+
+    def _load_epoch(self) -> str:
+        """
+        Read the board epoch id, creating it with a new log.
+
+        Sequence numbers survive restarts of a durable board, so its epoch
+        does too; it only changes if the log directory is replaced.
+        """
+        path = self.directory / EPOCH_FILE
+        epoch = path.read_text().strip() if path.exists() else ""
+        if not epoch:
+            epoch = uuid.uuid4().hex
+            path.write_text(epoch + "\n")
+        return epoch
+
+    def _open_topic(self, topic: str) -> TopicLog:
+        return TopicLog(self.directory / quote(topic, safe=""), topic,
+                        segment_bytes=self.segment_bytes,
+                        index_interval=self.index_interval)
+
+    def topic(self, topic: str) -> TopicLog:
+        """Get the log for a topic, creating it on first use."""
+        log = self.topics.get(topic)
+        if log is None:
+            log = self.topics[topic] = self._open_topic(topic)
+        return log
+
+    def append(self, topic: str, seq: int, payload: str) -> None:
+        """Append a serialized envelope to a topic's log."""
+        log = self.topic(topic)
+        log.append(seq, payload)
+        if self.fsync_interval <= 0:
+            log.sync()
+
+    def read_since(self, topic: str, since_seq: int, limit: Optional[int] = None) -> List[dict]:
+        """Read a topic's envelopes after ``since_seq`` (see TopicLog.read_since)."""
+        log = self.topics.get(topic)
+        return log.read_since(since_seq, limit) if log else []
+
+    def recover(self, history_size: int) -> Dict[str, Tuple[int, List[dict]]]:
+        """
+        Load what the server needs at startup.
+
+        Args:
+            history_size: Number of recent envelopes to load per topic
+
+        Returns:
+            Mapping of topic to (last sequence number, recent envelopes)
+        """
+        return {
+            topic: (log.last_seq, log.read_since(0, limit=history_size))
+            for topic, log in self.topics.items()
+            if log.last_seq > 0
+        }
+
+    def sync(self) -> None:
+        """Fsync every topic with unsynced writes."""
+        for log in self.topics.values():
+            log.sync()
+
+    def enforce_retention(self) -> int:
+        """Apply the retention limits to every topic."""
+        return sum(
+            log.enforce_retention(self.retention_bytes, self.retention_seconds)
+            for log in self.topics.values()
+        )
+
+    async def run(self) -> None:
+        """Background task: batched fsync plus periodic retention sweeps."""
+        interval = self.fsync_interval if self.fsync_interval > 0 else RETENTION_CHECK_INTERVAL
+        last_sweep = time.monotonic()
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                self.sync()
+                if time.monotonic() - last_sweep >= RETENTION_CHECK_INTERVAL:
+                    self.enforce_retention()
+                    last_sweep = time.monotonic()
+        except asyncio.CancelledError:
+            self.sync()
+            raise
+
+    def close(self) -> None:
+        """Flush and close every topic log."""
+        for log in self.topics.values():
+            log.close()
@@ -38,9 +38,13 @@ class ChromaDBMemory(MemoryBackend):
             # Lazy import to avoid circular dependency
             if self.doc_manager is None:
                 from rag_system.core.document_manager import DocumentManager
-                # Run in thread to avoid blocking
+                # The engine loads lazily: open Chroma now (in a thread) so a
+                # corrupted store still fails here, and load the embedding
+                # model in the background before the first remember/search.
                 # This may raise PanicException if ChromaDB is corrupted
-                self.doc_manager = await asyncio.to_thread(DocumentManager)
+                doc_manager = DocumentManager(warm_up=True)
+                await asyncio.to_thread(lambda: doc_manager.rag_engine.collection)
+                self.doc_manager = doc_manager
             
             self._connected = True
             
@@ -203,10 +207,11 @@ class ChromaDBMemory(MemoryBackend):
             raise ConnectionError("Not connected to ChromaDB")
         
         try:
-            # Use get_recent_activities with artifact filtering
+            # Time-ordered index lookup, filtered by type before the limit
             results = await asyncio.to_thread(
                 self.doc_manager.get_recent_activities,
-                n_results=limit
+                n_results=limit,
+                artifact_type=memory_type
             )
             
             # Convert to MemoryEntry and filter by type if specified
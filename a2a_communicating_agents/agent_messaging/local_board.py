@@ -0,0 +1,384 @@
+"""
+Append-only local message board used by RAGBoardTransport.
+
+Every agent process on the machine appends to the same JSONL file, one
+record per line, through an ``O_APPEND`` descriptor, so concurrent writers
+never overwrite each other and a send never rewrites the file. When the
+active file grows past ``segment_bytes`` it is renamed to a numbered segment
+and a fresh file is started; only the newest ``keep_segments`` segments are
+kept.
+
+Readers tail the active file from the byte offset they last reached and
+keep a small in-memory index of recent records by recipient and by topic,
+so polling costs only the bytes appended since the previous poll. On Linux
+``wait_for_append`` sleeps on inotify until the board changes.
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import json
+import logging
+import os
+import sys
+import threading
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_BYTES = 4 * 1024 * 1024   # Rotate the active file after this many bytes
+KEEP_SEGMENTS = 4                 # Rotated segments kept on disk
+INDEX_LIMIT = 500                 # Recent records kept per recipient / topic
+
+# inotify flags (see <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+    except OSError:
+        return None
+    return libc if hasattr(libc, "inotify_init1") else None
+
+
+_libc = _load_libc()
+
+
+class _InotifyWatch:
+    """Non-blocking inotify watch on a directory"""
+
+    def __init__(self, directory: Path):
+        self.fd = _libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if _libc.inotify_add_watch(self.fd, os.fsencode(str(directory)),
+                                   IN_MODIFY | IN_CREATE | IN_MOVED_TO) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def drain(self) -> None:
+        """Discard pending events."""
+        try:
+            while os.read(self.fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class LocalBoard:
+    """Append-only JSONL board with byte-offset tailing and a recent-message index"""
+
+    def __init__(
+        self,
+        path: Path,
+        segment_bytes: int = SEGMENT_BYTES,
+        keep_segments: int = KEEP_SEGMENTS,
+        index_limit: int = INDEX_LIMIT
+    ):
+        """
+        Open the board.
+
+        Args:
+            path: Active JSONL file; rotated segments are kept next to it
+            segment_bytes: Size at which the active file is rotated
+            keep_segments: Number of rotated segments to keep
+            index_limit: Recent records indexed per recipient and per topic
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.keep_segments = keep_segments
+        self.index_limit = index_limit
+
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=index_limit)
+        self.by_recipient: Dict[str, Deque[Dict[str, Any]]] = {}
+        self.by_topic: Dict[str, Deque[Dict[str, Any]]] = {}
+        self.records_seen = 0          # Records indexed since the board was opened
+
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._fd_ino: Optional[int] = None
+        self._reader = None
+        self._reader_ino: Optional[int] = None
+        self._partial = b""
+        self._watch: Optional[_InotifyWatch] = None
+        self._watch_failed = False
+
+        # Warm the index from the newest rotated segment, then follow the active file
+        for segment in self.segments()[-1:]:
+            with open(segment, "rb") as f:
+                self._index_lines(f.read().splitlines())
+        self.refresh()
+
+    # ------------------------------------------------------------------
+    # Segments
+    # ------------------------------------------------------------------
+
+    def _segment_path(self, number: int) -> Path:
+        return self.path.with_name(f"{self.path.stem}.{number:06d}{self.path.suffix}")
+
+    def _numbered_segments(self) -> List[Tuple[int, Path]]:
+        prefix = f"{self.path.stem}."
+        found = []
+        for candidate in self.path.parent.glob(f"{self.path.stem}.*{self.path.suffix}"):
+            number = candidate.name[len(prefix):len(candidate.name) - len(self.path.suffix)]
+            if number.isdigit():
+                found.append((int(number), candidate))
+        return sorted(found)
+
+    def segments(self) -> List[Path]:
+        """Rotated segments, oldest first."""
+        return [path for _, path in self._numbered_segments()]
+
+    def needs_rotation(self, size: Optional[int] = None) -> bool:
+        """Whether the active file has outgrown its segment size."""
+        if size is None:
+            try:
+                size = os.stat(self.path).st_size
+            except FileNotFoundError:
+                return False
+        return size >= self.segment_bytes
+
+    def rotate(self) -> bool:
+        """
+        Move the active file to a new numbered segment and prune old segments.
+
+        Safe to call from several processes; the first one to take the lock
+        rotates and the others find the file already small.
+
+        Returns:
+            True if the file was rotated
+        """
+        lock_path = self.path.with_name(self.path.name + ".lock")
+        with open(lock_path, "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                if not self.needs_rotation():
+                    return False
+                numbered = self._numbered_segments()
+                number = numbered[-1][0] + 1 if numbered else 1
+                segments = [path for _, path in numbered]
+                os.rename(self.path, self._segment_path(number))
+                segments.append(self._segment_path(number))
+                for old in segments[:-self.keep_segments] if self.keep_segments else segments:
+                    old.unlink(missing_ok=True)
+                logger.debug(f"Rotated {self.path.name} to segment {number}")
+                return True
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def _writer(self) -> int:
+        """Descriptor for the current active file, reopened after a rotation."""
+        try:
+            current_ino = os.stat(self.path).st_ino
+        except FileNotFoundError:
+            current_ino = None
+        if self._fd is None or current_ino != self._fd_ino:
+            if self._fd is not None:
+                os.close(self._fd)
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            self._fd_ino = os.fstat(self._fd).st_ino
+        return self._fd
+
+    def append(self, record: Dict[str, Any]) -> int:
+        """
+        Append one record.
+
+        Args:
+            record: JSON-serializable message record
+
+        Returns:
+            Size of the active file after the write
+        """
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        with self._lock:
+            fd = self._writer()
+            os.write(fd, line)
+            return os.fstat(fd).st_size
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    @property
+    def offset(self) -> int:
+        """Bytes of the active file consumed by this reader."""
+        return self._reader.tell() - len(self._partial) if self._reader else 0
+
+    def _index_lines(self, lines: Iterable[bytes]) -> List[Dict[str, Any]]:
+        records = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(record, dict):
+                continue
+            self.recent.append(record)
+            for index, key in ((self.by_recipient, record.get("to_agent")),
+                               (self.by_topic, record.get("topic"))):
+                key = (key or "").lower()
+                bucket = index.get(key)
+                if bucket is None:
+                    bucket = index[key] = deque(maxlen=self.index_limit)
+                bucket.append(record)
+            records.append(record)
+        self.records_seen += len(records)
+        return records
+
+    def _consume(self) -> List[Dict[str, Any]]:
+        """Index complete lines appended since the last read."""
+        data = self._partial + self._reader.read()
+        lines = data.split(b"\n")
+        self._partial = lines.pop()
+        return self._index_lines(lines)
+
+    def refresh(self) -> List[Dict[str, Any]]:
+        """
+        Index records appended since the last call.
+
+        Returns:
+            The new records, oldest first
+        """
+        with self._lock:
+            try:
+                current_ino = os.stat(self.path).st_ino
+            except FileNotFoundError:
+                current_ino = None
+
+            records: List[Dict[str, Any]] = []
+            if self._reader is not None:
+                records.extend(self._consume())
+                if current_ino == self._reader_ino:
+                    return records
+                # Rotated: the old file is fully read, switch to the new one
+                self._reader.close()
+                self._reader = None
+                self._partial = b""
+
+            if current_ino is None:
+                return records
+            try:
+                self._reader = open(self.path, "rb")
+            except FileNotFoundError:
+                return records
+            self._reader_ino = os.fstat(self._reader.fileno()).st_ino
+            records.extend(self._consume())
+            return records
+
+    def query(self, agent_id: Optional[str] = None, topic: Optional[str] = None,
+              limit: int = 25) -> List[Dict[str, Any]]:
+        """
+        Most recent indexed records for a recipient and/or topic, newest first.
+
+        Call ``refresh`` first to pick up records from other processes.
+        """
+        agent = (agent_id or "").lower()
+        topic_filter = (topic or "").lower()
+
+        with self._lock:
+            if agent and topic_filter:
+                by_agent = self.by_recipient.get(agent, ())
+                by_topic = self.by_topic.get(topic_filter, ())
+                candidates = by_agent if len(by_agent) <= len(by_topic) else by_topic
+            elif agent:
+                candidates = self.by_recipient.get(agent, ())
+            elif topic_filter:
+                candidates = self.by_topic.get(topic_filter, ())
+            else:
+                candidates = self.recent
+
+            results = []
+            for record in reversed(candidates):
+                if agent and (record.get("to_agent") or "").lower() != agent:
+                    continue
+                if topic_filter and (record.get("topic") or "").lower() != topic_filter:
+                    continue
+                results.append(record)
+                if len(results) == limit:
+                    break
+            return results
+
+    def since(self, mark: int) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Records indexed after a high-water mark taken from ``records_seen``.
+
+        Returns:
+            (records oldest first, new mark). If more records arrived than the
+            index keeps, only the retained ones are returned.
+        """
+        with self._lock:
+            count = self.records_seen - mark
+            if count <= 0:
+                return [], self.records_seen
+            start = max(0, len(self.recent) - count)
+            return list(islice(self.recent, start, None)), self.records_seen
+
+    async def wait_for_append(self, timeout: float) -> None:
+        """
+        Wait until the board directory changes or ``timeout`` seconds pass.
+
+        Uses inotify where available and falls back to sleeping.
+        """
+        watch = self._get_watch()
+        if watch is None:
+            await asyncio.sleep(timeout)
+            return
+
+        loop = asyncio.get_running_loop()
+        changed = loop.create_future()
+        loop.add_reader(watch.fd, lambda: changed.done() or changed.set_result(None))
+        try:
+            await asyncio.wait_for(changed, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            loop.remove_reader(watch.fd)
+            watch.drain()
+
+    def _get_watch(self) -> Optional[_InotifyWatch]:
+        if self._watch is None and _libc is not None and not self._watch_failed:
+            try:
+                self._watch = _InotifyWatch(self.path.parent)
+            except OSError as e:
+                logger.debug(f"inotify unavailable, polling {self.path.parent}: {e}")
+                self._watch_failed = True
+        return self._watch
+
+    def close(self) -> None:
+        """Close file descriptors and the inotify watch."""
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+            if self._watch is not None:
+                self._watch.close()
+                self._watch = None
@@ -5,7 +5,7 @@ Uses Pydantic for type safety and automatic serialization.
 """
 
 from enum import Enum
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime, timezone
 from pydantic import BaseModel, Field, field_validator
 
@@ -66,6 +66,15 @@ class ConnectionConfig(BaseModel):
     reconnect_attempts: int = Field(default=3, ge=0, le=10)
     reconnect_delay: float = Field(default=1.0, ge=0.1, le=60.0)
     timeout: float = Field(default=30.0, ge=1.0, le=300.0)
+    encodings: Optional[List[str]] = Field(
+        default=None,
+        description="Wire encodings to offer at registration, most preferred first "
+                    "(None offers every installed encoding, ['json'] disables negotiation)"
+    )
+    compress_threshold: Optional[int] = Field(
+        default=4096, ge=0,
+        description="Deflate binary frames larger than this many bytes (None disables)"
+    )
     
     @field_validator('url')
     @classmethod
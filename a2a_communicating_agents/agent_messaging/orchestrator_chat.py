@@ -133,18 +133,8 @@ class OrchestratorChatSession:
             return transport_name, transport
 
         try:
-            # Get or create persistent event loop
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_closed():
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-
             # Create transport using async method with persistent loop
-            name, transport_instance = loop.run_until_complete(
+            name, transport_instance = self._event_loop().run_until_complete(
                 self._transport_factory.create_transport_async(
                     agent_id=self.agent_name,
                     doc_manager=self._doc_manager,
@@ -206,21 +196,39 @@ class OrchestratorChatSession:
                 style = "white"
             console.print(f"[dim]{time_str}[/dim] [{style}]{sender}[/]: {content}")
 
+    @staticmethod
+    def _event_loop() -> asyncio.AbstractEventLoop:
+        """Persistent loop shared by the transport's background tasks."""
+        try:
+            loop = asyncio.get_event_loop()
+            if loop.is_closed():
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+        except RuntimeError:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+        return loop
+
     async def _message_callback(self, message: AgentMessage) -> None:
-        """Callback for real-time WebSocket messages."""
+        """Callback for real-time messages pushed by the transport."""
+        if message.from_agent == self.agent_name:
+            return  # Our own message echoed back by the board
         # Add to incoming queue for processing
         await self._incoming_messages.put(message)
 
     def subscribe_to_topic(self):
-        """Subscribe to the topic for real-time message delivery (WebSocket only)."""
-        if self.transport_name != "websocket":
-            return  # Only WebSocket supports subscriptions
+        """Subscribe to the topic for real-time message delivery (WebSocket and RAG)."""
+        if self.transport_name not in ("websocket", "rag"):
+            return  # Letta has no push delivery
 
         if self._subscription_active:
             return
 
         try:
-            asyncio.run(self.transport.subscribe(self.topic, self._message_callback))
+            # Subscribe on the persistent loop so background delivery keeps running
+            self._event_loop().run_until_complete(
+                self.transport.subscribe(self.topic, self._message_callback)
+            )
             self._subscription_active = True
             console.print(f"  📬 Subscribed to topic '{self.topic}' for real-time updates", style="dim")
         except Exception as e:
@@ -274,18 +282,8 @@ class OrchestratorChatSession:
             priority=TransportMessagePriority.NORMAL,
         )
         try:
-            # Get or create event loop for this thread
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_closed():
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-
             # Run the send in the persistent loop
-            success = loop.run_until_complete(self.transport.send(transport_message))
+            success = self._event_loop().run_until_complete(self.transport.send(transport_message))
         except Exception as exc:
             console.print(f"❌ Failed to send message: {exc}", style="red")
             return None
@@ -555,16 +553,18 @@ def main(argv: Optional[Sequence[str]] = None) -> None:
         session.send_user_message(user_input)
         console.print("✅ Message sent. Waiting for response...", style="green")
 
-        # Wait for response using WebSocket subscription if available, otherwise poll
-        if session.transport_name == "websocket" and session._subscription_active:
-            # Real-time WebSocket - wait for incoming messages
-            new_msgs = asyncio.run(session.wait_for_response_async(timeout=15.0))
+        # Wait for pushed messages if subscribed, otherwise poll
+        if session._subscription_active:
+            # Real-time delivery - wait for incoming messages on the transport's loop
+            new_msgs = session._event_loop().run_until_complete(
+                session.wait_for_response_async(timeout=15.0)
+            )
             if new_msgs:
                 session.render_messages(new_msgs)
             else:
                 console.print("⏱️  No response within 15 seconds. Orchestrator may be processing or offline.", style="yellow")
         else:
-            # Fallback to polling for RAG/Letta transports
+            # Fallback to polling for the Letta transport
             poll_timeout = 15.0
             poll_interval = 1.0
             start_time = time.time()
@@ -6,16 +6,38 @@ Always available as fallback when WebSocket and Letta are offline.
 """
 
 import asyncio
-import json
+import re
+import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional, Callable, Awaitable, Dict, List, Set
+from typing import Any, Optional, Callable, Awaitable, Deque, Dict, List, Set
 from uuid import uuid4
 
 from .message_transport import MessageTransport
-from .message_models import AgentMessage
+from .message_models import AgentMessage, MessagePriority
+from .local_board import LocalBoard
 from rag_system.models.document import QueryResult
 
+# Push delivery: the local board is checked right after every change
+# (inotify) or on an interval that doubles while nothing arrives; Chroma is
+# scanned on its own, slower backoff for messages written by other hosts
+DELIVERY_MIN_INTERVAL = 0.05
+DELIVERY_MAX_INTERVAL = 1.0
+CHROMA_MIN_INTERVAL = 0.5
+CHROMA_MAX_INTERVAL = 10.0
+CHROMA_SCAN_LIMIT = 50       # Page size for the Chroma scan
+DELIVERED_ID_LIMIT = 5000   # Message ids remembered for de-duplication
+
+# Inbox queries look back this far (seconds) first and widen until they
+# have enough messages; None means no time bound
+INBOX_WINDOWS = (300, 3600, 86400, 7 * 86400, None)
+
+_HEADER_RE = re.compile(
+    r"\s*\*\*From:\*\*.*?\*\*Time:\*\*\s*\S+",
+    re.DOTALL,
+)
+
 
 class LocalBoardMessage:
     """Lightweight message container backed by the JSONL cache."""
@@ -49,20 +71,30 @@ class RAGBoardTransport(MessageTransport):
     Slower than WebSocket/Letta but always available.
     """
     
-    def __init__(self, doc_manager):
+    def __init__(self, doc_manager, local_board_path: Optional[Path] = None):
         """
         Initialize RAG board transport.
         
         Args:
             doc_manager: DocumentManager instance for persistence
+            local_board_path: JSONL file for the local board
+                (defaults to storage/message_board.jsonl)
         """
         self.doc_manager = doc_manager
         self._connected = True  # Always "connected" (no server needed)
         self._subscriptions: Dict[str, Callable] = {}
-        root = Path(__file__).resolve().parents[2]
-        self._local_board_path = root / "storage" / "message_board.jsonl"
-        self._local_board_path.parent.mkdir(parents=True, exist_ok=True)
-        self._local_cache_limit = 200
+        if local_board_path is None:
+            root = Path(__file__).resolve().parents[2]
+            local_board_path = root / "storage" / "message_board.jsonl"
+        self._local_board_path = Path(local_board_path)
+        self._local_board = LocalBoard(self._local_board_path)
+        self._rotation: Optional[asyncio.Future] = None
+        self._delivery_task: Optional[asyncio.Task] = None
+        self._local_mark = 0
+        self._chroma_mark = 0.0
+        self._delivered_ids: Set[str] = set()
+        self._delivered_order: Deque[str] = deque()
+        self._metadata_backfilled = False
         
     async def connect(self) -> None:
         """No connection needed for RAG board"""
@@ -72,6 +104,10 @@ class RAGBoardTransport(MessageTransport):
         """Clean up subscriptions"""
         self._subscriptions.clear()
         self._connected = False
+        await self._stop_delivery()
+        if self._rotation is not None:
+            await self._rotation
+            self._rotation = None
     
     async def send(self, message: AgentMessage) -> bool:
         """
@@ -85,10 +121,9 @@ class RAGBoardTransport(MessageTransport):
         """
         if not self._connected:
             return False
-        
-        try:
-            # Format message for RAG storage
-            content = f"""
+
+        # Format message for RAG storage
+        content = f"""
 **From:** {message.from_agent}
 **To:** {message.to_agent}
 **Topic:** {message.topic}
@@ -97,7 +132,22 @@ class RAGBoardTransport(MessageTransport):
 
 {message.content}
 """
-            
+        message_id = str(uuid4())
+
+        # The local board comes first: it is what push delivery watches, and
+        # cache failures never stop the RAG write
+        self._append_local_board(
+            content=content,
+            from_agent=message.from_agent,
+            to_agent=message.to_agent,
+            topic=message.topic or "general",
+            priority=message.priority.value,
+            timestamp=message.timestamp,
+            message_id=message_id,
+            body=message.content,
+        )
+
+        try:
             # Persist to RAG with tags for filtering
             artifact_id = await asyncio.to_thread(
                 self.doc_manager.add_runtime_artifact,
@@ -108,23 +158,22 @@ class RAGBoardTransport(MessageTransport):
                     message.topic,
                     f"to:{message.to_agent}",
                     f"from:{message.from_agent}",
-                    f"priority:{message.priority.value}"
-                ]
+                    f"priority:{message.priority.value}",
+                    f"msg:{message_id}"
+                ],
+                # First-class fields so inbox queries filter inside Chroma
+                metadata={
+                    "to_agent": message.to_agent.lower(),
+                    "from_agent": message.from_agent.lower(),
+                    "topic": (message.topic or "general").lower(),
+                    "message_id": message_id,
+                }
             )
             
             return artifact_id is not None
             
         except Exception:
             return False
-        finally:
-            self._append_local_board(
-                content=content,
-                from_agent=message.from_agent,
-                to_agent=message.to_agent,
-                topic=message.topic or "general",
-                priority=message.priority.value,
-                timestamp=message.timestamp,
-            )
     
     async def subscribe(
         self, 
@@ -132,18 +181,172 @@ class RAGBoardTransport(MessageTransport):
         callback: Callable[[AgentMessage], Awaitable[None]]
     ) -> None:
         """
-        Subscribe to topic (polling-based).
-        
-        Note: RAG doesn't support push notifications, so this just
-        registers the callback. A background poller would be needed
-        for real-time delivery.
+        Subscribe to topic.
+
+        Messages posted after the first subscription are pushed to the
+        callback by a background delivery task that tails the local board
+        (woken by inotify where available) and periodically scans the Chroma
+        message artifacts for messages written by other hosts.
         """
         self._subscriptions[topic] = callback
+        if self._delivery_task is None or self._delivery_task.done():
+            self._start_delivery()
     
     async def unsubscribe(self, topic: str) -> None:
         """Unsubscribe from topic"""
         if topic in self._subscriptions:
             del self._subscriptions[topic]
+        if not self._subscriptions:
+            await self._stop_delivery()
+
+    # ------------------------------------------------------------------
+    # Push delivery
+    # ------------------------------------------------------------------
+
+    def _start_delivery(self) -> None:
+        """Start delivering from the current high-water marks."""
+        self._local_board.refresh()
+        self._local_mark = self._local_board.records_seen
+        # created_ts is epoch time, so the mark must be too
+        self._chroma_mark = time.time()
+        self._delivery_task = asyncio.create_task(self._delivery_loop())
+
+    async def _stop_delivery(self) -> None:
+        task, self._delivery_task = self._delivery_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _delivery_loop(self) -> None:
+        """Dispatch new board messages to subscribers with adaptive backoff."""
+        idle = DELIVERY_MIN_INTERVAL
+        chroma_interval = CHROMA_MIN_INTERVAL
+        next_chroma = asyncio.get_running_loop().time() + chroma_interval
+
+        while self._subscriptions:
+            delivered = await self._deliver_local()
+
+            now = asyncio.get_running_loop().time()
+            if now >= next_chroma:
+                from_chroma = await self._deliver_chroma()
+                delivered += from_chroma
+                # Scan Chroma quickly while other hosts are talking, back off when quiet
+                chroma_interval = (CHROMA_MIN_INTERVAL if from_chroma
+                                   else min(chroma_interval * 2, CHROMA_MAX_INTERVAL))
+                next_chroma = now + chroma_interval
+
+            idle = DELIVERY_MIN_INTERVAL if delivered else min(idle * 2, DELIVERY_MAX_INTERVAL)
+            wait = min(idle, max(0.0, next_chroma - asyncio.get_running_loop().time()))
+            await self._local_board.wait_for_append(wait)
+
+    async def _deliver_local(self) -> int:
+        try:
+            self._local_board.refresh()
+            records, self._local_mark = self._local_board.since(self._local_mark)
+        except Exception as exc:
+            print(f"[RAGBoardTransport] Local board read failed: {exc}")
+            return 0
+
+        delivered = 0
+        for record in records:
+            message_id = (record.get("id") or "").replace("local-", "", 1)
+            created_at = self._parse_timestamp(record.get("timestamp"))
+            body = record.get("body")
+            if body is None:
+                body = self._strip_header(record.get("content", ""))
+            delivered += await self._dispatch(
+                message_id,
+                topic=record.get("topic") or "general",
+                to_agent=record.get("to_agent") or "board",
+                from_agent=record.get("from_agent") or "unknown",
+                priority=record.get("priority") or "normal",
+                content=body,
+                timestamp=created_at,
+            )
+        return delivered
+
+    async def _deliver_chroma(self) -> int:
+        try:
+            items = await asyncio.to_thread(self._fetch_since, self._chroma_mark)
+        except Exception as exc:
+            print(f"[RAGBoardTransport] Chroma scan failed: {exc}")
+            return 0
+
+        fresh = []
+        for item in items:
+            metadata = item.metadata or {}
+            if metadata.get("chunk_index", 0) != 0:
+                continue
+            created = self._metadata_timestamp(metadata)
+            if created < self._chroma_mark:
+                continue
+            fresh.append((created, item))
+        fresh.sort(key=lambda pair: pair[0])
+
+        delivered = 0
+        for created, item in fresh:
+            self._chroma_mark = max(self._chroma_mark, created)
+            tag_set = self._normalize_tags((item.metadata or {}).get("tags"))
+            message_id = ((item.metadata or {}).get("message_id")
+                          or self._extract_tag_value(tag_set, "msg:") or item.document_id)
+            delivered += await self._dispatch(
+                message_id,
+                topic=item.topic,
+                to_agent=((item.metadata or {}).get("to_agent")
+                          or self._extract_tag_value(tag_set, "to:") or "board"),
+                from_agent=item.from_agent,
+                priority=self._extract_tag_value(tag_set, "priority:") or "normal",
+                content=self._strip_header(item.content),
+                timestamp=self._parse_timestamp((item.metadata or {}).get("created_at")),
+            )
+        return delivered
+
+    async def _dispatch(self, message_id: str, *, topic: str, to_agent: str, from_agent: str,
+                        priority: str, content: str, timestamp: datetime) -> int:
+        """Hand one message to its topic's callback, once per message id."""
+        if message_id in self._delivered_ids:
+            return 0
+        self._delivered_ids.add(message_id)
+        self._delivered_order.append(message_id)
+        if len(self._delivered_order) > DELIVERED_ID_LIMIT:
+            self._delivered_ids.discard(self._delivered_order.popleft())
+
+        callback = None
+        for subscribed, candidate in self._subscriptions.items():
+            if subscribed.lower() == topic.lower():
+                topic, callback = subscribed, candidate
+                break
+        if callback is None:
+            return 0
+
+        try:
+            message = AgentMessage(
+                to_agent=to_agent,
+                from_agent=from_agent,
+                content=content or " ",
+                topic=topic,
+                priority=MessagePriority(priority),
+                timestamp=timestamp,
+                metadata={"message_id": message_id, "transport_source": "rag"},
+            )
+        except Exception as exc:
+            print(f"[RAGBoardTransport] Skipping malformed message {message_id}: {exc}")
+            return 0
+
+        try:
+            await callback(message)
+        except Exception as exc:
+            print(f"[RAGBoardTransport] Error in subscription callback for topic '{topic}': {exc}")
+        return 1
+
+    @staticmethod
+    def _strip_header(text: str) -> str:
+        """Drop the **From:**/**To:**/... header written by send()."""
+        match = _HEADER_RE.match(text or "")
+        return (text[match.end():] if match else text or "").strip()
     
     def is_connected(self) -> bool:
         """RAG board is always "connected" """
@@ -189,7 +392,7 @@ class RAGBoardTransport(MessageTransport):
         except Exception as exc:
             print(f"[RAGBoardTransport] Metadata scan failed: {exc}")
         
-        # Fallback to semantic search if metadata scan returns nothing
+        # Fallback to a keyword search of the to: tag if metadata scan returns nothing
         fallback_needed = not combined
         if fallback_needed:
             try:
@@ -202,7 +405,8 @@ class RAGBoardTransport(MessageTransport):
                     self.doc_manager.search_artifacts,
                     query=query,
                     artifact_type="message",
-                    n_results=10
+                    n_results=10,
+                    mode="lexical"
                 )
                 print(f"[RAGBoardTransport] Fallback found {len(results)} results")
                 for result in results:
@@ -231,10 +435,12 @@ class RAGBoardTransport(MessageTransport):
         topic: str,
         priority: str,
         timestamp: datetime,
+        message_id: Optional[str] = None,
+        body: Optional[str] = None,
     ) -> None:
-        """Persist a small JSONL log so we can read the latest messages without scanning Chroma."""
+        """Append to the local JSONL board so we can read the latest messages without scanning Chroma."""
         record = {
-            "id": f"local-{uuid4()}",
+            "id": f"local-{message_id or uuid4()}",
             "from_agent": from_agent,
             "to_agent": to_agent,
             "topic": topic,
@@ -242,23 +448,27 @@ class RAGBoardTransport(MessageTransport):
             "timestamp": timestamp.isoformat(),
             "content": content,
         }
+        if body is not None:
+            record["body"] = body
         try:
-            existing: List[str] = []
-            if self._local_board_path.exists():
-                existing = [
-                    line.strip()
-                    for line in self._local_board_path.read_text(encoding="utf-8").splitlines()
-                    if line.strip()
-                ]
-            existing.append(json.dumps(record))
-            if len(existing) > self._local_cache_limit:
-                existing = existing[-self._local_cache_limit :]
-            data = "\n".join(existing) + ("\n" if existing else "")
-            self._local_board_path.write_text(data, encoding="utf-8")
+            size = self._local_board.append(record)
+            if self._local_board.needs_rotation(size):
+                self._schedule_rotation()
         except Exception:
             # Cache failures should never break the main transport flow
             pass
 
+    def _schedule_rotation(self) -> None:
+        """Rotate the local board off the send path."""
+        if self._rotation is not None and not self._rotation.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._local_board.rotate()
+            return
+        self._rotation = loop.run_in_executor(None, self._local_board.rotate)
+
     def _read_local_board(
         self,
         agent_id: str,
@@ -267,88 +477,153 @@ class RAGBoardTransport(MessageTransport):
         limit: int,
     ) -> List[LocalBoardMessage]:
         """Load cached entries for the requested recipient/topic."""
-        if not self._local_board_path.exists():
+        items: List[LocalBoardMessage] = []
+        try:
+            # Only the bytes appended since the last poll are read
+            self._local_board.refresh()
+            records = self._local_board.query(agent_id, topic, limit=limit)
+        except Exception:
             return []
 
-        agent = (agent_id or "").lower()
-        topic_filter = (topic or "").lower()
-        items: List[LocalBoardMessage] = []
+        for payload in records:
+            try:
+                created_at = datetime.fromisoformat(payload["timestamp"])
+            except Exception:
+                created_at = datetime.utcnow()
+
+            items.append(
+                LocalBoardMessage(
+                    content=payload.get("content", ""),
+                    from_agent=payload.get("from_agent", "unknown"),
+                    topic=payload.get("topic", "general"),
+                    document_id=payload.get("id", f"local-{uuid4()}"),
+                    created_at=created_at,
+                )
+            )
 
+        items.sort(key=lambda item: self._metadata_timestamp(item.metadata), reverse=True)
+        return items
+
+    def _ensure_message_metadata(self) -> None:
+        """Run the one-time metadata backfill for message artifacts."""
+        if self._metadata_backfilled:
+            return
+        self._metadata_backfilled = True
+        backfill = getattr(self.doc_manager, "backfill_message_metadata", None)
+        if not callable(backfill):
+            return
         try:
-            with self._local_board_path.open("r", encoding="utf-8") as handle:
-                for line in handle:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        payload = json.loads(line)
-                    except json.JSONDecodeError:
-                        continue
+            updated = backfill()
+            if isinstance(updated, int) and updated:
+                print(f"[RAGBoardTransport] Backfilled metadata for {updated} message chunks")
+        except Exception as exc:
+            print(f"[RAGBoardTransport] Message metadata backfill failed: {exc}")
 
-                    if agent and payload.get("to_agent", "").lower() != agent:
-                        continue
-                    if topic_filter and payload.get("topic", "").lower() != topic_filter:
-                        continue
+    def _fetch_since(self, since_ts: float) -> List[LocalBoardMessage]:
+        """
+        Pull every first-chunk message artifact created at or after ``since_ts``.
 
-                    try:
-                        created_at = datetime.fromisoformat(payload["timestamp"])
-                    except Exception:
-                        created_at = datetime.utcnow()
-
-                    items.append(
-                        LocalBoardMessage(
-                            content=payload.get("content", ""),
-                            from_agent=payload.get("from_agent", "unknown"),
-                            topic=payload.get("topic", "general"),
-                            document_id=payload.get("id", f"local-{uuid4()}"),
-                            created_at=created_at,
-                        )
-                    )
-        except Exception:
-            return []
+        Pages through the matches ``CHROMA_SCAN_LIMIT`` at a time until a
+        short page, so a burst larger than one page is not cut off below the
+        caller's high-water mark. Results are returned oldest first.
+        """
+        self._ensure_message_metadata()
+        collection = self.doc_manager.rag_engine.collection
+        where = {"$and": [
+            {"doc_type": "runtime_artifact"},
+            {"artifact_type": "message"},
+            {"chunk_index": 0},
+            {"created_ts": {"$gte": since_ts}},
+        ]}
+
+        items: List[LocalBoardMessage] = []
+        offset = 0
+        while True:
+            response = collection.get(
+                where=where,
+                include=["metadatas", "documents"],
+                limit=CHROMA_SCAN_LIMIT,
+                offset=offset,
+            )
+            page = self._items_from_response(response, None)
+            items.extend(page)
+            if len(page) < CHROMA_SCAN_LIMIT:
+                break
+            offset += len(page)
+
+        items.sort(key=lambda result: self._metadata_timestamp(result.metadata))
+        return items
 
-        items.sort(key=lambda item: self._metadata_timestamp(item.metadata), reverse=True)
-        return items[:limit]
     def _fetch_by_metadata(
         self,
         agent_id: str,
         topic: Optional[str],
         limit: int = 25,
     ) -> List[QueryResult]:
-        """Pull the latest message artifacts by scanning metadata instead of embeddings."""
+        """
+        Pull the latest message artifacts with a metadata query instead of embeddings.
+
+        Recipient, topic and time are filtered inside Chroma. Chroma cannot
+        sort, so the time window is widened until it holds ``limit``
+        messages, then the results are sorted here. Every get() is capped
+        at ``limit`` rows; the last window that came back short is complete,
+        so its (newest) messages are always kept alongside the full one.
+        """
+        self._ensure_message_metadata()
         collection = self.doc_manager.rag_engine.collection
-        filters = {
-            "$and": [
-                {"doc_type": "runtime_artifact"},
-                {"artifact_type": "message"},
-            ]
-        }
-        response = collection.get(
-            where=filters,
-            include=["metadatas", "documents"],
-            limit=max(limit * 4, 20),
+        clauses: List[Dict[str, Any]] = [
+            {"doc_type": "runtime_artifact"},
+            {"artifact_type": "message"},
+        ]
+        if agent_id:
+            clauses.append({"to_agent": agent_id.lower()})
+        if topic:
+            clauses.append({"topic": topic.lower()})
+
+        # created_ts is epoch time
+        now = time.time()
+        complete: List[LocalBoardMessage] = []
+        items: List[LocalBoardMessage] = []
+        for window in INBOX_WINDOWS:
+            lower = now - window if window else None
+            where_clauses = clauses + ([{"created_ts": {"$gte": lower}}] if lower is not None else [])
+            response = collection.get(
+                where={"$and": where_clauses},
+                include=["metadatas", "documents"],
+                limit=limit,
+            )
+            items = self._items_from_response(response, topic)
+            if len(items) >= limit:
+                seen = {item.document_id for item in items}
+                items.extend(item for item in complete if item.document_id not in seen)
+                break
+            complete = items
+
+        items.sort(
+            key=lambda result: self._metadata_timestamp(result.metadata),
+            reverse=True,
         )
+        return items[:limit]
+
+    def _items_from_response(
+        self,
+        response: Dict[str, Any],
+        topic: Optional[str],
+    ) -> List[LocalBoardMessage]:
+        """Wrap the rows of a ``collection.get`` response as board messages."""
         ids = response.get("ids") or []
         documents = response.get("documents") or []
         metadatas = response.get("metadatas") or []
 
-        agent_tag = f"to:{agent_id.lower()}" if agent_id else None
-        topic_tag = topic.lower() if topic else None
-
         items: List[LocalBoardMessage] = []
         for idx, chunk_id in enumerate(ids):
             metadata = metadatas[idx] or {}
             tag_set = self._normalize_tags(metadata.get("tags"))
 
-            if agent_tag and agent_tag not in tag_set:
-                continue
-            if topic_tag and topic_tag not in tag_set:
-                continue
-
             document_id = metadata.get("document_id", chunk_id)
             content = documents[idx] or ""
-            from_agent = self._extract_tag_value(tag_set, "from:") or "unknown"
-            topic_name = topic or self._extract_topic_from_tags(tag_set) or metadata.get("topic", "general")
+            from_agent = metadata.get("from_agent") or self._extract_tag_value(tag_set, "from:") or "unknown"
+            topic_name = topic or metadata.get("topic") or self._extract_topic_from_tags(tag_set) or "general"
             created_at = self._parse_timestamp(metadata.get("created_at"))
 
             items.append(
@@ -361,12 +636,7 @@ class RAGBoardTransport(MessageTransport):
                     metadata=metadata,
                 )
             )
-
-        items.sort(
-            key=lambda result: self._metadata_timestamp(result.metadata),
-            reverse=True,
-        )
-        return items[:limit]
+        return items
 
     @staticmethod
     def _normalize_tags(tag_blob: Optional[str]) -> Set[str]:
@@ -420,15 +690,17 @@ class RAGBoardTransport(MessageTransport):
 
     @staticmethod
     def _metadata_timestamp(metadata: Dict) -> float:
-        value = metadata.get("created_at")
-        if not value:
-            return 0.0
-        try:
-            timestamp = datetime.fromisoformat(value).timestamp()
-        except ValueError:
-            return 0.0
+        timestamp = metadata.get("created_ts")
+        if not isinstance(timestamp, (int, float)):
+            value = metadata.get("created_at")
+            if not value:
+                return 0.0
+            try:
+                timestamp = datetime.fromisoformat(value).timestamp()
+            except ValueError:
+                return 0.0
 
-        now = datetime.utcnow().timestamp()
+        now = time.time()
         # Some historic entries were written with far-future timestamps.
         # Clamp anything ahead of "now" so those artifacts don't hide new chats.
         if timestamp > now:
@@ -4,15 +4,27 @@ WebSocket Message Board Server
 
 Real-time message routing server for agent-to-agent communication.
 Supports topic-based pub/sub with instant message delivery.
+
+Each client has a bounded outbox drained by its own writer task, so a slow
+agent cannot hold up delivery to the rest of a topic.
+
+Messages addressed to a specific agent are delivered to that agent only;
+topic fan-out is kept for broadcasts (to_agent "board" or "*").
 """
 
 import asyncio
 import json
 import logging
+from collections import deque
 from datetime import datetime
-from typing import Dict, Set, Optional
+from itertools import islice
+from typing import Deque, Dict, List, Set, Optional, Union
 from pathlib import Path
+import argparse
+import multiprocessing
+import signal
 import sys
+import uuid
 
 try:
     import websockets
@@ -21,6 +33,16 @@ except ImportError:
     print("ERROR: websockets package not installed. Install with: pip install websockets")
     sys.exit(1)
 
+try:
+    from .board_bus import BusClient, BusHub, default_bus_path
+    from .board_log import BoardLog
+    from .wire_codec import DEFAULT_COMPRESS_THRESHOLD, JSON_CODEC, WireCodec, compress_threshold_from, negotiate
+except ImportError:
+    # Running as a script (python agent_messaging/websocket_server.py)
+    from board_bus import BusClient, BusHub, default_bus_path
+    from board_log import BoardLog
+    from wire_codec import DEFAULT_COMPRESS_THRESHOLD, JSON_CODEC, WireCodec, compress_threshold_from, negotiate
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -29,25 +51,210 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Store connected clients by agent_id
+# Store connected clients by agent_id; this is also the routing table for
+# direct (point-to-point) messages
 clients: Dict[str, WebSocketServerProtocol] = {}
 
 # Store topic subscriptions: topic -> set of agent_ids
 subscriptions: Dict[str, Set[str]] = {}
 
-# Message history for new subscribers (last 100 messages per topic)
-message_history: Dict[str, list] = {}
+# Message history for new subscribers: a ring of the last 100 envelopes per
+# topic. Envelopes carry a per-topic sequence number so a reconnecting agent
+# can ask for exactly what it missed.
+message_history: Dict[str, Deque[dict]] = {}
+topic_sequences: Dict[str, int] = {}
 MAX_HISTORY = 100
+HISTORY_REPLAY = 10        # Envelopes replayed on subscribe when no since_seq is given
+
+# Identifies this board's sequence numbering. Without a durable log the
+# numbers start again at 1 on every restart, and so does the epoch; clients
+# that see a new epoch resubscribe from the beginning.
+board_epoch: str = uuid.uuid4().hex
+
+# Optional durable mode: every broadcast is also appended to a per-topic log
+# on disk, the rings are rebuilt from it on startup and reconnecting agents
+# can replay further back than the in-memory ring
+board_log: Optional[BoardLog] = None
+REPLAY_LIMIT = 10000       # Most envelopes replayed from the durable log at once
+
+# Sharded mode: several worker processes share the port and exchange
+# broadcasts through a local bus hub (see board_bus.py). Each shard only
+# tracks its own clients and subscriptions.
+bus: Optional[BusClient] = None
+SHARD_RESTART_DELAY = 1.0  # Seconds between checks for crashed shards
+
+# Outbound delivery: every client gets a bounded queue drained by its own
+# writer task, so a slow agent only ever delays itself
+outboxes: Dict[str, "ClientOutbox"] = {}
+OUTBOX_SIZE = 256          # Queued messages per client before the policy applies
+SEND_TIMEOUT = 5.0         # Seconds a single send may take before the client is dropped
+SLOW_CLIENT_POLICY = "drop_oldest"  # "drop_oldest" or "disconnect" when a queue is full
+SLOW_CLIENT_POLICIES = ("drop_oldest", "disconnect")
+
+# to_agent values that mean "everyone on the topic"
+BROADCAST_ADDRESSES = ("board", "*")
+
+
+class ClientOutbox:
+    """Bounded outbound message queue with a dedicated writer task for one client."""
+
+    def __init__(
+        self,
+        agent_id: str,
+        websocket: WebSocketServerProtocol,
+        maxsize: Optional[int] = None,
+        send_timeout: Optional[float] = None,
+        policy: Optional[str] = None,
+        codec: Optional[WireCodec] = None
+    ):
+        # Defaults are read at construction so the module settings can be tuned at runtime
+        maxsize = OUTBOX_SIZE if maxsize is None else maxsize
+        send_timeout = SEND_TIMEOUT if send_timeout is None else send_timeout
+        policy = policy or SLOW_CLIENT_POLICY
+        if policy not in SLOW_CLIENT_POLICIES:
+            raise ValueError(f"Unknown slow client policy '{policy}', expected one of {SLOW_CLIENT_POLICIES}")
+
+        self.agent_id = agent_id
+        self.websocket = websocket
+        self.send_timeout = send_timeout
+        self.policy = policy
+        self.codec = codec or JSON_CODEC
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.sent = 0
+        self.dropped = 0
+        self.closed = False
+        # topic -> first sequence number dropped since the last gap notice
+        self._gaps: Dict[str, int] = {}
+        self._task = asyncio.create_task(self._drain())
+
+    def offer(self, payload: Union[str, bytes], topic: Optional[str] = None,
+              seq: Optional[int] = None) -> bool:
+        """
+        Queue an already-encoded message without blocking the caller.
+
+        Args:
+            payload: Encoded frame
+            topic: Topic of the envelopes the frame carries, if any
+            seq: Lowest sequence number the frame carries, if any
+
+        Returns:
+            False if the client is closed or was disconnected by the policy
+        """
+        if self.closed:
+            return False
+
+        entry = (payload, topic, seq)
+        try:
+            self.queue.put_nowait(entry)
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        if self.policy == "disconnect":
+            logger.warning(f"🐢 Outbox for '{self.agent_id}' is full, disconnecting slow client")
+            self._shutdown()
+            return False
+
+        # drop_oldest: the client keeps up with the newest messages; the next
+        # frame it receives is a gap notice naming the first sequence number it
+        # missed on each topic, so it can resubscribe from there
+        try:
+            _, dropped_topic, dropped_seq = self.queue.get_nowait()
+        except asyncio.QueueEmpty:
+            dropped_topic = dropped_seq = None
+        if dropped_topic is not None and dropped_seq is not None:
+            self._gaps[dropped_topic] = min(dropped_seq, self._gaps.get(dropped_topic, dropped_seq))
+        self.dropped += 1
+        if self.dropped == 1 or self.dropped % 100 == 0:
+            logger.warning(f"🐢 Outbox for '{self.agent_id}' is full, dropped {self.dropped} message(s)")
+        self.queue.put_nowait(entry)
+        return True
+
+    async def _drain(self) -> None:
+        """Send queued messages in order, giving up on a client that stalls."""
+        try:
+            while True:
+                payload, _, _ = await self.queue.get()
+                if not await self._send_gaps() or not await self._send(payload):
+                    break
+                self.sent += 1
+        except asyncio.CancelledError:
+            return
+
+        self._shutdown()
+
+    async def _send_gaps(self) -> bool:
+        """Tell the client where each topic's dropped messages begin."""
+        while self._gaps:
+            topic, from_seq = self._gaps.popitem()
+            gap = {"type": "gap", "topic": topic, "from_seq": from_seq}
+            if not await self._send(self.codec.encode(gap)):
+                return False
+        return True
+
+    async def _send(self, payload: Union[str, bytes]) -> bool:
+        """Send one frame, returning False if the client stalled or went away."""
+        try:
+            await asyncio.wait_for(self.websocket.send(payload), timeout=self.send_timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"⏱️  Send to '{self.agent_id}' timed out after {self.send_timeout}s, disconnecting")
+        except Exception as e:
+            logger.error(f"Failed to send to '{self.agent_id}': {e}")
+        return False
+
+    def _shutdown(self) -> None:
+        """Mark the outbox closed and close the socket; the handler unregisters the client."""
+        if self.closed:
+            return
+        self.closed = True
+        if not self._task.done() and self._task is not asyncio.current_task():
+            self._task.cancel()
+        asyncio.create_task(self._close_socket())
+
+    async def _close_socket(self) -> None:
+        try:
+            await asyncio.wait_for(self.websocket.close(), timeout=self.send_timeout)
+        except Exception:
+            pass
+
+    def stop(self) -> None:
+        """Stop the writer task without closing the socket."""
+        self.closed = True
+        if not self._task.done():
+            self._task.cancel()
+
+
+def is_direct(to_agent: Optional[str]) -> bool:
+    """Whether a to_agent value addresses a single agent rather than the topic."""
+    return bool(to_agent) and to_agent not in BROADCAST_ADDRESSES
+
+
+def visible_to(envelope: dict, agent_id: str) -> bool:
+    """Whether an envelope should be delivered to an agent subscribed to its topic."""
+    to_agent = envelope.get("to_agent")
+    return not is_direct(to_agent) or to_agent == agent_id
+
+
+def codec_for(agent_id: str) -> WireCodec:
+    """Codec negotiated by a client at registration (JSON for old clients)."""
+    outbox = outboxes.get(agent_id)
+    return outbox.codec if outbox else JSON_CODEC
 
 
-async def register_client(websocket: WebSocketServerProtocol, agent_id: str):
+async def register_client(websocket: WebSocketServerProtocol, agent_id: str,
+                          codec: Optional[WireCodec] = None):
     """Register a new client connection."""
     if agent_id in clients:
         logger.warning(f"Agent {agent_id} reconnecting, closing old connection")
+        old_outbox = outboxes.pop(agent_id, None)
+        if old_outbox:
+            old_outbox.stop()
         old_socket = clients[agent_id]
         await old_socket.close()
 
     clients[agent_id] = websocket
+    outboxes[agent_id] = ClientOutbox(agent_id, websocket, codec=codec)
     logger.info(f"✅ Agent '{agent_id}' connected (total: {len(clients)})")
 
 
@@ -56,6 +263,10 @@ async def unregister_client(agent_id: str):
     if agent_id in clients:
         del clients[agent_id]
 
+    outbox = outboxes.pop(agent_id, None)
+    if outbox:
+        outbox.stop()
+
     # Remove from all topic subscriptions
     for topic, subscribers in subscriptions.items():
         subscribers.discard(agent_id)
@@ -63,28 +274,77 @@ async def unregister_client(agent_id: str):
     logger.info(f"❌ Agent '{agent_id}' disconnected (total: {len(clients)})")
 
 
-async def subscribe_to_topic(agent_id: str, topic: str):
-    """Subscribe an agent to a topic."""
+def history_since(topic: str, since_seq: Optional[int] = None) -> List[dict]:
+    """
+    Get buffered envelopes for a topic.
+
+    Args:
+        topic: Topic name
+        since_seq: Return envelopes with a sequence number greater than this;
+            None returns the last HISTORY_REPLAY envelopes
+
+    Returns:
+        Envelopes in sequence order (older ones may have been dropped)
+    """
+    ring = message_history.get(topic)
+    if not ring:
+        return []
+
+    if since_seq is None:
+        return list(islice(ring, max(0, len(ring) - HISTORY_REPLAY), None))
+
+    if board_log and since_seq + 1 < ring[0]["seq"]:
+        # Older than the ring: replay from disk
+        return board_log.read_since(topic, since_seq, limit=REPLAY_LIMIT)
+
+    # Sequence numbers in a ring are contiguous, so the start is an offset
+    start = since_seq + 1 - ring[0]["seq"]
+    if start >= len(ring):
+        return []
+    return list(islice(ring, max(0, start), None))
+
+
+async def subscribe_to_topic(agent_id: str, topic: str, since_seq: Optional[int] = None) -> bool:
+    """
+    Subscribe an agent to a topic and replay the history it is missing.
+
+    Returns:
+        True if ``since_seq`` is ahead of the topic, meaning the client
+        numbered it in an earlier epoch; the whole ring is replayed then
+    """
     if topic not in subscriptions:
         subscriptions[topic] = set()
 
     subscriptions[topic].add(agent_id)
-    logger.info(f"📬 Agent '{agent_id}' subscribed to topic '{topic}'")
-
-    # Send message history for this topic
-    if topic in message_history and message_history[topic]:
-        websocket = clients.get(agent_id)
-        if websocket:
-            history_msg = {
-                "type": "history",
-                "topic": topic,
-                "messages": message_history[topic][-10:]  # Last 10 messages
-            }
-            try:
-                await websocket.send(json.dumps(history_msg))
-                logger.debug(f"📜 Sent {len(history_msg['messages'])} history messages to '{agent_id}'")
-            except Exception as e:
-                logger.error(f"Failed to send history to '{agent_id}': {e}")
+    logger.info(f"📬 Agent '{agent_id}' subscribed to topic '{topic}'"
+                + (f" since seq {since_seq}" if since_seq is not None else ""))
+
+    # A client that is ahead of the board last saw it before a restart
+    reset = since_seq is not None and since_seq > topic_sequences.get(topic, 0)
+    if reset:
+        since_seq = 0
+
+    # Queue the replay before yielding to the event loop, so it lands in the
+    # outbox ahead of any broadcast made after this subscription
+    messages = history_since(topic, since_seq)
+    # Some of the requested messages are no longer available
+    truncated = bool(messages) and since_seq is not None and messages[0]["seq"] > since_seq + 1
+    # Direct messages to other agents are never replayed
+    messages = [m for m in messages if visible_to(m, agent_id)]
+    outbox = outboxes.get(agent_id)
+    if messages and outbox:
+        history_msg = {
+            "type": "history",
+            "topic": topic,
+            "messages": messages
+        }
+        if truncated:
+            history_msg["truncated"] = True
+        if reset:
+            history_msg["reset"] = True
+        if outbox.offer(outbox.codec.encode(history_msg), topic, messages[0]["seq"]):
+            logger.debug(f"📜 Queued {len(messages)} history messages for '{agent_id}'")
+    return reset
 
 
 async def unsubscribe_from_topic(agent_id: str, topic: str):
@@ -95,28 +355,14 @@ async def unsubscribe_from_topic(agent_id: str, topic: str):
 
 
 async def broadcast_message(message: dict, topic: str, from_agent: str):
-    """Broadcast a message to all subscribers of a topic."""
-    # Add to message history
-    if topic not in message_history:
-        message_history[topic] = []
-
-    message_history[topic].append({
-        **message,
-        "timestamp": datetime.utcnow().isoformat(),
-        "from_agent": from_agent
-    })
-
-    # Trim history
-    if len(message_history[topic]) > MAX_HISTORY:
-        message_history[topic] = message_history[topic][-MAX_HISTORY:]
-
-    # Get subscribers for this topic
-    subscribers = subscriptions.get(topic, set())
-
-    if not subscribers:
-        logger.debug(f"📢 No subscribers for topic '{topic}'")
-        return
-
+    """
+    Publish a message on a topic.
+
+    Broadcasts go to every subscriber of the topic. A message addressed to a
+    single agent is delivered to that agent only (if it is connected and
+    subscribed); it is still sequenced and kept in the topic history so an
+    addressee that is offline receives it when it subscribes again.
+    """
     # Prepare message envelope
     envelope = {
         "type": "message",
@@ -129,24 +375,76 @@ async def broadcast_message(message: dict, topic: str, from_agent: str):
         "metadata": message.get("metadata", {})
     }
 
-    # Send to all subscribers
+    if bus:
+        # Sharded: the hub sequences the envelope and hands it back to every
+        # shard (this one included) through deliver_envelope
+        await bus.publish(topic, envelope)
+        return
+
+    seq = topic_sequences.get(topic, 0) + 1
+    topic_sequences[topic] = seq
+    envelope["seq"] = seq
+
+    # Serialize once; the same payload goes to the log and every subscriber
+    payload = json.dumps(envelope)
+
+    if board_log:
+        board_log.append(topic, seq, payload)
+
+    await deliver_envelope(envelope, payload)
+
+
+async def deliver_envelope(envelope: dict, payload: str):
+    """
+    Record a sequenced envelope in the topic history and queue it for this
+    process's subscribers.
+
+    Args:
+        envelope: Envelope carrying its topic sequence number
+        payload: The envelope serialized as JSON
+    """
+    topic = envelope["topic"]
+    seq = envelope["seq"]
+    topic_sequences[topic] = seq
+
+    # Add to message history; the ring drops the oldest envelope itself
+    if topic not in message_history:
+        message_history[topic] = deque(maxlen=MAX_HISTORY)
+    message_history[topic].append(envelope)
+
+    # Get subscribers for this topic; direct messages are routed through the
+    # client table straight to the addressee instead of fanning out
+    subscribers = subscriptions.get(topic, set())
+    to_agent = envelope["to_agent"]
+    direct = is_direct(to_agent)
+    if direct:
+        subscribers = {to_agent} if to_agent in clients and to_agent in subscribers else set()
+
+    if not subscribers:
+        if direct:
+            logger.debug(f"📭 '{to_agent}' is not subscribed to '{topic}', kept in history")
+        else:
+            logger.debug(f"📢 No subscribers for topic '{topic}'")
+        return
+
+    # Hand the payload to every subscriber's outbox; the per-client writer
+    # tasks deliver concurrently. Each negotiated encoding is produced once.
+    frames: Dict[tuple, Union[str, bytes]] = {("json", None): payload}
     disconnected = []
-    sent_count = 0
+    queued_count = 0
 
-    for agent_id in subscribers:
-        websocket = clients.get(agent_id)
-        if websocket:
-            try:
-                # Check if connection is still open (handles different websockets library versions)
-                if hasattr(websocket, 'closed') and websocket.closed:
-                    disconnected.append(agent_id)
-                    continue
-
-                await websocket.send(json.dumps(envelope))
-                sent_count += 1
-            except Exception as e:
-                logger.error(f"Failed to send to '{agent_id}': {e}")
-                disconnected.append(agent_id)
+    for agent_id in list(subscribers):
+        outbox = outboxes.get(agent_id)
+        if outbox is None:
+            disconnected.append(agent_id)
+            continue
+        codec = outbox.codec
+        key = ("json", None) if not codec.binary else (codec.encoding, codec.compress_threshold)
+        frame = frames.get(key)
+        if frame is None:
+            frame = frames[key] = codec.encode(envelope)
+        if outbox.offer(frame, topic, seq):
+            queued_count += 1
         else:
             disconnected.append(agent_id)
 
@@ -154,22 +452,39 @@ async def broadcast_message(message: dict, topic: str, from_agent: str):
     for agent_id in disconnected:
         await unregister_client(agent_id)
 
-    logger.info(f"📤 Sent message on topic '{topic}' to {sent_count}/{len(subscribers)} subscribers")
+    if direct:
+        logger.info(f"📤 Queued direct message on topic '{topic}' for '{to_agent}'")
+    else:
+        logger.info(f"📤 Queued message on topic '{topic}' for {queued_count}/{queued_count + len(disconnected)} subscribers")
 
 
 async def handle_message(websocket: WebSocketServerProtocol, message: str, agent_id: str):
     """Handle incoming message from a client."""
+    codec = codec_for(agent_id)
+    try:
+        data = codec.decode(message)
+    except ValueError as e:
+        logger.error(f"Invalid {codec.encoding} frame from '{agent_id}': {e}")
+        error = {"type": "error", "message": "Invalid JSON" if not codec.binary else "Invalid frame"}
+        await websocket.send(codec.encode(error))
+        return
+
     try:
-        data = json.loads(message)
         msg_type = data.get("type")
 
         if msg_type == "subscribe":
             topic = data.get("topic", "general")
-            await subscribe_to_topic(agent_id, topic)
-
-            # Send acknowledgment
-            ack = {"type": "subscribed", "topic": topic}
-            await websocket.send(json.dumps(ack))
+            since_seq = data.get("since_seq")
+            reset = await subscribe_to_topic(agent_id, topic, int(since_seq) if since_seq is not None else None)
+
+            # Acknowledge through the outbox, behind the history replay, so
+            # the client never sees latest_seq before the messages it covers
+            ack = {"type": "subscribed", "topic": topic, "latest_seq": topic_sequences.get(topic, 0)}
+            if reset:
+                ack["reset"] = True
+            outbox = outboxes.get(agent_id)
+            if outbox is None or not outbox.offer(codec.encode(ack)):
+                await websocket.send(codec.encode(ack))
 
         elif msg_type == "unsubscribe":
             topic = data.get("topic", "general")
@@ -177,39 +492,38 @@ async def handle_message(websocket: WebSocketServerProtocol, message: str, agent
 
             # Send acknowledgment
             ack = {"type": "unsubscribed", "topic": topic}
-            await websocket.send(json.dumps(ack))
+            await websocket.send(codec.encode(ack))
 
         elif msg_type == "send":
             topic = data.get("topic", "general")
             logger.info(f"📨 Agent '{agent_id}' sending to topic '{topic}'")
             await broadcast_message(data, topic, agent_id)
 
-            # Send acknowledgment
+            # Send acknowledgment, echoing the client's msg_id so pipelined
+            # sends can be matched to their acks
             ack = {"type": "sent", "topic": topic}
-            logger.info(f"✉️  Sending ACK to '{agent_id}' for topic '{topic}'")
-            await websocket.send(json.dumps(ack))
-            logger.info(f"✅ ACK sent to '{agent_id}'")
+            if "msg_id" in data:
+                ack["msg_id"] = data["msg_id"]
+            logger.debug(f"✉️  Sending ACK to '{agent_id}' for topic '{topic}'")
+            await websocket.send(codec.encode(ack))
 
         elif msg_type == "ping":
             # Respond to ping with pong
             pong = {"type": "pong"}
-            await websocket.send(json.dumps(pong))
+            await websocket.send(codec.encode(pong))
 
         else:
             logger.warning(f"Unknown message type '{msg_type}' from '{agent_id}'")
             error = {"type": "error", "message": f"Unknown message type: {msg_type}"}
-            await websocket.send(json.dumps(error))
-
-    except json.JSONDecodeError as e:
-        logger.error(f"Invalid JSON from '{agent_id}': {e}")
-        error = {"type": "error", "message": "Invalid JSON"}
-        await websocket.send(json.dumps(error))
+            await websocket.send(codec.encode(error))
 
     except Exception as e:
         logger.error(f"Error handling message from '{agent_id}': {e}")
         error = {"type": "error", "message": str(e)}
+        if isinstance(data, dict) and "msg_id" in data:
+            error["msg_id"] = data["msg_id"]
         try:
-            await websocket.send(json.dumps(error))
+            await websocket.send(codec.encode(error))
         except:
             pass
 
@@ -234,11 +548,19 @@ async def handler(websocket: WebSocketServerProtocol):
             await websocket.send(json.dumps(error))
             return
 
+        # Negotiate the wire encoding; clients that do not ask stay on JSON
+        encoding = negotiate(reg_data.get("encodings"))
+        threshold = compress_threshold_from(reg_data.get("compress_threshold", DEFAULT_COMPRESS_THRESHOLD))
+        codec = WireCodec(encoding, compress_threshold=threshold) if encoding != "json" else JSON_CODEC
+
         # Register the client
-        await register_client(websocket, agent_id)
+        await register_client(websocket, agent_id, codec=codec)
 
-        # Send registration confirmation
-        confirm = {"type": "registered", "agent_id": agent_id}
+        # Send registration confirmation (always JSON, it precedes the switch)
+        confirm = {"type": "registered", "agent_id": agent_id, "epoch": board_epoch}
+        if "encodings" in reg_data:
+            confirm["encoding"] = encoding
+            confirm["compress_threshold"] = threshold if codec.binary else None
         await websocket.send(json.dumps(confirm))
 
         # Handle messages
@@ -256,10 +578,36 @@ async def handler(websocket: WebSocketServerProtocol):
             await unregister_client(agent_id)
 
 
-async def main():
+def restore_from_log(log: BoardLog) -> int:
+    """
+    Rebuild sequence counters and history rings from the durable log.
+
+    Returns:
+        Number of topics restored
+    """
+    recovered = log.recover(MAX_HISTORY)
+    for topic, (last_seq, envelopes) in recovered.items():
+        topic_sequences[topic] = last_seq
+        message_history[topic] = deque(envelopes, maxlen=MAX_HISTORY)
+    return len(recovered)
+
+
+def _open_board_log(durable_dir: str, **options) -> BoardLog:
+    return BoardLog(durable_dir, **{k: v for k, v in options.items() if v is not None})
+
+
+async def main(
+    port: int = 3030,
+    durable_dir: Optional[str] = None,
+    segment_bytes: Optional[int] = None,
+    fsync_interval: Optional[float] = None,
+    retention_bytes: Optional[int] = None,
+    retention_seconds: Optional[float] = None
+):
     """Start the WebSocket server."""
+    global board_log, board_epoch
+
     host = "0.0.0.0"  # Listen on all interfaces for cross-machine access
-    port = 3030
 
     logger.info("🚀 Starting WebSocket Message Board Server")
     logger.info(f"   Listening on {host}:{port}")
@@ -267,18 +615,177 @@ async def main():
     logger.info(f"   Remote access: ws://<your-ip>:{port}")
     logger.info("")
 
-    async with websockets.serve(handler, host, port):
-        logger.info("✅ WebSocket server is running!")
-        logger.info("   Press Ctrl+C to stop")
-        logger.info("")
+    log_task = None
+    if durable_dir:
+        board_log = _open_board_log(
+            durable_dir,
+            segment_bytes=segment_bytes,
+            fsync_interval=fsync_interval,
+            retention_bytes=retention_bytes,
+            retention_seconds=retention_seconds,
+        )
+        board_epoch = board_log.epoch
+        restored = restore_from_log(board_log)
+        logger.info(f"💾 Durable log at {durable_dir} ({restored} topic(s) restored)")
+        log_task = asyncio.create_task(board_log.run())
+
+    try:
+        async with websockets.serve(handler, host, port):
+            logger.info("✅ WebSocket server is running!")
+            logger.info("   Press Ctrl+C to stop")
+            logger.info("")
+
+            # Run forever
+            await asyncio.Future()
+    finally:
+        if log_task:
+            log_task.cancel()
+        if board_log:
+            board_log.close()
+
+
+async def serve_shard(port: int, bus_path: str, host: str = "0.0.0.0", epoch: Optional[str] = None):
+    """Run one shard: serve clients on the shared port and follow the bus."""
+    global bus, board_epoch
+
+    # The hub does the numbering, so every shard reports the hub's epoch
+    if epoch:
+        board_epoch = epoch
+    bus = BusClient(bus_path)
+    await bus.connect()
+    try:
+        async with websockets.serve(handler, host, port, reuse_port=True):
+            # The shard exits when the bus goes away and is restarted by the supervisor
+            await bus.run(deliver_envelope)
+    finally:
+        await bus.close()
+        bus = None
+
+
+def _run_shard(port: int, shard_id: int, bus_path: str, epoch: Optional[str] = None):
+    """Entry point of a shard worker process."""
+    for log_handler in logging.getLogger().handlers:
+        log_handler.setFormatter(logging.Formatter(
+            f'[%(asctime)s] shard-{shard_id} %(levelname)s: %(message)s', datefmt='%H:%M:%S'))
+    try:
+        asyncio.run(serve_shard(port, bus_path, epoch=epoch))
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        logger.error(f"Shard {shard_id} stopped: {e}")
+        sys.exit(1)
+
+
+async def run_sharded(
+    port: int = 3030,
+    workers: int = 2,
+    bus_path: Optional[str] = None,
+    durable_dir: Optional[str] = None,
+    segment_bytes: Optional[int] = None,
+    fsync_interval: Optional[float] = None,
+    retention_bytes: Optional[int] = None,
+    retention_seconds: Optional[float] = None
+):
+    """
+    Start the board as ``workers`` shard processes sharing the port.
+
+    This process runs the bus hub (and owns the durable log, if any) and
+    restarts shards that exit. Replays older than the in-memory history ring
+    are not available in sharded mode.
+    """
+    bus_path = bus_path or default_bus_path(port)
+
+    logger.info(f"🚀 Starting WebSocket Message Board Server ({workers} shards)")
+    logger.info(f"   Listening on 0.0.0.0:{port}")
+    logger.info(f"   Connect with: ws://localhost:{port}")
+    logger.info("")
+
+    log = None
+    log_task = None
+    if durable_dir:
+        log = _open_board_log(
+            durable_dir,
+            segment_bytes=segment_bytes,
+            fsync_interval=fsync_interval,
+            retention_bytes=retention_bytes,
+            retention_seconds=retention_seconds,
+        )
+        logger.info(f"💾 Durable log at {durable_dir} ({len(log.topics)} topic(s))")
+        log_task = asyncio.create_task(log.run())
+
+    hub = BusHub(bus_path, board_log=log, history_size=MAX_HISTORY)
+    await hub.start()
+    epoch = log.epoch if log else uuid.uuid4().hex
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    context = multiprocessing.get_context("spawn")
+
+    def start_shard(shard_id: int):
+        process = context.Process(target=_run_shard, args=(port, shard_id, bus_path, epoch),
+                                  name=f"board-shard-{shard_id}", daemon=True)
+        process.start()
+        return process
+
+    shards = {shard_id: start_shard(shard_id) for shard_id in range(workers)}
+    logger.info("✅ WebSocket server is running!")
+    logger.info("   Press Ctrl+C to stop")
 
-        # Run forever
-        await asyncio.Future()
+    try:
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=SHARD_RESTART_DELAY)
+            except asyncio.TimeoutError:
+                pass
+            for shard_id, process in shards.items():
+                if not process.is_alive() and not stop.is_set():
+                    logger.warning(f"Shard {shard_id} exited ({process.exitcode}), restarting")
+                    shards[shard_id] = start_shard(shard_id)
+    finally:
+        for process in shards.values():
+            process.terminate()
+        for process in shards.values():
+            process.join(timeout=5)
+        await hub.close()
+        if log_task:
+            log_task.cancel()
+        if log:
+            log.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="WebSocket Message Board Server")
+    parser.add_argument("--port", type=int, default=3030, help="Port to listen on (default: 3030)")
+    parser.add_argument("--durable-dir", help="Persist every topic to an append-only log in this directory")
+    parser.add_argument("--segment-mb", type=float, help="Log segment size in MiB (default: 64)")
+    parser.add_argument("--fsync-interval", type=float, help="Seconds between batched fsyncs, 0 for every message (default: 0.05)")
+    parser.add_argument("--retention-mb", type=float, help="Keep at most this many MiB of log per topic")
+    parser.add_argument("--retention-hours", type=float, help="Drop log segments older than this")
+    parser.add_argument("--workers", type=int, default=1, help="Shard processes sharing the port (default: 1)")
+    parser.add_argument("--bus-path", help="Unix socket for the shard bus (default: $TMPDIR/a2a_board_<port>.sock)")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    return args
 
 
 if __name__ == "__main__":
+    args = parse_args()
+    log_options = dict(
+        durable_dir=args.durable_dir,
+        segment_bytes=int(args.segment_mb * 1024 * 1024) if args.segment_mb else None,
+        fsync_interval=args.fsync_interval,
+        retention_bytes=int(args.retention_mb * 1024 * 1024) if args.retention_mb else None,
+        retention_seconds=args.retention_hours * 3600 if args.retention_hours else None,
+    )
     try:
-        asyncio.run(main())
+        if args.workers > 1:
+            asyncio.run(run_sharded(port=args.port, workers=args.workers, bus_path=args.bus_path, **log_options))
+        else:
+            asyncio.run(main(port=args.port, **log_options))
     except KeyboardInterrupt:
         logger.info("\n👋 Server stopped by user")
     except Exception as e:
@@ -7,7 +7,8 @@ agent-to-agent communication.
 
 import asyncio
 import json
-from typing import Dict, Callable, Awaitable, Optional
+import uuid
+from typing import Dict, Callable, Awaitable, List, Optional, Set, Tuple
 from datetime import datetime
 
 try:
@@ -17,6 +18,13 @@ except ImportError:
 
 from .message_transport import MessageTransport
 from .message_models import AgentMessage, ConnectionConfig, MessagePriority
+from .wire_codec import JSON_CODEC, WireCodec, offered_encodings
+
+ACK_TIMEOUT = 5.0  # Seconds to wait for the server to acknowledge a send
+
+
+async def _false() -> bool:
+    return False
 
 
 class WebSocketTransport(MessageTransport):
@@ -46,10 +54,22 @@ class WebSocketTransport(MessageTransport):
         self._test_server = test_server
         self._connected = False
         self._subscriptions: Dict[str, Callable[[AgentMessage], Awaitable[None]]] = {}
+        # Highest board sequence number seen per topic, used to resume
+        # subscriptions without gaps or duplicates
+        self._last_seq: Dict[str, int] = {}
+        # Topics resubscribed after a gap notice; their live messages are
+        # skipped until the replay, which carries them too, arrives
+        self._resyncing: Set[str] = set()
+        # Board epoch from the last registration; sequence numbers from
+        # another epoch mean nothing to the current board
+        self._board_epoch: Optional[str] = None
         self.agent_id: Optional[str] = None
         self._websocket = None
         self._receiver_task = None
-        self._message_queue = asyncio.Queue()
+        # Negotiated at registration; JSON until then
+        self._codec = JSON_CODEC
+        # Sends waiting for their "sent" ack, keyed by client-generated msg_id
+        self._pending: Dict[str, asyncio.Future] = {}
 
     async def connect(self) -> None:
         """Establish connection to WebSocket server"""
@@ -66,24 +86,40 @@ class WebSocketTransport(MessageTransport):
         if websockets is None:
             raise ConnectionError("websockets package not installed. Install with: pip install websockets")
 
-        try:
-            # Connect to WebSocket server
-            self._websocket = await websockets.connect(self.config.url)
+        offered = offered_encodings(self.config.encodings or None)
+        negotiating = offered != ["json"]
 
-            # Register with server
+        try:
+            # Connect to WebSocket server. With a binary encoding large frames
+            # are deflated by the codec, so skip connection-wide compression.
+            connect_kwargs = {}
+            if negotiating and self.config.compress_threshold is not None:
+                connect_kwargs["compression"] = None
+            self._websocket = await websockets.connect(self.config.url, **connect_kwargs)
+
+            # Register with server, offering our encodings
             registration = {
                 "type": "register",
                 "agent_id": self.agent_id
             }
+            if negotiating:
+                registration["encodings"] = offered
+                registration["compress_threshold"] = self.config.compress_threshold
             await self._websocket.send(json.dumps(registration))
 
-            # Wait for confirmation
+            # Wait for confirmation (always JSON)
             response = await asyncio.wait_for(self._websocket.recv(), timeout=5.0)
             data = json.loads(response)
 
             if data.get("type") != "registered":
                 raise ConnectionError(f"Registration failed: {data}")
 
+            # Servers that predate negotiation do not answer with an encoding
+            encoding = data.get("encoding", "json")
+            self._codec = WireCodec(encoding, compress_threshold=data.get("compress_threshold")) \
+                if encoding != "json" else JSON_CODEC
+            self._note_epoch(data.get("epoch"))
+
             self._connected = True
 
             # Start receiver task
@@ -115,16 +151,58 @@ class WebSocketTransport(MessageTransport):
             # Close WebSocket
             await self._websocket.close()
             self._websocket = None
+            self._fail_pending()
 
         self._connected = False
         self._subscriptions.clear()
+        self._resyncing.clear()
+
+    def _build_payload(self, message: AgentMessage, msg_id: str) -> dict:
+        """Build the wire payload for a send request."""
+        return {
+            "type": "send",
+            "msg_id": msg_id,
+            "topic": message.topic,
+            "to_agent": message.to_agent,
+            "from_agent": message.from_agent,
+            "content": message.content,
+            "priority": message.priority.value if hasattr(message.priority, 'value') else message.priority,
+            "metadata": getattr(message, 'metadata', {})
+        }
+
+    async def _send_payload(self, message: AgentMessage) -> Tuple[str, asyncio.Future]:
+        """
+        Write one send request and register a future for its acknowledgment.
+
+        The future resolves to True on a matching "sent" ack, False on a
+        matching error.
+        """
+        msg_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._pending[msg_id] = future
+        try:
+            await self._websocket.send(self._codec.encode(self._build_payload(message, msg_id)))
+        except Exception:
+            self._pending.pop(msg_id, None)
+            raise
+        return msg_id, future
+
+    async def _await_ack(self, msg_id: str, future: asyncio.Future, timeout: float) -> bool:
+        """Wait for one acknowledgment, forgetting it on timeout."""
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            self._pending.pop(msg_id, None)
+            print(f"WebSocket send error: Timeout waiting for acknowledgment of {msg_id}")
+            return False
 
-    async def send(self, message: AgentMessage) -> bool:
+    async def send(self, message: AgentMessage, timeout: float = ACK_TIMEOUT) -> bool:
         """
         Send message via WebSocket.
 
         Args:
             message: AgentMessage to deliver
+            timeout: Seconds to wait for the server's acknowledgment
 
         Returns:
             True if sent successfully, False otherwise
@@ -136,59 +214,74 @@ class WebSocketTransport(MessageTransport):
         if self._test_server:
             return await self._test_server.send_message(message)
 
-        # Real WebSocket send
         try:
-            payload = {
-                "type": "send",
-                "topic": message.topic,
-                "to_agent": message.to_agent,
-                "from_agent": message.from_agent,
-                "content": message.content,
-                "priority": message.priority.value if hasattr(message.priority, 'value') else message.priority,
-                "metadata": getattr(message, 'metadata', {})
-            }
+            msg_id, future = await self._send_payload(message)
+        except Exception as e:
+            print(f"WebSocket send error: {e}")
+            return False
 
-            await self._websocket.send(json.dumps(payload))
+        return await self._await_ack(msg_id, future, timeout)
 
-            # Wait for "sent" acknowledgment with timeout (skip other acks)
-            deadline = asyncio.get_event_loop().time() + 5.0
-            while asyncio.get_event_loop().time() < deadline:
-                remaining = deadline - asyncio.get_event_loop().time()
-                if remaining <= 0:
-                    raise asyncio.TimeoutError()
+    async def send_many(self, messages: List[AgentMessage], timeout: float = ACK_TIMEOUT) -> List[bool]:
+        """
+        Send a batch of messages without waiting for each acknowledgment.
 
-                ack = await asyncio.wait_for(self._message_queue.get(), timeout=remaining)
-                if ack.get("type") == "sent":
-                    return True
-                # Got a different ack (subscribed, unsubscribed), discard and keep waiting
-                print(f"[WebSocketTransport] Skipping {ack.get('type')} ack, waiting for 'sent'...")
+        All requests are written back to back; acks are matched by msg_id as
+        they arrive, and each message gets its own timeout.
 
-            raise asyncio.TimeoutError()
+        Args:
+            messages: Messages to deliver, in order
+            timeout: Seconds to wait for each acknowledgment
 
-        except asyncio.TimeoutError:
-            print(f"WebSocket send error: Timeout waiting for acknowledgment")
-            print(f"  - Receiver task running: {self._receiver_task and not self._receiver_task.done()}")
-            print(f"  - WebSocket open: {self._websocket and not self._websocket.closed if hasattr(self._websocket, 'closed') else 'unknown'}")
-            print(f"  - Queue size: {self._message_queue.qsize()}")
-            print(f"  - Connected: {self._connected}")
-            # Try to see what's in the queue without blocking
-            temp_items = []
+        Returns:
+            One success flag per message, in the same order
+        """
+        if not self._connected:
+            print(f"WebSocket send error: Not connected")
+            return [False] * len(messages)
+
+        if self._test_server:
+            return [await self._test_server.send_message(message) for message in messages]
+
+        waiters = []
+        for message in messages:
             try:
-                while not self._message_queue.empty():
-                    item = self._message_queue.get_nowait()
-                    temp_items.append(item)
-                    print(f"  - Queue had: {item}")
-                # Put them back
-                for item in temp_items:
-                    self._message_queue.put_nowait(item)
-            except:
-                pass
-            return False
-        except Exception as e:
-            print(f"WebSocket send error: {e}")
-            import traceback
-            traceback.print_exc()
-            return False
+                msg_id, future = await self._send_payload(message)
+                waiters.append(self._await_ack(msg_id, future, timeout))
+            except Exception as e:
+                print(f"WebSocket send error: {e}")
+                waiters.append(_false())
+
+        return list(await asyncio.gather(*waiters))
+
+    def _note_epoch(self, epoch: Optional[str]) -> None:
+        """Forget sequence numbers from an earlier board epoch."""
+        if epoch and self._board_epoch and epoch != self._board_epoch:
+            # The board restarted and numbers from 1 again: resume every topic
+            # from the start of its history
+            self._last_seq = {topic: 0 for topic in self._last_seq}
+        if epoch:
+            self._board_epoch = epoch
+
+    def _resolve_ack(self, data: dict) -> None:
+        """Complete the pending send that an ack or error refers to."""
+        msg_id = data.get("msg_id")
+        if msg_id is None:
+            if data.get("type") != "sent" or not self._pending:
+                return
+            # Server without msg_id support: acks arrive in send order
+            msg_id = next(iter(self._pending))
+
+        future = self._pending.pop(msg_id, None)
+        if future and not future.done():
+            future.set_result(data.get("type") == "sent")
+
+    def _fail_pending(self) -> None:
+        """Fail every send still waiting for an acknowledgment."""
+        for future in self._pending.values():
+            if not future.done():
+                future.set_result(False)
+        self._pending.clear()
 
     async def subscribe(
         self,
@@ -210,12 +303,17 @@ class WebSocketTransport(MessageTransport):
         if self._test_server:
             await self._test_server.subscribe(self.agent_id, topic)
         else:
-            # Send subscription request to server
-            request = {
-                "type": "subscribe",
-                "topic": topic
-            }
-            await self._websocket.send(json.dumps(request))
+            await self._request_subscription(topic)
+
+    async def _request_subscription(self, topic: str) -> None:
+        """Send a subscription request, resuming after the last message seen on the topic."""
+        request = {
+            "type": "subscribe",
+            "topic": topic
+        }
+        if topic in self._last_seq:
+            request["since_seq"] = self._last_seq[topic]
+        await self._websocket.send(self._codec.encode(request))
 
     async def unsubscribe(self, topic: str) -> None:
         """
@@ -226,6 +324,7 @@ class WebSocketTransport(MessageTransport):
         """
         if topic in self._subscriptions:
             del self._subscriptions[topic]
+        self._resyncing.discard(topic)
 
         if self._test_server and self.agent_id:
             await self._test_server.unsubscribe(self.agent_id, topic)
@@ -235,7 +334,7 @@ class WebSocketTransport(MessageTransport):
                 "type": "unsubscribe",
                 "topic": topic
             }
-            await self._websocket.send(json.dumps(request))
+            await self._websocket.send(self._codec.encode(request))
 
     def is_connected(self) -> bool:
         """
@@ -254,29 +353,9 @@ class WebSocketTransport(MessageTransport):
         try:
             async for raw_message in self._websocket:
                 try:
-                    data = json.loads(raw_message)
-                    msg_type = data.get("type")
-
-                    if msg_type == "message":
-                        # Incoming message from server
-                        await self._handle_incoming_message(data)
-
-                    elif msg_type in ("sent", "subscribed", "unsubscribed"):
-                        # Acknowledgment - put in queue for send() to process
-                        print(f"[WebSocketTransport-{self.agent_id}] Received ACK: {msg_type} for topic {data.get('topic')}")
-                        await self._message_queue.put(data)
-                        print(f"[WebSocketTransport-{self.agent_id}] ACK queued, queue size now: {self._message_queue.qsize()}")
-
-                    elif msg_type == "error":
-                        print(f"WebSocket error: {data.get('message')}")
-
-                    elif msg_type == "history":
-                        # Message history for newly subscribed topic
-                        for historical_msg in data.get("messages", []):
-                            await self._handle_incoming_message(historical_msg)
-
-                except json.JSONDecodeError as e:
-                    print(f"Invalid JSON received: {e}")
+                    await self._handle_frame(self._codec.decode(raw_message))
+                except ValueError as e:
+                    print(f"Invalid {self._codec.encoding} frame received: {e}")
                 except Exception as e:
                     print(f"Error processing message: {e}")
 
@@ -286,6 +365,50 @@ class WebSocketTransport(MessageTransport):
         except Exception as e:
             print(f"Receiver error: {e}")
             self._connected = False
+        finally:
+            self._fail_pending()
+
+    async def _handle_frame(self, data: dict) -> None:
+        """Dispatch one decoded frame from the server."""
+        msg_type = data.get("type")
+
+        if msg_type == "message":
+            # Incoming message from server
+            await self._handle_incoming_message(data)
+
+        elif msg_type == "sent":
+            self._resolve_ack(data)
+
+        elif msg_type in ("subscribed", "unsubscribed"):
+            latest_seq = data.get("latest_seq")
+            topic = data.get("topic")
+            self._resyncing.discard(topic)
+            if msg_type == "subscribed" and latest_seq is not None \
+                    and latest_seq < self._last_seq.get(topic, 0):
+                # The board restarted and its sequence numbers began again
+                self._last_seq[topic] = latest_seq
+
+        elif msg_type == "error":
+            print(f"WebSocket error: {data.get('message')}")
+            self._resolve_ack(data)
+
+        elif msg_type == "gap":
+            # The board dropped messages from our full outbox: replay them
+            topic = data.get("topic")
+            from_seq = data.get("from_seq")
+            if topic in self._subscriptions and from_seq is not None:
+                self._last_seq[topic] = min(self._last_seq.get(topic, 0), from_seq - 1)
+                self._resyncing.add(topic)
+                await self._request_subscription(topic)
+
+        elif msg_type == "history":
+            self._resyncing.discard(data.get("topic"))
+            if data.get("reset"):
+                # Replayed from a new epoch: every sequence number is new to us
+                self._last_seq[data.get("topic")] = 0
+            # Message history for newly subscribed topic
+            for historical_msg in data.get("messages", []):
+                await self._handle_incoming_message(historical_msg)
 
     async def _handle_incoming_message(self, data: dict) -> None:
         """
@@ -300,6 +423,16 @@ class WebSocketTransport(MessageTransport):
             print(f"[WebSocketTransport] Topic '{topic}' not in subscriptions, ignoring")
             return
 
+        if topic in self._resyncing:
+            return
+
+        seq = data.get("seq")
+        if seq is not None:
+            if seq <= self._last_seq.get(topic, 0):
+                # Already delivered (history replay overlapping live messages)
+                return
+            self._last_seq[topic] = seq
+
         # Convert to AgentMessage
         message = AgentMessage(
             to_agent=data.get("to_agent", "board"),
@@ -0,0 +1,164 @@
+"""
+Wire encodings for the WebSocket message board.
+
+Clients list the encodings they support when they register and the board
+picks the first one it also supports. ``json`` is always available and is
+sent as text frames, exactly as before, so clients that do not negotiate keep
+working. ``msgpack`` and ``orjson`` are used when the packages are installed
+and travel as binary frames with a one-byte header:
+
+    0x00  payload follows as-is
+    0x01  payload is zlib-deflated (used above the negotiated size threshold)
+"""
+
+import json
+import zlib
+from typing import Any, Iterable, List, Optional, Union
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+DEFAULT_COMPRESS_THRESHOLD = 4096   # Deflate binary frames larger than this many bytes
+MIN_COMPRESS_THRESHOLD = 256        # Smaller frames cost more to deflate than they save
+COMPRESS_LEVEL = 6
+
+_PLAIN = b"\x00"
+_DEFLATED = b"\x01"
+
+Frame = Union[str, bytes]
+
+
+def available_encodings() -> List[str]:
+    """Encodings this process can speak, most compact first."""
+    encodings = []
+    if msgpack is not None:
+        encodings.append("msgpack")
+    if orjson is not None:
+        encodings.append("orjson")
+    encodings.append("json")
+    return encodings
+
+
+def offered_encodings(preferred: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Encodings a client offers at registration.
+
+    Args:
+        preferred: Configured encodings in order of preference (None for all)
+
+    Returns:
+        The preferred encodings that are installed here, falling back to "json"
+    """
+    supported = available_encodings()
+    if preferred is None:
+        return supported
+    offered = [encoding for encoding in preferred if encoding in supported]
+    return offered or ["json"]
+
+
+def compress_threshold_from(value: Any) -> Optional[int]:
+    """
+    Validate a compression threshold requested by a client.
+
+    Args:
+        value: Requested threshold; None disables compression
+
+    Returns:
+        The threshold raised to MIN_COMPRESS_THRESHOLD, or the default when
+        the value is not an integer
+    """
+    if value is None:
+        return None
+    if not isinstance(value, int) or isinstance(value, bool):
+        return DEFAULT_COMPRESS_THRESHOLD
+    return max(value, MIN_COMPRESS_THRESHOLD)
+
+
+def negotiate(requested: Optional[Iterable[str]]) -> str:
+    """
+    Pick the encoding for a connection.
+
+    Args:
+        requested: Client's encodings in order of preference (None for old clients)
+
+    Returns:
+        First requested encoding that is available here, else "json"
+    """
+    supported = set(available_encodings())
+    for encoding in requested or ():
+        if encoding in supported:
+            return encoding
+    return "json"
+
+
+class WireCodec:
+    """Encode and decode board frames for one negotiated encoding"""
+
+    def __init__(self, encoding: str = "json", compress_threshold: Optional[int] = None):
+        """
+        Initialize codec.
+
+        Args:
+            encoding: "json", "orjson" or "msgpack"
+            compress_threshold: Deflate binary frames above this size (None disables)
+        """
+        if encoding not in available_encodings():
+            raise ValueError(f"Encoding '{encoding}' is not available, expected one of {available_encodings()}")
+        self.encoding = encoding
+        self.compress_threshold = compress_threshold
+
+    @property
+    def binary(self) -> bool:
+        return self.encoding != "json"
+
+    def encode(self, obj: Any) -> Frame:
+        """Encode a message dict into a frame (str for JSON, bytes otherwise)."""
+        if self.encoding == "json":
+            return json.dumps(obj)
+
+        if self.encoding == "msgpack":
+            body = msgpack.packb(obj, use_bin_type=True, default=str)
+        else:
+            body = orjson.dumps(obj, default=str)
+
+        if self.compress_threshold is not None and len(body) > self.compress_threshold:
+            return _DEFLATED + zlib.compress(body, COMPRESS_LEVEL)
+        return _PLAIN + body
+
+    def decode(self, frame: Frame) -> Any:
+        """
+        Decode a frame.
+
+        Text frames are always JSON, so a client may fall back to plain JSON
+        at any time. Raises ValueError on malformed frames.
+        """
+        if isinstance(frame, str):
+            return json.loads(frame)
+        if not frame:
+            raise ValueError("Empty frame")
+
+        flag, body = frame[:1], frame[1:]
+        if flag == _DEFLATED:
+            try:
+                body = zlib.decompress(body)
+            except zlib.error as e:
+                raise ValueError(f"Invalid compressed frame: {e}")
+        elif flag != _PLAIN:
+            raise ValueError(f"Unknown frame flag {flag!r}")
+
+        if self.encoding == "msgpack":
+            try:
+                return msgpack.unpackb(body, raw=False)
+            except Exception as e:
+                raise ValueError(f"Invalid msgpack frame: {e}")
+        return (orjson.loads if orjson is not None else json.loads)(body)
+
+
+JSON_CODEC = WireCodec("json")
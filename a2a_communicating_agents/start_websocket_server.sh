@@ -35,7 +35,11 @@ fi
 
 # Start server in background
 cd "$SCRIPT_DIR"
-"$PYTHON_CMD" agent_messaging/websocket_server.py > "$LOG_FILE" 2>&1 &
+# Set WEBSOCKET_DURABLE_DIR to keep topic history on disk across restarts
+# Set WEBSOCKET_WORKERS to run several shard processes on the same port
+"$PYTHON_CMD" agent_messaging/websocket_server.py \
+    ${WEBSOCKET_DURABLE_DIR:+--durable-dir "$WEBSOCKET_DURABLE_DIR"} \
+    ${WEBSOCKET_WORKERS:+--workers "$WEBSOCKET_WORKERS"} > "$LOG_FILE" 2>&1 &
 SERVER_PID=$!
 
 # Save PID
@@ -9,7 +9,7 @@ from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.markdown import Markdown
-from typing import Optional
+from typing import List, Optional
 from pathlib import Path
 
 from rag_system.core.document_manager import DocumentManager
@@ -23,11 +23,17 @@ console = Console()
 doc_manager = None
 context_provider = None
 
-def get_managers():
-    """Initialize managers if not already done"""
+def get_managers(warm_up: bool = False):
+    """
+    Initialize managers if not already done
+
+    The RAG engine opens Chroma and loads the embedding model lazily.
+    Commands that embed pass warm_up=True to start loading the model in the
+    background while they do their other work; the rest never load it.
+    """
     global doc_manager, context_provider
     if not doc_manager:
-        doc_manager = DocumentManager()
+        doc_manager = DocumentManager(warm_up=warm_up)
         context_provider = ContextProvider(doc_manager)
     return doc_manager, context_provider
 
@@ -51,7 +57,7 @@ def ingest(file_path: str, doc_type: Optional[str] = None):
     """Ingest a document into the RAG system"""
     console.print(f"📄 Ingesting document: {file_path}", style="bold blue")
     
-    dm, _ = get_managers()
+    dm, _ = get_managers(warm_up=True)
     
     try:
         # Convert string doc_type to enum if provided
@@ -67,6 +73,51 @@ def ingest(file_path: str, doc_type: Optional[str] = None):
     except Exception as e:
         console.print(f"❌ Error ingesting document: {str(e)}", style="red")
 
+@app.command()
+def ingest_dir(
+    directory: str,
+    pattern: Optional[List[str]] = typer.Option(None, "--pattern", "-p", help="Filename glob, repeatable (default: *.md *.txt *.rst)"),
+    doc_type: Optional[str] = None,
+    workers: Optional[int] = typer.Option(None, help="Reader/chunker processes (default: CPUs - 1, 0: none)"),
+    batch_size: int = typer.Option(256, help="Chunks per embedding forward pass"),
+    write_batch: int = typer.Option(2048, help="Chunks embedded and written to Chroma together"),
+    force: bool = typer.Option(False, help="Re-ingest files the manifest says are unchanged"),
+    storage: str = "./storage/chromadb"
+):
+    """Ingest a directory tree in parallel, skipping unchanged files"""
+    from rag_system.core.bulk_ingest import BulkIngester, DEFAULT_PATTERNS
+    from rag_system.core.rag_engine import RAGEngine
+
+    console.print(f"📚 Ingesting directory: {directory}", style="bold blue")
+
+    # A local engine: one model instance embedding large batches, no
+    # per-call batching window
+    engine = RAGEngine(storage_path=storage, batch_size=batch_size, batch_window=0, warm_up=True)
+    ingester = BulkIngester(engine, workers=workers, write_batch=write_batch)
+
+    try:
+        document_type = DocumentType(doc_type) if doc_type else None
+        report = ingester.ingest_dir(directory, patterns=pattern or DEFAULT_PATTERNS,
+                                     doc_type=document_type, force=force)
+    except Exception as e:
+        console.print(f"❌ Error ingesting directory: {str(e)}", style="red")
+        return
+
+    summary = Table(title="Ingest Summary")
+    summary.add_column("Metric", style="cyan")
+    summary.add_column("Value", style="green")
+    summary.add_row("Files found", str(report["files_found"]))
+    summary.add_row("Ingested", str(report["ingested"]))
+    summary.add_row("Replaced (changed)", str(report["replaced"]))
+    summary.add_row("Skipped (unchanged)", str(report["skipped_unchanged"]))
+    summary.add_row("Empty (nothing to index)", str(report["empty"]))
+    summary.add_row("Failed", str(report["failed"]))
+    summary.add_row("Chunks written", f"{report['chunks']} in {report['batches']} batches")
+    summary.add_row("Wall time", f"{report['seconds']:.2f}s (embed + write {report['embed_write_seconds']:.2f}s)")
+    summary.add_row("Throughput", f"{report['files_per_second']} files/s, {report['chunks_per_second']} chunks/s, "
+                                  f"{report['mb_per_second']} MB/s")
+    console.print(summary)
+
 @app.command()
 def note(
     content: str, 
@@ -77,7 +128,7 @@ def note(
     priority: Optional[str] = None
 ):
     """Add a quick note to memory"""
-    dm, _ = get_managers()
+    dm, _ = get_managers(warm_up=True)
     
     try:
         doc_id = dm.add_quick_note(
@@ -93,13 +144,17 @@ def note(
         console.print(f"❌ Error adding note: {str(e)}", style="red")
 
 @app.command()
-def search(question: str, limit: int = 5):
+def search(
+    question: str,
+    limit: int = 5,
+    mode: str = typer.Option("hybrid", help="vector, lexical (exact identifiers) or hybrid")
+):
     """Search the knowledge base"""
     console.print(f"🔍 Searching: {question}", style="bold cyan")
     
-    dm, _ = get_managers()
+    dm, _ = get_managers(warm_up=True)
     
-    results = dm.search_by_context(question, n_results=limit)
+    results = dm.search_by_context(question, n_results=limit, mode=mode)
     
     if not results:
         console.print("No results found.", style="yellow")
@@ -125,7 +180,7 @@ def context(query: str, client: Optional[str] = None, project: Optional[str] = N
     """Get contextual information for a query"""
     console.print(f"🧠 Getting context for: {query}", style="bold magenta")
     
-    _, cp = get_managers()
+    _, cp = get_managers(warm_up=True)
     
     context_text = cp.get_conversation_context(
         query=query,
@@ -151,7 +206,7 @@ def project(name: str):
     """Get comprehensive project overview"""
     console.print(f"📊 Project Overview: {name}", style="bold green")
     
-    _, cp = get_managers()
+    _, cp = get_managers(warm_up=True)
     
     project_context = cp.get_project_context(name)
     console.print(Panel(
@@ -165,7 +220,7 @@ def client(name: str):
     """Get comprehensive client overview"""  
     console.print(f"👤 Client Overview: {name}", style="bold blue")
     
-    _, cp = get_managers()
+    _, cp = get_managers(warm_up=True)
     
     client_context = cp.get_client_context(name)
     console.print(Panel(
@@ -206,12 +261,12 @@ def recent(limit: int = 10):
     console.print(table)
 
 @app.command()
-def status():
+def status(recount: bool = False):
     """Show system status and statistics"""
     console.print("📊 RAG System Status", style="bold yellow")
     
     dm, _ = get_managers()
-    stats = dm.get_system_stats()
+    stats = dm.get_system_stats(recount=recount)
     
     # Create main stats table
     stats_table = Table(title="System Statistics")
@@ -222,6 +277,10 @@ def status():
     stats_table.add_row("Unique Clients", str(stats['unique_clients']))
     stats_table.add_row("Unique Projects", str(stats['unique_projects']))
     stats_table.add_row("Storage Path", stats['storage_path'])
+    cache = stats.get('embedding_cache')
+    if cache:
+        stats_table.add_row("Embedding Cache", f"{cache['entries']}/{cache['capacity']} entries, "
+                                               f"{cache['hit_rate']:.0%} hit rate")
     
     console.print(stats_table)
     
@@ -247,7 +306,7 @@ def artifact(
     """Log runtime artifacts (errors, CI logs, test failures, PR decisions)"""
     console.print(f"📦 Logging {artifact_type} artifact from {source}", style="bold magenta")
 
-    dm, _ = get_managers()
+    dm, _ = get_managers(warm_up=True)
 
     try:
         doc_id = dm.add_runtime_artifact(
@@ -272,7 +331,7 @@ def gotcha(
     """Log a code gotcha and its workaround"""
     console.print(f"💡 Logging gotcha...", style="bold yellow")
 
-    dm, _ = get_managers()
+    dm, _ = get_managers(warm_up=True)
 
     try:
         doc_id = dm.log_gotcha(
@@ -298,7 +357,7 @@ def perf(
     """Log a performance issue"""
     console.print(f"⚡ Logging performance issue...", style="bold red")
 
-    dm, _ = get_managers()
+    dm, _ = get_managers(warm_up=True)
 
     try:
         doc_id = dm.log_performance_issue(
@@ -324,7 +383,7 @@ def deploy(
     """Log a deployment action"""
     console.print(f"🚀 Logging deployment to {environment}...", style="bold blue")
 
-    dm, _ = get_managers()
+    dm, _ = get_managers(warm_up=True)
 
     try:
         doc_id = dm.log_deployment(
@@ -348,7 +407,7 @@ def dependency(
     """Log a dependency or version conflict issue"""
     console.print(f"📦 Logging dependency issue for {package}...", style="bold yellow")
 
-    dm, _ = get_managers()
+    dm, _ = get_managers(warm_up=True)
 
     try:
         doc_id = dm.log_dependency_issue(
@@ -366,18 +425,20 @@ def search_artifacts(
     query: str,
     artifact_type: Optional[str] = None,
     file_path: Optional[str] = None,
-    limit: int = 5
+    limit: int = 5,
+    mode: str = typer.Option("hybrid", help="vector, lexical (exact identifiers) or hybrid")
 ):
     """Search runtime artifacts with time-decay ranking"""
     console.print(f"🔍 Searching artifacts: {query}", style="bold magenta")
 
-    dm, _ = get_managers()
+    dm, _ = get_managers(warm_up=True)
 
     results = dm.search_artifacts(
         query=query,
         artifact_type=artifact_type,
         file_path=file_path,
-        n_results=limit
+        n_results=limit,
+        mode=mode
     )
 
     if not results:
@@ -405,6 +466,20 @@ def search_artifacts(
             border_style="magenta"
         ))
 
+@app.command()
+def serve(storage: str = "./storage/chromadb", socket: Optional[str] = None):
+    """Run the shared RAG service for agents and CLI commands"""
+    import asyncio
+    from rag_system.core.rag_service import default_socket_path, serve as run_service
+
+    path = socket or default_socket_path(storage)
+    console.print(f"🧠 Loading model and serving {storage} on {path}", style="bold green")
+    console.print("Other processes on this machine use it automatically. Ctrl+C to stop.")
+    try:
+        asyncio.run(run_service(storage, path))
+    except KeyboardInterrupt:
+        console.print("👋 RAG service stopped", style="yellow")
+
 @app.command()
 def types():
     """Show available document types"""
@@ -0,0 +1,138 @@
+"""
+Stage timing and profiling helpers for the ingestion pipeline.
+
+``StageTimer`` records how long each pipeline step takes together with the
+number of rows that went in and came out, so a slow import can be pinned on
+Docling, validation, duplicate detection or MySQL. ``ProfileCapture``
+optionally wraps a whole run in cProfile or pyinstrument.
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional, Iterator
+from pathlib import Path
+import cProfile
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+PROFILERS = ('cprofile', 'pyinstrument')
+
+
+@dataclass
+class StageRecord:
+    """Timing and row counters for one pipeline stage"""
+    name: str
+    seconds: float = 0.0
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    failed: bool = False
+
+
+class StageTimer:
+    """Collects per-stage timings for a single pipeline run"""
+
+    def __init__(self, prior: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the timer
+
+        Args:
+            prior: Timings from an earlier part of the same run (``to_dict()``
+                output), e.g. the stages a worker process already ran
+        """
+        self.stages: List[StageRecord] = []
+        self._offset = 0.0
+        if prior:
+            self.stages = [StageRecord(**stage) for stage in prior.get('stages', [])]
+            self._offset = prior.get('total_seconds', 0.0)
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None) -> Iterator[StageRecord]:
+        """
+        Time a pipeline stage
+
+        Args:
+            name: Stage name used in reports
+            rows_in: Number of rows handed to the stage
+
+        Yields:
+            The StageRecord; set ``rows_out`` on it before leaving the block
+        """
+        record = StageRecord(name=name, rows_in=rows_in)
+        started = time.perf_counter()
+        try:
+            yield record
+        except BaseException:
+            record.failed = True
+            raise
+        finally:
+            record.seconds = round(time.perf_counter() - started, 6)
+            self.stages.append(record)
+            logger.debug(f"Stage {name} took {record.seconds:.3f}s "
+                         f"(rows in={record.rows_in}, out={record.rows_out})")
+
+    @property
+    def total_seconds(self) -> float:
+        return round(self._offset + time.perf_counter() - self._started, 6)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert timings to a JSON-serializable dictionary"""
+        return {
+            'total_seconds': self.total_seconds,
+            'stages': [asdict(record) for record in self.stages]
+        }
+
+
+class ProfileCapture:
+    """Context manager that profiles a block with cProfile or pyinstrument"""
+
+    def __init__(self, profiler: str, output_path: str):
+        """
+        Initialize profile capture
+
+        Args:
+            profiler: 'cprofile' or 'pyinstrument'
+            output_path: File path (without suffix) for the captured profile
+        """
+        if profiler not in PROFILERS:
+            raise ValueError(f"Unknown profiler '{profiler}', expected one of {PROFILERS}")
+
+        self.profiler = profiler
+        self.output_path: Optional[str] = None
+        self._base_path = Path(output_path)
+        self._profile = None
+
+        if profiler == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+                self._profile = Profiler()
+            except ImportError:
+                logger.warning("pyinstrument is not installed, falling back to cProfile")
+                self.profiler = 'cprofile'
+
+        if self.profiler == 'cprofile':
+            self._profile = cProfile.Profile()
+
+    def __enter__(self) -> 'ProfileCapture':
+        if self.profiler == 'pyinstrument':
+            self._profile.start()
+        else:
+            self._profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._base_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.profiler == 'pyinstrument':
+            self._profile.stop()
+            path = self._base_path.with_suffix('.html')
+            path.write_text(self._profile.output_html(), encoding='utf-8')
+        else:
+            self._profile.disable()
+            path = self._base_path.with_suffix('.prof')
+            self._profile.dump_stats(str(path))
+
+        self.output_path = str(path)
+        logger.info(f"Profile written to {self.output_path}")
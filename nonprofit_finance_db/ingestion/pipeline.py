@@ -8,22 +8,32 @@ from parsers import CSVParser, PDFParser
 from detection import DuplicateDetector
 from .validators import TransactionValidator, FileValidator
 from .processors import TransactionProcessor, ImportBatchProcessor
+from .instrumentation import StageTimer, ProfileCapture
+from .checkpoints import compute_row_hash, compute_row_hashes, ImportCheckpoint
 
 logger = logging.getLogger(__name__)
 
 class IngestionPipeline:
     """Main pipeline for bank statement data ingestion"""
 
-    def __init__(self, org_id: int, database_connection=None):
+    def __init__(self, org_id: int, database_connection=None,
+                 profile: Optional[str] = None, profile_dir: str = 'logs/profiles',
+                 chunk_size: int = 500):
         """
         Initialize ingestion pipeline
 
         Args:
             org_id: Organization ID for transactions
             database_connection: Database connection for storing data
+            profile: Optional profiler ('cprofile' or 'pyinstrument') wrapped around each ingest
+            profile_dir: Directory where captured profiles are written
+            chunk_size: Number of transactions imported between checkpoints
         """
         self.org_id = org_id
         self.db_connection = database_connection
+        self.profile = profile
+        self.profile_dir = profile_dir
+        self.chunk_size = max(1, chunk_size)
 
         # Initialize components
         self.file_validator = FileValidator()
@@ -42,6 +52,9 @@ class IngestionPipeline:
         # re-query for every duplicate check run.
         self._existing_transactions_cache: Optional[List[Dict[str, Any]]] = None
 
+        # Columns added by later migrations, checked once per pipeline
+        self._column_support: Dict[Tuple[str, str], bool] = {}
+
     def ingest_file(self, file_path: str, auto_process: bool = True) -> Dict[str, Any]:
         """
         Main method to ingest a bank statement file
@@ -53,9 +66,120 @@ class IngestionPipeline:
         Returns:
             Ingestion result dictionary
         """
+        if not self.profile:
+            return self._ingest_file(file_path, auto_process)
+
+        stem = os.path.splitext(os.path.basename(file_path))[0]
+        output_path = os.path.join(
+            self.profile_dir, f"{stem}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        )
+        capture = ProfileCapture(self.profile, output_path)
+        with capture:
+            result = self._ingest_file(file_path, auto_process)
+        result['profile_path'] = capture.output_path
+        return result
+
+    def _ingest_file(self, file_path: str, auto_process: bool,
+                     resume_batch: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Run the ingestion steps for one file, timing each stage
+
+        Args:
+            file_path: Path to the bank statement file
+            auto_process: Whether to automatically process high-confidence duplicates
+            resume_batch: Existing import batch to resume from its checkpoint
+        """
         logger.info(f"Starting ingestion for file: {file_path}")
 
-        result = {
+        timer = StageTimer()
+        result = self._new_result(file_path)
+
+        try:
+            prepared = self._prepare(file_path, result, timer)
+            if prepared is not None:
+                file_format, parsed_count, processed_transactions = prepared
+                self._write(file_path, file_format, parsed_count, processed_transactions,
+                            result, timer, auto_process, resume_batch)
+
+        except Exception as e:
+            self._record_pipeline_error(result, timer, e)
+
+        finally:
+            result['timings'] = timer.to_dict()
+
+        return result
+
+    def prepare_file(self, file_path: str) -> Dict[str, Any]:
+        """
+        Parse, validate and process a file without touching the database
+
+        This is the CPU-heavy half of ``ingest_file`` (Docling conversion,
+        validation and categorization). Its result can be produced in a worker
+        process and handed to ``ingest_prepared`` in the process that owns the
+        database connection.
+
+        Args:
+            file_path: Path to the bank statement file
+
+        Returns:
+            Prepared file dictionary (picklable)
+        """
+        timer = StageTimer()
+        result = self._new_result(file_path)
+        prepared = {
+            'file_path': file_path,
+            'file_format': None,
+            'parsed_count': 0,
+            'transactions': None,
+            'result': result
+        }
+
+        try:
+            outcome = self._prepare(file_path, result, timer)
+            if outcome is not None:
+                prepared['file_format'], prepared['parsed_count'], prepared['transactions'] = outcome
+        except Exception as e:
+            logger.error(f"Preparing {file_path} failed: {str(e)}")
+            result['processing_errors'].append(f"Pipeline error: {str(e)}")
+
+        result['timings'] = timer.to_dict()
+        return prepared
+
+    def ingest_prepared(self, prepared: Dict[str, Any], auto_process: bool = True) -> Dict[str, Any]:
+        """
+        Import a file prepared by ``prepare_file``
+
+        Runs batch creation, duplicate detection and the database import, so
+        files prepared in parallel are deduplicated exactly as they would be
+        when imported one after another.
+
+        Args:
+            prepared: Result of ``prepare_file``
+            auto_process: Whether to automatically process high-confidence duplicates
+
+        Returns:
+            Ingestion result dictionary
+        """
+        result = prepared['result']
+        timer = StageTimer(prior=result.get('timings'))
+
+        if prepared['transactions'] is None:
+            return result
+
+        try:
+            self._write(prepared['file_path'], prepared['file_format'], prepared['parsed_count'],
+                        prepared['transactions'], result, timer, auto_process)
+
+        except Exception as e:
+            self._record_pipeline_error(result, timer, e)
+
+        finally:
+            result['timings'] = timer.to_dict()
+
+        return result
+
+    def _new_result(self, file_path: str) -> Dict[str, Any]:
+        return {
             'success': False,
             'file_path': file_path,
             'import_batch': None,
@@ -66,126 +190,171 @@ class IngestionPipeline:
             'validation_errors': [],
             'processing_errors': [],
             'duplicate_report': None,
-            'summary': None
+            'summary': None,
+            'timings': None
         }
 
-        try:
-            # Step 1: Validate file
-            logger.info("Step 1: Validating file format...")
+    def _prepare(self, file_path: str, result: Dict[str, Any],
+                 timer: StageTimer) -> Optional[Tuple[str, int, List[Dict[str, Any]]]]:
+        """
+        Steps that do not need the database: validate, parse and process
+
+        Returns:
+            (file_format, parsed_count, processed_transactions), or None when the
+            file cannot be imported at all (errors are recorded in ``result``)
+        """
+        # Step 1: Validate file
+        logger.info("Step 1: Validating file format...")
+        with timer.stage('validate_file'):
             file_validation = self.file_validator.validate_file(file_path)
-            if not file_validation['is_valid']:
-                result['validation_errors'] = file_validation['errors']
-                return result
-
-            # Step 2: Determine file format and get appropriate parser
-            logger.info("Step 2: Detecting file format...")
-            file_format = self._detect_file_format(file_path)
-            if file_format not in self.parsers:
-                result['validation_errors'] = [f"Unsupported file format: {file_format}"]
-                return result
-
-            parser = self.parsers[file_format]
-            logger.info(f"Format detected: {file_format}")
-
-            # Step 3: Parse file
-            logger.info("Step 3: Parsing bank statement file...")
+        if not file_validation['is_valid']:
+            result['validation_errors'] = file_validation['errors']
+            return None
+
+        # Step 2: Determine file format and get appropriate parser
+        logger.info("Step 2: Detecting file format...")
+        file_format = self._detect_file_format(file_path)
+        if file_format not in self.parsers:
+            result['validation_errors'] = [f"Unsupported file format: {file_format}"]
+            return None
+
+        parser = self.parsers[file_format]
+        logger.info(f"Format detected: {file_format}")
+
+        # Step 3: Parse file
+        logger.info("Step 3: Parsing bank statement file...")
+        with timer.stage('parse') as stage:
             parsed_transactions = parser.parse(file_path)
-            result['total_transactions'] = len(parsed_transactions)
-            logger.info(f"Found {len(parsed_transactions)} transactions in file")
-
-            if not parsed_transactions:
-                result['validation_errors'] = ["No transactions found in file"]
-                return result
-
-            # Step 4: Create import batch
-            filename = os.path.basename(file_path)
-            import_batch = self.batch_processor.create_import_batch(
-                org_id=self.org_id,
-                filename=filename,
-                file_format=file_format,
-                total_transactions=len(parsed_transactions)
-            )
-            import_batch = self._save_import_batch(import_batch)
-            import_batch = self.batch_processor.update_batch_status(
-                import_batch,
-                'PROCESSING'
-            )
-            self._update_import_batch(import_batch)
-            result['import_batch'] = import_batch
+            stage.rows_out = len(parsed_transactions)
+        result['total_transactions'] = len(parsed_transactions)
+        logger.info(f"Found {len(parsed_transactions)} transactions in file")
+
+        if not parsed_transactions:
+            result['validation_errors'] = ["No transactions found in file"]
+            return None
 
-            # Step 5: Validate transactions
-            logger.info("Step 5: Validating transactions...")
+        # Step 4: Validate transactions
+        logger.info("Step 4: Validating transactions...")
+        with timer.stage('validate', rows_in=len(parsed_transactions)) as stage:
             validation_result = self.transaction_validator.validate_batch(parsed_transactions)
             valid_transactions = validation_result['validated_transactions']
-            result['validation_errors'] = validation_result['summary']['errors']
-            logger.info(f"Validated {len(valid_transactions)} transactions")
+            stage.rows_out = len(valid_transactions)
+        result['validation_errors'] = validation_result['summary']['errors']
+        logger.info(f"Validated {len(valid_transactions)} transactions")
 
-            if not valid_transactions:
-                import_batch = self.batch_processor.update_batch_status(
-                    import_batch, 'FAILED', error_log="No valid transactions found"
-                )
-                result['import_batch'] = import_batch
-                return result
+        if not valid_transactions:
+            # The batch is still recorded (as FAILED) by the write step
+            return file_format, len(parsed_transactions), []
 
-            # Step 6: Process transactions
-            logger.info("Step 6: Processing transactions...")
+        # Step 5: Process transactions
+        logger.info("Step 5: Processing transactions...")
+        with timer.stage('process', rows_in=len(valid_transactions)) as stage:
             processing_result = self.transaction_processor.process_batch(valid_transactions)
             processed_transactions = processing_result['processed_transactions']
-            result['processing_errors'] = processing_result['summary']['processing_errors']
-            logger.info(f"Processed {len(processed_transactions)} transactions")
+            stage.rows_out = len(processed_transactions)
+        result['processing_errors'] = processing_result['summary']['processing_errors']
+        logger.info(f"Processed {len(processed_transactions)} transactions")
+
+        return file_format, len(parsed_transactions), processed_transactions
+
+    def _write(self, file_path: str, file_format: str, parsed_count: int,
+               processed_transactions: List[Dict[str, Any]], result: Dict[str, Any],
+               timer: StageTimer, auto_process: bool,
+               resume_batch: Optional[Dict[str, Any]] = None) -> None:
+        """Steps that use the database: import batch, duplicate detection and import"""
+        # Step 6: Create import batch (or reopen the one being resumed)
+        with timer.stage('create_batch'):
+            if resume_batch is None:
+                filename = os.path.basename(file_path)
+                import_batch = self.batch_processor.create_import_batch(
+                    org_id=self.org_id,
+                    filename=filename,
+                    file_format=file_format,
+                    total_transactions=parsed_count,
+                    source_path=os.path.abspath(file_path)
+                )
+                import_batch = self._save_import_batch(import_batch)
+            else:
+                import_batch = self.batch_processor.update_batch_status(resume_batch, 'PENDING')
+            import_batch = self.batch_processor.update_batch_status(
+                import_batch,
+                'PROCESSING'
+            )
+            self._update_import_batch(import_batch)
+        result['import_batch'] = import_batch
+
+        if not processed_transactions:
+            import_batch = self.batch_processor.update_batch_status(
+                import_batch, 'FAILED', error_log="No valid transactions found"
+            )
+            import_batch['stage_timings'] = timer.to_dict()
+            self._update_import_batch(import_batch)
+            result['import_batch'] = import_batch
+            return
 
-            # Step 7: Detect duplicates
-            logger.info("Step 7: Detecting duplicates...")
+        # Step 7: Detect duplicates
+        logger.info("Step 7: Detecting duplicates...")
+        with timer.stage('load_existing') as stage:
             existing_transactions = self._get_existing_transactions()
+            stage.rows_out = len(existing_transactions)
+        with timer.stage('detect_duplicates', rows_in=len(processed_transactions)) as stage:
             duplicate_flags = self.duplicate_detector.find_duplicates(
                 processed_transactions, existing_transactions
             )
-            result['duplicate_count'] = len(duplicate_flags)
-            result['duplicate_report'] = self.duplicate_detector.generate_duplicate_report(duplicate_flags)
-            logger.info(f"Found {len(duplicate_flags)} potential duplicates")
-
-            # Step 8: Filter out duplicates and import
-            logger.info("Step 8: Importing transactions to database...")
+            stage.rows_out = len(duplicate_flags)
+        result['duplicate_count'] = len(duplicate_flags)
+        result['duplicate_report'] = self.duplicate_detector.generate_duplicate_report(duplicate_flags)
+        logger.info(f"Found {len(duplicate_flags)} potential duplicates")
+
+        # Step 8: Filter out duplicates and import
+        logger.info("Step 8: Importing transactions to database...")
+        with timer.stage('import', rows_in=len(processed_transactions)) as stage:
             import_result = self._import_transactions(
                 processed_transactions, duplicate_flags, auto_process, import_batch
             )
-            logger.info(f"Imported {import_result['successful_imports']} transactions successfully")
+            stage.rows_out = import_result['successful_imports']
+        logger.info(f"Imported {import_result['successful_imports']} transactions successfully")
+
+        result['successful_imports'] = import_result['successful_imports']
+        result['failed_imports'] = import_result['failed_imports']
+
+        # Step 9: Update import batch status
+        # A re-run that only finds already imported or duplicate rows is still complete
+        imported_rows = (import_result['successful_imports'] + import_result['already_imported']
+                         + import_result['skipped_duplicates'])
+        final_status = 'COMPLETED' if imported_rows > 0 else 'FAILED'
+        import_batch = self.batch_processor.update_batch_status(
+            import_batch,
+            final_status,
+            successful_imports=import_result['successful_imports'],
+            failed_imports=import_result['failed_imports'],
+            duplicate_count=len(duplicate_flags)
+        )
+        import_batch['stage_timings'] = timer.to_dict()
+        self._update_import_batch(import_batch)
+        result['import_batch'] = import_batch
+
+        # Step 10: Generate summary
+        result['summary'] = self.batch_processor.generate_batch_summary(import_batch)
+        result['success'] = True
 
-            result['successful_imports'] = import_result['successful_imports']
-            result['failed_imports'] = import_result['failed_imports']
+        logger.info(f"Ingestion completed. Imported {result['successful_imports']} transactions "
+                    f"in {timer.total_seconds:.2f}s")
 
-            # Step 9: Update import batch status
-            final_status = 'COMPLETED' if import_result['successful_imports'] > 0 else 'FAILED'
+    def _record_pipeline_error(self, result: Dict[str, Any], timer: StageTimer, error: Exception) -> None:
+        """Record a pipeline failure and mark the import batch as failed"""
+        logger.error(f"Ingestion failed: {str(error)}")
+        result['processing_errors'].append(f"Pipeline error: {str(error)}")
+
+        # Update batch status to failed if batch was created
+        if result.get('import_batch'):
             import_batch = self.batch_processor.update_batch_status(
-                import_batch,
-                final_status,
-                successful_imports=import_result['successful_imports'],
-                failed_imports=import_result['failed_imports'],
-                duplicate_count=len(duplicate_flags)
+                result['import_batch'], 'FAILED', error_log=str(error)
             )
+            import_batch['stage_timings'] = timer.to_dict()
             self._update_import_batch(import_batch)
             result['import_batch'] = import_batch
 
-            # Step 10: Generate summary
-            result['summary'] = self.batch_processor.generate_batch_summary(import_batch)
-            result['success'] = True
-
-            logger.info(f"Ingestion completed. Imported {result['successful_imports']} transactions")
-
-        except Exception as e:
-            logger.error(f"Ingestion failed: {str(e)}")
-            result['processing_errors'].append(f"Pipeline error: {str(e)}")
-
-            # Update batch status to failed if batch was created
-            if result.get('import_batch'):
-                import_batch = self.batch_processor.update_batch_status(
-                    result['import_batch'], 'FAILED', error_log=str(e)
-                )
-                self._update_import_batch(import_batch)
-                result['import_batch'] = import_batch
-
-        return result
-
     def _detect_file_format(self, file_path: str) -> str:
         """Detect file format based on extension"""
         _, ext = os.path.splitext(file_path.lower())
@@ -250,18 +419,28 @@ class IngestionPipeline:
         """
         Import transactions to database, handling duplicates
 
+        Transactions are written in chunks of ``chunk_size``. After each chunk
+        the batch checkpoint is advanced so a failed import can be resumed
+        with ``retry_failed_import``; rows whose ``row_hash`` is already in
+        the database are skipped, which makes re-running a file idempotent.
+
         Args:
             transactions: List of transactions to import
             duplicate_flags: List of duplicate flags
             auto_process: Whether to auto-process high-confidence duplicates
+            import_batch: Import batch the transactions belong to
 
         Returns:
             Import result dictionary
         """
+        checkpoint = ImportCheckpoint.from_batch(import_batch)
+        start_index = min(checkpoint.next_row, len(transactions))
         import_result = {
-            'successful_imports': 0,
-            'failed_imports': 0,
-            'skipped_duplicates': 0
+            'successful_imports': checkpoint.successful_imports if start_index else 0,
+            'failed_imports': checkpoint.failed_imports if start_index else 0,
+            'skipped_duplicates': 0,
+            'already_imported': 0,
+            'resumed_from_row': start_index
         }
 
         if not self.db_connection:
@@ -280,8 +459,9 @@ class IngestionPipeline:
                         duplicate_indices.add(i)
                         break
 
+        # Keys are collected over the whole file, including rows before the
+        # checkpoint, so a resumed run skips the same in-batch duplicates.
         seen_keys = set()
-
         for i, transaction in enumerate(transactions):
             tx_key = self._get_transaction_key(transaction)
             if tx_key in seen_keys:
@@ -289,34 +469,135 @@ class IngestionPipeline:
             else:
                 seen_keys.add(tx_key)
 
-            if i in duplicate_indices:
-                import_result['skipped_duplicates'] += 1
-                continue
-
-            try:
-                transaction['import_batch_id'] = import_batch.get('id')
-                transaction_id = self._save_transaction(transaction)
-
-                if transaction_id:
-                    import_result['successful_imports'] += 1
-                    # Augment cache so subsequent duplicate checks during the same
-                    # ingest run are aware of the newly inserted transaction.
-                    if self._existing_transactions_cache is not None:
-                        cached_tx = transaction.copy()
-                        cached_tx['id'] = transaction_id
-                        self._existing_transactions_cache.append(cached_tx)
-                else:
+        # Hashes are computed over the whole file so identical rows are numbered
+        # the same way whichever chunk a resumed run starts from.
+        row_hashes = compute_row_hashes(transactions, self.org_id)
+
+        if start_index:
+            logger.info(f"Resuming import batch {import_batch.get('id')} at row {start_index}")
+
+        for chunk_start in range(start_index, len(transactions), self.chunk_size):
+            chunk_end = min(chunk_start + self.chunk_size, len(transactions))
+
+            pending = []
+            for i in range(chunk_start, chunk_end):
+                if i in duplicate_indices:
+                    import_result['skipped_duplicates'] += 1
+                    continue
+                transaction = transactions[i]
+                transaction['row_hash'] = row_hashes[i]
+                pending.append((i, transaction))
+
+            committed_hashes = self._find_committed_row_hashes(
+                [transaction['row_hash'] for _, transaction in pending]
+            )
+
+            for i, transaction in pending:
+                if transaction['row_hash'] in committed_hashes:
+                    import_result['already_imported'] += 1
+                    continue
+
+                try:
+                    transaction['import_batch_id'] = import_batch.get('id')
+                    transaction_id = self._save_transaction(transaction)
+
+                    if transaction.pop('already_imported', False):
+                        # Committed concurrently since the row hash lookup above
+                        import_result['already_imported'] += 1
+                    elif transaction_id:
+                        import_result['successful_imports'] += 1
+                        # Augment cache so subsequent duplicate checks during the same
+                        # ingest run are aware of the newly inserted transaction.
+                        if self._existing_transactions_cache is not None:
+                            cached_tx = transaction.copy()
+                            cached_tx['id'] = transaction_id
+                            self._existing_transactions_cache.append(cached_tx)
+                    else:
+                        import_result['failed_imports'] += 1
+
+                except Exception as e:
+                    logger.error(f"Error importing transaction {i}: {str(e)}")
                     import_result['failed_imports'] += 1
 
-            except Exception as e:
-                logger.error(f"Error importing transaction {i}: {str(e)}")
-                import_result['failed_imports'] += 1
+            self._save_checkpoint(import_batch, chunk_end, import_result)
 
         if duplicate_flags:
             self._save_duplicate_flags(duplicate_flags)
 
         return import_result
 
+    def _has_column(self, table: str, column: str) -> bool:
+        """Check once whether a migrated column exists in the connected database."""
+        key = (table, column)
+        if key not in self._column_support:
+            supported = False
+            if self.db_connection:
+                try:
+                    with self.db_connection.cursor() as cursor:
+                        cursor.execute(f"SHOW COLUMNS FROM {table} LIKE %s", (column,))
+                        supported = cursor.fetchone() is not None
+                    if not supported:
+                        logger.warning(f"Column {table}.{column} not found; "
+                                       "apply migrations/add_transaction_row_hash_and_checkpoints.sql")
+                except Exception as e:
+                    logger.warning(f"Could not inspect {table}.{column}: {str(e)}")
+            self._column_support[key] = supported
+        return self._column_support[key]
+
+    def _find_committed_row_hashes(self, row_hashes: List[str]) -> set:
+        """
+        Return the subset of row hashes already stored for this organization
+
+        Args:
+            row_hashes: Row hashes of the chunk about to be imported
+
+        Returns:
+            Set of row hashes that are already in the transactions table
+        """
+        if not row_hashes or not self.db_connection or not self._has_column('transactions', 'row_hash'):
+            return set()
+
+        placeholders = ', '.join(['%s'] * len(row_hashes))
+        sql = (
+            f"SELECT row_hash FROM transactions "
+            f"WHERE org_id = %s AND row_hash IN ({placeholders})"
+        )
+        try:
+            with self.db_connection.cursor() as cursor:
+                cursor.execute(sql, (self.org_id, *row_hashes))
+                return {row[0] for row in cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"Error looking up committed row hashes: {str(e)}")
+            return set()
+
+    def _save_checkpoint(self, import_batch: Dict[str, Any], next_row: int,
+                         import_result: Dict[str, Any]) -> None:
+        """Record that every row before ``next_row`` has been committed."""
+        import_batch['checkpoint_row'] = next_row
+        import_batch['successful_imports'] = import_result['successful_imports']
+        import_batch['failed_imports'] = import_result['failed_imports']
+
+        if (not self.db_connection or not import_batch.get('id')
+                or not self._has_column('import_batches', 'checkpoint_row')):
+            return
+
+        sql = (
+            "UPDATE import_batches SET checkpoint_row=%s, successful_imports=%s, "
+            "failed_imports=%s WHERE id=%s"
+        )
+        try:
+            with self.db_connection.cursor() as cursor:
+                cursor.execute(sql, (
+                    next_row,
+                    import_result['successful_imports'],
+                    import_result['failed_imports'],
+                    import_batch['id']
+                ))
+            self.db_connection.commit()
+        except Exception as e:
+            logger.error(f"Error saving checkpoint for import batch {import_batch['id']}: {str(e)}")
+            self.db_connection.rollback()
+
     def _transactions_match(self, tx1: Dict[str, Any], tx2: Dict[str, Any]) -> bool:
         """Check if two transactions are the same"""
         key_fields = ['transaction_date', 'amount', 'description']
@@ -336,6 +617,9 @@ class IngestionPipeline:
         """
         Persist a transaction to the database and return its primary key.
 
+        When the row hash is already stored the existing row's ID is returned
+        and ``transaction['already_imported']`` is set.
+
         Args:
             transaction: Transaction to save
 
@@ -362,9 +646,13 @@ class IngestionPipeline:
             'balance_after': transaction.get('balance_after'),
             'category_id': transaction.get('category_id'),
             'import_batch_id': transaction.get('import_batch_id'),
-            'raw_data': transaction.get('raw_data')
+            'raw_data': transaction.get('raw_data'),
+            'row_hash': None
         }
 
+        if self._has_column('transactions', 'row_hash'):
+            payload['row_hash'] = transaction.get('row_hash') or compute_row_hash(transaction, self.org_id)
+
         # Ensure raw_data is serialized JSON
         if payload['raw_data'] is not None and not isinstance(payload['raw_data'], str):
             payload['raw_data'] = json.dumps(payload['raw_data'])
@@ -380,11 +668,17 @@ class IngestionPipeline:
                 values.append(value)
 
         sql = f"INSERT INTO transactions ({', '.join(columns)}) VALUES ({', '.join(placeholders)})"
+        if payload['row_hash'] is not None:
+            # A row committed by an earlier run keeps its ID instead of failing
+            sql += " ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)"
 
         try:
             with self.db_connection.cursor() as cursor:
                 cursor.execute(sql, tuple(values))
                 transaction_id = cursor.lastrowid
+                # ON DUPLICATE KEY UPDATE reports 2 (updated) or 0 (unchanged) for an existing row
+                if payload['row_hash'] is not None and cursor.rowcount in (0, 2):
+                    transaction['already_imported'] = True
             self.db_connection.commit()
             return transaction_id
 
@@ -433,6 +727,9 @@ class IngestionPipeline:
             'error_log': batch.get('error_log')
         }
 
+        if self._has_column('import_batches', 'source_path'):
+            payload['source_path'] = batch.get('source_path')
+
         columns = [col for col, val in payload.items() if val is not None]
         placeholders = ['%s'] * len(columns)
         values = [payload[col] for col in columns]
@@ -480,6 +777,26 @@ class IngestionPipeline:
         except Exception as e:
             logger.error(f"Error updating import batch {batch['id']}: {str(e)}")
             self.db_connection.rollback()
+            return
+
+        if batch.get('stage_timings') is not None:
+            self._update_import_batch_timings(batch['id'], batch['stage_timings'])
+
+    def _update_import_batch_timings(self, batch_id: int, timings: Dict[str, Any]) -> None:
+        """Store stage timings in the import_batches.stage_timings JSON column."""
+        # Kept separate from the status update so a database without the
+        # stage_timings column (see migrations/add_import_batch_stage_timings.sql)
+        # still records the batch status.
+        try:
+            with self.db_connection.cursor() as cursor:
+                cursor.execute(
+                    "UPDATE import_batches SET stage_timings=%s WHERE id=%s",
+                    (json.dumps(timings), batch_id)
+                )
+            self.db_connection.commit()
+        except Exception as e:
+            logger.warning(f"Could not store stage timings for import batch {batch_id}: {str(e)}")
+            self.db_connection.rollback()
 
     def get_import_history(self, limit: int = 50) -> List[Dict[str, Any]]:
         """
@@ -503,19 +820,55 @@ class IngestionPipeline:
             logger.error(f"Error fetching import history: {str(e)}")
             return []
 
-    def retry_failed_import(self, batch_id: int) -> Dict[str, Any]:
+    def retry_failed_import(self, batch_id: int, auto_process: bool = True) -> Dict[str, Any]:
         """
         Retry a failed import batch
 
+        The batch's source file is parsed again and the import resumes after
+        the last committed chunk. Rows that were already written are
+        recognized by their row hash, so nothing is inserted twice.
+
         Args:
             batch_id: ID of the batch to retry
+            auto_process: Whether to automatically process high-confidence duplicates
 
         Returns:
             Retry result dictionary
         """
-        # TODO: Implement retry logic
-        logger.info(f"Retry functionality not yet implemented for batch {batch_id}")
-        return {'success': False, 'message': 'Retry functionality not implemented'}
+        if not self.db_connection:
+            return {'success': False, 'message': 'Database connection required to retry an import'}
+
+        batch = self._load_import_batch(batch_id)
+        if not batch:
+            return {'success': False, 'message': f'Import batch {batch_id} not found'}
+
+        if batch.get('status') == 'COMPLETED':
+            return {'success': False, 'message': f'Import batch {batch_id} already completed'}
+
+        source_path = batch.get('source_path')
+        if not source_path or not os.path.exists(source_path):
+            return {'success': False, 'message': f'Source file for import batch {batch_id} is not available'}
+
+        logger.info(f"Retrying import batch {batch_id} from row {batch.get('checkpoint_row') or 0}")
+        result = self._ingest_file(source_path, auto_process, resume_batch=batch)
+        if not result['success']:
+            errors = result['processing_errors'] or result['validation_errors']
+            result['message'] = errors[0] if errors else 'Retry failed'
+        return result
+
+    def _load_import_batch(self, batch_id: int) -> Optional[Dict[str, Any]]:
+        """Load an import batch record belonging to this organization."""
+        try:
+            with self.db_connection.cursor(dictionary=True) as cursor:
+                cursor.execute(
+                    "SELECT * FROM import_batches WHERE id = %s AND org_id = %s",
+                    (batch_id, self.org_id)
+                )
+                row = cursor.fetchone()
+            return dict(row) if row else None
+        except Exception as e:
+            logger.error(f"Error loading import batch {batch_id}: {str(e)}")
+            return None
 
 class PipelineConfig:
     """Configuration class for ingestion pipeline"""
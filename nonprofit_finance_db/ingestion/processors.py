@@ -235,7 +235,8 @@ class ImportBatchProcessor:
                           org_id: int,
                           filename: str,
                           file_format: str,
-                          total_transactions: int) -> Dict[str, Any]:
+                          total_transactions: int,
+                          source_path: Optional[str] = None) -> Dict[str, Any]:
         """
         Create a new import batch record
 
@@ -244,6 +245,7 @@ class ImportBatchProcessor:
             filename: Name of the imported file
             file_format: Format of the file (CSV, PDF, OFX)
             total_transactions: Total number of transactions in file
+            source_path: Absolute path of the imported file, used to retry the batch
 
         Returns:
             Import batch dictionary
@@ -259,6 +261,8 @@ class ImportBatchProcessor:
             'duplicate_count': 0,
             'status': 'PENDING',
             'error_log': None,
+            'source_path': source_path,
+            'checkpoint_row': 0,
             'created_at': datetime.now()
         }
 
@@ -325,7 +329,8 @@ class ImportBatchProcessor:
             'duplicate_count': duplicate_count,
             'success_rate': round(success_rate, 2),
             'import_date': batch.get('import_date'),
-            'processing_time': self._calculate_processing_time(batch)
+            'processing_time': self._calculate_processing_time(batch),
+            'stage_timings': batch.get('stage_timings')
         }
 
     def _calculate_processing_time(self, batch: Dict[str, Any]) -> Optional[float]:
@@ -336,6 +341,6 @@ class ImportBatchProcessor:
         if not import_date or status not in ['COMPLETED', 'FAILED']:
             return None
 
-        # For now, return None since we don't track completion time
-        # In a real implementation, you'd store completion_time
-        return None
\ No newline at end of file
+        # Stage timings are recorded by the pipeline while the batch runs
+        stage_timings = batch.get('stage_timings') or {}
+        return stage_timings.get('total_seconds')
\ No newline at end of file
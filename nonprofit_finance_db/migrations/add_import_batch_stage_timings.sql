@@ -0,0 +1,11 @@
+-- Add per-stage timing data to import batches
+-- The ingestion pipeline stores a JSON document with the duration and row
+-- counts of each step (parse, validate, process, duplicate detection, import).
+
+USE nonprofit_finance;
+
+ALTER TABLE import_batches
+    ADD COLUMN stage_timings JSON NULL AFTER error_log;
+
+-- Verify the new column
+SHOW COLUMNS FROM import_batches LIKE 'stage_timings';
@@ -0,0 +1,14 @@
+-- Add composite indexes for keyset paging in the transaction viewer
+-- scripts/view_transactions.py pages with
+--   WHERE org_id = ? AND (sort_col, id) past the last row ORDER BY sort_col, id
+-- so these indexes let each page be read as a short range scan instead of
+-- sorting the whole organization and skipping OFFSET rows.
+
+USE nonprofit_finance;
+
+ALTER TABLE transactions
+    ADD INDEX idx_transactions_org_date_id (org_id, transaction_date, id),
+    ADD INDEX idx_transactions_org_amount_id (org_id, amount, id);
+
+-- Verify the new indexes
+SHOW INDEX FROM transactions WHERE Key_name LIKE 'idx_transactions_org_%_id';
@@ -0,0 +1,22 @@
+-- Make statement imports idempotent and resumable
+-- transactions.row_hash identifies a statement line (org, account, date,
+-- amount, normalized description); the unique key lets a re-run skip rows
+-- that were already committed. import_batches records where the source file
+-- lives and how far the import got so `import_statements.py retry` can resume.
+--
+-- Existing rows keep a NULL row_hash until scripts/backfill_row_hashes.py is run.
+
+USE nonprofit_finance;
+
+ALTER TABLE transactions
+    ADD COLUMN row_hash CHAR(64) NULL AFTER raw_data,
+    ADD UNIQUE KEY uq_transactions_row_hash (org_id, row_hash);
+
+ALTER TABLE import_batches
+    ADD COLUMN source_path VARCHAR(1024) NULL AFTER filename,
+    ADD COLUMN checkpoint_row INT NOT NULL DEFAULT 0 AFTER duplicate_count;
+
+-- Verify the new columns
+SHOW COLUMNS FROM transactions LIKE 'row_hash';
+SHOW COLUMNS FROM import_batches LIKE 'source_path';
+SHOW COLUMNS FROM import_batches LIKE 'checkpoint_row';
@@ -262,7 +262,7 @@ class PDFParser(BaseParser):
             return ""
         return self.extractor.extract_text(file_path)
 
-    def extract_tables(self, file_path: str) -> List[List[List[str]]]:
+    def extract_tables(self, file_path: str) -> List[List[List[List[str]]]]:
         """
         Extract structured table data from the PDF.
 
@@ -270,7 +270,7 @@ class PDFParser(BaseParser):
             file_path: Path to the PDF file
 
         Returns:
-            List[List[List[str]]]: Tables as nested lists [page][table][row][cell]
+            List[List[List[List[str]]]]: Tables as nested lists [page][table][row][cell]
         """
         if not self.extractor:
             logger.error("PDF extractor not available - cannot extract tables")
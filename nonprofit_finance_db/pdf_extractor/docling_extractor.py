@@ -7,6 +7,7 @@ with superior accuracy compared to traditional PDF parsing libraries.
 """
 
 import logging
+import time
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, date
 import re
@@ -17,10 +18,18 @@ from docling.datamodel.base_models import InputFormat
 from docling.datamodel.pipeline_options import PdfPipelineOptions
 from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
 
+from .table_classifier import (
+    CHECK_NUMBER_RE,
+    DATE_CELL_RE,
+    ColumnRoles,
+    TableClassifier,
+    is_amount,
+    is_date,
+)
+
 logger = logging.getLogger(__name__)
 
-# Bank statement parsing patterns
-DATE_MD = re.compile(r'^(\d{1,2})/(\d{1,2})(?:/(\d{2,4}))?$')
+# Bank statement parsing patterns (month/day cells use DATE_CELL_RE)
 START_LINE_RE = re.compile(r'^(?P<md>\d{1,2}/\d{1,2}(?:/\d{2,4})?)\s+(?P<amount>[\$\(\)\-\d,\.]+)\s+(?P<desc>.*)$')
 CHECK_TRIPLE_RE = re.compile(r'(\d{3,8})\s+(?:[is]\s*)?(\d{1,2}/\d{1,2})\s+([\d,]+\.\d{2})')
 STATEMENT_PERIOD_RE = re.compile(r'Statement\s+Period\s+Date\s*:\s*(\d{1,2}/\d{1,2}/\d{4})\s*-\s*(\d{1,2}/\d{1,2}/\d{4})', re.I)
@@ -63,6 +72,12 @@ class DoclingPDFExtractor:
         # Cache for processed documents to avoid redundant processing
         self._document_cache = {}
 
+        # Per-page table parsing timings from the last parse_transactions call
+        self.last_page_timings: List[Dict[str, Any]] = []
+
+        # Document page number of each page group returned by the last extract_tables call
+        self.last_table_pages: List[int] = []
+
         logger.info("Docling PDF extractor initialized")
 
     def _get_cached_document(self, file_path: str):
@@ -147,24 +162,29 @@ class DoclingPDFExtractor:
             logger.error(f"[DOCLING] Traceback: {traceback.format_exc()}")
             return ""
 
-    def extract_tables(self, file_path: str) -> List[List[List[str]]]:
+    def extract_tables(self, file_path: str) -> List[List[List[List[str]]]]:
         """
         Extract structured table data from the PDF.
 
+        Pages without tables are left out; ``last_table_pages`` holds the
+        document page number of each returned page group.
+
         Args:
             file_path: Path to the PDF file
 
         Returns:
-            List[List[List[str]]]: Tables as nested lists [table][row][cell]
+            List[List[List[List[str]]]]: Tables grouped by page as [page][table][row][cell]
         """
+        self.last_table_pages = []
         try:
             logger.info(f"[DOCLING] Getting document for table extraction...")
             result = self._get_cached_document(file_path)
-            all_tables = []
+            tables_by_page: Dict[int, List[List[List[str]]]] = {}
 
             if result.document and result.document.tables:
                 logger.info(f"[DOCLING] Found {len(result.document.tables)} tables in document")
                 for i, table in enumerate(result.document.tables):
+                    page_tables = tables_by_page.setdefault(self._table_page_number(table), [])
                     try:
                         logger.info(f"[DOCLING] Processing table {i+1}/{len(result.document.tables)}...")
                         # Use the modern export_to_dataframe API
@@ -180,7 +200,7 @@ class DoclingPDFExtractor:
                         for _, row in df.iterrows():
                             table_data.append([str(cell) for cell in row])
 
-                        all_tables.append(table_data)
+                        page_tables.append(table_data)
                         logger.info(f"[DOCLING] Table {i+1} extracted: {len(table_data)} rows")
 
                     except Exception as e:
@@ -190,11 +210,14 @@ class DoclingPDFExtractor:
                         if hasattr(table, 'data') and table.data and hasattr(table.data, 'table_cells'):
                             for row in table.data.table_cells:
                                 table_data.append([cell.text if hasattr(cell, 'text') else str(cell) for cell in row])
-                        all_tables.append(table_data)
+                        page_tables.append(table_data)
                         logger.info(f"[DOCLING] Table {i+1} extracted via fallback: {len(table_data)} rows")
 
-            logger.info(f"[DOCLING] Extracted {len(all_tables)} tables from {file_path}")
-            return [all_tables]  # Return as [tables] to match expected format
+            table_count = sum(len(page_tables) for page_tables in tables_by_page.values())
+            logger.info(f"[DOCLING] Extracted {table_count} tables on {len(tables_by_page)} pages from {file_path}")
+            # Return as [page][tables], pages in document order
+            self.last_table_pages = sorted(tables_by_page)
+            return [tables_by_page[page] for page in self.last_table_pages]
 
         except Exception as e:
             logger.error(f"[DOCLING] Table extraction failed for {file_path}: {e}")
@@ -202,6 +225,14 @@ class DoclingPDFExtractor:
             logger.error(f"[DOCLING] Traceback: {traceback.format_exc()}")
             return []
 
+    @staticmethod
+    def _table_page_number(table) -> int:
+        """Page number a Docling table starts on (1 when provenance is missing)."""
+        prov = getattr(table, 'prov', None)
+        if prov:
+            return getattr(prov[0], 'page_no', 1) or 1
+        return 1
+
     def _parse_currency(self, value: str, absolute: bool = False) -> Optional[float]:
         """Parse a currency-like string into a float, respecting parentheses for negatives."""
         if value is None:
@@ -439,7 +470,9 @@ class DoclingPDFExtractor:
             # First try to parse from tables (more reliable)
             logger.info(f"[DOCLING] Attempting to parse transactions from tables...")
             try:
-                table_transactions = self._parse_transactions_from_tables(tables, start_date, end_date)
+                table_transactions = self._parse_transactions_from_tables(
+                    tables, start_date, end_date, page_numbers=self.last_table_pages
+                )
                 transactions.extend(table_transactions)
                 logger.info(f"[DOCLING] Parsed {len(table_transactions)} transactions from tables")
             except Exception as e:
@@ -479,106 +512,63 @@ class DoclingPDFExtractor:
             logger.error(f"[DOCLING] Traceback: {traceback.format_exc()}")
             return []
 
-    def _parse_transactions_from_tables(self, tables: List[List[List[str]]],
+    def _parse_transactions_from_tables(self, tables: List[List[List[List[str]]]],
                                       start_date: Optional[date],
-                                      end_date: Optional[date]) -> List[Dict[str, Any]]:
-        """Parse transactions from extracted table data."""
+                                      end_date: Optional[date],
+                                      page_numbers: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """Parse transactions from [page][table] data; page timings use ``page_numbers`` when given."""
         transactions = []
-        last_sign_hint = 0  # Track sign_hint from previous table for continuation tables
+        # One classifier per document so continuation tables inherit the
+        # sign hint and column roles of the table they continue
+        classifier = TableClassifier()
+        self.last_page_timings = []
 
         # Tables now come as [page][tables] format
-        for page_tables in tables:
-            for table in page_tables:
-                if len(table) < 2:  # Skip tables with no data rows
-                    continue
+        if not page_numbers or len(page_numbers) != len(tables):
+            page_numbers = list(range(1, len(tables) + 1))
 
-                # Check if this looks like a transaction table
-                header = table[0] if table else []
-                header_text = ' '.join(str(h) for h in header).lower()
-                logger.debug(f"Table header: {header}")
+        for page_no, page_tables in zip(page_numbers, tables):
+            page_started = time.perf_counter()
+            page_transactions = 0
 
-                sign_hint = 0
+            for table in page_tables:
+                classification = classifier.classify(table)
+                logger.debug(f"Table header: {table[0] if table else []} -> {classification.kind}")
 
-                # Skip balance summary tables explicitly
-                if any(keyword in header_text for keyword in [
-                    'daily balance summary', 'balance summary', 'daily balance',
-                    'account summary', 'myadvance', 'point balance', 'points'
-                ]):
-                    logger.debug(f"Skipping balance/summary table: {header_text}")
+                if not classification.is_transaction_table:
                     continue
 
-                # Look for transaction indicators in headers
-                is_transaction_table = any(
-                    keyword in header_text
-                    for keyword in ['withdrawal', 'deposit', 'debit', 'credit', 'checks']
-                )
-
-                if 'withdrawal' in header_text or 'debit' in header_text or 'checks' in header_text:
-                    sign_hint = -1
-                elif 'deposit' in header_text or 'credit' in header_text:
-                    sign_hint = 1
-
-                # Also check for explicit transaction table patterns
-                if not is_transaction_table:
-                    # Look for date/amount/description patterns in header
-                    is_transaction_table = (
-                        'date' in header_text and
-                        ('amount' in header_text or 'description' in header_text)
-                    )
-
-                    # If this looks like a continuation table (generic Date/Amount/Description header),
-                    # inherit the sign hint from the previous transaction table
-                    if is_transaction_table and sign_hint == 0 and last_sign_hint != 0:
-                        sign_hint = last_sign_hint
-                        logger.debug(f"Continuation table detected, using sign_hint={sign_hint} from previous table")
-
-                if is_transaction_table:
-                    logger.debug(f"Processing transaction table with {len(table)-1} rows")
-
-                    # Additional filtering: check first few rows to confirm it's not a balance table
-                    is_balance_table = False
-                    for row in table[1:3]:  # Check first 2 data rows
-                        if len(row) >= 2:
-                            # Check if amounts are very large (likely balances)
-                            try:
-                                amount_str = str(row[1]).replace('$', '').replace(',', '').strip()
-                                if amount_str and float(amount_str) > 50000:
-                                    logger.debug(f"Detected large amounts (balance table): {amount_str}")
-                                    is_balance_table = True
-                                    break
-                            except (ValueError, IndexError):
-                                pass
-
-                            # Check for balance-related text in row
-                            row_text = ' '.join(str(cell) for cell in row).lower()
-                            if any(keyword in row_text for keyword in [
-                                'beginning balance', 'ending balance', 'previous balance',
-                                'total balance', 'credit limit', 'available credit'
-                            ]):
-                                logger.debug(f"Detected balance-related text: {row_text}")
-                                is_balance_table = True
-                                break
-
-                    if is_balance_table:
-                        logger.debug("Skipping table identified as balance table")
+                logger.debug(f"Processing transaction table with {len(table)-1} rows")
+                for row in table[1:]:  # Skip header row
+                    if len(row) < 2:  # Need at least date and amount (description might be combined)
                         continue
 
-                    # Look for transaction-like patterns in table
-                    for row in table[1:]:  # Skip header row
-                        if len(row) >= 2:  # Need at least date and amount (description might be combined)
-                            if 'check' in header_text and len(row) >= 3:
-                                multi = self._extract_multiple_transactions_from_row(row, start_date, end_date, sign_hint, header_text)
-                                if multi:
-                                    transactions.extend(multi)
-                                    continue
-
-                            transaction = self._extract_transaction_from_row(row, start_date, end_date, sign_hint, header_text)
-                            if transaction:
-                                transactions.append(transaction)
+                    if classification.is_check_table and len(row) >= 3:
+                        multi = self._extract_multiple_transactions_from_row(
+                            row, start_date, end_date, classification.sign_hint, classification.header_text
+                        )
+                        if multi:
+                            transactions.extend(multi)
+                            page_transactions += len(multi)
+                            continue
 
-                    # Remember this sign_hint for potential continuation tables
-                    if sign_hint != 0:
-                        last_sign_hint = sign_hint
+                    transaction = self._extract_transaction_from_row(
+                        row, start_date, end_date, classification.sign_hint,
+                        classification.header_text, classification.roles
+                    )
+                    if transaction:
+                        transactions.append(transaction)
+                        page_transactions += 1
+
+            elapsed = time.perf_counter() - page_started
+            self.last_page_timings.append({
+                'page': page_no,
+                'tables': len(page_tables),
+                'transactions': page_transactions,
+                'seconds': round(elapsed, 6),
+            })
+            logger.info(f"[DOCLING] Page {page_no}: parsed {page_transactions} transactions "
+                        f"from {len(page_tables)} tables in {elapsed * 1000:.1f} ms")
 
         return transactions
 
@@ -607,46 +597,58 @@ class DoclingPDFExtractor:
                                     start_date: Optional[date],
                                     end_date: Optional[date],
                                     sign_hint: int = 0,
-                                    header_text: str = "") -> Optional[Dict[str, Any]]:
+                                    header_text: str = "",
+                                    roles: Optional[ColumnRoles] = None) -> Optional[Dict[str, Any]]:
         """Extract transaction data from a table row."""
         try:
             # Clean the row data
-            row = [cell.strip() if cell else '' for cell in row]
+            row = [str(cell).strip() if cell else '' for cell in row]
 
             # Try different column patterns based on common bank statement formats
             date_str = None
             amount_str = None
             description = None
 
+            # Pattern 0: Column roles resolved by the table classifier
+            if roles is not None and roles.is_usable and max(roles.date, roles.amount) < len(row):
+                potential_date = row[roles.date]
+                potential_amount = row[roles.amount]
+
+                if is_date(potential_date) and is_amount(potential_amount):
+                    date_str = potential_date
+                    amount_str = potential_amount
+                    if roles.description is not None and roles.description < len(row):
+                        description = row[roles.description]
+                    else:
+                        skip = {roles.date, roles.amount, roles.balance}
+                        description = ' '.join(cell for i, cell in enumerate(row) if i not in skip and cell)
+
             # Pattern 1: Date, Amount, Description (3 columns)
-            if len(row) >= 3:
-                potential_date = str(row[0]).strip()
-                potential_amount = str(row[1]).strip()
-                potential_desc = str(row[2]).strip()
+            if not date_str and len(row) >= 3:
+                potential_date = row[0]
+                potential_amount = row[1]
+                potential_desc = row[2]
 
-                if DATE_MD.match(potential_date) and self._is_amount(potential_amount):
+                if is_date(potential_date) and is_amount(potential_amount):
                     date_str = potential_date
                     amount_str = potential_amount
                     description = potential_desc
 
             # Pattern 2: Search for date and amount in any position
             if not date_str:
-                for i, cell in enumerate(row):
-                    cell_str = str(cell).strip()
-
+                for cell_str in row:
                     # Look for date pattern
-                    if DATE_MD.match(cell_str):
+                    if is_date(cell_str):
                         date_str = cell_str
 
                     # Look for amount pattern (more flexible)
-                    if self._is_amount(cell_str) and not amount_str:
+                    if is_amount(cell_str) and not amount_str:
                         amount_str = cell_str
 
                 # Use remaining cells as description
                 if date_str and amount_str:
                     desc_parts = []
-                    for cell in row:
-                        cell_str = str(cell).strip()
+                    for cell_str in row:
                         if cell_str != date_str and cell_str != amount_str and cell_str:
                             desc_parts.append(cell_str)
                     description = ' '.join(desc_parts)
@@ -683,11 +685,11 @@ class DoclingPDFExtractor:
             date_cell = str(date_cell).strip()
             amount_cell = str(amount_cell).strip()
 
-            if not DATE_MD.match(date_cell) or not self._is_amount(amount_cell):
+            if not is_date(date_cell) or not is_amount(amount_cell):
                 continue
 
             description = check_fragment or "Check"
-            match = re.search(r'(\d{3,8})', description)
+            match = CHECK_NUMBER_RE.search(description)
             if match:
                 description = f"Check #{match.group(1)}"
 
@@ -707,21 +709,7 @@ class DoclingPDFExtractor:
 
     def _is_amount(self, cell: str) -> bool:
         """Check if a cell contains a monetary amount."""
-        if not cell:
-            return False
-
-        cell = cell.strip()
-
-        # Check for amount patterns
-        amount_patterns = [
-            r'^\$?[\d,]+\.\d{2}$',  # $1,234.56 or 1,234.56
-            r'^\([\d,]+\.\d{2}\)$',  # (1,234.56) - negative
-            r'^[\d,]+\.\d{2}$',     # 1,234.56
-            r'^\$[\d,]+$',          # $1234 - whole dollars
-            r'^[\d,]+$'             # 1234 - whole dollars
-        ]
-
-        return any(re.match(pattern, cell) for pattern in amount_patterns)
+        return is_amount(cell)
 
     def _extract_transaction_from_match(self, match,
                                       start_date: Optional[date],
@@ -820,7 +808,7 @@ class DoclingPDFExtractor:
                               end_date: Optional[date]) -> Optional[date]:
         """Parse transaction date with intelligent year inference."""
         try:
-            match = DATE_MD.match(date_str)
+            match = DATE_CELL_RE.match(date_str)
             if not match:
                 return None
 
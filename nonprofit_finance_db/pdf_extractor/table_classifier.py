@@ -0,0 +1,238 @@
+"""
+Table classification for Docling bank statement tables.
+
+Docling hands back every table on a statement (account summaries, daily
+balance grids, deposits, withdrawals, checks, ...). This module decides once
+per table what kind of table it is, which sign applies to its amounts and
+which column holds the date, description, amount and balance, so the row
+parser does not have to rescan headers for every row.
+
+All header and row patterns are compiled at import time.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+# Cell level patterns
+DATE_CELL_RE = re.compile(r'^(\d{1,2})/(\d{1,2})(?:/(\d{2,4}))?$')
+AMOUNT_CELL_RE = re.compile(
+    r'^(?:'
+    r'\$?[\d,]+\.\d{2}'    # $1,234.56 or 1,234.56
+    r'|\([\d,]+\.\d{2}\)'  # (1,234.56) - negative
+    r'|\$?[\d,]+'          # $1234 or 1234 - whole dollars
+    r')$'
+)
+CHECK_NUMBER_RE = re.compile(r'(\d{3,8})')
+
+# Header level patterns
+SUMMARY_HEADER_RE = re.compile(
+    r'daily balance summary|balance summary|daily balance|account summary|'
+    r'myadvance|point balance|points'
+)
+TRANSACTION_HEADER_RE = re.compile(r'withdrawal|deposit|debit|credit|checks')
+DEBIT_HEADER_RE = re.compile(r'withdrawal|debit|checks')
+CREDIT_HEADER_RE = re.compile(r'deposit|credit')
+BALANCE_ROW_RE = re.compile(
+    r'beginning balance|ending balance|previous balance|'
+    r'total balance|credit limit|available credit'
+)
+
+# Column role patterns, checked against each header cell in this order
+COLUMN_ROLE_PATTERNS = (
+    ('balance', re.compile(r'balance')),
+    ('date', re.compile(r'date|posted')),
+    ('amount', re.compile(r'amount|debit|credit|withdrawal|deposit')),
+    ('description', re.compile(r'description|details|memo|payee|transaction')),
+)
+
+BALANCE_AMOUNT_THRESHOLD = 50000
+
+
+@dataclass
+class ColumnRoles:
+    """Column indexes for the well-known roles of a transaction table."""
+
+    date: Optional[int] = None
+    description: Optional[int] = None
+    amount: Optional[int] = None
+    balance: Optional[int] = None
+
+    @property
+    def is_usable(self) -> bool:
+        """True when both the date and amount columns are known."""
+        return self.date is not None and self.amount is not None
+
+
+@dataclass
+class TableClassification:
+    """Result of classifying a single table."""
+
+    kind: str  # 'transaction', 'summary', 'balance' or 'other'
+    header_text: str = ""
+    sign_hint: int = 0
+    is_check_table: bool = False
+    is_continuation: bool = False
+    roles: ColumnRoles = field(default_factory=ColumnRoles)
+
+    @property
+    def is_transaction_table(self) -> bool:
+        return self.kind == 'transaction'
+
+
+def is_amount(cell: str) -> bool:
+    """Check if a cell contains a monetary amount."""
+    if not cell:
+        return False
+    return AMOUNT_CELL_RE.match(cell.strip()) is not None
+
+
+def is_date(cell: str) -> bool:
+    """Check if a cell contains a month/day(/year) date."""
+    if not cell:
+        return False
+    return DATE_CELL_RE.match(cell.strip()) is not None
+
+
+class TableClassifier:
+    """
+    Classify statement tables and remember state across continuation tables.
+
+    A statement section that spills onto the next page usually shows up as a
+    second table with a generic ``Date / Amount / Description`` header. The
+    classifier keeps the sign hint and column roles of the last transaction
+    table so such continuation tables are parsed the same way.
+
+    Use one classifier per document; call ``reset()`` to reuse it.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the state carried over from previous tables."""
+        self._last_sign_hint = 0
+        self._last_roles: Optional[ColumnRoles] = None
+        self._last_width: Optional[int] = None
+
+    def classify(self, table: Sequence[Sequence[str]]) -> TableClassification:
+        """
+        Classify a table given as rows of cells, header row first.
+
+        Args:
+            table: Table rows; ``table[0]`` is the header
+
+        Returns:
+            TableClassification describing the table
+        """
+        header = list(table[0]) if table else []
+        header_text = ' '.join(str(h) for h in header).lower()
+
+        if len(table) < 2:
+            return TableClassification(kind='other', header_text=header_text)
+
+        if SUMMARY_HEADER_RE.search(header_text):
+            return TableClassification(kind='summary', header_text=header_text)
+
+        sign_hint = 0
+        if DEBIT_HEADER_RE.search(header_text):
+            sign_hint = -1
+        elif CREDIT_HEADER_RE.search(header_text):
+            sign_hint = 1
+
+        is_continuation = False
+        is_transaction = TRANSACTION_HEADER_RE.search(header_text) is not None
+        if not is_transaction:
+            is_transaction = (
+                'date' in header_text and
+                ('amount' in header_text or 'description' in header_text)
+            )
+            if is_transaction and sign_hint == 0 and self._last_sign_hint != 0:
+                sign_hint = self._last_sign_hint
+                is_continuation = True
+
+        if not is_transaction:
+            return TableClassification(kind='other', header_text=header_text, sign_hint=sign_hint)
+
+        roles = self._resolve_roles(header, table[1:], is_continuation)
+
+        if self._looks_like_balance_table(table[1:3], roles):
+            return TableClassification(
+                kind='balance', header_text=header_text, sign_hint=sign_hint, roles=roles
+            )
+
+        if sign_hint != 0:
+            self._last_sign_hint = sign_hint
+        if roles.is_usable:
+            self._last_roles = roles
+            self._last_width = len(header)
+
+        return TableClassification(
+            kind='transaction',
+            header_text=header_text,
+            sign_hint=sign_hint,
+            is_check_table='check' in header_text,
+            is_continuation=is_continuation,
+            roles=roles,
+        )
+
+    def _resolve_roles(self, header: List[str], rows: Sequence[Sequence[str]],
+                       is_continuation: bool) -> ColumnRoles:
+        """Map columns to roles from the header, falling back to the cached mapping."""
+        roles = self._roles_from_header(header)
+        if roles.is_usable:
+            return roles
+
+        if self._last_roles is not None and (is_continuation or len(header) == self._last_width):
+            return self._last_roles
+
+        return self._roles_from_rows(rows) or roles
+
+    @staticmethod
+    def _roles_from_header(header: List[str]) -> ColumnRoles:
+        found: Dict[str, int] = {}
+        for index, cell in enumerate(header):
+            cell_text = str(cell).lower()
+            for role, pattern in COLUMN_ROLE_PATTERNS:
+                if role not in found and pattern.search(cell_text):
+                    found[role] = index
+                    break
+        return ColumnRoles(**found)
+
+    @staticmethod
+    def _roles_from_rows(rows: Sequence[Sequence[str]]) -> Optional[ColumnRoles]:
+        """Infer roles from the first data row that has a date and an amount."""
+        for row in rows[:3]:
+            cells = [str(cell).strip() if cell else '' for cell in row]
+            date_index = next((i for i, cell in enumerate(cells) if is_date(cell)), None)
+            amount_index = next(
+                (i for i, cell in enumerate(cells) if i != date_index and is_amount(cell)), None
+            )
+            if date_index is None or amount_index is None:
+                continue
+            description_index = next(
+                (i for i, cell in enumerate(cells)
+                 if i not in (date_index, amount_index) and cell and not is_amount(cell)),
+                None,
+            )
+            return ColumnRoles(date=date_index, amount=amount_index, description=description_index)
+        return None
+
+    @staticmethod
+    def _looks_like_balance_table(sample_rows: Sequence[Sequence[str]], roles: ColumnRoles) -> bool:
+        """Check the first data rows for balance-sized amounts or balance labels."""
+        amount_index = roles.amount if roles.amount is not None else 1
+        for row in sample_rows:
+            if len(row) < 2:
+                continue
+            try:
+                amount_str = str(row[amount_index]).replace('$', '').replace(',', '').strip()
+                if amount_str and float(amount_str) > BALANCE_AMOUNT_THRESHOLD:
+                    return True
+            except (ValueError, IndexError):
+                pass
+
+            row_text = ' '.join(str(cell) for cell in row).lower()
+            if BALANCE_ROW_RE.search(row_text):
+                return True
+        return False
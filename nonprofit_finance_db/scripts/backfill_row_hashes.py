@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Backfill transactions.row_hash for rows imported before the row hash migration
+
+Run after migrations/add_transaction_row_hash_and_checkpoints.sql. Each import
+batch stands in for the file it came from, so identical rows are numbered in
+ID order exactly as the import pipeline numbers them within a file. Rows whose
+hash collides with an earlier row (true duplicates already in the table) keep
+a NULL row_hash and are listed so they can be reviewed.
+"""
+import sys
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db import get_connection
+from ingestion.checkpoints import compute_row_hashes
+
+
+def backfill_row_hashes(conn, batch_size: int = 1000):
+    """Assign row hashes to every transaction that does not have one yet"""
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("""
+        SELECT org_id, row_hash
+        FROM transactions
+        WHERE row_hash IS NOT NULL
+    """)
+    taken = {(row['org_id'], row['row_hash']) for row in cursor.fetchall()}
+
+    cursor.execute("""
+        SELECT id, org_id, import_batch_id, account_number, transaction_date, amount, description
+        FROM transactions
+        WHERE row_hash IS NULL
+        ORDER BY id
+    """)
+    rows = cursor.fetchall()
+    cursor.close()
+
+    batches = {}
+    for row in rows:
+        batches.setdefault(row['import_batch_id'], []).append(row)
+    hashed = []
+    for batch_rows in batches.values():
+        hashed.extend(zip(batch_rows, compute_row_hashes(batch_rows)))
+    hashed.sort(key=lambda item: item[0]['id'])
+
+    updates = []
+    collisions = []
+    for row, row_hash in hashed:
+        key = (row['org_id'], row_hash)
+        if key in taken:
+            collisions.append(row)
+            continue
+        taken.add(key)
+        updates.append((row_hash, row['id']))
+
+    cursor = conn.cursor()
+    for start in range(0, len(updates), batch_size):
+        cursor.executemany(
+            "UPDATE transactions SET row_hash = %s WHERE id = %s",
+            updates[start:start + batch_size]
+        )
+        conn.commit()
+    cursor.close()
+
+    print(f"✓ Assigned row hashes to {len(updates)} transactions")
+    if collisions:
+        print(f"⚠ {len(collisions)} transactions duplicate an existing row and were left without a hash:")
+        for row in collisions[:20]:
+            print(f"  - id={row['id']} {row['transaction_date']} {row['amount']} {row['description'][:60]}")
+
+
+def main():
+    with get_connection() as conn:
+        backfill_row_hashes(conn)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,10 +8,13 @@ import sys
 import os
 from pathlib import Path
 import json
+from contextlib import contextmanager
 from datetime import datetime
 from rich.console import Console
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import (
+    Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn, TimeElapsedColumn
+)
 from rich.panel import Panel
 from rich import print as rprint
 
@@ -19,6 +22,7 @@ from rich import print as rprint
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from ingestion.pipeline import IngestionPipeline, PipelineConfig
+from ingestion.parallel import ParallelImporter
 from app.config import settings
 
 console = Console()
@@ -26,8 +30,13 @@ console = Console()
 @click.group()
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose output')
 @click.option('--org-id', '-o', type=int, required=True, help='Organization ID')
+@click.option('--profile', is_flag=True, help='Capture a profile of each file import')
+@click.option('--profiler', type=click.Choice(['cprofile', 'pyinstrument']),
+              default='cprofile', help='Profiler used with --profile')
+@click.option('--profile-dir', type=click.Path(file_okay=False), default='logs/profiles',
+              help='Directory for captured profiles')
 @click.pass_context
-def cli(ctx, verbose, org_id):
+def cli(ctx, verbose, org_id, profile, profiler, profile_dir):
     """
     Nonprofit Finance Database - Bank Statement Import Tool
 
@@ -36,6 +45,8 @@ def cli(ctx, verbose, org_id):
     ctx.ensure_object(dict)
     ctx.obj['verbose'] = verbose
     ctx.obj['org_id'] = org_id
+    ctx.obj['profile'] = profiler if profile else None
+    ctx.obj['profile_dir'] = profile_dir
 
     if verbose:
         console.print(f"[bold blue]Organization ID:[/bold blue] {org_id}")
@@ -51,7 +62,6 @@ def cli(ctx, verbose, org_id):
 def import_file(ctx, file_path, auto_process, dry_run, output_format):
     """Import a bank statement file"""
 
-    org_id = ctx.obj['org_id']
     verbose = ctx.obj['verbose']
 
     if dry_run:
@@ -61,7 +71,7 @@ def import_file(ctx, file_path, auto_process, dry_run, output_format):
 
     try:
         # Initialize pipeline
-        pipeline = IngestionPipeline(org_id=org_id)
+        pipeline = _create_pipeline(ctx)
 
         with Progress(
             SpinnerColumn(),
@@ -94,19 +104,25 @@ def import_file(ctx, file_path, auto_process, dry_run, output_format):
 @click.option('--pattern', '-p', default='*.csv', help='File pattern to match')
 @click.option('--auto-process', '-a', is_flag=True, default=True)
 @click.option('--dry-run', '-d', is_flag=True, help='Perform dry run without importing')
+@click.option('--workers', '-w', type=int, default=1,
+              help='Worker processes for parsing files in parallel (1 = serial)')
 @click.pass_context
-def import_directory(ctx, directory, pattern, auto_process, dry_run):
+def import_directory(ctx, directory, pattern, auto_process, dry_run, workers):
     """Import all bank statement files from a directory"""
 
-    org_id = ctx.obj['org_id']
     verbose = ctx.obj['verbose']
 
+    if workers > 1 and ctx.obj.get('profile'):
+        # Files are parsed in worker processes, outside the profiler
+        raise click.UsageError("--profile cannot be combined with --workers > 1; "
+                               "profile with --workers 1")
+
     if dry_run:
         console.print("[yellow]⚠️  DRY RUN MODE - No data will be imported[/yellow]")
 
     # Find matching files
     directory_path = Path(directory)
-    files = list(directory_path.glob(pattern))
+    files = sorted(directory_path.glob(pattern))
 
     if not files:
         console.print(f"[yellow]No files found matching pattern '{pattern}' in {directory}[/yellow]")
@@ -115,7 +131,11 @@ def import_directory(ctx, directory, pattern, auto_process, dry_run):
     console.print(f"\n[bold]Found {len(files)} files to import[/bold]")
 
     # Initialize pipeline
-    pipeline = IngestionPipeline(org_id=org_id)
+    pipeline = _create_pipeline(ctx)
+
+    if workers > 1:
+        _import_directory_parallel(pipeline, files, auto_process, dry_run, workers)
+        return
 
     results = []
     for file_path in files:
@@ -174,11 +194,16 @@ def retry(ctx, batch_id):
     org_id = ctx.obj['org_id']
 
     try:
-        pipeline = IngestionPipeline(org_id=org_id)
-        result = pipeline.retry_failed_import(batch_id)
+        # Resuming needs the batch checkpoint and committed row hashes
+        from app.db import get_connection
+
+        with get_connection() as db_connection:
+            pipeline = IngestionPipeline(org_id=org_id, database_connection=db_connection)
+            result = pipeline.retry_failed_import(batch_id)
 
         if result['success']:
             console.print(f"[green]✅ Successfully retried batch {batch_id}[/green]")
+            _display_import_results(result, 'table')
         else:
             console.print(f"[red]❌ Failed to retry batch {batch_id}: {result.get('message')}[/red]")
 
@@ -207,10 +232,62 @@ def validate(ctx, file_path):
         console.print(f"[red]❌ Validation failed: {str(e)}[/red]")
         sys.exit(1)
 
-def _dry_run_import(pipeline, file_path):
-    """Perform a dry run import without saving to database"""
+def _create_pipeline(ctx):
+    """Create an ingestion pipeline using the global CLI options"""
+    return IngestionPipeline(
+        org_id=ctx.obj['org_id'],
+        profile=ctx.obj.get('profile'),
+        profile_dir=ctx.obj.get('profile_dir', 'logs/profiles')
+    )
+
+def _import_directory_parallel(pipeline, files, auto_process, dry_run, workers):
+    """Parse files in a process pool and write them in order through one writer"""
+
+    importer = ParallelImporter(pipeline, workers=workers)
+    console.print(f"[bold]Parsing with {importer.workers} worker processes[/bold]")
+
+    def run():
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TimeElapsedColumn(),
+            console=console
+        ) as progress:
+            task = progress.add_task("Importing files...", total=len(files))
+
+            def on_file_done(result):
+                status = "[green]✅[/green]" if result['success'] else "[red]❌[/red]"
+                progress.console.print(
+                    f"{status} {Path(result['file_path']).name}: "
+                    f"{result['successful_imports']}/{result['total_transactions']} imported"
+                )
+                progress.advance(task)
+
+            return importer.import_files(
+                files, auto_process=auto_process and not dry_run, on_file_done=on_file_done
+            )
+
+    if dry_run:
+        with _dry_run_patches(pipeline):
+            outcome = run()
+    else:
+        outcome = run()
+
+    results = outcome['results']
+    for result in results:
+        result['file_name'] = Path(result['file_path']).name
+        if dry_run:
+            result['dry_run'] = True
+
+    _display_batch_results(results, dry_run)
+    _display_throughput(outcome['throughput'])
+
+@contextmanager
+def _dry_run_patches(pipeline):
+    """Mock the pipeline's database writes for a dry run"""
 
-    # Mock the database operations
     original_save_transaction = pipeline._save_transaction
     original_save_duplicate_flags = pipeline._save_duplicate_flags
 
@@ -218,14 +295,20 @@ def _dry_run_import(pipeline, file_path):
     pipeline._save_duplicate_flags = lambda flags: True  # Mock success
 
     try:
-        result = pipeline.ingest_file(file_path, auto_process=False)
-        result['dry_run'] = True
-        return result
+        yield pipeline
     finally:
         # Restore original methods
         pipeline._save_transaction = original_save_transaction
         pipeline._save_duplicate_flags = original_save_duplicate_flags
 
+def _dry_run_import(pipeline, file_path):
+    """Perform a dry run import without saving to database"""
+
+    with _dry_run_patches(pipeline):
+        result = pipeline.ingest_file(file_path, auto_process=False)
+        result['dry_run'] = True
+        return result
+
 def _validate_file_only(pipeline, file_path):
     """Validate file and parse transactions without processing"""
 
@@ -294,6 +377,12 @@ def _display_import_results(result, output_format, dry_run=False):
     if result.get('duplicate_report') and result['duplicate_report']['total_duplicates'] > 0:
         _display_duplicate_report(result['duplicate_report'])
 
+    if result.get('timings'):
+        _display_stage_timings(result['timings'])
+
+    if result.get('profile_path'):
+        console.print(f"\n[bold]Profile saved to:[/bold] {result['profile_path']}")
+
 def _display_batch_results(results, dry_run=False):
     """Display results from batch import"""
 
@@ -339,6 +428,24 @@ def _display_batch_results(results, dry_run=False):
 
         console.print(detail_table)
 
+def _display_throughput(throughput):
+    """Display the throughput report of a parallel import"""
+
+    console.print("\n[bold cyan]Throughput[/bold cyan]")
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", style="green", justify="right")
+
+    table.add_row("Workers", str(throughput['workers']))
+    table.add_row("Elapsed", f"{throughput['elapsed_seconds']:.2f}s")
+    table.add_row("Files / second", f"{throughput['files_per_second']:.2f}")
+    table.add_row("Transactions / second", f"{throughput['transactions_per_second']:.1f}")
+    table.add_row("Parse time (all workers)", f"{throughput['prepare_seconds']:.2f}s")
+    table.add_row("Parallel speedup", f"{throughput['parallel_speedup']:.2f}x")
+
+    console.print(table)
+
 def _display_import_history(history_records):
     """Display import history"""
 
@@ -389,6 +496,28 @@ def _display_duplicate_report(duplicate_report):
 
     console.print(dup_table)
 
+def _display_stage_timings(timings):
+    """Display per-stage pipeline timings"""
+
+    console.print(f"\n[bold cyan]Stage Timings[/bold cyan] ({timings['total_seconds']:.2f}s total)")
+
+    timing_table = Table(show_header=True, header_style="bold magenta")
+    timing_table.add_column("Stage", style="cyan")
+    timing_table.add_column("Seconds", justify="right", style="green")
+    timing_table.add_column("Rows In", justify="right")
+    timing_table.add_column("Rows Out", justify="right")
+
+    for stage in timings['stages']:
+        name = f"{stage['name']} (failed)" if stage.get('failed') else stage['name']
+        timing_table.add_row(
+            name,
+            f"{stage['seconds']:.3f}",
+            '' if stage.get('rows_in') is None else str(stage['rows_in']),
+            '' if stage.get('rows_out') is None else str(stage['rows_out'])
+        )
+
+    console.print(timing_table)
+
 def _display_validation_results(result):
     """Display validation results"""
 
@@ -8,7 +8,7 @@ Usage:
 Features:
     - Interactive filtering and search
     - Summary statistics
-    - Pagination
+    - Keyset pagination with cached and prefetched pages
     - Export capabilities
     - Rich terminal formatting
 """
@@ -22,6 +22,9 @@ import subprocess
 import socket
 import shutil
 import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
 from pathlib import Path
 from datetime import datetime, date
 from typing import List, Dict, Any, Optional, Tuple
@@ -504,9 +507,48 @@ class DatabaseManager:
             border_style="magenta",
         )
 
+class PageCache:
+    """Small LRU cache for transaction pages and summary statistics"""
+
+    def __init__(self, capacity: int = 32):
+        self.capacity = capacity
+        self._items: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[Any]:
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def __contains__(self, key: Any) -> bool:
+        with self._lock:
+            return key in self._items
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+
 class TransactionViewer:
     """Enhanced transaction data viewer with CLI interface"""
 
+    # Whitelisted sort columns; every page is ordered by (column, id) so the
+    # last row of a page is a unique seek key for the next one
+    SORT_COLUMNS = ('transaction_date', 'amount', 'description', 'transaction_type')
+
     def __init__(self, org_id: int = 1):
         self.org_id = org_id
         self.page_size = 20
@@ -517,182 +559,255 @@ class TransactionViewer:
         self.console = Console()
         self.db_manager = DatabaseManager(self.console)
 
-    def get_transactions(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
-        """Get transactions with current filters and pagination"""
+        # Pages and stats are cached per view (filters + sort + page size) and
+        # per data version, so flipping back and forth never re-queries MySQL
+        self.page_cache = PageCache(capacity=64)
+        self.stats_cache = PageCache(capacity=16)
+        # Seek key (sort value, id) of the last row of each page, per view
+        self._page_keys: Dict[Tuple, Dict[int, Tuple[Any, int]]] = {}
+        self._data_version: Optional[Tuple] = None
+        self._prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="page-prefetch")
+        self._prefetching: Dict[Tuple, Future] = {}
+
+    def _build_where_clause(self, filters: Optional[Dict[str, Any]] = None) -> Tuple[str, List[Any]]:
+        """Build the WHERE clause and parameters for the given (or current) filters"""
+        filters = self.filters if filters is None else filters
+        where_conditions = ["org_id = %s"]
+        params = [self.org_id]
+
+        if filters.get('start_date'):
+            where_conditions.append("transaction_date >= %s")
+            params.append(filters['start_date'])
+
+        if filters.get('end_date'):
+            where_conditions.append("transaction_date <= %s")
+            params.append(filters['end_date'])
+
+        if filters.get('transaction_type'):
+            where_conditions.append("transaction_type = %s")
+            params.append(filters['transaction_type'])
+
+        if filters.get('min_amount'):
+            where_conditions.append("amount >= %s")
+            params.append(filters['min_amount'])
+
+        if filters.get('max_amount'):
+            where_conditions.append("amount <= %s")
+            params.append(filters['max_amount'])
+
+        if filters.get('search'):
+            where_conditions.append("description LIKE %s")
+            params.append(f"%{filters['search']}%")
+
+        if filters.get('account_number'):
+            where_conditions.append("account_number = %s")
+            params.append(filters['account_number'])
+
+        return " AND ".join(where_conditions), params
+
+    def _order_clause(self, sort_by: str, sort_order: str) -> str:
+        if sort_by not in self.SORT_COLUMNS:
+            raise ValueError(f"Unsupported sort column: {sort_by}")
+        order = 'ASC' if sort_order == 'ASC' else 'DESC'
+        return f"ORDER BY {sort_by} {order}, id {order}"
+
+    def _view_key(self) -> Tuple:
+        """Identify the current filtered/sorted view for caching"""
+        filters = tuple(sorted((k, v) for k, v in self.filters.items() if v))
+        return (self.org_id, filters, self.sort_by, self.sort_order, self.page_size)
+
+    def _query_transactions(self, limit: Optional[int] = None, offset: int = 0,
+                            after: Optional[Tuple[Any, int]] = None,
+                            view_key: Optional[Tuple] = None) -> List[Dict[str, Any]]:
+        """Run the transaction SELECT, seeking past ``after`` when given
+
+        ``view_key`` pins the filters and sort order so a background prefetch
+        is not affected by menu changes made while it runs.
+        """
+        _, filters, sort_by, sort_order, _ = view_key or self._view_key()
+        where_clause, params = self._build_where_clause(dict(filters))
+
+        if after is not None:
+            # Keyset seek: rows strictly after (sort value, id) in this order
+            op = '>' if sort_order == 'ASC' else '<'
+            where_clause += (f" AND ({sort_by} {op} %s"
+                             f" OR ({sort_by} = %s AND id {op} %s))")
+            params.extend([after[0], after[0], after[1]])
+
+        limit_clause = ""
+        if limit:
+            limit_clause = f"LIMIT {int(limit)}"
+            if offset > 0:
+                limit_clause += f" OFFSET {int(offset)}"
+
+        query = f"""
+        SELECT id, transaction_date, amount, description, transaction_type,
+               account_number, bank_reference, balance_after, import_batch_id,
+               created_at
+        FROM transactions
+        WHERE {where_clause}
+        {self._order_clause(sort_by, sort_order)}
+        {limit_clause}
+        """
+
         with get_connection() as conn:
             cursor = conn.cursor()
-
-            # Build WHERE clause
-            where_conditions = ["org_id = %s"]
-            params = [self.org_id]
-
-            if self.filters.get('start_date'):
-                where_conditions.append("transaction_date >= %s")
-                params.append(self.filters['start_date'])
-
-            if self.filters.get('end_date'):
-                where_conditions.append("transaction_date <= %s")
-                params.append(self.filters['end_date'])
-
-            if self.filters.get('transaction_type'):
-                where_conditions.append("transaction_type = %s")
-                params.append(self.filters['transaction_type'])
-
-            if self.filters.get('min_amount'):
-                where_conditions.append("amount >= %s")
-                params.append(self.filters['min_amount'])
-
-            if self.filters.get('max_amount'):
-                where_conditions.append("amount <= %s")
-                params.append(self.filters['max_amount'])
-
-            if self.filters.get('search'):
-                where_conditions.append("description LIKE %s")
-                params.append(f"%{self.filters['search']}%")
-
-            if self.filters.get('account_number'):
-                where_conditions.append("account_number = %s")
-                params.append(self.filters['account_number'])
-
-            where_clause = " AND ".join(where_conditions)
-
-            # Build ORDER BY clause
-            order_clause = f"ORDER BY {self.sort_by} {self.sort_order}"
-
-            # Build LIMIT clause
-            limit_clause = ""
-            if limit:
-                limit_clause = f"LIMIT {limit}"
-                if offset > 0:
-                    limit_clause += f" OFFSET {offset}"
-
-            query = f"""
-            SELECT id, transaction_date, amount, description, transaction_type,
-                   account_number, bank_reference, balance_after, import_batch_id,
-                   created_at
-            FROM transactions
-            WHERE {where_clause}
-            {order_clause}
-            {limit_clause}
-            """
-
             cursor.execute(query, params)
             columns = [desc[0] for desc in cursor.description]
-
             return [dict(zip(columns, row)) for row in cursor.fetchall()]
 
-    def get_transaction_count(self) -> int:
-        """Get total count of transactions matching current filters"""
+    def get_transactions(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """Get transactions with current filters and pagination"""
+        return self._query_transactions(limit=limit, offset=offset)
+
+    def get_data_version(self) -> Tuple:
+        """Cheap fingerprint of the organization's transactions
+
+        Row count and highest id change when rows are imported or deleted;
+        the newest ``updated_at`` (maintained by MySQL ON UPDATE) changes when
+        existing rows are edited, e.g. by a category migration or hash
+        backfill. Any change invalidates cached pages and summary statistics.
+        ``updated_at`` has one-second resolution, so a second edit within
+        the same second as the newest previous one is only seen with the
+        next change.
+        """
         with get_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute(
+                "SELECT COUNT(*), MAX(id), MAX(updated_at) FROM transactions WHERE org_id = %s",
+                (self.org_id,)
+            )
+            return tuple(cursor.fetchone())
 
-            where_conditions = ["org_id = %s"]
-            params = [self.org_id]
-
-            if self.filters.get('start_date'):
-                where_conditions.append("transaction_date >= %s")
-                params.append(self.filters['start_date'])
+    def refresh_data_version(self) -> bool:
+        """Re-check the data version, dropping caches if it changed
 
-            if self.filters.get('end_date'):
-                where_conditions.append("transaction_date <= %s")
-                params.append(self.filters['end_date'])
+        Returns:
+            True when the data changed since the last check
+        """
+        version = self.get_data_version()
+        if version == self._data_version:
+            return False
+        self._data_version = version
+        self.invalidate_cache()
+        return True
 
-            if self.filters.get('transaction_type'):
-                where_conditions.append("transaction_type = %s")
-                params.append(self.filters['transaction_type'])
+    def invalidate_cache(self):
+        """Forget every cached page, seek key and summary"""
+        self.page_cache.clear()
+        self.stats_cache.clear()
+        self._page_keys.clear()
+        self._prefetching.clear()
+
+    def _fetch_page(self, view_key: Tuple, page: int) -> List[Dict[str, Any]]:
+        """Fetch one page, by keyset seek when the previous page's last key is known"""
+        _, _, sort_by, _, page_size = view_key
+        keys = self._page_keys.setdefault(view_key, {})
+        after = keys.get(page - 1) if page > 1 else None
+
+        if page == 1 or after is not None:
+            rows = self._query_transactions(limit=page_size, after=after, view_key=view_key)
+        else:
+            # Jumped to a page we have never seen: one OFFSET query, then
+            # seek from here on
+            rows = self._query_transactions(limit=page_size, offset=(page - 1) * page_size,
+                                            view_key=view_key)
+
+        if rows:
+            last = rows[-1]
+            keys[page] = (last[sort_by], last['id'])
+        return rows
+
+    def get_page(self, page: int) -> List[Dict[str, Any]]:
+        """Get a page of transactions for the current view, using the page cache"""
+        view_key = self._view_key()
+        cache_key = (view_key, self._data_version, page)
+
+        rows = self.page_cache.get(cache_key)
+        if rows is not None:
+            return rows
+
+        pending = self._prefetching.pop(cache_key, None)
+        if pending is not None:
+            try:
+                rows = pending.result()
+            except Exception:
+                rows = None
 
-            if self.filters.get('min_amount'):
-                where_conditions.append("amount >= %s")
-                params.append(self.filters['min_amount'])
+        if rows is None:
+            rows = self._fetch_page(view_key, page)
 
-            if self.filters.get('max_amount'):
-                where_conditions.append("amount <= %s")
-                params.append(self.filters['max_amount'])
+        self.page_cache.put(cache_key, rows)
+        return rows
 
-            if self.filters.get('search'):
-                where_conditions.append("description LIKE %s")
-                params.append(f"%{self.filters['search']}%")
+    def prefetch_page(self, page: int):
+        """Load a page in the background so the next keypress is served from cache"""
+        view_key = self._view_key()
+        cache_key = (view_key, self._data_version, page)
+        if cache_key in self.page_cache or cache_key in self._prefetching:
+            return
 
-            if self.filters.get('account_number'):
-                where_conditions.append("account_number = %s")
-                params.append(self.filters['account_number'])
+        def load() -> List[Dict[str, Any]]:
+            rows = self._fetch_page(view_key, page)
+            self.page_cache.put(cache_key, rows)
+            return rows
 
-            where_clause = " AND ".join(where_conditions)
+        self._prefetching[cache_key] = self._prefetcher.submit(load)
 
-            query = f"SELECT COUNT(*) FROM transactions WHERE {where_clause}"
-            cursor.execute(query, params)
-            return cursor.fetchone()[0]
+    def get_transaction_count(self) -> int:
+        """Get total count of transactions matching current filters"""
+        return self.get_summary_stats()['total_count']
 
     def get_summary_stats(self) -> Dict[str, Any]:
         """Get summary statistics for current filtered data"""
-        with get_connection() as conn:
-            cursor = conn.cursor()
-
-            where_conditions = ["org_id = %s"]
-            params = [self.org_id]
-
-            if self.filters.get('start_date'):
-                where_conditions.append("transaction_date >= %s")
-                params.append(self.filters['start_date'])
-
-            if self.filters.get('end_date'):
-                where_conditions.append("transaction_date <= %s")
-                params.append(self.filters['end_date'])
-
-            if self.filters.get('transaction_type'):
-                where_conditions.append("transaction_type = %s")
-                params.append(self.filters['transaction_type'])
-
-            if self.filters.get('min_amount'):
-                where_conditions.append("amount >= %s")
-                params.append(self.filters['min_amount'])
-
-            if self.filters.get('max_amount'):
-                where_conditions.append("amount <= %s")
-                params.append(self.filters['max_amount'])
-
-            if self.filters.get('search'):
-                where_conditions.append("description LIKE %s")
-                params.append(f"%{self.filters['search']}%")
+        cache_key = (self._view_key()[:2], self._data_version)
+        stats = self.stats_cache.get(cache_key)
+        if stats is not None:
+            return stats
 
-            if self.filters.get('account_number'):
-                where_conditions.append("account_number = %s")
-                params.append(self.filters['account_number'])
+        where_clause, params = self._build_where_clause()
 
-            where_clause = " AND ".join(where_conditions)
+        with get_connection() as conn:
+            cursor = conn.cursor()
 
-            # Get overall stats
+            # Overall stats and the per-type breakdown in a single pass
             query = f"""
-            SELECT
-                COUNT(*) as total_count,
-                SUM(amount) as total_amount,
-                AVG(amount) as avg_amount,
-                MIN(amount) as min_amount,
-                MAX(amount) as max_amount,
-                MIN(transaction_date) as earliest_date,
-                MAX(transaction_date) as latest_date
-            FROM transactions
-            WHERE {where_clause}
-            """
-
-            cursor.execute(query, params)
-            stats = dict(zip([desc[0] for desc in cursor.description], cursor.fetchone()))
-
-            # Get breakdown by type
-            type_query = f"""
-            SELECT transaction_type, COUNT(*) as count, SUM(amount) as total
+            SELECT transaction_type, COUNT(*) as count, SUM(amount) as total,
+                   MIN(amount) as min_amount, MAX(amount) as max_amount,
+                   MIN(transaction_date) as earliest_date,
+                   MAX(transaction_date) as latest_date
             FROM transactions
             WHERE {where_clause}
             GROUP BY transaction_type
             """
 
-            cursor.execute(type_query, params)
-            type_breakdown = {}
-            for row in cursor.fetchall():
-                type_breakdown[row[0]] = {'count': row[1], 'total': float(row[2]) if row[2] else 0}
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+
+        total_count = sum(row[1] for row in rows)
+        amounts = [row[2] for row in rows if row[2] is not None]
+        total_amount = sum(amounts) if amounts else None
+
+        def _extreme(index, fn):
+            values = [row[index] for row in rows if row[index] is not None]
+            return fn(values) if values else None
+
+        stats = {
+            'total_count': total_count,
+            'total_amount': total_amount,
+            'avg_amount': total_amount / total_count if total_count and total_amount is not None else None,
+            'min_amount': _extreme(3, min),
+            'max_amount': _extreme(4, max),
+            'earliest_date': _extreme(5, min),
+            'latest_date': _extreme(6, max),
+            'type_breakdown': {
+                row[0]: {'count': row[1], 'total': float(row[2]) if row[2] else 0}
+                for row in rows
+            },
+        }
 
-            stats['type_breakdown'] = type_breakdown
-            return stats
+        self.stats_cache.put(cache_key, stats)
+        return stats
 
     def print_header(self):
         """Print application header with Rich formatting"""
@@ -767,6 +882,8 @@ class TransactionViewer:
                 return True
 
         success, message = action["fn"]()
+        # Demo data, schema rebuilds and resets all change what is on screen
+        self.invalidate_cache()
         icon = "✅" if success else "❌"
         style = "green" if success else "red"
         self.console.print(f"\n{icon} {message}", style=style)
@@ -1143,13 +1260,18 @@ class TransactionViewer:
             self.export_transactions('json')
 
     def reset_all(self):
-        """Reset filters, sorting, and pagination"""
+        """Reset filters, sorting, pagination and cached pages"""
         self.filters.clear()
         self.current_page = 1
         self.sort_by = 'transaction_date'
         self.sort_order = 'DESC'
+        self.invalidate_cache()
         print("✅ Reset to default view")
 
+    def close(self):
+        """Stop the background prefetch thread"""
+        self._prefetcher.shutdown(wait=False, cancel_futures=True)
+
     def run_interactive(self):
         """Run interactive dashboard with system management controls"""
         while True:
@@ -1176,8 +1298,11 @@ class TransactionViewer:
                     continue
 
                 try:
-                    total_count = self.get_transaction_count()
+                    # One cheap fingerprint query per redraw; stats, counts
+                    # and pages are only recomputed when the data changed
+                    self.refresh_data_version()
                     stats = self.get_summary_stats()
+                    total_count = stats['total_count']
                 except MySQLError as db_error:
                     self.print_database_error(db_error)
                     choice = input("\nEnter your choice ([1-5]/q or Enter to retry): ").strip().lower()
@@ -1210,7 +1335,12 @@ class TransactionViewer:
                     continue
 
                 offset = (self.current_page - 1) * self.page_size
-                transactions = self.get_transactions(limit=self.page_size, offset=offset)
+                transactions = self.get_page(self.current_page)
+
+                total_pages = (total_count + self.page_size - 1) // self.page_size
+                if self.current_page < total_pages:
+                    # Load the next page while the user reads this one
+                    self.prefetch_page(self.current_page + 1)
 
                 self.print_transactions(transactions, offset)
                 self.print_pagination_info(total_count, status=status)
@@ -1222,7 +1352,6 @@ class TransactionViewer:
                 if choice == 'q':
                     break
                 elif choice == 'n':
-                    total_pages = (total_count + self.page_size - 1) // self.page_size
                     if self.current_page < total_pages:
                         self.current_page += 1
                 elif choice == 'p':
@@ -1273,7 +1402,10 @@ def main():
         return
 
     # Interactive mode
-    viewer.run_interactive()
+    try:
+        viewer.run_interactive()
+    finally:
+        viewer.close()
 
 if __name__ == "__main__":
     main()
@@ -10,6 +10,9 @@ import os
 from ingestion.validators import TransactionValidator, FileValidator, ValidationError
 from ingestion.processors import TransactionProcessor, ImportBatchProcessor
 from ingestion.pipeline import IngestionPipeline
+from ingestion.instrumentation import StageTimer
+from ingestion.checkpoints import compute_row_hash, compute_row_hashes
+from ingestion.parallel import ParallelImporter
 
 
 class TestTransactionValidator:
@@ -399,6 +402,201 @@ class TestIngestionPipeline:
         assert pipeline._transactions_match(tx1, tx2) == True
         assert pipeline._transactions_match(tx1, tx3) == False
 
+    @patch('os.path.exists')
+    def test_ingest_file_returns_stage_timings(self, mock_exists):
+        """Test that stage timings are returned even when ingestion stops early"""
+        pipeline = IngestionPipeline(org_id=1)
+        mock_exists.return_value = False
+
+        result = pipeline.ingest_file('nonexistent.csv')
+
+        assert result['timings'] is not None
+        assert [stage['name'] for stage in result['timings']['stages']] == ['validate_file']
+
+
+class TestResumableImport:
+    """Test row hashing and checkpointed imports"""
+
+    def _transactions(self, count):
+        return [
+            {
+                'org_id': 1,
+                'transaction_date': f'2024-01-{day:02d}',
+                'amount': -10.0 * day,
+                'description': f'Purchase {day}',
+                'transaction_type': 'DEBIT'
+            }
+            for day in range(1, count + 1)
+        ]
+
+    def test_row_hash_is_deterministic_and_normalized(self):
+        """Test that formatting differences do not change the row hash"""
+        tx1 = {'transaction_date': '2024-01-01', 'amount': -45.6, 'description': 'OFFICE  Depot'}
+        tx2 = {'transaction_date': '2024-01-01', 'amount': '-45.60', 'description': ' office depot '}
+        tx3 = {'transaction_date': '2024-01-02', 'amount': -45.6, 'description': 'OFFICE Depot'}
+
+        assert compute_row_hash(tx1, 1) == compute_row_hash(tx2, 1)
+        assert compute_row_hash(tx1, 1) != compute_row_hash(tx3, 1)
+        assert compute_row_hash(tx1, 1) != compute_row_hash(tx1, 2)
+
+    def test_identical_rows_in_a_file_get_distinct_hashes(self):
+        """Test that repeated rows are numbered by their position in the file"""
+        coffee = {'transaction_date': '2024-01-01', 'amount': -5.0, 'description': 'Coffee'}
+        rent = {'transaction_date': '2024-01-01', 'amount': -900.0, 'description': 'Rent'}
+
+        hashes = compute_row_hashes([coffee, rent, dict(coffee)], 1)
+
+        assert hashes[0] == compute_row_hash(coffee, 1)
+        assert hashes[2] == compute_row_hash(coffee, 1, occurrence=1)
+        assert len(set(hashes)) == 3
+        assert compute_row_hashes([coffee, rent, dict(coffee)], 1) == hashes
+
+    def test_row_committed_since_lookup_counts_as_already_imported(self):
+        """Test that an upsert hitting an existing row is not counted as imported"""
+        cursor = MagicMock(lastrowid=55, rowcount=0)
+        connection = Mock()
+        connection.cursor.return_value.__enter__ = Mock(return_value=cursor)
+        connection.cursor.return_value.__exit__ = Mock(return_value=False)
+
+        pipeline = IngestionPipeline(org_id=1, database_connection=connection, chunk_size=10)
+        pipeline._has_column = Mock(return_value=True)
+        pipeline._find_committed_row_hashes = Mock(return_value=set())
+        pipeline._save_checkpoint = Mock()
+
+        transactions = self._transactions(1)
+        transactions[0]['org_id'] = 1
+        result = pipeline._import_transactions(transactions, [], False, {'id': 9})
+
+        assert result['already_imported'] == 1
+        assert result['successful_imports'] == 0
+        assert 'already_imported' not in transactions[0]
+
+    def test_import_resumes_from_checkpoint(self):
+        """Test that rows before the checkpoint are not imported again"""
+        pipeline = IngestionPipeline(org_id=1, database_connection=Mock(), chunk_size=2)
+        pipeline._find_committed_row_hashes = Mock(return_value=set())
+        pipeline._save_checkpoint = Mock()
+        pipeline._save_transaction = Mock(side_effect=[101, 102])
+
+        batch = {'id': 7, 'checkpoint_row': 2, 'successful_imports': 2, 'failed_imports': 0}
+        result = pipeline._import_transactions(self._transactions(4), [], False, batch)
+
+        saved = [call.args[0]['description'] for call in pipeline._save_transaction.call_args_list]
+        assert saved == ['Purchase 3', 'Purchase 4']
+        assert result['successful_imports'] == 4
+        assert result['resumed_from_row'] == 2
+        pipeline._save_checkpoint.assert_called_once()
+
+    def test_committed_rows_are_skipped(self):
+        """Test that re-running a file skips rows whose hash is already stored"""
+        transactions = self._transactions(3)
+        committed = {compute_row_hash(transactions[0], 1)}
+
+        pipeline = IngestionPipeline(org_id=1, database_connection=Mock(), chunk_size=10)
+        pipeline._find_committed_row_hashes = Mock(return_value=committed)
+        pipeline._save_checkpoint = Mock()
+        pipeline._save_transaction = Mock(side_effect=[201, 202])
+
+        result = pipeline._import_transactions(transactions, [], False, {'id': 8})
+
+        assert result['already_imported'] == 1
+        assert result['successful_imports'] == 2
+        assert pipeline._save_transaction.call_count == 2
+
+    def test_retry_requires_database(self):
+        """Test retry without a database connection"""
+        pipeline = IngestionPipeline(org_id=1)
+
+        result = pipeline.retry_failed_import(5)
+
+        assert result['success'] == False
+
+
+class TestParallelImport:
+    """Test parallel directory import"""
+
+    def _write_statement(self, directory, name, description):
+        path = directory / name
+        path.write_text(
+            "Date,Description,Amount\n"
+            f"2024-01-05,{description} one,-12.50\n"
+            f"2024-01-06,{description} two,-40.00\n"
+        )
+        return path
+
+    def test_prepared_files_are_written_in_file_order(self, tmp_path):
+        """Test that files parsed in parallel are written in the given order"""
+        files = [
+            self._write_statement(tmp_path, f"statement_{i}.csv", f"Store {i}")
+            for i in range(3)
+        ]
+        pipeline = IngestionPipeline(org_id=1, database_connection=Mock())
+        pipeline._get_existing_transactions = Mock(return_value=[])
+        written = []
+
+        def import_transactions(transactions, duplicate_flags, auto_process, import_batch):
+            written.append(transactions[0]['description'])
+            return {'successful_imports': len(transactions), 'failed_imports': 0,
+                    'skipped_duplicates': 0, 'already_imported': 0}
+
+        pipeline._import_transactions = import_transactions
+
+        outcome = ParallelImporter(pipeline, workers=2).import_files(files)
+
+        assert written == ['Store 0 one', 'Store 1 one', 'Store 2 one']
+        assert [r['file_path'] for r in outcome['results']] == [str(f) for f in files]
+        assert all(r['success'] for r in outcome['results'])
+        assert outcome['throughput']['files'] == 3
+        assert outcome['throughput']['successful_imports'] == 6
+
+    def test_profiling_requires_a_single_worker(self):
+        """Test that a profiled pipeline is not silently run in parallel"""
+        pipeline = IngestionPipeline(org_id=1, profile='cprofile')
+
+        with pytest.raises(ValueError):
+            ParallelImporter(pipeline, workers=2)
+        assert ParallelImporter(pipeline, workers=1).workers == 1
+
+    def test_prepare_file_does_not_need_database(self, tmp_path):
+        """Test that preparing a file stops before any database stage"""
+        path = self._write_statement(tmp_path, "statement.csv", "Store")
+        pipeline = IngestionPipeline(org_id=1)
+
+        prepared = pipeline.prepare_file(str(path))
+
+        assert prepared['file_format'] == 'CSV'
+        assert len(prepared['transactions']) == 2
+        stages = [stage['name'] for stage in prepared['result']['timings']['stages']]
+        assert stages == ['validate_file', 'parse', 'validate', 'process']
+
+
+class TestStageTimer:
+    """Test pipeline stage timing"""
+
+    def test_stage_records_duration_and_rows(self):
+        """Test that each stage records its duration and row counters"""
+        timer = StageTimer()
+
+        with timer.stage('validate', rows_in=10) as stage:
+            stage.rows_out = 8
+
+        timings = timer.to_dict()
+        assert timings['stages'][0]['name'] == 'validate'
+        assert timings['stages'][0]['rows_in'] == 10
+        assert timings['stages'][0]['rows_out'] == 8
+        assert timings['stages'][0]['seconds'] >= 0
+        assert timings['total_seconds'] >= timings['stages'][0]['seconds']
+
+    def test_failed_stage_is_recorded(self):
+        """Test that a stage raising an exception is still recorded"""
+        timer = StageTimer()
+
+        with pytest.raises(ValueError):
+            with timer.stage('parse'):
+                raise ValueError("boom")
+
+        assert timer.stages[0].failed is True
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
\ No newline at end of file
@@ -0,0 +1,71 @@
+from pdf_extractor.docling_extractor import DoclingPDFExtractor
+from pdf_extractor.table_classifier import TableClassifier
+
+
+def test_summary_tables_are_skipped():
+    classifier = TableClassifier()
+    result = classifier.classify([
+        ["Daily Balance Summary", "Amount"],
+        ["04/24", "74,260.12"],
+    ])
+
+    assert result.kind == "summary"
+    assert not result.is_transaction_table
+
+
+def test_continuation_table_reuses_sign_hint_and_roles():
+    classifier = TableClassifier()
+    first = classifier.classify([
+        ["Withdrawals / Debits.Date", "Withdrawals / Debits.Amount", "Description"],
+        ["04/24", "200.00", "ATM WITHDRAWAL"],
+    ])
+    continuation = classifier.classify([
+        ["Date", "Description", "Amount"],
+        ["04/25", "DEBIT CARD PURCHASE", "33.82"],
+    ])
+
+    assert first.sign_hint == -1
+    assert (first.roles.date, first.roles.amount, first.roles.description) == (0, 1, 2)
+    assert continuation.is_continuation
+    assert continuation.sign_hint == -1
+    assert (continuation.roles.date, continuation.roles.amount, continuation.roles.description) == (0, 2, 1)
+
+
+def test_balance_column_is_not_part_of_description():
+    extractor = DoclingPDFExtractor(org_id=1)
+    tables = [[
+        [
+            ["Date", "Description", "Amount", "Balance"],
+            ["05/02", "TRANSFER FROM SAVINGS", "100.00", "1,200.00"],
+        ]
+    ]]
+
+    txns = extractor._parse_transactions_from_tables(tables, None, None)
+
+    assert [t["amount"] for t in txns] == [100.0]
+    assert [t["description"] for t in txns] == ["TRANSFER FROM SAVINGS"]
+
+
+def test_page_timings_are_recorded():
+    extractor = DoclingPDFExtractor(org_id=1)
+    tables = [
+        [[["Deposits / Credits.Date", "Deposits / Credits.Amount", "Description"], ["05/02", "100.00", "DEPOSIT"]]],
+        [[["Date", "Amount", "Description"], ["05/03", "25.00", "DEPOSIT"]]],
+    ]
+
+    extractor._parse_transactions_from_tables(tables, None, None)
+
+    assert [t["page"] for t in extractor.last_page_timings] == [1, 2]
+    assert [t["transactions"] for t in extractor.last_page_timings] == [1, 1]
+
+
+def test_page_timings_use_document_page_numbers():
+    extractor = DoclingPDFExtractor(org_id=1)
+    tables = [
+        [[["Date", "Amount", "Description"], ["05/02", "100.00", "DEPOSIT"]]],
+        [[["Date", "Amount", "Description"], ["05/03", "25.00", "DEPOSIT"]]],
+    ]
+
+    extractor._parse_transactions_from_tables(tables, None, None, page_numbers=[2, 5])
+
+    assert [t["page"] for t in extractor.last_page_timings] == [2, 5]
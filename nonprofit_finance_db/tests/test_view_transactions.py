@@ -0,0 +1,85 @@
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from view_transactions import TransactionViewer
+
+
+def _rows(start, count):
+    return [
+        {'id': i, 'transaction_date': f"2025-01-{i:02d}", 'amount': i, 'description': f"TX {i}"}
+        for i in range(start, start + count)
+    ]
+
+
+def test_pages_are_keyset_seeked_and_cached():
+    viewer = TransactionViewer(org_id=1)
+    viewer.page_size = 2
+
+    with patch.object(viewer, '_query_transactions', side_effect=[_rows(10, 2), _rows(12, 2)]) as query:
+        viewer.get_page(1)
+        viewer.get_page(2)
+        viewer.get_page(1)
+
+    assert query.call_count == 2
+    assert query.call_args_list[0].kwargs['after'] is None
+    assert query.call_args_list[1].kwargs['after'] == ("2025-01-11", 11)
+    viewer.close()
+
+
+def test_prefetched_page_is_served_without_a_new_query():
+    viewer = TransactionViewer(org_id=1)
+    viewer.page_size = 2
+
+    with patch.object(viewer, '_query_transactions', side_effect=[_rows(1, 2), _rows(3, 2)]) as query:
+        viewer.get_page(1)
+        viewer.prefetch_page(2)
+        rows = viewer.get_page(2)
+
+    assert [r['id'] for r in rows] == [3, 4]
+    assert query.call_count == 2
+    viewer.close()
+
+
+def test_summary_stats_are_cached_until_data_changes():
+    viewer = TransactionViewer(org_id=1)
+
+    with patch.object(viewer, 'get_data_version', side_effect=[(5, 5), (5, 5), (6, 6)]), \
+         patch('view_transactions.get_connection') as get_conn:
+        cursor = get_conn.return_value.__enter__.return_value.cursor.return_value
+        cursor.fetchall.return_value = [('CREDIT', 5, 100, 10, 30, '2025-01-01', '2025-01-05')]
+
+        viewer.refresh_data_version()
+        stats = viewer.get_summary_stats()
+        assert not viewer.refresh_data_version()
+        assert viewer.get_summary_stats() is stats
+        assert cursor.execute.call_count == 1
+
+        assert viewer.refresh_data_version()
+        viewer.get_summary_stats()
+        assert cursor.execute.call_count == 2
+
+    assert stats['total_count'] == 5
+    assert stats['avg_amount'] == 20
+    viewer.close()
+
+
+def test_data_version_changes_when_rows_are_edited():
+    viewer = TransactionViewer(org_id=1)
+
+    with patch('view_transactions.get_connection') as get_conn:
+        cursor = get_conn.return_value.__enter__.return_value.cursor.return_value
+        cursor.fetchone.side_effect = [
+            (5, 5, '2025-01-05 10:00:00'),
+            (5, 5, '2025-01-05 10:00:00'),
+            (5, 5, '2025-02-01 09:30:00'),   # An UPDATE: same rows, newer updated_at
+        ]
+
+        assert viewer.refresh_data_version()
+        assert not viewer.refresh_data_version()
+        assert viewer.refresh_data_version()
+
+    assert "MAX(updated_at)" in cursor.execute.call_args.args[0]
+    viewer.close()
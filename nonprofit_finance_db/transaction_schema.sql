@@ -8,14 +8,17 @@ CREATE TABLE IF NOT EXISTS import_batches (
     id BIGINT UNSIGNED PRIMARY KEY AUTO_INCREMENT,
     org_id BIGINT UNSIGNED NOT NULL,
     filename VARCHAR(255) NOT NULL,
+    source_path VARCHAR(1024) NULL,
     file_format ENUM('CSV', 'PDF', 'OFX') NOT NULL,
     import_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     total_transactions INT NOT NULL DEFAULT 0,
     successful_imports INT NOT NULL DEFAULT 0,
     failed_imports INT NOT NULL DEFAULT 0,
     duplicate_count INT NOT NULL DEFAULT 0,
+    checkpoint_row INT NOT NULL DEFAULT 0,
     status ENUM('PENDING', 'PROCESSING', 'COMPLETED', 'FAILED') NOT NULL DEFAULT 'PENDING',
     error_log TEXT NULL,
+    stage_timings JSON NULL,
     created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
 
     INDEX idx_import_batches_org (org_id),
@@ -38,6 +41,7 @@ CREATE TABLE IF NOT EXISTS transactions (
     category_id BIGINT UNSIGNED NULL,
     import_batch_id BIGINT UNSIGNED NULL,
     raw_data JSON NULL,
+    row_hash CHAR(64) NULL,
     created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
 
@@ -47,6 +51,9 @@ CREATE TABLE IF NOT EXISTS transactions (
     INDEX idx_transactions_account (account_number),
     INDEX idx_transactions_batch (import_batch_id),
     INDEX idx_transactions_category (category_id),
+    INDEX idx_transactions_org_date_id (org_id, transaction_date, id),
+    INDEX idx_transactions_org_amount_id (org_id, amount, id),
+    UNIQUE KEY uq_transactions_row_hash (org_id, row_hash),
     FOREIGN KEY (org_id) REFERENCES organizations(id) ON DELETE CASCADE,
     FOREIGN KEY (import_batch_id) REFERENCES import_batches(id) ON DELETE SET NULL,
     FOREIGN KEY (category_id) REFERENCES categories(id) ON DELETE SET NULL
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Chunking throughput and quality on large markdown files.
+
+Concatenates the repository's markdown files (repeated up to a target size
+per document) and chunks them with the previous fixed-size character
+chunker and with TokenChunker. For each it reports characters per second,
+the number of chunks, the mean tokens per chunk and the share of chunks
+longer than the model's window, i.e. text the embedding model would
+silently drop. Token counts come from the model's own tokenizer when
+transformers is installed, else from whitespace-separated words.
+
+Usage:
+    python rag_system/benchmarks/chunker_benchmark.py [--size-kb 512] [--repeat 3]
+        [--model sentence-transformers/all-MiniLM-L6-v2] [--max-tokens 254]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from rag_system.core.chunker import TokenChunker
+from rag_system.utils.text_processing import clean_text_keep_lines
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _legacy_chunk(text: str, chunk_size: int = 500, overlap: int = 50) -> list:
+    """RAGEngine._chunk_text before token-aware chunking"""
+    if len(text) <= chunk_size:
+        return [text]
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + chunk_size
+        chunk = text[start:end]
+        if end < len(text):
+            last_space = chunk.rfind(' ')
+            if last_space > chunk_size * 0.7:
+                chunk = chunk[:last_space]
+                end = start + last_space
+        chunks.append(chunk.strip())
+        start = end - overlap
+    return chunks
+
+
+def _load_tokenizer(model: str):
+    try:
+        from transformers import AutoTokenizer
+        return AutoTokenizer.from_pretrained(model)
+    except Exception as e:
+        print(f"Tokenizer unavailable ({e}); counting words instead", file=sys.stderr)
+        return None
+
+
+def _documents(size_kb: int) -> list:
+    texts = [path.read_text(encoding="utf-8", errors="ignore")
+             for path in sorted(ROOT.glob("**/*.md"))
+             if ".git" not in path.parts and "node_modules" not in path.parts]
+    corpus = clean_text_keep_lines("\n\n".join(texts))
+    if not corpus:
+        raise SystemExit("No markdown files found")
+    target = size_kb * 1024
+    document = (corpus + "\n\n") * (target // len(corpus) + 1)
+    return [document[:target]]
+
+
+def _measure(name: str, chunk_fn, documents: list, chunker: TokenChunker,
+             max_tokens: int, repeat: int) -> dict:
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        chunks = [chunk for document in documents for chunk in chunk_fn(document)]
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    lengths = [len(chunker.token_offsets(chunk)[0]) for chunk in chunks]
+    chars = sum(len(document) for document in documents)
+    return {
+        "chunker": name,
+        "chars": chars,
+        "seconds": round(best, 4),
+        "chars_per_second": round(chars / best) if best else 0,
+        "chunks": len(chunks),
+        "mean_tokens": round(sum(lengths) / len(lengths), 1) if lengths else 0.0,
+        "over_limit_share": round(sum(1 for n in lengths if n > max_tokens) / len(lengths), 4) if lengths else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark character vs token-aware chunking")
+    parser.add_argument("--size-kb", type=int, default=512, help="Size of each document in KiB (default: 512)")
+    parser.add_argument("--documents", type=int, default=4, help="Documents to chunk (default: 4)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs, best is reported (default: 3)")
+    parser.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2",
+                        help="Tokenizer to count tokens with")
+    parser.add_argument("--max-tokens", type=int, default=254, help="Token budget per chunk (default: 254)")
+    args = parser.parse_args()
+
+    tokenizer = _load_tokenizer(args.model)
+    chunker = TokenChunker(tokenizer, max_tokens=args.max_tokens)
+    documents = _documents(args.size_kb) * args.documents
+
+    reports = [
+        _measure("legacy_chars", _legacy_chunk, documents, chunker, args.max_tokens, args.repeat),
+        _measure("token", chunker.chunk, documents, chunker, args.max_tokens, args.repeat),
+    ]
+    for report in reports:
+        report["tokenizer"] = args.model if tokenizer is not None else "words"
+    print(json.dumps(reports, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Cold-start time of each cli.py command.
+
+Runs every command as a fresh ``python cli.py ...`` process in a scratch
+directory (the CLI keeps its store in ``./storage/chromadb``) and reports
+the wall time from spawn to exit. Commands that only read stats or print
+static tables should not pay for importing torch or loading the embedding
+model; commands that embed still do.
+
+The embedding model should already be in the local Hugging Face cache,
+otherwise the first command that embeds also pays for the download.
+
+Usage:
+    python rag_system/benchmarks/cli_startup_benchmark.py [--runs 3]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+CLI = ROOT / "cli.py"
+
+COMMANDS = [
+    ["--help"],
+    ["types"],
+    ["status"],
+    ["init"],
+    ["note", "Benchmark note body", "Benchmark note"],
+    ["search", "benchmark"],
+    ["recent", "--limit", "5"],
+    ["search-artifacts", "benchmark"],
+]
+
+
+def _run(args, cwd: str) -> float:
+    env = dict(os.environ, PYTHONPATH=str(ROOT) + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    started = time.perf_counter()
+    subprocess.run([sys.executable, str(CLI), *args], cwd=cwd, env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cli.py cold start per command")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per command (default: 3)")
+    args = parser.parse_args()
+
+    report = []
+    with tempfile.TemporaryDirectory() as cwd:
+        # Create the store and one document so reads have something to find
+        _run(["note", "Seed note", "Seed"], cwd)
+        for command in COMMANDS:
+            samples = [_run(command, cwd) for _ in range(args.runs)]
+            report.append({
+                "command": " ".join(command),
+                "min_s": round(min(samples), 3),
+                "median_s": round(statistics.median(samples), 3),
+            })
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Burst of concurrent ChromaDBMemory.remember calls, with and without
+micro-batched embeddings.
+
+Each run starts from a fresh store, issues N concurrent ``remember`` calls
+(each goes through ``asyncio.to_thread(add_runtime_artifact)`` and embeds
+one or two chunks) and reports the wall time of the burst, remembers per
+second and, when batching is on, the embedding scheduler's metrics. The
+embedding cache is disabled so every chunk is actually encoded.
+
+Usage:
+    python rag_system/benchmarks/embedding_batch_benchmark.py [--remembers 100]
+        [--windows 0 0.002 0.005 0.01]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from a2a_communicating_agents.agent_messaging.chromadb_memory import ChromaDBMemory
+from rag_system.core.document_manager import DocumentManager
+from rag_system.core.rag_engine import RAGEngine
+
+
+async def _burst(window: float, remembers: int) -> dict:
+    with tempfile.TemporaryDirectory() as storage:
+        engine = RAGEngine(storage_path=storage, cache_capacity=0, batch_window=window)
+        # Load the model and open the store before timing
+        engine.embed(["warm up"])
+        engine.collection.count()
+
+        memory = ChromaDBMemory(doc_manager=DocumentManager(rag_engine=engine))
+        await memory.connect()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            memory.remember(f"Error {i}: connection reset while syncing batch {i % 7}",
+                            memory_type="error", source="benchmark")
+            for i in range(remembers)
+        ))
+        elapsed = time.perf_counter() - started
+
+        report = {
+            "batch_window_s": window,
+            "remembers": remembers,
+            "seconds": round(elapsed, 3),
+            "remembers_per_second": round(remembers / elapsed, 1),
+        }
+        if engine.scheduler:
+            report["scheduler"] = engine.scheduler.metrics()
+            engine.scheduler.close()
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark micro-batched embeddings under a remember burst")
+    parser.add_argument("--remembers", type=int, default=100, help="Concurrent remember calls (default: 100)")
+    parser.add_argument("--windows", type=float, nargs="+", default=[0, 0.002, 0.005, 0.01],
+                        help="Batch windows in seconds, 0 = no batching (default: 0 0.002 0.005 0.01)")
+    args = parser.parse_args()
+
+    reports = [asyncio.run(_burst(window, args.remembers)) for window in args.windows]
+    print(json.dumps(reports, indent=2))
+
+
+if __name__ == "__main__":
+    main()
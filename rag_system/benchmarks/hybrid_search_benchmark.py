@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Latency and recall of vector, lexical and hybrid queries on the project's
+own documents.
+
+By default the repository's markdown files are ingested into a fresh
+store; ``--storage`` instead copies an existing Chroma store (for example
+./storage/chromadb with its runtime artifacts and messages) to a temporary
+directory, so the keyword index is built on the copy.
+
+Known-item queries are sampled from the store's chunks:
+
+* identifier: one rare identifier-like token from the chunk (an error
+  code, file path, snake_case name or ``to:agent`` tag)
+* phrase: eight consecutive words from the middle of the chunk
+
+A query is a hit when its source document is among the top k results.
+The report gives recall@k and p50/p95 latency per query kind and mode.
+
+Usage:
+    python rag_system/benchmarks/hybrid_search_benchmark.py [--queries 200] [--k 5]
+        [--storage ./storage/chromadb]
+"""
+
+import argparse
+import json
+import random
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from rag_system.core.bulk_ingest import BulkIngester
+from rag_system.core.rag_engine import RAGEngine, QUERY_MODES
+
+ROOT = Path(__file__).resolve().parents[2]
+IDENTIFIER = re.compile(r'[A-Za-z][\w.:/-]*(?:_|::|/|:|\.py\b|\d)[\w.:/-]*')
+
+
+def _identifiers(text: str, metadata: dict) -> list:
+    tags = (metadata.get("tags") or "").replace(",", " ")
+    return [token.rstrip(".:/-") for token in IDENTIFIER.findall(f"{text} {tags}")]
+
+
+def _sample_queries(engine: RAGEngine, count: int, seed: int) -> list:
+    page = engine.collection.get(include=["documents", "metadatas"], limit=max(count * 20, 2000))
+    chunks = list(zip(page["documents"], page["metadatas"]))
+    document_frequency = Counter()
+    for text, metadata in chunks:
+        document_frequency.update(set(_identifiers(text, metadata)))
+
+    rng = random.Random(seed)
+    rng.shuffle(chunks)
+    queries = []
+    for text, metadata in chunks:
+        identifiers = [token for token in _identifiers(text, metadata)
+                       if document_frequency[token] <= 3 and len(token) > 4]
+        if identifiers:
+            queries.append({"kind": "identifier", "text": rng.choice(identifiers),
+                            "document_id": metadata["document_id"]})
+        words = text.split()
+        if len(words) >= 16:
+            start = rng.randrange(4, len(words) - 8)
+            queries.append({"kind": "phrase", "text": " ".join(words[start:start + 8]),
+                            "document_id": metadata["document_id"]})
+        if len(queries) >= count:
+            break
+    return queries
+
+
+def _run(engine: RAGEngine, queries: list, k: int) -> list:
+    reports = []
+    for kind in sorted({query["kind"] for query in queries}):
+        selected = [query for query in queries if query["kind"] == kind]
+        for mode in QUERY_MODES:
+            latencies, hits = [], 0
+            for query in selected:
+                started = time.perf_counter()
+                results = engine.query(query["text"], n_results=k, apply_artifact_boosting=False, mode=mode)
+                latencies.append(time.perf_counter() - started)
+                hits += any(result.document_id == query["document_id"] for result in results)
+            latencies.sort()
+            reports.append({
+                "kind": kind,
+                "mode": mode,
+                "queries": len(selected),
+                f"recall_at_{k}": round(hits / len(selected), 3),
+                "p50_ms": round(statistics.median(latencies) * 1000, 2),
+                "p95_ms": round(latencies[max(0, int(len(latencies) * 0.95) - 1)] * 1000, 2),
+            })
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vector, lexical and hybrid retrieval")
+    parser.add_argument("--queries", type=int, default=200, help="Queries to sample (default: 200)")
+    parser.add_argument("--k", type=int, default=5, help="Results per query (default: 5)")
+    parser.add_argument("--storage", help="Existing Chroma store to copy and query instead of the repo's markdown")
+    parser.add_argument("--seed", type=int, default=7, help="Sampling seed (default: 7)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as storage:
+        if args.storage:
+            shutil.copytree(args.storage, storage, dirs_exist_ok=True)
+        engine = RAGEngine(storage_path=storage, batch_window=0)
+        if not args.storage:
+            BulkIngester(engine).ingest_dir(str(ROOT), patterns=("*.md",))
+
+        # Build the keyword index and load the model before timing
+        engine.lexical_index
+        engine.embed(["warm up"])
+
+        queries = _sample_queries(engine, args.queries, args.seed)
+        if not queries:
+            raise SystemExit("No chunks to sample queries from")
+        print(json.dumps(_run(engine, queries, args.k), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Ingest throughput and memory of RAGEngine.
+
+Adds N synthetic documents to a fresh Chroma store and reports chunks per
+second together with the process's resident memory after the engine is
+created and after ingesting, plus the peak.
+
+Two modes are compared, each in its own subprocess so memory figures do
+not leak between them:
+
+* engine: ``RAGEngine.add_document``, which embeds chunks in batches with
+  the engine's SentenceTransformer and passes ``embeddings=`` to Chroma
+* legacy: the previous path, where the engine's model was loaded but
+  chunks went to Chroma as raw ``documents`` and Chroma embedded them with
+  its own default model
+
+Usage:
+    python rag_system/benchmarks/ingest_benchmark.py [--documents 200] [--chars 2000]
+        [--batch-size 64] [--modes engine legacy]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+WORDS = ("invoice", "budget", "deploy", "error", "client", "meeting", "schema", "rollback",
+         "timeout", "release", "contract", "review", "migration", "dashboard", "agent")
+
+
+def _rss_mb() -> dict:
+    """Current and peak resident memory of this process (Linux)."""
+    values = {}
+    with open("/proc/self/status", encoding="utf-8") as status:
+        for line in status:
+            key, _, rest = line.partition(":")
+            if key in ("VmRSS", "VmHWM"):
+                values[key] = round(int(rest.split()[0]) / 1024, 1)
+    return {"rss_mb": values.get("VmRSS"), "peak_mb": values.get("VmHWM")}
+
+
+def _text(i: int, chars: int) -> str:
+    words = []
+    length = 0
+    n = i
+    while length < chars:
+        word = WORDS[n % len(WORDS)]
+        words.append(word)
+        length += len(word) + 1
+        n = n * 7 + 3
+    return f"Document {i}. " + " ".join(words)
+
+
+def _child(mode: str, documents: int, chars: int, batch_size: int) -> dict:
+    from rag_system.core.rag_engine import RAGEngine
+    from rag_system.models.document import Document, DocumentType
+
+    report = {"mode": mode, "before": _rss_mb()}
+    with tempfile.TemporaryDirectory() as storage:
+        engine = RAGEngine(storage_path=storage, batch_size=batch_size)
+        report["after_init"] = _rss_mb()
+
+        chunks = 0
+        started = time.perf_counter()
+        for i in range(documents):
+            document = Document(id=f"doc-{i}", title=f"Doc {i}", content=_text(i, chars),
+                                doc_type=DocumentType.MEETING_NOTES)
+            if mode == "engine":
+                engine.add_document(document)
+                chunks += len(engine._chunk_text(document.content))
+            else:
+                texts = engine._chunk_text(document.content)
+                engine.collection.add(
+                    ids=[f"{document.id}_chunk_{n}" for n in range(len(texts))],
+                    documents=texts,
+                    metadatas=[{"document_id": document.id, "chunk_index": n} for n in range(len(texts))]
+                )
+                chunks += len(texts)
+        elapsed = time.perf_counter() - started
+
+        report["after_ingest"] = _rss_mb()
+        report["chunks"] = chunks
+        report["seconds"] = round(elapsed, 3)
+        report["chunks_per_second"] = round(chunks / elapsed, 1) if elapsed else 0.0
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RAGEngine ingest")
+    parser.add_argument("--documents", type=int, default=200, help="Documents to ingest (default: 200)")
+    parser.add_argument("--chars", type=int, default=2000, help="Characters per document (default: 2000)")
+    parser.add_argument("--batch-size", type=int, default=64, help="Embedding batch size (default: 64)")
+    parser.add_argument("--modes", nargs="+", default=["engine", "legacy"], choices=["engine", "legacy"],
+                        help="Ingest paths to compare (default: engine legacy)")
+    parser.add_argument("--child", choices=["engine", "legacy"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_child(args.child, args.documents, args.chars, args.batch_size)))
+        return
+
+    reports = []
+    for mode in args.modes:
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", mode, "--documents", str(args.documents),
+             "--chars", str(args.chars), "--batch-size", str(args.batch_size)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        reports.append(json.loads(output.strip().splitlines()[-1]))
+    print(json.dumps(reports, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Parallel bulk ingestion of a directory tree
+
+``DocumentManager.add_document_from_file`` reads, chunks, embeds and writes
+one file at a time on one thread. The bulk ingester splits that work:
+
+* worker processes read, hash, parse and chunk files (the CPU-bound,
+  GIL-holding part), each with a copy of the engine's chunker
+* the parent process keeps the single embedding model and collects
+  prepared files until ``write_batch`` chunks are pending, then embeds them
+  in large batches and writes them with ``RAGEngine.add_documents``, which
+  also keeps the recency index and stats counters in step
+* an IngestManifest skips files whose size and mtime, or content hash,
+  are unchanged since they were last ingested, and makes a changed file
+  replace its previous document
+
+The manifest is updated after every write, so an interrupted run resumes
+where it stopped. A changed file is written as a new document and its
+previous document is deleted only once the new one is stored and recorded,
+so a failed embed or write leaves the old version in place.
+"""
+
+import hashlib
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .chunker import TokenChunker
+from .document_manager import document_from_file
+from .ingest_manifest import FileRecord, IngestManifest
+from ..models.document import DocumentType
+
+DEFAULT_PATTERNS = ("*.md", "*.txt", "*.rst")
+SKIP_DIRS = {"node_modules", "__pycache__", "venv"}
+WRITE_BATCH = 2048      # Chunks embedded and written to Chroma together
+IN_FLIGHT_PER_WORKER = 4  # Files queued per worker, bounds prepared-but-unwritten memory
+
+# (path, doc type value, SHA-256 at last ingest)
+Task = Tuple[str, Optional[str], Optional[str]]
+
+_worker_chunker: Optional[TokenChunker] = None
+
+
+def _init_worker(chunker: TokenChunker) -> None:
+    global _worker_chunker
+    # Each worker tokenizes on its own core; nested tokenizer threads only contend
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    _worker_chunker = chunker
+
+
+def _prepare_file(task: Task, chunker: Optional[TokenChunker] = None) -> Dict[str, Any]:
+    """Read, hash, parse and chunk one file (runs in a worker process)."""
+    path_str, doc_type_value, known_sha = task
+    path = Path(path_str)
+    try:
+        stat = path.stat()
+        data = path.read_bytes()
+        result = {
+            "path": path_str,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": hashlib.sha256(data).hexdigest(),
+        }
+        if result["sha256"] == known_sha:
+            result["status"] = "unchanged"
+            return result
+
+        doc_type = DocumentType(doc_type_value) if doc_type_value else None
+        document = document_from_file(path, data.decode("utf-8"), doc_type)
+        chunker = chunker or _worker_chunker
+        chunks = [chunk for chunk in chunker.chunk(document.content, document.doc_type) if chunk.strip()]
+        result.update(status="ready", document=document, chunks=chunks)
+        return result
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        return {"path": path_str, "status": "failed", "error": str(e)}
+
+
+def iter_files(root: str, patterns: Sequence[str] = DEFAULT_PATTERNS) -> Iterator[Path]:
+    """Files under root matching any pattern, skipping hidden and build directories."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith(".") and d not in SKIP_DIRS)
+        for name in sorted(filenames):
+            if any(fnmatch(name, pattern) for pattern in patterns):
+                yield Path(dirpath) / name
+
+
+class BulkIngester:
+    """Ingests directory trees into a RAGEngine"""
+
+    def __init__(self, engine, workers: Optional[int] = None, write_batch: int = WRITE_BATCH,
+                 manifest: Optional[IngestManifest] = None):
+        """
+        Initialize the ingester
+
+        Args:
+            engine: Local RAGEngine to embed with and write to
+            workers: Processes that read and chunk files (None: one per CPU
+                but one, 0: read and chunk in this process)
+            write_batch: Chunks collected before each embed-and-write
+            manifest: File manifest (defaults to one next to the engine's store)
+        """
+        self.engine = engine
+        self.workers = max(1, (os.cpu_count() or 2) - 1) if workers is None else workers
+        self.write_batch = write_batch
+        self.manifest = manifest or IngestManifest(str(Path(engine.storage_path) / "ingest_manifest.sqlite3"))
+
+    def ingest_dir(self, root: str, patterns: Sequence[str] = DEFAULT_PATTERNS,
+                   doc_type: Optional[DocumentType] = None, force: bool = False) -> Dict[str, Any]:
+        """
+        Ingest every matching file under a directory
+
+        Args:
+            root: Directory to walk
+            patterns: Filename glob patterns to include
+            doc_type: Document type for every file (auto-detected if None)
+            force: Re-ingest files even if the manifest says they are unchanged
+
+        Returns:
+            Throughput summary
+        """
+        if not Path(root).is_dir():
+            raise NotADirectoryError(f"Not a directory: {root}")
+
+        started = time.perf_counter()
+        report = {
+            "files_found": 0, "skipped_unchanged": 0, "ingested": 0, "replaced": 0, "empty": 0, "failed": 0,
+            "chunks": 0, "bytes": 0, "batches": 0, "embed_write_seconds": 0.0,
+        }
+        paths = [str(path.resolve()) for path in iter_files(root, patterns)]
+        report["files_found"] = len(paths)
+        known = self.manifest.get_many(paths)
+
+        tasks: List[Task] = []
+        doc_type_value = doc_type.value if doc_type else None
+        for path in paths:
+            record = known.get(path)
+            if record and not force:
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if stat.st_size == record.size and stat.st_mtime_ns == record.mtime_ns:
+                    report["skipped_unchanged"] += 1
+                    continue
+            tasks.append((path, doc_type_value, record.sha256 if record and not force else None))
+
+        pending: List[Dict[str, Any]] = []
+        pending_chunks = 0
+        for result in self._prepare_all(tasks):
+            record = known.get(result["path"])
+            if result["status"] == "failed":
+                report["failed"] += 1
+                print(f"[BulkIngester] Skipping {result['path']}: {result['error']}")
+            elif result["status"] == "unchanged":
+                # Touched but not edited: remember the new mtime so it is not re-read
+                report["skipped_unchanged"] += 1
+                self.manifest.record([FileRecord(result["path"], result["size"], result["mtime_ns"],
+                                                 result["sha256"], record.document_id)])
+            else:
+                if record and record.document_id:
+                    result["replaces"] = record.document_id
+                pending.append(result)
+                pending_chunks += len(result["chunks"])
+                if pending_chunks >= self.write_batch:
+                    self._write(pending, report)
+                    pending, pending_chunks = [], 0
+        if pending:
+            self._write(pending, report)
+
+        elapsed = time.perf_counter() - started
+        report["seconds"] = round(elapsed, 3)
+        report["embed_write_seconds"] = round(report["embed_write_seconds"], 3)
+        report["files_per_second"] = round((report["ingested"] + report["replaced"]) / elapsed, 1) if elapsed else 0.0
+        report["chunks_per_second"] = round(report["chunks"] / elapsed, 1) if elapsed else 0.0
+        report["mb_per_second"] = round(report["bytes"] / elapsed / 1e6, 2) if elapsed else 0.0
+        return report
+
+    def _prepare_all(self, tasks: List[Task]) -> Iterator[Dict[str, Any]]:
+        """Prepared files, as workers finish them."""
+        if not tasks:
+            return
+        # Loads the model's tokenizer; every worker gets a copy
+        chunker = self.engine.chunker
+        if self.workers == 0 or len(tasks) == 1:
+            for task in tasks:
+                yield _prepare_file(task, chunker)
+            return
+
+        # spawn, not fork: the parent holds torch and the embedding threads
+        context = multiprocessing.get_context("spawn")
+        remaining = iter(tasks)
+        in_flight = set()
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                 initializer=_init_worker, initargs=(chunker,)) as executor:
+            def refill():
+                while len(in_flight) < self.workers * IN_FLIGHT_PER_WORKER:
+                    task = next(remaining, None)
+                    if task is None:
+                        return
+                    in_flight.add(executor.submit(_prepare_file, task))
+
+            refill()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                in_flight.difference_update(done)
+                refill()
+                for future in done:
+                    yield future.result()
+
+    def _write(self, prepared: List[Dict[str, Any]], report: Dict[str, Any]) -> None:
+        """Embed and write one batch of prepared files, then record them."""
+        started = time.perf_counter()
+        # A file that chunks to nothing (e.g. an empty one) has no document;
+        # it is recorded without one so it is not read again until it changes
+        written = [item for item in prepared if item["chunks"]]
+        document_ids: List[str] = []
+        if written:
+            document_ids = self.engine.add_documents([item["document"] for item in written],
+                                                     chunks=[item["chunks"] for item in written])
+            if len(document_ids) != len(written):
+                raise RuntimeError(f"add_documents returned {len(document_ids)} ids for {len(written)} documents")
+        report["embed_write_seconds"] += time.perf_counter() - started
+
+        new_ids = iter(document_ids)
+        self.manifest.record([
+            FileRecord(item["path"], item["size"], item["mtime_ns"], item["sha256"],
+                       next(new_ids) if item["chunks"] else "")
+            for item in prepared
+        ])
+
+        # The new versions are stored and recorded; only now drop the old ones
+        for item in prepared:
+            if "replaces" in item and not self.engine.delete_document(item["replaces"]):
+                print(f"[BulkIngester] Could not delete the previous document of {item['path']} "
+                      f"({item['replaces']})")
+
+        if written:
+            report["batches"] += 1
+        for item in prepared:
+            if not item["chunks"]:
+                report["empty"] += 1
+            else:
+                report["replaced" if "replaces" in item else "ingested"] += 1
+            report["chunks"] += len(item["chunks"])
+            report["bytes"] += item["size"]
@@ -0,0 +1,146 @@
+"""
+Token-aware chunking for the RAG engine
+
+The embedding model only sees its first ``max_seq_length`` tokens (256 for
+all-MiniLM-L6-v2) and silently drops the rest, so chunks are measured in
+the model's own tokens. Each document is tokenized once with the fast
+tokenizer's offset mapping; candidate cut points (markdown section starts,
+paragraph breaks, sentence ends, or line breaks for code) are mapped onto
+token positions with one ``searchsorted`` call, and every window is cut at
+the best boundary that keeps it within the token budget: a section start,
+else a sentence (or line) break, else a word start.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..models.document import DocumentType
+from ..utils.text_processing import markdown_section_spans
+
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n\s*\n')
+LINE_BOUNDARY = re.compile(r'\n')
+WORD = re.compile(r'\S+')
+
+
+@dataclass(frozen=True)
+class ChunkProfile:
+    """How documents of one type are chunked"""
+    max_tokens: Optional[int] = None   # None: the model's window
+    overlap_tokens: int = 32           # Carried over when a cut falls inside a section
+    min_fill: float = 0.5              # Boundary cuts must keep at least this share of max_tokens
+    split_lines: bool = False          # Cut on line breaks (code) instead of sentences
+
+
+DEFAULT_PROFILE = ChunkProfile()
+
+CHUNK_PROFILES: Dict[DocumentType, ChunkProfile] = {
+    # Stack traces and logs: short chunks so one error doesn't dilute another
+    DocumentType.RUNTIME_ARTIFACT: ChunkProfile(max_tokens=128, overlap_tokens=16, split_lines=True),
+    DocumentType.CODE_SNIPPET: ChunkProfile(overlap_tokens=16, split_lines=True),
+    DocumentType.CONVERSATION: ChunkProfile(overlap_tokens=48),
+}
+
+
+class TokenChunker:
+    """Cuts text into windows of at most ``max_tokens`` model tokens"""
+
+    def __init__(self, tokenizer=None, max_tokens: int = 254,
+                 profiles: Optional[Dict[DocumentType, ChunkProfile]] = None):
+        """
+        Initialize the chunker
+
+        Args:
+            tokenizer: Hugging Face fast tokenizer (None counts whitespace-separated words)
+            max_tokens: Token budget per chunk when a profile does not set one
+            profiles: Per-document-type settings (defaults to CHUNK_PROFILES)
+        """
+        self.tokenizer = tokenizer
+        self.max_tokens = max_tokens
+        self.profiles = CHUNK_PROFILES if profiles is None else profiles
+
+    def token_offsets(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Start and end character offsets of every token."""
+        if self.tokenizer is not None:
+            try:
+                encoded = self.tokenizer(text, add_special_tokens=False, return_offsets_mapping=True,
+                                         return_attention_mask=False, return_token_type_ids=False)
+                offsets = np.asarray(encoded["offset_mapping"], dtype=np.int64).reshape(-1, 2)
+                return offsets[:, 0], offsets[:, 1]
+            except (NotImplementedError, TypeError, ValueError, KeyError):
+                # Slow tokenizers have no offset mapping; fall back to words
+                pass
+        spans = [match.span() for match in WORD.finditer(text)]
+        offsets = np.asarray(spans, dtype=np.int64).reshape(-1, 2)
+        return offsets[:, 0], offsets[:, 1]
+
+    def chunk(self, text: str, doc_type: Optional[DocumentType] = None) -> List[str]:
+        """
+        Split text into chunks
+
+        Args:
+            text: Text to chunk
+            doc_type: Selects the chunk profile
+
+        Returns:
+            Non-empty chunks in document order (one chunk, possibly empty, for blank text)
+        """
+        profile = self.profiles.get(doc_type, DEFAULT_PROFILE) if doc_type else DEFAULT_PROFILE
+        max_tokens = profile.max_tokens or self.max_tokens
+        overlap = min(profile.overlap_tokens, max_tokens // 2)
+
+        starts, ends = self.token_offsets(text)
+        n = len(starts)
+        if n <= max_tokens:
+            return [text.strip()]
+
+        # Cut points as token indexes: a cut at i ends a chunk before token i
+        boundary = LINE_BOUNDARY if profile.split_lines else SENTENCE_BOUNDARY
+        section_chars = np.asarray([start for _, start, _ in markdown_section_spans(text)[1:]], dtype=np.int64)
+        break_chars = np.asarray([match.end() for match in boundary.finditer(text)], dtype=np.int64)
+        sections = np.unique(np.searchsorted(starts, section_chars))
+        breaks = np.unique(np.searchsorted(starts, break_chars))
+        # Tokens that begin a word (whitespace before them), so hard cuts and
+        # overlaps never split a word into word pieces
+        words = np.flatnonzero(starts[1:] > ends[:-1]) + 1
+
+        min_cut = max(1, int(max_tokens * profile.min_fill))
+        chunks = []
+        start = 0
+        while start < n:
+            limit = start + max_tokens
+            if limit >= n:
+                end, carry = n, 0
+            else:
+                end = self._last_within(sections, start + min_cut, limit)
+                carry = 0   # A new section starts fresh
+                if end is None:
+                    end = self._last_within(breaks, start + min_cut, limit)
+                    carry = overlap
+                if end is None:
+                    end = self._last_within(words, start + 1, limit) or limit
+                    carry = overlap
+
+            chunk = text[starts[start]:ends[end - 1]].strip()
+            if chunk:
+                chunks.append(chunk)
+            if end >= n:
+                break
+            next_start = end
+            if carry:
+                # Back up by the overlap, to the start of a word
+                i = np.searchsorted(words, end - carry)
+                if i < len(words) and words[i] < end:
+                    next_start = int(words[i])
+            start = max(next_start, start + 1)
+        return chunks or [text.strip()]
+
+    @staticmethod
+    def _last_within(cuts: np.ndarray, low: int, high: int) -> Optional[int]:
+        """Largest cut in [low, high], if any."""
+        i = np.searchsorted(cuts, high, side="right") - 1
+        if i >= 0 and cuts[i] >= low:
+            return int(cuts[i])
+        return None
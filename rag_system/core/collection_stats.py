@@ -0,0 +1,138 @@
+"""
+Incrementally maintained collection statistics
+
+``get_stats`` used to load every chunk's metadata to count document types,
+clients and projects. These counters live in a small SQLite file next to
+the Chroma store and are updated by RAGEngine on every add and delete, so
+reading them costs a few indexed rows no matter how large the collection
+is. ``recount`` rebuilds them from the collection page by page when they
+are missing or suspected to have drifted.
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stats_counts (
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    chunks INTEGER NOT NULL,
+    PRIMARY KEY (kind, value)
+);
+CREATE TABLE IF NOT EXISTS stats_meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+RECOUNT_PAGE = 1000  # Chunks read per page when recounting
+
+# Counter kind -> chunk metadata field
+COUNTED_FIELDS = {
+    "doc_type": "doc_type",
+    "client": "client_name",
+    "project": "project_name",
+}
+
+
+class CollectionStats:
+    """Per-value chunk counters for document types, clients and projects"""
+
+    def __init__(self, path: str):
+        """
+        Open or create the counters
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    @property
+    def counted_at(self) -> Optional[str]:
+        """When the counters were last rebuilt from the collection (None if never)"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM stats_meta WHERE key = 'counted_at'").fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _deltas(metadatas: Iterable[Dict[str, Any]], sign: int) -> Dict[tuple, int]:
+        deltas: Dict[tuple, int] = {}
+        for metadata in metadatas:
+            metadata = metadata or {}
+            for kind, field in COUNTED_FIELDS.items():
+                value = metadata.get(field) or ("unknown" if kind == "doc_type" else "")
+                if value:
+                    deltas[(kind, value)] = deltas.get((kind, value), 0) + sign
+        return deltas
+
+    def _apply(self, deltas: Dict[tuple, int]) -> None:
+        if not deltas:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO stats_counts (kind, value, chunks) VALUES (?, ?, ?) "
+                "ON CONFLICT (kind, value) DO UPDATE SET chunks = chunks + excluded.chunks",
+                [(kind, value, delta) for (kind, value), delta in deltas.items()]
+            )
+            self._conn.execute("DELETE FROM stats_counts WHERE chunks <= 0")
+
+    def add(self, metadatas: Iterable[Dict[str, Any]]) -> None:
+        """Count newly added chunks."""
+        self._apply(self._deltas(metadatas, 1))
+
+    def remove(self, metadatas: Iterable[Dict[str, Any]]) -> None:
+        """Uncount deleted chunks."""
+        self._apply(self._deltas(metadatas, -1))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Document-type chunk counts and the number of distinct clients and projects"""
+        with self._lock:
+            rows = self._conn.execute("SELECT kind, value, chunks FROM stats_counts").fetchall()
+        doc_types = {value: chunks for kind, value, chunks in rows if kind == "doc_type"}
+        return {
+            "unique_clients": sum(1 for kind, _, _ in rows if kind == "client"),
+            "unique_projects": sum(1 for kind, _, _ in rows if kind == "project"),
+            "document_types": doc_types,
+        }
+
+    def recount(self, collection, page_size: int = RECOUNT_PAGE) -> int:
+        """
+        Rebuild the counters from a Chroma collection
+
+        Reads metadata page by page, so memory stays bounded.
+
+        Returns:
+            Number of chunks counted
+        """
+        deltas: Dict[tuple, int] = {}
+        counted = 0
+        offset = 0
+        while True:
+            page = collection.get(include=["metadatas"], limit=page_size, offset=offset)
+            ids = page.get("ids") or []
+            if not ids:
+                break
+            offset += len(ids)
+            counted += len(ids)
+            for key, delta in self._deltas(page.get("metadatas") or [], 1).items():
+                deltas[key] = deltas.get(key, 0) + delta
+
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM stats_counts")
+            self._conn.executemany(
+                "INSERT INTO stats_counts (kind, value, chunks) VALUES (?, ?, ?)",
+                [(kind, value, chunks) for (kind, value), chunks in deltas.items()]
+            )
+            self._conn.execute("INSERT OR REPLACE INTO stats_meta (key, value) VALUES ('counted_at', ?)",
+                               (datetime.now().isoformat(),))
+        return counted
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
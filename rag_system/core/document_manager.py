@@ -7,18 +7,103 @@ from pathlib import Path
 from datetime import datetime
 
 from .rag_engine import RAGEngine
+from .rag_service import connect_service
 from ..models.document import Document, DocumentType, QueryResult, ArtifactType
 from ..utils.text_processing import (
-    clean_text, extract_markdown_sections, extract_tags_from_text,
+    clean_text, clean_text_keep_lines, extract_markdown_sections, extract_tags_from_text,
     detect_document_type_from_content, parse_metadata_from_text
 )
 
+# Collection metadata flag set once message artifacts carry first-class fields
+MESSAGE_METADATA_MARKER = "message_metadata_version"
+MESSAGE_METADATA_VERSION = 1
+
+
+def message_fields_from_tags(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Recover a message artifact's recipient, sender, topic and timestamp from its tags."""
+    fields: Dict[str, Any] = {}
+    topic = None
+    for token in (metadata.get("tags") or "").split(","):
+        token = token.strip().lower()
+        if token.startswith("to:"):
+            fields["to_agent"] = token[3:]
+        elif token.startswith("from:"):
+            fields["from_agent"] = token[5:]
+        elif token and ":" not in token and token not in ("message", "file-specific") and topic is None:
+            topic = token
+    fields.setdefault("to_agent", "")
+    fields.setdefault("from_agent", "")
+    fields["topic"] = topic or str(metadata.get("topic") or "general").lower()
+    try:
+        fields["created_ts"] = datetime.fromisoformat(metadata["created_at"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        fields["created_ts"] = 0.0
+    return fields
+
+
+def document_from_file(path: Path, content: str,
+                       doc_type: Optional[DocumentType] = None,
+                       metadata: Optional[Dict[str, Any]] = None) -> Document:
+    """
+    Build the Document for a file's content
+    
+    Shared by DocumentManager.add_document_from_file and the bulk ingester's
+    worker processes.
+    
+    Args:
+        path: File the content was read from
+        content: File content
+        doc_type: Optional document type (will be auto-detected if not provided)
+        metadata: Optional additional metadata
+    """
+    # Auto-detect document type if not provided
+    if not doc_type:
+        detected_type = detect_document_type_from_content(content, path.name)
+        doc_type = DocumentType(detected_type)
+    
+    # Extract metadata from content
+    extracted_metadata = parse_metadata_from_text(content)
+    
+    # Merge metadata
+    final_metadata = {
+        "source_file": str(path),
+        "file_extension": path.suffix,
+        **extracted_metadata,
+        **(metadata or {})
+    }
+    
+    # Extract tags
+    tags = extract_tags_from_text(content)
+    
+    # Create document
+    return Document(
+        title=path.stem,
+        content=clean_text_keep_lines(content),
+        doc_type=doc_type,
+        metadata=final_metadata,
+        tags=tags,
+        client_name=extracted_metadata.get('client'),
+        project_name=extracted_metadata.get('project'),
+        priority=extracted_metadata.get('priority'),
+        status=extracted_metadata.get('status')
+    )
+
+
 class DocumentManager:
     """High-level document management interface"""
     
-    def __init__(self, rag_engine: Optional[RAGEngine] = None):
-        """Initialize with RAG engine"""
-        self.rag_engine = rag_engine or RAGEngine()
+    def __init__(self, rag_engine: Optional[RAGEngine] = None, warm_up: bool = False):
+        """
+        Initialize with RAG engine
+        
+        Args:
+            rag_engine: Engine to use. If None, the local RAG service is used
+                when it is running, else a lazily initialized RAGEngine
+            warm_up: Load the embedding model in the background right away
+        """
+        self.rag_engine = rag_engine or connect_service() or RAGEngine()
+        if warm_up:
+            self.rag_engine.warm_up()
     
     def add_document_from_file(self, file_path: str, 
                                doc_type: Optional[DocumentType] = None,
@@ -40,38 +125,7 @@ class DocumentManager:
         
         # Read file content
         content = path.read_text(encoding='utf-8')
-        
-        # Auto-detect document type if not provided
-        if not doc_type:
-            detected_type = detect_document_type_from_content(content, path.name)
-            doc_type = DocumentType(detected_type)
-        
-        # Extract metadata from content
-        extracted_metadata = parse_metadata_from_text(content)
-        
-        # Merge metadata
-        final_metadata = {
-            "source_file": str(path),
-            "file_extension": path.suffix,
-            **extracted_metadata,
-            **(metadata or {})
-        }
-        
-        # Extract tags
-        tags = extract_tags_from_text(content)
-        
-        # Create document
-        document = Document(
-            title=path.stem,
-            content=clean_text(content),
-            doc_type=doc_type,
-            metadata=final_metadata,
-            tags=tags,
-            client_name=extracted_metadata.get('client'),
-            project_name=extracted_metadata.get('project'),
-            priority=extracted_metadata.get('priority'),
-            status=extracted_metadata.get('status')
-        )
+        document = document_from_file(path, content, doc_type, metadata)
         
         return self.rag_engine.add_document(document)
     
@@ -138,9 +192,9 @@ class DocumentManager:
         
         return self.rag_engine.add_document(document)
     
-    def search_by_context(self, query: str, n_results: int = 5) -> List[QueryResult]:
-        """Search documents by semantic similarity"""
-        return self.rag_engine.query(query_text=query, n_results=n_results)
+    def search_by_context(self, query: str, n_results: int = 5, mode: str = "vector") -> List[QueryResult]:
+        """Search documents by semantic similarity, keywords ("lexical") or both ("hybrid")"""
+        return self.rag_engine.query(query_text=query, n_results=n_results, mode=mode)
     
     def search_by_client(self, client_name: str, n_results: int = 10) -> List[QueryResult]:
         """Get all documents for a specific client"""
@@ -158,21 +212,10 @@ class DocumentManager:
             filter_dict={"project_name": project_name}
         )
     
-    def get_recent_activities(self, n_results: int = 10) -> List[QueryResult]:
-        """Get recent documents/activities"""
-        # For now, just get all and sort by created_at in metadata
-        # ChromaDB doesn't have native date filtering yet
-        results = self.rag_engine.query("", n_results=n_results * 2)
-        
-        # Sort by created_at if available
-        def get_created_at(result):
-            try:
-                return datetime.fromisoformat(result.metadata.get('created_at', '1900-01-01'))
-            except:
-                return datetime(1900, 1, 1)
-        
-        sorted_results = sorted(results, key=get_created_at, reverse=True)
-        return sorted_results[:n_results]
+    def get_recent_activities(self, n_results: int = 10, doc_type: Optional[str] = None,
+                              artifact_type: Optional[str] = None) -> List[QueryResult]:
+        """Get the most recently created documents, optionally of one type"""
+        return self.rag_engine.get_recent(n_results, doc_type=doc_type, artifact_type=artifact_type)
     
     def get_project_status_summary(self, project_name: str) -> Dict[str, Any]:
         """Get a comprehensive status summary for a project"""
@@ -229,7 +272,8 @@ class DocumentManager:
                             source: str,
                             file_path: Optional[str] = None,
                             project_name: Optional[str] = None,
-                            tags: Optional[List[str]] = None) -> str:
+                            tags: Optional[List[str]] = None,
+                            metadata: Optional[Dict[str, Any]] = None) -> str:
         """
         Log runtime artifacts (errors, test failures, CI output, PR decisions)
         Based on Letta's memory pattern for capturing "what actually happened"
@@ -241,6 +285,7 @@ class DocumentManager:
             file_path: Associated file path for code-specific artifacts
             project_name: Optional project association
             tags: Additional tags for categorization
+            metadata: Extra first-class metadata fields (filterable in Chroma)
 
         Returns:
             Document ID
@@ -264,7 +309,8 @@ class DocumentManager:
             artifact_tags.extend(tags)
 
         # Create metadata
-        metadata = {
+        artifact_metadata = {
+            **(metadata or {}),
             "runtime_capture": True,
             "source_system": source,
             "artifact_category": artifact_type
@@ -273,9 +319,9 @@ class DocumentManager:
         # Create document
         document = Document(
             title=title,
-            content=clean_text(artifact_text),
+            content=clean_text_keep_lines(artifact_text),
             doc_type=DocumentType.RUNTIME_ARTIFACT,
-            metadata=metadata,
+            metadata=artifact_metadata,
             tags=list(set(artifact_tags)),  # Remove duplicates
             artifact_type=artifact_type,
             source=source,
@@ -288,7 +334,8 @@ class DocumentManager:
     def search_artifacts(self, query: str,
                         artifact_type: Optional[str] = None,
                         file_path: Optional[str] = None,
-                        n_results: int = 5) -> List[QueryResult]:
+                        n_results: int = 5,
+                        mode: str = "vector") -> List[QueryResult]:
         """
         Search specifically for runtime artifacts with optional filtering
 
@@ -297,6 +344,7 @@ class DocumentManager:
             artifact_type: Filter by artifact type (error, fix, etc.)
             file_path: Filter by associated file
             n_results: Number of results
+            mode: "vector", "lexical" (exact error codes, paths, tags) or "hybrid"
 
         Returns:
             List of QueryResult objects, ranked with time-decay
@@ -333,7 +381,8 @@ class DocumentManager:
             query_text=query,
             n_results=n_results,
             filter_dict=filter_dict,
-            apply_artifact_boosting=True
+            apply_artifact_boosting=True,
+            mode=mode
         )
 
     def log_performance_issue(self, description: str, metric: str,
@@ -413,6 +462,48 @@ class DocumentManager:
             tags=["dependency", package]
         )
 
-    def get_system_stats(self) -> Dict[str, Any]:
-        """Get comprehensive system statistics"""
-        return self.rag_engine.get_stats()
\ No newline at end of file
+    def backfill_message_metadata(self, batch_size: int = 500) -> int:
+        """
+        One-time migration for message artifacts written before ``to_agent``,
+        ``from_agent``, ``topic`` and ``created_ts`` were stored as metadata
+        fields. The values are recovered from the comma-joined tags.
+
+        Returns:
+            Number of chunks updated
+        """
+        collection = self.rag_engine.collection
+        if (collection.metadata or {}).get(MESSAGE_METADATA_MARKER) == MESSAGE_METADATA_VERSION:
+            return 0
+
+        where = {"$and": [{"doc_type": DocumentType.RUNTIME_ARTIFACT.value}, {"artifact_type": "message"}]}
+        updated = 0
+        offset = 0
+        while True:
+            page = collection.get(where=where, include=["metadatas"], limit=batch_size, offset=offset)
+            ids = page.get("ids") or []
+            if not ids:
+                break
+            offset += len(ids)
+
+            changed_ids, changed_metadata = [], []
+            for chunk_id, metadata in zip(ids, page.get("metadatas") or []):
+                metadata = metadata or {}
+                if "created_ts" in metadata and "to_agent" in metadata:
+                    continue
+                changed_ids.append(chunk_id)
+                changed_metadata.append({**metadata, **message_fields_from_tags(metadata)})
+
+            if changed_ids:
+                collection.update(ids=changed_ids, metadatas=changed_metadata)
+                updated += len(changed_ids)
+
+        # Chroma refuses to modify the hnsw:* settings, so only pass the rest back
+        collection_metadata = {key: value for key, value in (collection.metadata or {}).items()
+                               if not key.startswith("hnsw:")}
+        collection_metadata[MESSAGE_METADATA_MARKER] = MESSAGE_METADATA_VERSION
+        collection.modify(metadata=collection_metadata)
+        return updated
+
+    def get_system_stats(self, recount: bool = False) -> Dict[str, Any]:
+        """Get comprehensive system statistics (recount rebuilds the counters first)"""
+        return self.rag_engine.get_stats(recount=recount)
\ No newline at end of file
@@ -0,0 +1,167 @@
+"""
+Persistent embedding cache keyed by model name and chunk hash
+"""
+
+import hashlib
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+EMBED_CACHE_CAPACITY = 50000  # Embeddings kept per model before evicting
+
+
+def chunk_digest(text: str) -> bytes:
+    """SHA-256 digest of a chunk's text"""
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+class EmbeddingCache:
+    """
+    Fixed-capacity embedding store backed by memory-mapped files
+
+    Each model gets its own set of files, so the effective key is
+    (model_name, sha256(chunk_text)):
+
+    - ``<model>.<dim>.f32``: float32 matrix, one embedding per slot
+    - ``<model>.<dim>.keys``: 32-byte chunk digest per slot (zeros when empty)
+    - ``<model>.<dim>.used``: last-use tick per slot, for LRU eviction
+
+    The digest-to-slot index is rebuilt from the keys file on open. Lookups
+    re-check a slot's digest, so another process overwriting a slot only
+    turns a hit into a miss. Writes are serialized across processes with a
+    lock file and reach disk through the shared mapping; the cache is not
+    fsynced, since a lost entry only costs a re-embed.
+    """
+
+    def __init__(self, path: str, model_name: str, dim: int, capacity: int = EMBED_CACHE_CAPACITY):
+        """
+        Open or create the cache
+
+        Args:
+            path: Directory for the cache files
+            model_name: Embedding model the vectors come from
+            dim: Embedding dimension
+            capacity: Maximum number of cached embeddings (must be positive)
+        """
+        if capacity <= 0:
+            raise ValueError("Embedding cache capacity must be positive")
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.model_name = model_name
+        self.dim = dim
+        self.capacity = capacity
+
+        stem = self.path / f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', model_name)}.{dim}"
+        self._lock_path = stem.with_name(stem.name + ".lock")
+        self.vectors = self._open(stem.with_name(stem.name + ".f32"), np.float32, (capacity, dim))
+        self.keys = self._open(stem.with_name(stem.name + ".keys"), np.uint8, (capacity, 32))
+        self.used = self._open(stem.with_name(stem.name + ".used"), np.uint64, (capacity,))
+
+        self._lock = threading.Lock()
+        self._tick = int(self.used.max())
+        self._slots: Dict[bytes, int] = {}
+        for slot in np.flatnonzero(self.keys.any(axis=1)):
+            self._slots[self.keys[slot].tobytes()] = int(slot)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _open(path: Path, dtype, shape) -> np.memmap:
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        if not path.exists() or path.stat().st_size != size:
+            # New cache, or capacity/dimension changed: start empty
+            with open(path, "wb") as f:
+                f.truncate(size)
+        return np.memmap(path, dtype=dtype, mode="r+", shape=shape)
+
+    def get_many(self, digests: Sequence[bytes]) -> List[Optional[np.ndarray]]:
+        """
+        Look up embeddings
+
+        Args:
+            digests: Chunk digests from ``chunk_digest``
+
+        Returns:
+            One embedding (a copy) or None per digest
+        """
+        results: List[Optional[np.ndarray]] = []
+        with self._lock:
+            self._tick += 1
+            for digest in digests:
+                slot = self._slots.get(digest)
+                vector = None
+                if slot is not None and self.keys[slot].tobytes() == digest:
+                    vector = np.array(self.vectors[slot])
+                    if self.keys[slot].tobytes() != digest:
+                        vector = None
+                if vector is None:
+                    if slot is not None:
+                        self._slots.pop(digest, None)
+                    self.misses += 1
+                else:
+                    self.used[slot] = self._tick
+                    self.hits += 1
+                results.append(vector)
+        return results
+
+    def put_many(self, digests: Sequence[bytes], vectors: np.ndarray) -> None:
+        """
+        Store embeddings, evicting the least recently used ones when full
+
+        Args:
+            digests: Chunk digests from ``chunk_digest``
+            vectors: Matching float32 embeddings, shape (len(digests), dim)
+        """
+        new = {}
+        for digest, vector in zip(digests, vectors):
+            if digest not in self._slots:
+                new[digest] = vector
+        new_items = list(new.items())[-self.capacity:]
+        if not new_items:
+            return
+
+        with self._lock, open(self._lock_path, "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self._tick += 1
+                # Oldest (or never used) slots first
+                free = np.argpartition(self.used, len(new_items) - 1)[:len(new_items)]
+                for slot, (digest, vector) in zip(free, new_items):
+                    slot = int(slot)
+                    old = self.keys[slot].tobytes()
+                    if self._slots.get(old) == slot:
+                        del self._slots[old]
+                        self.evictions += 1
+                    # Clear the key first so readers never pair it with a half-written vector
+                    self.keys[slot] = 0
+                    self.vectors[slot] = vector
+                    self.keys[slot] = np.frombuffer(digest, dtype=np.uint8)
+                    self.used[slot] = self._tick
+                    self._slots[digest] = slot
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def stats(self) -> Dict[str, float]:
+        """Hit-rate statistics since the cache was opened"""
+        lookups = self.hits + self.misses
+        return {
+            "model_name": self.model_name,
+            "entries": len(self._slots),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,159 @@
+"""
+Micro-batching scheduler for embedding requests
+
+Agents call ``add_runtime_artifact`` and ``search_artifacts`` from many
+threads at once (``asyncio.to_thread``), and each call embeds only one or
+two chunks. Run directly, those become many tiny forward passes competing
+for the GIL and torch's intra-op threads. The scheduler funnels them through
+one worker thread instead: it waits up to ``max_wait`` seconds, or until
+``max_batch`` texts are queued, runs a single embedding call for everything
+collected, and hands each caller its slice of the result.
+"""
+
+import queue
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+EMBED_BATCH_WINDOW = 0.005   # Seconds to wait for more requests before encoding
+LATENCY_SAMPLES = 1000       # Recent requests kept for latency percentiles
+
+
+class EmbeddingScheduler:
+    """Collects concurrent embedding requests into batched calls"""
+
+    def __init__(self, embed_fn: Callable[[List[str]], List[List[float]]],
+                 max_batch: int = 64, max_wait: float = EMBED_BATCH_WINDOW):
+        """
+        Initialize the scheduler
+
+        Args:
+            embed_fn: Embeds a list of texts, one vector per text
+            max_batch: Texts that trigger a batch without waiting further
+            max_wait: Seconds the first request of a batch waits for company
+        """
+        self.embed_fn = embed_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+
+        self._queue: "queue.Queue[Optional[Tuple[List[str], Future, float]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        self.requests = 0
+        self.texts = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self.encode_seconds = 0.0
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._waits: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts as part of the next batch, blocking until done."""
+        return self.submit(texts).result()
+
+    def submit(self, texts: List[str]) -> Future:
+        """
+        Queue texts for the next batch
+
+        Returns:
+            Future resolving to one vector per text
+        """
+        future: Future = Future()
+        if not texts:
+            future.set_result([])
+            return future
+        self._ensure_worker()
+        self._queue.put((list(texts), future, time.perf_counter()))
+        return future
+
+    def _ensure_worker(self) -> None:
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="embedding-scheduler", daemon=True)
+                    self._thread.start()
+
+    def _collect(self, first: Tuple[List[str], Future, float]) -> Tuple[List[Tuple[List[str], Future, float]], bool]:
+        """Gather requests for one batch; the flag says whether close() was called."""
+        batch = [first]
+        size = len(first[0])
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+            size += len(item[0])
+        return batch, False
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, closing = self._collect(first)
+            self._encode(batch)
+            if closing:
+                return
+
+    def _encode(self, batch: List[Tuple[List[str], Future, float]]) -> None:
+        started = time.perf_counter()
+        texts = [text for request_texts, _, _ in batch for text in request_texts]
+        try:
+            vectors = self.embed_fn(texts)
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        finished = time.perf_counter()
+
+        self.requests += len(batch)
+        self.texts += len(texts)
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, len(texts))
+        self.encode_seconds += finished - started
+
+        offset = 0
+        for request_texts, future, submitted in batch:
+            future.set_result(vectors[offset:offset + len(request_texts)])
+            offset += len(request_texts)
+            self._waits.append(started - submitted)
+            self._latencies.append(finished - submitted)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Throughput and latency since the scheduler was created"""
+
+        def percentiles(samples: Deque[float]) -> Dict[str, float]:
+            if not samples:
+                return {"p50_ms": 0.0, "p99_ms": 0.0}
+            ordered = sorted(samples)
+            return {
+                "p50_ms": round(statistics.median(ordered) * 1000, 3),
+                "p99_ms": round(ordered[max(0, int(len(ordered) * 0.99) - 1)] * 1000, 3),
+            }
+
+        return {
+            "requests": self.requests,
+            "texts": self.texts,
+            "batches": self.batches,
+            "mean_batch_size": round(self.texts / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "texts_per_second": round(self.texts / self.encode_seconds, 1) if self.encode_seconds else 0.0,
+            "queue_wait": percentiles(self._waits),
+            "latency": percentiles(self._latencies),
+        }
+
+    def close(self) -> None:
+        """Finish queued requests and stop the worker."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
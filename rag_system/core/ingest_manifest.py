@@ -0,0 +1,96 @@
+"""
+Manifest of files ingested by the bulk ingester
+
+One row per file with the size, modification time and SHA-256 it had when
+it was ingested, and the document it became. A file whose size and mtime
+are unchanged is skipped without being read; one whose content hash is
+unchanged is skipped without being chunked or embedded; a changed file
+replaces its previous document with a new one. A file that produced no
+chunks is recorded with an empty document id. The SQLite file lives next
+to the Chroma store.
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, NamedTuple, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingested_files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    document_id TEXT NOT NULL,
+    ingested_at TEXT NOT NULL
+);
+"""
+
+
+class FileRecord(NamedTuple):
+    """What a file looked like when it was last ingested"""
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: str
+    document_id: str
+
+
+class IngestManifest:
+    """SQLite table of ingested files"""
+
+    def __init__(self, path: str):
+        """
+        Open or create the manifest
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def get_many(self, paths: Iterable[str]) -> Dict[str, FileRecord]:
+        """Records of the given paths that have been ingested before"""
+        records: Dict[str, FileRecord] = {}
+        paths = list(paths)
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(paths), 500):
+                batch = paths[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT path, size, mtime_ns, sha256, document_id FROM ingested_files "
+                    f"WHERE path IN ({','.join('?' * len(batch))})",
+                    batch
+                ).fetchall()
+                records.update((row[0], FileRecord(*row)) for row in rows)
+        return records
+
+    def get(self, path: str) -> Optional[FileRecord]:
+        return self.get_many([path]).get(path)
+
+    def record(self, records: Iterable[FileRecord]) -> None:
+        """Store records of ingested (or re-checked) files."""
+        now = datetime.now().isoformat()
+        rows = [(*record, now) for record in records]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO ingested_files (path, size, mtime_ns, sha256, document_id, ingested_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM ingested_files").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
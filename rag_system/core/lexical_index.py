@@ -0,0 +1,168 @@
+"""
+BM25 keyword index kept next to the Chroma store
+
+Vector search is poor at exact identifiers such as error codes, file
+paths, agent ids and ``to:agent`` tags: they carry little meaning for the
+embedding model, so nearly matching text outranks the exact match. This
+SQLite FTS5 table indexes every chunk's title, text and tags, and answers
+keyword queries ranked by BM25. RAGEngine keeps it in sync on add and
+delete and fuses its ranking with the vector ranking in hybrid queries.
+
+FTS5's unicode61 tokenizer splits on punctuation (underscores are kept, so
+``ERR_CONN_RESET`` stays one token). Each query word is searched as a
+phrase, so ``to:claude`` or ``src/app.py`` match their tokens in order.
+"""
+
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lexical_chunks (
+    rowid INTEGER PRIMARY KEY,
+    chunk_id TEXT NOT NULL UNIQUE,
+    document_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS lexical_by_document ON lexical_chunks (document_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS lexical_fts USING fts5(
+    title, content, tags,
+    tokenize = "unicode61 tokenchars '_'"
+);
+CREATE TABLE IF NOT EXISTS lexical_meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+REBUILD_PAGE = 1000          # Chunks read per page when rebuilding from Chroma
+COLUMN_WEIGHTS = (2.0, 1.0, 3.0)  # BM25 weights of title, content and tags
+
+QUERY_WORD = re.compile(r'\S+')
+EDGE_PUNCTUATION = '.,;!?()[]{}<>"\'`'
+
+
+def fts_query(text: str) -> Optional[str]:
+    """
+    FTS5 MATCH expression for free text
+
+    Every word becomes a quoted phrase and the phrases are OR-ed, so no
+    query text is ever parsed as FTS5 syntax. Returns None if nothing is
+    searchable.
+    """
+    phrases = []
+    for word in QUERY_WORD.findall(text):
+        word = word.strip(EDGE_PUNCTUATION)
+        if word and any(ch.isalnum() for ch in word):
+            phrases.append('"' + word.replace('"', '""') + '"')
+    return " OR ".join(dict.fromkeys(phrases)) or None
+
+
+class LexicalIndex:
+    """SQLite FTS5 index of chunk text, ranked with BM25"""
+
+    def __init__(self, path: str):
+        """
+        Open or create the index
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    @property
+    def built(self) -> bool:
+        """Whether existing Chroma chunks have been indexed"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM lexical_meta WHERE key = 'built'").fetchone()
+        return row is not None
+
+    def add(self, chunks: Iterable[Tuple[str, str, Dict[str, Any]]]) -> None:
+        """
+        Index chunks, replacing any already indexed under the same id
+
+        Args:
+            chunks: (chunk_id, chunk text, chunk metadata) triples
+        """
+        with self._lock, self._conn:
+            for chunk_id, text, metadata in chunks:
+                metadata = metadata or {}
+                self._delete_rows("SELECT rowid FROM lexical_chunks WHERE chunk_id = ?", (chunk_id,))
+                cursor = self._conn.execute(
+                    "INSERT INTO lexical_chunks (chunk_id, document_id) VALUES (?, ?)",
+                    (chunk_id, metadata.get("document_id") or "")
+                )
+                self._conn.execute(
+                    "INSERT INTO lexical_fts (rowid, title, content, tags) VALUES (?, ?, ?, ?)",
+                    (cursor.lastrowid, metadata.get("title") or "", text or "",
+                     (metadata.get("tags") or "").replace(",", " "))
+                )
+
+    def remove(self, document_id: str) -> None:
+        """Drop every chunk of a document."""
+        with self._lock, self._conn:
+            self._delete_rows("SELECT rowid FROM lexical_chunks WHERE document_id = ?", (document_id,))
+
+    def _delete_rows(self, select: str, params: tuple) -> None:
+        rowids = [(rowid,) for (rowid,) in self._conn.execute(select, params).fetchall()]
+        if rowids:
+            self._conn.executemany("DELETE FROM lexical_fts WHERE rowid = ?", rowids)
+            self._conn.executemany("DELETE FROM lexical_chunks WHERE rowid = ?", rowids)
+
+    def search(self, query_text: str, limit: int) -> List[Tuple[str, float]]:
+        """
+        Chunks matching any query word, best BM25 first
+
+        Args:
+            query_text: Free text; words are matched as exact phrases
+            limit: Number of chunks
+
+        Returns:
+            (chunk_id, BM25 score) pairs; higher scores are better
+        """
+        match = fts_query(query_text)
+        if match is None:
+            return []
+        weights = ", ".join(str(weight) for weight in COLUMN_WEIGHTS)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT c.chunk_id, bm25(lexical_fts, {weights}) AS rank "
+                "FROM lexical_fts JOIN lexical_chunks c ON c.rowid = lexical_fts.rowid "
+                "WHERE lexical_fts MATCH ? ORDER BY rank LIMIT ?",
+                (match, limit)
+            ).fetchall()
+        # SQLite's bm25() is negated so that ascending order is best first
+        return [(chunk_id, -rank) for chunk_id, rank in rows]
+
+    def rebuild(self, collection, page_size: int = REBUILD_PAGE) -> int:
+        """
+        Index every chunk already in a Chroma collection
+
+        Reads chunks page by page, so memory stays bounded.
+
+        Returns:
+            Number of chunks indexed
+        """
+        indexed = 0
+        offset = 0
+        while True:
+            page = collection.get(include=["documents", "metadatas"], limit=page_size, offset=offset)
+            ids = page.get("ids") or []
+            if not ids:
+                break
+            offset += len(ids)
+            self.add(zip(ids, page.get("documents") or [], page.get("metadatas") or []))
+            indexed += len(ids)
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO lexical_meta (key, value) VALUES ('built', ?)",
+                               (datetime.now().isoformat(),))
+        return indexed
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,82 +1,289 @@
 """
 Core RAG engine using ChromaDB and sentence-transformers
+
+chromadb and sentence_transformers (which pulls in torch) are imported
+lazily: the Chroma client is opened on first use of ``collection`` and the
+model is loaded on first embed, so building a RAGEngine is cheap.
 """
 
-import chromadb
-from chromadb.config import Settings
-from chromadb.errors import ChromaError, InternalError
-from sentence_transformers import SentenceTransformer
+import numpy as np
 from typing import List, Dict, Any, Optional
 import uuid
 import os
 import math
+import threading
 from pathlib import Path
 from datetime import datetime
 
+from .embedding_cache import EmbeddingCache, EMBED_CACHE_CAPACITY, chunk_digest
+from .embedding_scheduler import EmbeddingScheduler, EMBED_BATCH_WINDOW
+from .recency_index import RecencyIndex
+from .collection_stats import CollectionStats
+from .chunker import TokenChunker, ChunkProfile
+from .lexical_index import LexicalIndex
 from ..models.document import Document, DocumentChunk, QueryResult, DocumentType
 
+EMBED_BATCH_SIZE = 64  # Chunks per forward pass of the embedding model
+RRF_K = 60             # Reciprocal rank fusion constant: higher flattens the rank curve
+QUERY_MODES = ("vector", "lexical", "hybrid")
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = RRF_K) -> Dict[str, float]:
+    """
+    Fuse rankings by summing 1 / (k + rank) over the lists an id appears in
+    
+    Scores are divided by the best possible sum, so an id ranked first in
+    every list scores 1.0.
+    """
+    fused: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, 1):
+            fused[item_id] = fused.get(item_id, 0.0) + 1.0 / (k + rank)
+    best = len(rankings) / (k + 1) if rankings else 1.0
+    return {item_id: score / best for item_id, score in fused.items()}
+
 class RAGEngine:
     """Main RAG engine for project management memory"""
     
-    def __init__(self, storage_path: str = "./storage/chromadb", model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(self, storage_path: str = "./storage/chromadb", model_name: str = "all-MiniLM-L6-v2",
+                 batch_size: int = EMBED_BATCH_SIZE, cache_capacity: int = EMBED_CACHE_CAPACITY,
+                 batch_window: float = EMBED_BATCH_WINDOW, warm_up: bool = False,
+                 chunk_profiles: Optional[Dict[DocumentType, ChunkProfile]] = None):
         """
         Initialize the RAG engine
         
         Args:
             storage_path: Path to store ChromaDB data
             model_name: Sentence transformer model name
+            batch_size: Chunks encoded per batch by the embedding model
+            cache_capacity: Embeddings kept in the on-disk cache (0 disables it)
+            batch_window: Seconds concurrent embed calls wait to be batched
+                together (0 embeds each call directly)
+            warm_up: Open Chroma and load the model in a background thread now
+            chunk_profiles: Per-document-type chunking (defaults to chunker.CHUNK_PROFILES)
         """
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.cache_capacity = cache_capacity
+        self.chunk_profiles = chunk_profiles
+        
+        # Concurrent embed() calls from different threads share forward passes
+        self.scheduler: Optional[EmbeddingScheduler] = None
+        if batch_window > 0:
+            self.scheduler = EmbeddingScheduler(self._embed_now, max_batch=batch_size, max_wait=batch_window)
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
         
-        # Initialize ChromaDB client
-        self.client = chromadb.PersistentClient(
-            path=str(self.storage_path),
-            settings=Settings(allow_reset=True)
-        )
+        self._client = None
+        self._collection = None
+        self._embedding_model = None
+        self._embedding_cache = None
+        self._collection_lock = threading.Lock()
+        self._model_lock = threading.Lock()
+        self._warm_up_thread: Optional[threading.Thread] = None
+        self._recency_index: Optional[RecencyIndex] = None
+        self._recency_lock = threading.Lock()
+        self._collection_stats: Optional[CollectionStats] = None
+        self._stats_lock = threading.Lock()
+        self._lexical_index: Optional[LexicalIndex] = None
+        self._lexical_lock = threading.Lock()
+        self._chunker: Optional[TokenChunker] = None
         
-        # Initialize embedding model
-        self.embedding_model = SentenceTransformer(model_name)
+        if warm_up:
+            self.warm_up()
+    
+    @property
+    def client(self):
+        """ChromaDB client, opened on first use"""
+        self._open_collection()
+        return self._client
+    
+    @property
+    def collection(self):
+        """ChromaDB collection, opened on first use"""
+        return self._collection or self._open_collection()
+    
+    def _open_collection(self):
+        with self._collection_lock:
+            if self._collection is None:
+                import chromadb
+                from chromadb.config import Settings
+                
+                # Initialize ChromaDB client
+                self._client = chromadb.PersistentClient(
+                    path=str(self.storage_path),
+                    settings=Settings(allow_reset=True)
+                )
+                
+                # Create or get collection
+                self._collection = self._client.get_or_create_collection(
+                    name="project_memory",
+                    metadata={"description": "Project management documents and context"}
+                )
+            return self._collection
+    
+    @property
+    def recency_index(self) -> RecencyIndex:
+        """Time-ordered document index, built from the collection on first use"""
+        if self._recency_index is None:
+            with self._recency_lock:
+                if self._recency_index is None:
+                    index = RecencyIndex(str(self.storage_path / "recency_index.sqlite3"))
+                    if not index.built:
+                        indexed = index.rebuild(self.collection)
+                        print(f"[RAGEngine] Indexed {indexed} existing documents by creation time")
+                    self._recency_index = index
+        return self._recency_index
+    
+    @property
+    def collection_stats(self) -> CollectionStats:
+        """Incremental stats counters, counted from the collection on first use"""
+        if self._collection_stats is None:
+            with self._stats_lock:
+                if self._collection_stats is None:
+                    stats = CollectionStats(str(self.storage_path / "collection_stats.sqlite3"))
+                    if stats.counted_at is None:
+                        stats.recount(self.collection)
+                    self._collection_stats = stats
+        return self._collection_stats
+    
+    @property
+    def lexical_index(self) -> LexicalIndex:
+        """BM25 keyword index of chunk text, built from the collection on first use"""
+        if self._lexical_index is None:
+            with self._lexical_lock:
+                if self._lexical_index is None:
+                    index = LexicalIndex(str(self.storage_path / "lexical_index.sqlite3"))
+                    if not index.built:
+                        indexed = index.rebuild(self.collection)
+                        print(f"[RAGEngine] Indexed {indexed} existing chunks for keyword search")
+                    self._lexical_index = index
+        return self._lexical_index
+    
+    @property
+    def embedding_model(self):
+        """SentenceTransformer model, loaded on first embed"""
+        return self._embedding_model or self._load_model()
+    
+    @property
+    def embedding_cache(self) -> Optional[EmbeddingCache]:
+        """Embedding cache, opened together with the model"""
+        if self._embedding_model is None:
+            self._load_model()
+        return self._embedding_cache
+    
+    @property
+    def chunker(self) -> TokenChunker:
+        """Chunker measuring chunks in the embedding model's tokens"""
+        if self._chunker is None:
+            model = self.embedding_model
+            # Leave room for the [CLS] and [SEP] tokens the model adds
+            max_tokens = (model.max_seq_length or 256) - 2
+            self._chunker = TokenChunker(getattr(model, "tokenizer", None), max_tokens=max_tokens,
+                                         profiles=self.chunk_profiles)
+        return self._chunker
+    
+    @property
+    def model_loaded(self) -> bool:
+        return self._embedding_model is not None
+    
+    def _load_model(self):
+        with self._model_lock:
+            if self._embedding_model is None:
+                from sentence_transformers import SentenceTransformer
+                
+                # Every add and query passes embeddings from this model, so
+                # Chroma never loads its own default one.
+                model = SentenceTransformer(self.model_name)
+                
+                # Embeddings of previously seen chunks, so re-ingesting skips inference
+                if self.cache_capacity > 0:
+                    self._embedding_cache = EmbeddingCache(
+                        str(self.storage_path / "embedding_cache"),
+                        self.model_name,
+                        model.get_sentence_embedding_dimension(),
+                        capacity=self.cache_capacity
+                    )
+                self._embedding_model = model
+            return self._embedding_model
+    
+    def warm_up(self) -> threading.Thread:
+        """
+        Open Chroma and load the model in a background daemon thread
         
-        # Create or get collection
-        self.collection = self.client.get_or_create_collection(
-            name="project_memory",
-            metadata={"description": "Project management documents and context"}
-        )
+        Returns:
+            The warm-up thread (already started)
+        """
+        if self._warm_up_thread is None:
+            def load():
+                try:
+                    self._open_collection()
+                    self._load_model()
+                except Exception as e:
+                    # The first real use retries and raises
+                    print(f"[RAGEngine] Background warm-up failed: {e}")
+            
+            self._warm_up_thread = threading.Thread(target=load, name="rag-engine-warm-up", daemon=True)
+            self._warm_up_thread.start()
+        return self._warm_up_thread
     
-    def _chunk_text(self, text: str, chunk_size: int = 500, overlap: int = 50) -> List[str]:
+    def embed(self, texts: List[str]) -> List[List[float]]:
         """
-        Split text into overlapping chunks
+        Embed texts with the configured model
         
         Args:
-            text: Text to chunk
-            chunk_size: Maximum characters per chunk
-            overlap: Character overlap between chunks
+            texts: Texts to embed
             
         Returns:
-            List of text chunks
+            One normalized embedding per text
         """
-        if len(text) <= chunk_size:
-            return [text]
+        if not texts:
+            return []
+        if self.scheduler is not None:
+            return self.scheduler.embed(texts)
+        return self._embed_now(texts)
+    
+    def _embed_now(self, texts: List[str]) -> List[List[float]]:
+        if self.embedding_cache is None:
+            return self._encode(texts).tolist()
         
-        chunks = []
-        start = 0
+        digests = [chunk_digest(text) for text in texts]
+        embeddings = self.embedding_cache.get_many(digests)
         
-        while start < len(text):
-            end = start + chunk_size
-            chunk = text[start:end]
-            
-            # Try to break at word boundary
-            if end < len(text):
-                last_space = chunk.rfind(' ')
-                if last_space > chunk_size * 0.7:  # Don't break too early
-                    chunk = chunk[:last_space]
-                    end = start + last_space
-            
-            chunks.append(chunk.strip())
-            start = end - overlap
+        # Encode each distinct missing text once
+        missing: Dict[bytes, str] = {}
+        for digest, text, embedding in zip(digests, texts, embeddings):
+            if embedding is None:
+                missing.setdefault(digest, text)
+        if missing:
+            encoded = self._encode(list(missing.values()))
+            self.embedding_cache.put_many(list(missing), encoded)
+            fresh = dict(zip(missing, encoded))
+            embeddings = [fresh[digest] if embedding is None else embedding
+                          for digest, embedding in zip(digests, embeddings)]
+        return np.stack(embeddings).tolist()
+    
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        return self.embedding_model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        ).astype(np.float32)
+    
+    def _chunk_text(self, text: str, doc_type: Optional[DocumentType] = None) -> List[str]:
+        """
+        Split text into chunks that fit the embedding model's window
+        
+        Args:
+            text: Text to chunk
+            doc_type: Selects the chunk profile (size, overlap, line or sentence cuts)
             
-        return chunks
+        Returns:
+            List of text chunks
+        """
+        return self.chunker.chunk(text, doc_type)
     
     def add_document(self, document: Document) -> str:
         """
@@ -88,49 +295,90 @@ class RAGEngine:
         Returns:
             Document ID
         """
-        if not document.id:
-            document.id = str(uuid.uuid4())
-        
-        # Chunk the document
-        chunks = self._chunk_text(document.content)
+        return self.add_documents([document])[0]
+    
+    def add_documents(self, documents: List[Document],
+                      chunks: Optional[List[List[str]]] = None) -> List[str]:
+        """
+        Add several documents with one embedding pass and one Chroma write
         
+        Args:
+            documents: Documents to add
+            chunks: Already chunked text of each document (skips chunking)
+            
+        Returns:
+            Document IDs, in order
+        """
         # Prepare data for ChromaDB
         chunk_ids = []
         chunk_texts = []
         chunk_metadatas = []
         
-        for i, chunk_text in enumerate(chunks):
-            chunk_id = f"{document.id}_chunk_{i}"
-            chunk_ids.append(chunk_id)
-            chunk_texts.append(chunk_text)
+        for n, document in enumerate(documents):
+            if not document.id:
+                document.id = str(uuid.uuid4())
             
-            # Combine document metadata with chunk-specific info
-            chunk_metadata = {
-                "document_id": document.id,
-                "title": document.title,
-                "doc_type": document.doc_type.value,
-                "chunk_index": i,
-                "created_at": document.created_at.isoformat(),
-                "client_name": document.client_name or "",
-                "project_name": document.project_name or "",
-                "priority": document.priority or "",
-                "status": document.status or "",
-                "tags": ",".join(document.tags),
-                "artifact_type": document.artifact_type or "",
-                "source": document.source or "",
-                "file_path": document.file_path or "",
-                **document.metadata
-            }
-            chunk_metadatas.append(chunk_metadata)
+            # Chunk the document
+            document_chunks = chunks[n] if chunks is not None else self._chunk_text(document.content, document.doc_type)
+            
+            for i, chunk_text in enumerate(document_chunks):
+                chunk_id = f"{document.id}_chunk_{i}"
+                chunk_ids.append(chunk_id)
+                chunk_texts.append(chunk_text)
+                
+                # Combine document metadata with chunk-specific info
+                chunk_metadata = {
+                    "document_id": document.id,
+                    "title": document.title,
+                    "doc_type": document.doc_type.value,
+                    "chunk_index": i,
+                    "created_at": document.created_at.isoformat(),
+                    "created_ts": document.created_at.timestamp(),
+                    "client_name": document.client_name or "",
+                    "project_name": document.project_name or "",
+                    "priority": document.priority or "",
+                    "status": document.status or "",
+                    "tags": ",".join(document.tags),
+                    "artifact_type": document.artifact_type or "",
+                    "source": document.source or "",
+                    "file_path": document.file_path or "",
+                    **document.metadata
+                }
+                chunk_metadatas.append(chunk_metadata)
         
-        # Add to ChromaDB
-        self.collection.add(
-            ids=chunk_ids,
-            documents=chunk_texts,
-            metadatas=chunk_metadatas
-        )
+        if not chunk_ids:
+            return []
         
-        return document.id
+        # Open the counters before writing: on a store without them the first
+        # open recounts the collection, which must not include these chunks yet
+        try:
+            stats = self.collection_stats
+        except Exception as e:
+            stats = None
+            print(f"[RAGEngine] Stats counters unavailable: {e}")
+        
+        # Add to ChromaDB, in slices no larger than its maximum batch
+        embeddings = self.embed(chunk_texts)
+        max_batch = self.client.get_max_batch_size() if hasattr(self.client, "get_max_batch_size") else len(chunk_ids)
+        for start in range(0, len(chunk_ids), max_batch):
+            end = start + max_batch
+            self.collection.add(
+                ids=chunk_ids[start:end],
+                embeddings=embeddings[start:end],
+                documents=chunk_texts[start:end],
+                metadatas=chunk_metadatas[start:end]
+            )
+        
+        try:
+            self.recency_index.add(zip(chunk_ids, chunk_metadatas))
+            if stats is not None:
+                stats.add(chunk_metadatas)
+            self.lexical_index.add(zip(chunk_ids, chunk_texts, chunk_metadatas))
+        except Exception as e:
+            # The documents are stored; only listings, stats and keyword search miss them
+            print(f"[RAGEngine] Side index update failed: {e}")
+        
+        return [document.id for document in documents]
     
     def _calculate_time_decay(self, timestamp_iso: str) -> float:
         """
@@ -192,7 +440,9 @@ class RAGEngine:
 
     def query(self, query_text: str, n_results: int = 5,
               filter_dict: Optional[Dict[str, Any]] = None,
-              apply_artifact_boosting: bool = True) -> List[QueryResult]:
+              apply_artifact_boosting: bool = True,
+              query_embedding: Optional[List[float]] = None,
+              mode: str = "vector") -> List[QueryResult]:
         """
         Query the RAG system with optional artifact boosting
 
@@ -201,16 +451,43 @@ class RAGEngine:
             n_results: Number of results to return
             filter_dict: Optional metadata filters
             apply_artifact_boosting: Apply time-decay and tag boosting for artifacts
+            query_embedding: Precomputed embedding of query_text (skips the model)
+            mode: "vector" (embedding similarity), "lexical" (BM25 keyword
+                match, for exact identifiers, paths and tags) or "hybrid"
+                (both rankings fused with reciprocal rank fusion)
 
         Returns:
             List of QueryResult objects
         """
+        if mode not in QUERY_MODES:
+            raise ValueError(f"Unknown query mode '{mode}', expected one of {', '.join(QUERY_MODES)}")
+        
         # Query ChromaDB - get more results for re-ranking
         fetch_count = n_results * 2 if apply_artifact_boosting else n_results
 
+        if mode == "vector":
+            query_results = self._vector_results(query_text, fetch_count, filter_dict, query_embedding)
+        else:
+            rankings = [self._lexical_results(query_text, fetch_count, filter_dict)]
+            if mode == "hybrid":
+                rankings.append(self._vector_results(query_text, fetch_count, filter_dict, query_embedding))
+            query_results = self._fuse(rankings)
+
+        # Apply artifact-specific boosting if enabled
+        if apply_artifact_boosting and query_results:
+            query_results = self._apply_artifact_boosting(query_results)
+
+        # Return top n_results after boosting
+        return query_results[:n_results]
+    
+    def _vector_results(self, query_text: str, fetch_count: int,
+                        filter_dict: Optional[Dict[str, Any]],
+                        query_embedding: Optional[List[float]]) -> List[QueryResult]:
+        from chromadb.errors import InternalError
+        
         try:
             results = self.collection.query(
-                query_texts=[query_text],
+                query_embeddings=[query_embedding] if query_embedding is not None else self.embed([query_text]),
                 n_results=fetch_count,
                 where=filter_dict
             )
@@ -238,52 +515,129 @@ class RAGEngine:
                     metadata=results['metadatas'][0][i]
                 )
                 query_results.append(result)
-
-        # Apply artifact-specific boosting if enabled
-        if apply_artifact_boosting and query_results:
-            query_results = self._apply_artifact_boosting(query_results)
-
-        # Return top n_results after boosting
-        return query_results[:n_results]
+        return query_results
+    
+    def _lexical_results(self, query_text: str, fetch_count: int,
+                         filter_dict: Optional[Dict[str, Any]]) -> List[QueryResult]:
+        """BM25 matches, filtered by Chroma with the same where clause as vector search"""
+        # Over-fetch when filtering, since the keyword index does not know the filter
+        limit = fetch_count * 5 if filter_dict else fetch_count
+        matches = self.lexical_index.search(query_text, limit)
+        if not matches:
+            return []
+        
+        chunks = self.collection.get(ids=[chunk_id for chunk_id, _ in matches], where=filter_dict,
+                                     include=["documents", "metadatas"])
+        found = {chunk_id: (text, metadata) for chunk_id, text, metadata
+                 in zip(chunks['ids'], chunks['documents'], chunks['metadatas'])}
+        
+        query_results = []
+        for chunk_id, score in matches:
+            if chunk_id in found:
+                text, metadata = found[chunk_id]
+                query_results.append(QueryResult(
+                    content=text,
+                    score=score,
+                    document_id=metadata['document_id'],
+                    chunk_id=chunk_id,
+                    metadata=metadata
+                ))
+        return query_results[:fetch_count]
+    
+    @staticmethod
+    def _fuse(rankings: List[List[QueryResult]]) -> List[QueryResult]:
+        """Merge ranked result lists by reciprocal rank fusion; scores become fused scores."""
+        by_chunk: Dict[str, QueryResult] = {}
+        for ranking in rankings:
+            for result in ranking:
+                by_chunk.setdefault(result.chunk_id, result)
+        fused = reciprocal_rank_fusion([[result.chunk_id for result in ranking] for ranking in rankings])
+        
+        query_results = []
+        for chunk_id, score in sorted(fused.items(), key=lambda item: item[1], reverse=True):
+            result = by_chunk[chunk_id]
+            result.score = score
+            query_results.append(result)
+        return query_results
     
     def get_document_by_id(self, document_id: str) -> Optional[List[QueryResult]]:
         """Get all chunks for a specific document"""
         return self.query("", filter_dict={"document_id": document_id}, n_results=100)
     
+    def get_recent(self, n_results: int = 10, doc_type: Optional[str] = None,
+                   artifact_type: Optional[str] = None) -> List[QueryResult]:
+        """
+        Newest documents by creation time, without a similarity search
+        
+        Args:
+            n_results: Number of documents
+            doc_type: Only this document type
+            artifact_type: Only this artifact type
+            
+        Returns:
+            First chunk of each document, newest first
+        """
+        chunk_ids = self.recency_index.latest(n_results, doc_type=doc_type, artifact_type=artifact_type)
+        if not chunk_ids:
+            return []
+        
+        found = self.collection.get(ids=chunk_ids, include=["documents", "metadatas"])
+        by_id = {
+            chunk_id: (content, metadata)
+            for chunk_id, content, metadata in zip(found['ids'], found['documents'], found['metadatas'])
+        }
+        
+        results = []
+        for chunk_id in chunk_ids:
+            if chunk_id not in by_id:
+                continue
+            content, metadata = by_id[chunk_id]
+            results.append(QueryResult(
+                content=content,
+                score=1.0,
+                document_id=metadata.get('document_id', chunk_id),
+                chunk_id=chunk_id,
+                metadata=metadata
+            ))
+        return results
+    
     def delete_document(self, document_id: str) -> bool:
         """Delete a document and all its chunks"""
         try:
             # Get all chunk IDs for this document
-            results = self.collection.get(where={"document_id": document_id})
+            results = self.collection.get(where={"document_id": document_id}, include=["metadatas"])
             if results['ids']:
+                # Opened first so a recount on first use doesn't see the delete
+                stats = self.collection_stats
                 self.collection.delete(ids=results['ids'])
+                stats.remove(results['metadatas'])
+            self.recency_index.remove(document_id)
+            self.lexical_index.remove(document_id)
             return True
         except Exception:
             return False
     
-    def get_stats(self) -> Dict[str, Any]:
-        """Get system statistics"""
-        count = self.collection.count()
-        
-        # Get document types breakdown
-        all_metadata = self.collection.get()['metadatas']
-        doc_types = {}
-        clients = set()
-        projects = set()
+    def get_stats(self, recount: bool = False) -> Dict[str, Any]:
+        """
+        Get system statistics
         
-        for metadata in all_metadata:
-            doc_type = metadata.get('doc_type', 'unknown')
-            doc_types[doc_type] = doc_types.get(doc_type, 0) + 1
-            
-            if metadata.get('client_name'):
-                clients.add(metadata['client_name'])
-            if metadata.get('project_name'):
-                projects.add(metadata['project_name'])
+        Args:
+            recount: Rebuild the counters from the collection first (reads
+                every chunk's metadata, page by page)
+        """
+        count = self.collection.count()
+        if recount:
+            self.collection_stats.recount(self.collection)
+        counters = self.collection_stats.snapshot()
         
         return {
             "total_chunks": count,
-            "unique_clients": len(clients),
-            "unique_projects": len(projects),
-            "document_types": doc_types,
-            "storage_path": str(self.storage_path)
+            "unique_clients": counters["unique_clients"],
+            "unique_projects": counters["unique_projects"],
+            "document_types": counters["document_types"],
+            "counted_at": self.collection_stats.counted_at,
+            "storage_path": str(self.storage_path),
+            # Reported once the model is loaded; stats never load it
+            "embedding_cache": self._embedding_cache.stats() if self._embedding_cache else None,
+            "embedding_scheduler": self.scheduler.metrics() if self.scheduler else None
         }
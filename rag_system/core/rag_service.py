@@ -0,0 +1,500 @@
+"""
+Local RAG service shared by every agent and CLI process on the machine
+
+One long-running process owns the embedding model and the Chroma client for
+a store and answers requests over a Unix-domain socket. Other processes get
+a ``RemoteRAGEngine`` from ``DocumentManager`` when the service is running,
+so they neither load the model nor open the store themselves.
+
+Wire format, one JSON object per line in both directions:
+
+    request   {"id": 1, "op": "query", "args": {...}}
+    response  {"id": 1, "ok": true, "result": ...}
+              {"id": 1, "ok": false, "error": "...", "type": "ValueError"}
+
+Requests from all connections go through one queue and are executed on a
+single worker thread. Whatever has queued up while the worker was busy is
+handled as one batch: the chunks of all ``add_document`` requests are
+embedded and written together, and all ``query`` texts are embedded in one
+model call.
+
+Run it with ``python cli.py serve`` or
+``python -m rag_system.core.rag_service``.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .rag_engine import RAGEngine
+from ..models.document import Document, QueryResult
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORAGE_PATH = "./storage/chromadb"
+LINE_LIMIT = 64 * 1024 * 1024   # Largest request or response line
+CONNECT_TIMEOUT = 0.5           # Seconds to wait when probing for the service
+
+# Collection methods forwarded for callers that use rag_engine.collection directly
+COLLECTION_METHODS = ("get", "count", "update", "modify", "delete")
+
+
+def default_socket_path(storage_path: str = DEFAULT_STORAGE_PATH) -> str:
+    """
+    Socket path of the service for a store
+
+    ``RAG_SERVICE_SOCKET`` overrides it; otherwise it is derived from the
+    store's absolute path so each store has its own service.
+    """
+    override = os.environ.get("RAG_SERVICE_SOCKET")
+    if override:
+        return override
+    digest = hashlib.sha1(str(Path(storage_path).resolve()).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(os.environ.get("TMPDIR", "/tmp"), f"rag_service_{digest}.sock")
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    return json.dumps(message, default=_json_default).encode("utf-8") + b"\n"
+
+
+class RAGService:
+    """Serves one RAGEngine to local clients over a Unix socket"""
+
+    def __init__(self, engine: RAGEngine, path: str):
+        """
+        Initialize the service
+
+        Args:
+            engine: Engine that owns the model and the store
+            path: Unix socket path to listen on
+        """
+        # Imported here: document_manager imports this module for its client
+        from .document_manager import DocumentManager
+
+        self.engine = engine
+        self.doc_manager = DocumentManager(rag_engine=engine)
+        self.path = path
+        self.requests = 0
+        self.batches = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rag-service")
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._clients: Set[asyncio.StreamWriter] = set()
+        self._worker: Optional[asyncio.Task] = None
+
+        self._ops: Dict[str, Callable[..., Any]] = {
+            "ping": lambda: {"pid": os.getpid(), "requests": self.requests, "batches": self.batches},
+            "query": self._query,
+            "search_artifacts": self._search_artifacts,
+            "get_recent_activities": self._get_recent_activities,
+            "delete_document": lambda document_id: self.engine.delete_document(document_id),
+            "get_stats": lambda recount=False: self.engine.get_stats(recount=recount),
+            "collection": self._collection,
+        }
+
+    async def start(self) -> None:
+        """Start listening."""
+        if os.path.exists(self.path):
+            if _probe(self.path):
+                raise RuntimeError(f"A RAG service is already listening on {self.path}")
+            os.unlink(self.path)
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run_worker())
+        self._server = await asyncio.start_unix_server(self._handle_client, path=self.path, limit=LINE_LIMIT)
+        logger.info(f"🧠 RAG service listening on {self.path}")
+
+    async def close(self) -> None:
+        """Disconnect every client and stop listening."""
+        for writer in list(self._clients):
+            writer.close()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._worker:
+            self._worker.cancel()
+        self._executor.shutdown(wait=False)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        pending = set()
+        self._clients.add(writer)
+
+        async def respond(request_id: Any, future: asyncio.Future) -> None:
+            response = await future
+            response["id"] = request_id
+            writer.write(_encode(response))
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                try:
+                    request = json.loads(raw)
+                    if not isinstance(request, dict):
+                        raise ValueError("request is not an object")
+                except ValueError:
+                    writer.write(_encode({"id": None, "ok": False, "error": "Malformed request",
+                                          "type": "ValueError"}))
+                    continue
+                future = loop.create_future()
+                await self._queue.put((request, future))
+                task = asyncio.create_task(respond(request.get("id"), future))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+        except (ConnectionError, ValueError) as e:
+            logger.warning(f"RAG service client failed: {e}")
+        finally:
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            self._clients.discard(writer)
+            writer.close()
+
+    async def _run_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                responses = await loop.run_in_executor(self._executor, self.execute, [r for r, _ in batch])
+            except Exception as e:
+                logger.exception("RAG service batch failed")
+                responses = [_error(e)] * len(batch)
+            for (_, future), response in zip(batch, responses):
+                if not future.done():
+                    future.set_result(response)
+
+    # ------------------------------------------------------------------
+    # Execution (worker thread)
+    # ------------------------------------------------------------------
+
+    def execute(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run a batch of requests
+
+        Returns:
+            One response per request, in order
+        """
+        self.requests += len(requests)
+        self.batches += 1
+        responses: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+
+        adds = [i for i, r in enumerate(requests) if r.get("op") == "add_document"]
+        if adds:
+            self._add_batch(requests, adds, responses)
+
+        # Lexical queries never touch the model
+        queries = [i for i, r in enumerate(requests)
+                   if r.get("op") == "query" and (r.get("args") or {}).get("mode", "vector") != "lexical"]
+        if len(queries) > 1:
+            # One model call for every query text in the batch
+            try:
+                texts = [requests[i].get("args", {}).get("query_text", "") for i in queries]
+                for i, embedding in zip(queries, self.engine.embed(texts)):
+                    requests[i].setdefault("args", {})["query_embedding"] = embedding
+            except Exception as e:
+                logger.warning(f"Batched query embedding failed, embedding one by one: {e}")
+
+        for i, request in enumerate(requests):
+            if responses[i] is None:
+                responses[i] = self._call(request.get("op"), request.get("args") or {})
+        return responses
+
+    def _add_batch(self, requests, indexes: List[int], responses) -> None:
+        try:
+            documents = [Document.model_validate(requests[i]["args"]["document"]) for i in indexes]
+            ids = self.engine.add_documents(documents)
+        except Exception as e:
+            if len(indexes) == 1:
+                responses[indexes[0]] = _error(e)
+                return
+            # Isolate the failing request(s)
+            for i in indexes:
+                self._add_batch(requests, [i], responses)
+            return
+        for i, document_id in zip(indexes, ids):
+            responses[i] = {"ok": True, "result": document_id}
+
+    def _call(self, op: Optional[str], args: Dict[str, Any]) -> Dict[str, Any]:
+        handler = self._ops.get(op)
+        if handler is None:
+            return {"ok": False, "error": f"Unknown operation '{op}'", "type": "ValueError"}
+        try:
+            return {"ok": True, "result": handler(**args)}
+        except Exception as e:
+            return _error(e)
+
+    def _query(self, **kwargs) -> List[Dict[str, Any]]:
+        return [result.model_dump(mode="json") for result in self.engine.query(**kwargs)]
+
+    def _search_artifacts(self, **kwargs) -> List[Dict[str, Any]]:
+        return [result.model_dump(mode="json") for result in self.doc_manager.search_artifacts(**kwargs)]
+
+    def _get_recent_activities(self, **kwargs) -> List[Dict[str, Any]]:
+        return [result.model_dump(mode="json") for result in self.doc_manager.get_recent_activities(**kwargs)]
+
+    def _collection(self, method: str, kwargs: Optional[Dict[str, Any]] = None) -> Any:
+        collection = self.engine.collection
+        if method == "metadata":
+            return collection.metadata
+        if method not in COLLECTION_METHODS:
+            raise ValueError(f"Collection method '{method}' is not served")
+        return getattr(collection, method)(**(kwargs or {}))
+
+
+def _error(e: Exception) -> Dict[str, Any]:
+    return {"ok": False, "error": str(e), "type": type(e).__name__}
+
+
+def _probe(path: str) -> bool:
+    """Whether something accepts connections on ``path``."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(path)
+            return True
+        except OSError:
+            return False
+
+
+class RAGServiceError(RuntimeError):
+    """An operation failed inside the RAG service"""
+
+
+class RAGServiceLostError(RAGServiceError):
+    """The service went away after receiving a request, which may have run"""
+
+
+class _RemoteCollection:
+    """The subset of a Chroma collection that callers use, forwarded to the service"""
+
+    def __init__(self, engine: "RemoteRAGEngine"):
+        self._engine = engine
+
+    @property
+    def metadata(self) -> Optional[Dict[str, Any]]:
+        return self._engine.call("collection", method="metadata")
+
+    def __getattr__(self, method: str):
+        if method not in COLLECTION_METHODS:
+            raise AttributeError(method)
+        return lambda **kwargs: self._engine.call("collection", method=method, kwargs=kwargs)
+
+
+class RemoteRAGEngine:
+    """
+    RAGEngine stand-in that forwards to a running RAG service
+
+    Each thread gets its own connection, so concurrent callers in one
+    process can be batched together by the service. If the service goes
+    away and cannot be reached again, the client logs it and carries on
+    with a local RAGEngine on the same store.
+    """
+
+    def __init__(self, path: str, storage_path: str = DEFAULT_STORAGE_PATH):
+        """
+        Initialize the client
+
+        Args:
+            path: Unix socket path of the service
+            storage_path: Store to open locally if the service stops
+        """
+        self.path = path
+        self.storage_path = storage_path
+        self._remote_collection = _RemoteCollection(self)
+        self._fallback: Optional[RAGEngine] = None
+        self._local = threading.local()
+        self._next_id = 0
+        self._id_lock = threading.Lock()
+
+    @property
+    def collection(self):
+        return self._fallback.collection if self._fallback else self._remote_collection
+
+    def _connection(self) -> Tuple[socket.socket, Any]:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(self.path)
+            conn = self._local.conn = (sock, sock.makefile("rb"))
+        return conn
+
+    def _drop_connection(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn:
+            conn[1].close()
+            conn[0].close()
+
+    def _send(self, payload: bytes) -> Any:
+        """Write one request and return the reader its response arrives on."""
+        try:
+            sock, reader = self._connection()
+            sock.sendall(payload)
+        except OSError:
+            # Stale connection (e.g. the service restarted): retry once on a new
+            # one. Nothing was delivered, so the retry cannot run a request twice.
+            self._drop_connection()
+            sock, reader = self._connection()
+            sock.sendall(payload)
+        return reader
+
+    def call(self, op: str, **args) -> Any:
+        """
+        Run one operation in the service
+
+        Raises:
+            ConnectionError: The service is not reachable; the request was
+                not delivered
+            RAGServiceLostError: The request was delivered but no response
+                came back, so it may or may not have run
+            RAGServiceError: The operation failed in the service
+        """
+        with self._id_lock:
+            self._next_id += 1
+            request_id = self._next_id
+        try:
+            reader = self._send(_encode({"id": request_id, "op": op, "args": args}))
+        except OSError as e:
+            self._drop_connection()
+            raise ConnectionError(f"RAG service at {self.path} is unreachable: {e}") from e
+
+        try:
+            raw = reader.readline()
+            if not raw:
+                raise ConnectionResetError("connection closed")
+        except OSError as e:
+            self._drop_connection()
+            raise RAGServiceLostError(
+                f"RAG service at {self.path} stopped before answering '{op}'; it may have run: {e}"
+            ) from e
+
+        response = json.loads(raw)
+        if not response.get("ok"):
+            raise RAGServiceError(f"{response.get('type', 'Error')}: {response.get('error')}")
+        return response.get("result")
+
+    def _remote(self, op: str, local: Callable[[RAGEngine], Any], **args) -> Any:
+        # Only an undelivered request is run locally instead; a lost response
+        # (RAGServiceLostError) is raised, since retrying could add a document twice
+        if self._fallback is None:
+            try:
+                return self.call(op, **args)
+            except ConnectionError as e:
+                logger.warning(f"{e}; using a local RAG engine instead")
+                self._fallback = RAGEngine(storage_path=self.storage_path)
+        return local(self._fallback)
+
+    def add_document(self, document: Document) -> str:
+        return self._remote("add_document", lambda engine: engine.add_document(document),
+                            document=document.model_dump(mode="json"))
+
+    def add_documents(self, documents: List[Document]) -> List[str]:
+        return [self.add_document(document) for document in documents]
+
+    def query(self, query_text: str, n_results: int = 5,
+              filter_dict: Optional[Dict[str, Any]] = None,
+              apply_artifact_boosting: bool = True,
+              query_embedding: Optional[List[float]] = None,
+              mode: str = "vector") -> List[QueryResult]:
+        results = self._remote(
+            "query",
+            lambda engine: engine.query(query_text, n_results, filter_dict, apply_artifact_boosting,
+                                        query_embedding=query_embedding, mode=mode),
+            query_text=query_text, n_results=n_results,
+            filter_dict=filter_dict, apply_artifact_boosting=apply_artifact_boosting,
+            query_embedding=query_embedding, mode=mode
+        )
+        return [result if isinstance(result, QueryResult) else QueryResult.model_validate(result)
+                for result in results]
+
+    def get_document_by_id(self, document_id: str) -> Optional[List[QueryResult]]:
+        return self.query("", filter_dict={"document_id": document_id}, n_results=100)
+
+    def delete_document(self, document_id: str) -> bool:
+        return self._remote("delete_document", lambda engine: engine.delete_document(document_id),
+                            document_id=document_id)
+
+    def get_recent(self, n_results: int = 10, doc_type: Optional[str] = None,
+                   artifact_type: Optional[str] = None) -> List[QueryResult]:
+        results = self._remote(
+            "get_recent_activities",
+            lambda engine: engine.get_recent(n_results, doc_type=doc_type, artifact_type=artifact_type),
+            n_results=n_results, doc_type=doc_type, artifact_type=artifact_type
+        )
+        return [result if isinstance(result, QueryResult) else QueryResult.model_validate(result)
+                for result in results]
+
+    def get_stats(self, recount: bool = False) -> Dict[str, Any]:
+        return self._remote("get_stats", lambda engine: engine.get_stats(recount=recount), recount=recount)
+
+    def warm_up(self) -> None:
+        """The service keeps its model loaded; nothing to warm."""
+
+
+def connect_service(storage_path: str = DEFAULT_STORAGE_PATH) -> Optional[RemoteRAGEngine]:
+    """
+    Client for the store's RAG service, if one is running
+
+    ``RAG_SERVICE=off`` disables the lookup.
+    """
+    if os.environ.get("RAG_SERVICE", "").lower() in ("0", "off", "false", "no"):
+        return None
+    path = default_socket_path(storage_path)
+    if not os.path.exists(path) or not _probe(path):
+        return None
+    return RemoteRAGEngine(path, storage_path)
+
+
+async def serve(storage_path: str = DEFAULT_STORAGE_PATH, path: Optional[str] = None) -> None:
+    """Load the engine and serve it until cancelled."""
+    # The service already batches on its single worker thread, so the
+    # engine's own micro-batching window would only add latency
+    engine = RAGEngine(storage_path=storage_path, batch_window=0)
+    # Load everything up front so the first client does not wait
+    await asyncio.to_thread(lambda: (engine.collection, engine.embedding_model))
+
+    service = RAGService(engine, path or default_socket_path(storage_path))
+    await service.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local RAG service")
+    parser.add_argument("--storage", default=DEFAULT_STORAGE_PATH, help=f"ChromaDB path (default: {DEFAULT_STORAGE_PATH})")
+    parser.add_argument("--socket", help="Unix socket path (default: derived from the storage path)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        asyncio.run(serve(args.storage, args.socket))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
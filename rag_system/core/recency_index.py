@@ -0,0 +1,150 @@
+"""
+Time-ordered index of documents kept next to the Chroma store
+
+Chroma can filter on metadata but cannot order results, so "latest N
+documents" used to be answered with an empty-string similarity query and a
+local sort, which was neither recent nor complete. This SQLite side table
+holds one row per document (its first chunk) keyed by ``created_ts``, so
+the latest N, optionally of one doc type or artifact type, is an index scan
+with no embedding. RAGEngine keeps it in sync on add and delete.
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recency (
+    document_id TEXT PRIMARY KEY,
+    chunk_id TEXT NOT NULL,
+    created_ts REAL NOT NULL,
+    doc_type TEXT NOT NULL DEFAULT '',
+    artifact_type TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS recency_by_time ON recency (created_ts DESC);
+CREATE INDEX IF NOT EXISTS recency_by_type ON recency (doc_type, created_ts DESC);
+CREATE INDEX IF NOT EXISTS recency_by_artifact ON recency (artifact_type, created_ts DESC);
+CREATE TABLE IF NOT EXISTS recency_meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+REBUILD_PAGE = 1000  # Chunks read per page when rebuilding from Chroma
+
+
+def _created_ts(metadata: Dict[str, Any]) -> float:
+    value = metadata.get("created_ts")
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(metadata.get("created_at", "")).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class RecencyIndex:
+    """SQLite table of documents ordered by creation time"""
+
+    def __init__(self, path: str):
+        """
+        Open or create the index
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    @property
+    def built(self) -> bool:
+        """Whether existing Chroma documents have been indexed"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM recency_meta WHERE key = 'built'").fetchone()
+        return row is not None
+
+    def add(self, chunks: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Index documents from their chunks
+
+        Args:
+            chunks: (chunk_id, chunk metadata) pairs; only chunk 0 of each
+                document is recorded
+        """
+        rows = [
+            (metadata["document_id"], chunk_id, _created_ts(metadata),
+             metadata.get("doc_type") or "", metadata.get("artifact_type") or "")
+            for chunk_id, metadata in chunks
+            if metadata.get("chunk_index", 0) == 0 and metadata.get("document_id")
+        ]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO recency (document_id, chunk_id, created_ts, doc_type, artifact_type) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def remove(self, document_id: str) -> None:
+        """Drop a document from the index."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM recency WHERE document_id = ?", (document_id,))
+
+    def latest(self, limit: int, doc_type: Optional[str] = None,
+               artifact_type: Optional[str] = None) -> List[str]:
+        """
+        Chunk ids of the newest documents, newest first
+
+        Args:
+            limit: Number of documents
+            doc_type: Only this document type
+            artifact_type: Only this artifact type
+        """
+        clauses, params = [], []
+        if doc_type:
+            clauses.append("doc_type = ?")
+            params.append(doc_type)
+        if artifact_type:
+            clauses.append("artifact_type = ?")
+            params.append(artifact_type)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT chunk_id FROM recency {where}ORDER BY created_ts DESC LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+        return [chunk_id for (chunk_id,) in rows]
+
+    def rebuild(self, collection, page_size: int = REBUILD_PAGE) -> int:
+        """
+        Index every document already in a Chroma collection
+
+        Reads first chunks' metadata page by page, so memory stays bounded.
+
+        Returns:
+            Number of documents indexed
+        """
+        indexed = 0
+        offset = 0
+        while True:
+            page = collection.get(where={"chunk_index": 0}, include=["metadatas"],
+                                  limit=page_size, offset=offset)
+            ids = page.get("ids") or []
+            if not ids:
+                break
+            offset += len(ids)
+            self.add(zip(ids, page.get("metadatas") or []))
+            indexed += len(ids)
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO recency_meta (key, value) VALUES ('built', ?)",
+                               (datetime.now().isoformat(),))
+        return indexed
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
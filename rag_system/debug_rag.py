@@ -11,7 +11,7 @@ async def main():
     dm = DocumentManager()
     
     print("Searching for artifacts with query 'to:board topic:planner-agent'...")
-    results = dm.search_artifacts(query="to:board topic:planner-agent", n_results=20)
+    results = dm.search_artifacts(query="to:board topic:planner-agent", n_results=20, mode="lexical")
     
     print(f"Found {len(results)} results.")
     for res in results:
@@ -21,7 +21,7 @@ async def main():
         print("-" * 20)
 
     print("\nSearching specifically for 'to:board'...")
-    results = dm.search_artifacts(query="to:board", n_results=20)
+    results = dm.search_artifacts(query="to:board", n_results=20, mode="lexical")
     print(f"Found {len(results)} results.")
 
 if __name__ == "__main__":
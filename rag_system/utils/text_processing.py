@@ -3,7 +3,7 @@ Text processing utilities for the RAG system
 """
 
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from pathlib import Path
 
 def clean_text(text: str) -> str:
@@ -14,6 +14,36 @@ def clean_text(text: str) -> str:
     text = text.strip()
     return text
 
+def clean_text_keep_lines(text: str) -> str:
+    """Normalize whitespace like clean_text but keep line breaks and paragraphs"""
+    # Collapse runs of spaces and tabs, drop trailing spaces
+    text = re.sub(r'[ \t\f\v]+', ' ', text)
+    text = re.sub(r' *\r?\n *', '\n', text)
+    # At most one blank line between paragraphs
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text.strip()
+
+MARKDOWN_HEADER = re.compile(r'^(#{1,6})[^\S\n]+(.*)', re.MULTILINE)
+
+def markdown_section_spans(text: str) -> List[Tuple[str, int, int]]:
+    """
+    Locate markdown sections by their headers
+    
+    Returns:
+        (section name, start, end) character spans in order. Text before the
+        first header is the "content" section; a section's span starts at
+        its header line.
+    """
+    spans = []
+    current_section = "content"
+    start = 0
+    for match in MARKDOWN_HEADER.finditer(text):
+        spans.append((current_section, start, match.start()))
+        current_section = match.group(2).lower().replace(' ', '_')
+        start = match.start()
+    spans.append((current_section, start, len(text)))
+    return spans
+
 def extract_markdown_sections(text: str) -> Dict[str, str]:
     """Extract sections from markdown text based on headers"""
     sections = {}
@@ -23,7 +53,7 @@ def extract_markdown_sections(text: str) -> Dict[str, str]:
     lines = text.split('\n')
     for line in lines:
         # Check for markdown headers
-        header_match = re.match(r'^(#{1,6})\s+(.*)', line)
+        header_match = MARKDOWN_HEADER.match(line)
         if header_match:
             # Save previous section
             if current_text:
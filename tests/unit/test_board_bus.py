@@ -0,0 +1,145 @@
+"""
+Unit tests for the bus that connects message board shards.
+"""
+
+import asyncio
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from a2a_communicating_agents.agent_messaging import websocket_server as board
+from a2a_communicating_agents.agent_messaging.board_bus import BusClient, BusHub
+from a2a_communicating_agents.agent_messaging.board_log import BoardLog
+
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, payload):
+        self.sent.append(payload)
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def bus_path():
+    # Unix socket paths are limited to ~100 characters, so avoid tmp_path
+    directory = tempfile.mkdtemp(prefix="bus", dir="/tmp")
+    yield str(Path(directory) / "board.sock")
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+async def _collect(client: BusClient, received: list):
+    async def on_envelope(envelope, payload):
+        received.append(envelope)
+    try:
+        await client.run(on_envelope)
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+
+
+async def _wait_for(condition, timeout: float = 1.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met")
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.unit
+class TestBusHub:
+    """Sequencing and relaying between shards"""
+
+    @pytest.mark.asyncio
+    async def test_every_shard_sees_sequenced_envelopes(self, bus_path):
+        hub = BusHub(bus_path)
+        await hub.start()
+        shards = [BusClient(bus_path) for _ in range(2)]
+        inboxes = [[], []]
+        for shard in shards:
+            await shard.connect()
+        await _wait_for(lambda: len(hub.shards) == 2)
+        tasks = [asyncio.create_task(_collect(s, inbox)) for s, inbox in zip(shards, inboxes)]
+
+        await shards[0].publish("general", {"type": "message", "topic": "general", "content": "a"})
+        await shards[1].publish("general", {"type": "message", "topic": "general", "content": "b"})
+        await shards[1].publish("ops", {"type": "message", "topic": "ops", "content": "c"})
+        await _wait_for(lambda: all(len(inbox) == 3 for inbox in inboxes))
+
+        assert inboxes[0] == inboxes[1]
+        assert [(e["topic"], e["seq"]) for e in inboxes[0]] == [("general", 1), ("general", 2), ("ops", 1)]
+
+        for task in tasks:
+            task.cancel()
+        for shard in shards:
+            await shard.close()
+        await hub.close()
+
+    @pytest.mark.asyncio
+    async def test_new_shard_receives_recent_history(self, bus_path, tmp_path):
+        log = BoardLog(str(tmp_path / "log"))
+        hub = BusHub(bus_path, board_log=log, history_size=2)
+        await hub.start()
+        publisher = BusClient(bus_path)
+        await publisher.connect()
+        for i in range(3):
+            await publisher.publish("general", {"type": "message", "topic": "general", "content": f"m{i}"})
+        await _wait_for(lambda: hub.relayed == 3)
+
+        late, received = BusClient(bus_path), []
+        await late.connect()
+        task = asyncio.create_task(_collect(late, received))
+        await _wait_for(lambda: len(received) == 2)
+
+        assert [e["content"] for e in received] == ["m1", "m2"]
+        log.sync()
+        assert [e["seq"] for e in log.read_since("general", 0)] == [1, 2, 3]
+
+        task.cancel()
+        await publisher.close()
+        await late.close()
+        await hub.close()
+        log.close()
+
+
+@pytest.mark.unit
+class TestShardBroadcast:
+    """A shard publishes through the bus and delivers what comes back"""
+
+    @pytest.fixture(autouse=True)
+    async def clean_board(self):
+        for state in (board.clients, board.subscriptions, board.message_history, board.topic_sequences, board.outboxes):
+            state.clear()
+        yield
+        for agent_id in list(board.clients):
+            await board.unregister_client(agent_id)
+        board.bus = None
+        await asyncio.sleep(0.01)
+
+    @pytest.mark.asyncio
+    async def test_broadcast_round_trips_through_hub(self, bus_path):
+        hub = BusHub(bus_path)
+        await hub.start()
+        board.bus = BusClient(bus_path)
+        await board.bus.connect()
+        follower = asyncio.create_task(board.bus.run(board.deliver_envelope))
+
+        websocket = FakeSocket()
+        await board.register_client(websocket, "agent")
+        await board.subscribe_to_topic("agent", "general")
+        await board.broadcast_message({"content": "hello"}, "general", "sender")
+        await _wait_for(lambda: websocket.sent)
+
+        envelope = json.loads(websocket.sent[0])
+        assert envelope["seq"] == 1
+        assert envelope["content"] == "hello"
+        assert board.topic_sequences["general"] == 1
+
+        follower.cancel()
+        await board.bus.close()
+        await hub.close()
@@ -0,0 +1,121 @@
+"""
+Unit tests for the durable message board log.
+"""
+
+import json
+
+import pytest
+
+from a2a_communicating_agents.agent_messaging import websocket_server as board
+from a2a_communicating_agents.agent_messaging.board_log import BoardLog
+
+
+def _payload(seq: int, topic: str = "general") -> str:
+    return json.dumps({"type": "message", "topic": topic, "seq": seq, "content": f"m{seq}"})
+
+
+@pytest.mark.unit
+class TestBoardLog:
+    """Append, recovery, replay and retention"""
+
+    def test_reopen_recovers_last_seq_and_history(self, tmp_path):
+        log = BoardLog(str(tmp_path), index_interval=3)
+        for seq in range(1, 11):
+            log.append("general", seq, _payload(seq))
+        log.close()
+
+        reopened = BoardLog(str(tmp_path), index_interval=3)
+        last_seq, envelopes = reopened.recover(history_size=4)["general"]
+
+        assert last_seq == 10
+        assert [e["seq"] for e in envelopes] == [7, 8, 9, 10]
+
+    def test_partial_last_record_is_discarded(self, tmp_path):
+        log = BoardLog(str(tmp_path))
+        for seq in range(1, 4):
+            log.append("general", seq, _payload(seq))
+        log.close()
+        segment = next((tmp_path / "general").glob("*.log"))
+        with open(segment, "ab") as f:
+            f.write(b'{"type": "mess')
+
+        reopened = BoardLog(str(tmp_path))
+        reopened.append("general", 4, _payload(4))
+
+        assert [e["seq"] for e in reopened.read_since("general", 0)] == [1, 2, 3, 4]
+        reopened.close()
+
+    def test_read_since_seeks_across_segments(self, tmp_path):
+        log = BoardLog(str(tmp_path), segment_bytes=200, index_interval=2)
+        for seq in range(1, 51):
+            log.append("general", seq, _payload(seq))
+
+        assert len(log.topic("general").segments) > 1
+        assert [e["seq"] for e in log.read_since("general", 45)] == [46, 47, 48, 49, 50]
+        assert [e["seq"] for e in log.read_since("general", 0, limit=3)] == [48, 49, 50]
+        log.close()
+
+    def test_size_retention_drops_oldest_segments(self, tmp_path):
+        log = BoardLog(str(tmp_path), segment_bytes=200, retention_bytes=400)
+        for seq in range(1, 51):
+            log.append("general", seq, _payload(seq))
+
+        assert log.enforce_retention() > 0
+        remaining = log.read_since("general", 0)
+        assert remaining[-1]["seq"] == 50
+        assert remaining[0]["seq"] > 1
+        assert [e["seq"] for e in remaining] == list(range(remaining[0]["seq"], 51))
+        log.close()
+
+    def test_epoch_survives_reopen(self, tmp_path):
+        epoch = BoardLog(str(tmp_path)).epoch
+
+        assert epoch
+        assert BoardLog(str(tmp_path)).epoch == epoch
+        assert BoardLog(str(tmp_path / "other")).epoch != epoch
+
+    def test_topic_names_are_escaped(self, tmp_path):
+        log = BoardLog(str(tmp_path))
+        log.append("team/ops", 1, _payload(1, "team/ops"))
+        log.close()
+
+        assert list(BoardLog(str(tmp_path)).topics) == ["team/ops"]
+
+
+@pytest.mark.unit
+class TestDurableBoard:
+    """Server restores rings from the log and replays past the ring from disk"""
+
+    @pytest.fixture(autouse=True)
+    def durable_board(self, tmp_path, monkeypatch):
+        for state in (board.message_history, board.topic_sequences):
+            state.clear()
+        monkeypatch.setattr(board, "MAX_HISTORY", 5)
+        monkeypatch.setattr(board, "board_log", BoardLog(str(tmp_path)))
+        yield tmp_path
+        board.board_log.close()
+        for state in (board.message_history, board.topic_sequences):
+            state.clear()
+
+    @pytest.mark.asyncio
+    async def test_restart_restores_sequences_and_rings(self, durable_board):
+        for i in range(8):
+            await board.broadcast_message({"content": f"m{i}"}, "general", "sender")
+        board.board_log.close()
+        board.message_history.clear()
+        board.topic_sequences.clear()
+
+        board.board_log = BoardLog(str(durable_board))
+        assert board.restore_from_log(board.board_log) == 1
+
+        assert board.topic_sequences["general"] == 8
+        assert [m["seq"] for m in board.message_history["general"]] == [4, 5, 6, 7, 8]
+        await board.broadcast_message({"content": "after restart"}, "general", "sender")
+        assert board.message_history["general"][-1]["seq"] == 9
+
+    @pytest.mark.asyncio
+    async def test_since_seq_older_than_ring_replays_from_log(self):
+        for i in range(12):
+            await board.broadcast_message({"content": f"m{i}"}, "general", "sender")
+
+        assert [m["seq"] for m in board.history_since("general", 2)] == list(range(3, 13))
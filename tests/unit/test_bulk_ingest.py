@@ -0,0 +1,162 @@
+"""
+Unit tests for parallel bulk ingestion and its file manifest.
+"""
+
+import os
+import uuid
+
+import pytest
+
+from rag_system.core.bulk_ingest import BulkIngester, iter_files
+from rag_system.core.chunker import TokenChunker
+
+
+class FakeEngine:
+    """Records add_documents and delete_document calls"""
+
+    def __init__(self, storage_path):
+        self.storage_path = storage_path
+        self.chunker = TokenChunker(max_tokens=20)
+        self.batches = []
+        self.deleted = []
+        self.fail_adds = False
+
+    def add_documents(self, documents, chunks=None):
+        if self.fail_adds:
+            raise RuntimeError("embedding failed")
+        self.batches.append((documents, chunks))
+        for document in documents:
+            document.id = document.id or str(uuid.uuid4())
+        return [document.id for document in documents]
+
+    def delete_document(self, document_id):
+        self.deleted.append(document_id)
+        return True
+
+
+def _tree(root, files):
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+
+@pytest.mark.unit
+class TestBulkIngester:
+    """Batching, manifest skips and replacement of changed files"""
+
+    def test_walk_matches_patterns_and_skips_hidden_dirs(self, tmp_path):
+        _tree(tmp_path, {"a.md": "x", "b.txt": "x", "c.py": "x", "docs/d.md": "x", ".git/e.md": "x"})
+
+        names = sorted(path.name for path in iter_files(str(tmp_path), ("*.md", "*.txt")))
+
+        assert names == ["a.md", "b.txt", "d.md"]
+
+    def test_ingests_in_write_batches(self, tmp_path):
+        docs = tmp_path / "docs"
+        _tree(docs, {f"note{i}.md": f"# Note {i}\n" + "Some words here. " * 12 for i in range(6)})
+        engine = FakeEngine(tmp_path / "store")
+
+        report = BulkIngester(engine, workers=0, write_batch=5).ingest_dir(str(docs))
+
+        assert report["ingested"] == 6
+        assert report["chunks"] == sum(len(c) for _, chunks in engine.batches for c in chunks)
+        assert report["batches"] == len(engine.batches) > 1
+        assert all(len(chunk.split()) <= 20 for _, chunks in engine.batches for c in chunks for chunk in c)
+
+    def test_unchanged_files_are_skipped_and_changed_ones_replaced(self, tmp_path):
+        docs = tmp_path / "docs"
+        _tree(docs, {"keep.md": "Stays the same.", "touch.md": "Only touched.", "edit.md": "Old text."})
+        engine = FakeEngine(tmp_path / "store")
+        ingester = BulkIngester(engine, workers=0)
+        ingester.ingest_dir(str(docs))
+        first_ids = {document.file_path or document.metadata["source_file"]: document.id
+                     for documents, _ in engine.batches for document in documents}
+
+        stat = os.stat(docs / "touch.md")
+        os.utime(docs / "touch.md", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        (docs / "edit.md").write_text("New text, longer than before.", encoding="utf-8")
+        engine.batches.clear()
+
+        report = ingester.ingest_dir(str(docs))
+
+        assert report["skipped_unchanged"] == 2
+        assert report["replaced"] == 1 and report["ingested"] == 0
+        (replaced,), _ = engine.batches[0]
+        assert replaced.content == "New text, longer than before."
+        old_id = first_ids[str((docs / "edit.md").resolve())]
+        assert engine.deleted == [old_id] and replaced.id != old_id
+        assert ingester.manifest.get(str((docs / "edit.md").resolve())).document_id == replaced.id
+
+        # The touched file's new mtime was recorded, so a third run reads nothing
+        engine.batches.clear()
+        report = ingester.ingest_dir(str(docs))
+        assert report["skipped_unchanged"] == 3 and not engine.batches
+
+    def test_force_reingests_and_replaces_previous_documents(self, tmp_path):
+        docs = tmp_path / "docs"
+        _tree(docs, {"a.md": "Alpha.", "b.md": "Beta."})
+        engine = FakeEngine(tmp_path / "store")
+        ingester = BulkIngester(engine, workers=0)
+        ingester.ingest_dir(str(docs))
+        first_ids = sorted(document.id for documents, _ in engine.batches for document in documents)
+
+        report = ingester.ingest_dir(str(docs), force=True)
+
+        assert report["replaced"] == 2
+        assert sorted(engine.deleted) == first_ids
+
+    def test_failed_write_keeps_the_previous_version(self, tmp_path):
+        docs = tmp_path / "docs"
+        _tree(docs, {"edit.md": "Old text."})
+        engine = FakeEngine(tmp_path / "store")
+        ingester = BulkIngester(engine, workers=0)
+        ingester.ingest_dir(str(docs))
+        path = str((docs / "edit.md").resolve())
+        old_record = ingester.manifest.get(path)
+
+        (docs / "edit.md").write_text("New text.", encoding="utf-8")
+        engine.fail_adds = True
+        with pytest.raises(RuntimeError):
+            ingester.ingest_dir(str(docs))
+
+        assert engine.deleted == []
+        assert ingester.manifest.get(path) == old_record
+
+    def test_files_without_chunks_are_recorded(self, tmp_path):
+        docs = tmp_path / "docs"
+        _tree(docs, {"empty.md": "", "blank.txt": "  \n"})
+        engine = FakeEngine(tmp_path / "store")
+        ingester = BulkIngester(engine, workers=0)
+
+        report = ingester.ingest_dir(str(docs))
+
+        assert report["empty"] == 2 and report["ingested"] == 0 and report["batches"] == 0
+        assert not engine.batches
+        assert ingester.manifest.get(str((docs / "empty.md").resolve())).document_id == ""
+        assert ingester.ingest_dir(str(docs))["skipped_unchanged"] == 2
+
+        (docs / "empty.md").write_text("Now has content.", encoding="utf-8")
+        report = ingester.ingest_dir(str(docs))
+        assert report["ingested"] == 1 and engine.deleted == []
+
+    def test_undecodable_files_are_reported_not_fatal(self, tmp_path):
+        docs = tmp_path / "docs"
+        _tree(docs, {"good.md": "Fine."})
+        (docs / "bad.md").write_bytes(b"\xff\xfe\x00bad")
+        engine = FakeEngine(tmp_path / "store")
+
+        report = BulkIngester(engine, workers=0).ingest_dir(str(docs))
+
+        assert report["failed"] == 1 and report["ingested"] == 1
+
+    def test_worker_processes(self, tmp_path):
+        docs = tmp_path / "docs"
+        _tree(docs, {f"n{i}.md": f"Document {i}. " + "More text. " * 30 for i in range(8)})
+        engine = FakeEngine(tmp_path / "store")
+
+        report = BulkIngester(engine, workers=2, write_batch=10).ingest_dir(str(docs))
+
+        assert report["ingested"] == 8 and report["failed"] == 0
+        titles = sorted(document.title for documents, _ in engine.batches for document in documents)
+        assert titles == [f"n{i}" for i in range(8)]
@@ -0,0 +1,90 @@
+"""
+Unit tests for the token-aware chunker.
+"""
+
+import pytest
+
+from rag_system.core.chunker import TokenChunker, ChunkProfile
+from rag_system.models.document import DocumentType
+
+
+def _sentences(prefix, count):
+    return " ".join(f"{prefix} sentence number {i} is here." for i in range(count))
+
+
+def _words(text):
+    return len(text.split())
+
+
+@pytest.mark.unit
+class TestTokenChunker:
+    """Token budget and boundary preferences (word tokens, no model tokenizer)"""
+
+    def test_short_text_is_one_chunk(self):
+        chunker = TokenChunker(max_tokens=50)
+
+        assert chunker.chunk("  A short note.  ") == ["A short note."]
+
+    def test_chunks_respect_the_token_limit(self):
+        chunker = TokenChunker(max_tokens=30)
+        text = _sentences("Plain", 40)
+
+        chunks = chunker.chunk(text)
+
+        assert len(chunks) > 1
+        assert all(_words(chunk) <= 30 for chunk in chunks)
+        assert chunks[0].startswith("Plain sentence number 0")
+        assert chunks[-1].endswith("number 39 is here.")
+
+    def test_cuts_end_on_sentences_with_overlap(self):
+        chunker = TokenChunker(max_tokens=30, profiles={})
+        text = _sentences("Plain", 40)
+
+        chunks = chunker.chunk(text)
+
+        assert all(chunk.endswith(".") for chunk in chunks)
+        # The overlap repeats the tail of one chunk at the start of the next
+        assert " ".join(chunks[1].split()[:5]) in chunks[0]
+
+    def test_cuts_prefer_markdown_sections(self):
+        chunker = TokenChunker(max_tokens=60)
+        text = (f"# Budget\n{_sentences('Budget', 6)}\n\n"
+                f"# Timeline\n{_sentences('Timeline', 6)}")
+
+        chunks = chunker.chunk(text)
+
+        assert chunks[0].startswith("# Budget")
+        assert "Timeline" not in chunks[0]
+        assert chunks[1].startswith("# Timeline")
+
+    def test_hard_cut_without_boundaries_stays_within_limit(self):
+        chunker = TokenChunker(max_tokens=10)
+        text = " ".join(f"w{i}" for i in range(35))
+
+        chunks = chunker.chunk(text)
+
+        assert all(_words(chunk) <= 10 for chunk in chunks)
+        assert chunks[-1].endswith("w34")
+
+    def test_code_profile_cuts_on_lines(self):
+        chunker = TokenChunker(max_tokens=200, profiles={
+            DocumentType.CODE_SNIPPET: ChunkProfile(max_tokens=12, overlap_tokens=0, split_lines=True)
+        })
+        text = "\n".join(f"value_{i} = compute(a, b) + offset" for i in range(10))
+
+        chunks = chunker.chunk(text, DocumentType.CODE_SNIPPET)
+
+        assert len(chunks) > 1
+        for chunk in chunks:
+            assert all(line.startswith("value_") and line.endswith("offset") for line in chunk.split("\n"))
+
+    def test_profile_sets_chunk_size_per_doc_type(self):
+        chunker = TokenChunker(max_tokens=400)
+        text = "\n".join(_sentences("Trace", 1) for _ in range(30))
+
+        default_chunks = chunker.chunk(text, DocumentType.MEETING_NOTES)
+        artifact_chunks = chunker.chunk(text, DocumentType.RUNTIME_ARTIFACT)
+
+        assert len(default_chunks) == 1
+        assert len(artifact_chunks) > 1
+        assert all(_words(chunk) <= 128 for chunk in artifact_chunks)
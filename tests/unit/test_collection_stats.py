@@ -0,0 +1,124 @@
+"""
+Unit tests for incrementally maintained collection statistics.
+"""
+
+import pytest
+
+from rag_system.core.collection_stats import CollectionStats
+
+
+def _meta(doc_type, client="", project=""):
+    return {"doc_type": doc_type, "client_name": client, "project_name": project}
+
+
+@pytest.mark.unit
+class TestCollectionStats:
+    """Counters follow adds and deletes and match a recount"""
+
+    def test_add_and_remove(self, tmp_path):
+        stats = CollectionStats(str(tmp_path / "stats.sqlite3"))
+        stats.add([_meta("meeting_notes", "acme", "site"), _meta("meeting_notes", "acme", "site"),
+                   _meta("runtime_artifact", project="infra")])
+
+        assert stats.snapshot() == {
+            "unique_clients": 1,
+            "unique_projects": 2,
+            "document_types": {"meeting_notes": 2, "runtime_artifact": 1},
+        }
+
+        stats.remove([_meta("runtime_artifact", project="infra")])
+
+        snapshot = stats.snapshot()
+        assert snapshot["unique_projects"] == 1
+        assert snapshot["document_types"] == {"meeting_notes": 2}
+
+    def test_recount_replaces_counters(self, tmp_path):
+        chunks = [_meta("template"), _meta("template", "globex"), {}]
+
+        class Collection:
+            def get(self, include, limit, offset):
+                page = chunks[offset:offset + limit]
+                return {"ids": [str(i) for i in range(offset, offset + len(page))], "metadatas": page}
+
+        stats = CollectionStats(str(tmp_path / "stats.sqlite3"))
+        stats.add([_meta("stale", "nobody")])
+        assert stats.counted_at is None
+
+        assert stats.recount(Collection(), page_size=2) == 3
+        assert stats.counted_at is not None
+        assert stats.snapshot() == {
+            "unique_clients": 1,
+            "unique_projects": 0,
+            "document_types": {"template": 2, "unknown": 1},
+        }
+
+
+class InMemoryCollection:
+    """Just enough of a Chroma collection for RAGEngine writes and recounts"""
+
+    def __init__(self):
+        self.rows = {}
+
+    def add(self, ids, embeddings, documents, metadatas):
+        for chunk_id, metadata in zip(ids, metadatas):
+            self.rows[chunk_id] = metadata
+
+    def get(self, where=None, include=None, limit=None, offset=0):
+        ids = [chunk_id for chunk_id, metadata in self.rows.items()
+               if not where or all(metadata.get(key) == value for key, value in where.items())]
+        ids = ids[offset:offset + limit] if limit is not None else ids
+        return {"ids": ids, "metadatas": [self.rows[chunk_id] for chunk_id in ids]}
+
+    def delete(self, ids):
+        for chunk_id in ids:
+            self.rows.pop(chunk_id, None)
+
+    def count(self):
+        return len(self.rows)
+
+
+@pytest.mark.unit
+class TestRAGEngineStats:
+    """The first write to a store without counters is counted exactly once"""
+
+    @staticmethod
+    def _engine(tmp_path):
+        from rag_system.core.rag_engine import RAGEngine
+
+        engine = RAGEngine(storage_path=str(tmp_path), batch_window=0)
+        engine._collection = InMemoryCollection()
+        engine._client = object()
+        engine.embed = lambda texts: [[0.0] for _ in texts]
+        return engine
+
+    @staticmethod
+    def _document(doc_type):
+        from rag_system.models.document import Document
+
+        return Document(title="notes", content="one chunk", doc_type=doc_type)
+
+    def test_first_add_is_not_double_counted(self, tmp_path):
+        from rag_system.models.document import DocumentType
+
+        engine = self._engine(tmp_path)
+        engine.add_documents([self._document(DocumentType.MEETING_NOTES)], chunks=[["one chunk"]])
+
+        assert engine.get_stats()["document_types"] == {"meeting_notes": 1}
+        assert engine.get_stats(recount=True)["document_types"] == {"meeting_notes": 1}
+
+    def test_first_delete_is_not_double_counted(self, tmp_path):
+        from rag_system.models.document import DocumentType
+
+        engine = self._engine(tmp_path)
+        engine.add_documents([self._document(DocumentType.MEETING_NOTES),
+                              self._document(DocumentType.MEETING_NOTES)],
+                             chunks=[["one chunk"], ["one chunk"]])
+        collection = engine._collection
+
+        # Another engine opens the same collection with no counters yet
+        engine = self._engine(tmp_path / "fresh")
+        engine._collection = collection
+        document_id = next(iter(collection.rows.values()))["document_id"]
+
+        assert engine.delete_document(document_id)
+        assert engine.get_stats()["document_types"] == {"meeting_notes": 1}
@@ -0,0 +1,48 @@
+"""
+Unit tests for the persistent embedding cache.
+"""
+
+import numpy as np
+import pytest
+
+from rag_system.core.embedding_cache import EmbeddingCache, chunk_digest
+
+
+@pytest.mark.unit
+class TestEmbeddingCache:
+    """Lookups, persistence and eviction"""
+
+    def test_hit_after_put_and_reopen(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path), "all-MiniLM-L6-v2", dim=4, capacity=8)
+        digest = chunk_digest("repeated error text")
+        vector = np.array([0.1, 0.2, 0.3, 0.4], dtype=np.float32)
+
+        assert cache.get_many([digest]) == [None]
+        cache.put_many([digest], vector[None, :])
+
+        reopened = EmbeddingCache(str(tmp_path), "all-MiniLM-L6-v2", dim=4, capacity=8)
+        [cached] = reopened.get_many([digest])
+        np.testing.assert_allclose(cached, vector)
+        assert reopened.stats()["hit_rate"] == 1.0
+        assert cache.stats()["misses"] == 1
+
+    def test_models_do_not_share_entries(self, tmp_path):
+        digest = chunk_digest("same text")
+        EmbeddingCache(str(tmp_path), "model-a", dim=2, capacity=4).put_many(
+            [digest], np.ones((1, 2), dtype=np.float32))
+
+        assert EmbeddingCache(str(tmp_path), "model-b", dim=2, capacity=4).get_many([digest]) == [None]
+
+    def test_least_recently_used_is_evicted(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path), "m", dim=2, capacity=2)
+        a, b, c = (chunk_digest(text) for text in "abc")
+        cache.put_many([a], np.full((1, 2), 1, dtype=np.float32))
+        cache.put_many([b], np.full((1, 2), 2, dtype=np.float32))
+        cache.get_many([a])  # a is now more recent than b
+
+        cache.put_many([c], np.full((1, 2), 3, dtype=np.float32))
+
+        hit_a, hit_b, hit_c = cache.get_many([a, b, c])
+        assert hit_b is None
+        assert hit_a[0] == 1 and hit_c[0] == 3
+        assert cache.stats()["evictions"] == 1
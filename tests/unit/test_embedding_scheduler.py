@@ -0,0 +1,59 @@
+"""
+Unit tests for the micro-batching embedding scheduler.
+"""
+
+import threading
+
+import pytest
+
+from rag_system.core.embedding_scheduler import EmbeddingScheduler
+
+
+@pytest.mark.unit
+class TestEmbeddingScheduler:
+    """Batching, result routing and errors"""
+
+    def test_concurrent_requests_share_batches(self):
+        calls = []
+
+        def embed(texts):
+            calls.append(list(texts))
+            return [[float(len(text))] for text in texts]
+
+        scheduler = EmbeddingScheduler(embed, max_batch=64, max_wait=0.05)
+        results = {}
+        barrier = threading.Barrier(20)
+
+        def request(i):
+            barrier.wait()
+            results[i] = scheduler.embed(["x" * i, "y" * (i + 100)])
+
+        threads = [threading.Thread(target=request, args=(i,)) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        scheduler.close()
+
+        assert results == {i: [[float(i)], [float(i + 100)]] for i in range(20)}
+        assert len(calls) < 20
+        metrics = scheduler.metrics()
+        assert metrics["requests"] == 20
+        assert metrics["texts"] == 40
+        assert metrics["batches"] == len(calls)
+
+    def test_full_batch_does_not_wait(self):
+        scheduler = EmbeddingScheduler(lambda texts: [[0.0]] * len(texts), max_batch=2, max_wait=5)
+
+        assert scheduler.embed(["a", "b"]) == [[0.0], [0.0]]
+        scheduler.close()
+
+    def test_errors_reach_every_caller(self):
+        def embed(texts):
+            raise RuntimeError("model failed")
+
+        scheduler = EmbeddingScheduler(embed, max_wait=0)
+
+        with pytest.raises(RuntimeError, match="model failed"):
+            scheduler.embed(["a"])
+        scheduler.close()
@@ -0,0 +1,103 @@
+"""
+Unit tests for the BM25 keyword index and hybrid rank fusion.
+"""
+
+import pytest
+
+from rag_system.core.lexical_index import LexicalIndex, fts_query
+from rag_system.core.rag_engine import RAGEngine, reciprocal_rank_fusion
+
+
+def _chunk(document_id, text, tags="", title="", chunk_index=0):
+    return (f"{document_id}_chunk_{chunk_index}", text,
+            {"document_id": document_id, "title": title or document_id, "tags": tags})
+
+
+class FakeCollection:
+    """Chroma get() over an in-memory list of chunks"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def get(self, ids=None, where=None, include=None, limit=None, offset=0):
+        rows = [c for c in self.chunks if ids is None or c[0] in ids]
+        if where:
+            rows = [c for c in rows if all(c[2].get(k) == v for k, v in where.items())]
+        rows = rows[offset:offset + limit] if limit else rows
+        return {"ids": [c[0] for c in rows], "documents": [c[1] for c in rows],
+                "metadatas": [c[2] for c in rows]}
+
+
+CHUNKS = [
+    _chunk("reset", "Worker crashed with ERR_CONN_RESET in src/sync/client.py", tags="error,to:planner"),
+    _chunk("budget", "Connection budget review with the client", tags="meeting"),
+    _chunk("hello", "The planner agent says hello to everyone", tags="message,to:coder"),
+]
+
+
+@pytest.mark.unit
+class TestLexicalIndex:
+    """Exact identifiers, tags and sync"""
+
+    def test_query_words_become_quoted_phrases(self):
+        assert fts_query('to:planner "quoted" src/app.py, OR -') == '"to:planner" OR "quoted" OR "src/app.py" OR "OR"'
+        assert fts_query(' ?! ') is None
+
+    def test_exact_identifiers_and_paths(self, tmp_path):
+        index = LexicalIndex(str(tmp_path / "lexical.sqlite3"))
+        index.add(CHUNKS)
+
+        assert [c for c, _ in index.search("ERR_CONN_RESET", 5)] == ["reset_chunk_0"]
+        assert [c for c, _ in index.search("src/sync/client.py", 5)] == ["reset_chunk_0"]
+        # The tag matches as a phrase, not the bare word "planner" in another chunk
+        assert [c for c, _ in index.search("to:planner", 5)] == ["reset_chunk_0"]
+
+    def test_re_adding_a_chunk_replaces_it_and_remove_drops_a_document(self, tmp_path):
+        index = LexicalIndex(str(tmp_path / "lexical.sqlite3"))
+        index.add(CHUNKS)
+
+        index.add([_chunk("reset", "Rewritten text")])
+        index.remove("budget")
+
+        assert index.search("ERR_CONN_RESET", 5) == []
+        assert [c for c, _ in index.search("rewritten", 5)] == ["reset_chunk_0"]
+        assert index.search("budget", 5) == []
+
+    def test_rebuild_from_collection(self, tmp_path):
+        index = LexicalIndex(str(tmp_path / "lexical.sqlite3"))
+        assert not index.built
+
+        assert index.rebuild(FakeCollection(CHUNKS), page_size=2) == 3
+        assert index.built
+        assert [c for c, _ in index.search("hello", 5)] == ["hello_chunk_0"]
+
+
+@pytest.mark.unit
+class TestHybridQuery:
+    """Rank fusion and lexical queries through the engine"""
+
+    def test_reciprocal_rank_fusion(self):
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "a", "d"]])
+
+        assert fused["a"] == fused["b"] == pytest.approx((1 / 61 + 1 / 62) / (2 / 61))
+        assert fused["a"] > fused["c"] > 0 and fused["c"] == fused["d"]
+        assert reciprocal_rank_fusion([["x"], ["x"]])["x"] == pytest.approx(1.0)
+
+    def test_lexical_mode_applies_the_where_filter(self, tmp_path):
+        chunks = CHUNKS + [_chunk("note", "Noted ERR_CONN_RESET again", tags="note")]
+        chunks[-1][2]["doc_type"] = "meeting_notes"
+        for chunk in chunks[:-1]:
+            chunk[2]["doc_type"] = "runtime_artifact"
+        engine = RAGEngine(storage_path=str(tmp_path))
+        engine._collection = FakeCollection(chunks)
+
+        results = engine.query("ERR_CONN_RESET", n_results=5, apply_artifact_boosting=False, mode="lexical",
+                               filter_dict={"doc_type": "runtime_artifact"})
+
+        assert [r.chunk_id for r in results] == ["reset_chunk_0"]
+        assert results[0].score == pytest.approx(1.0)
+        assert results[0].document_id == "reset"
+
+    def test_unknown_mode_is_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            RAGEngine(storage_path=str(tmp_path)).query("x", mode="fuzzy")
@@ -0,0 +1,108 @@
+"""
+Unit tests for the append-only local message board.
+"""
+
+import asyncio
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from a2a_communicating_agents.agent_messaging.local_board import LocalBoard
+from a2a_communicating_agents.agent_messaging.message_models import AgentMessage
+from a2a_communicating_agents.agent_messaging.rag_board_transport import RAGBoardTransport
+
+
+def _record(i: int, to_agent: str = "agent-b", topic: str = "general") -> dict:
+    return {"id": f"local-{i}", "from_agent": "agent-a", "to_agent": to_agent, "topic": topic,
+            "priority": "normal", "timestamp": f"2025-01-01T00:00:{i:02d}", "content": f"m{i}"}
+
+
+@pytest.mark.unit
+class TestLocalBoard:
+    """Appending, tailing, indexing and rotation"""
+
+    def test_refresh_reads_only_new_records(self, tmp_path):
+        board = LocalBoard(tmp_path / "board.jsonl")
+        board.append(_record(1))
+        assert [r["id"] for r in board.refresh()] == ["local-1"]
+
+        offset = board.offset
+        board.append(_record(2))
+        assert [r["id"] for r in board.refresh()] == ["local-2"]
+        assert board.offset > offset
+        assert board.refresh() == []
+
+    def test_records_from_another_writer_are_picked_up(self, tmp_path):
+        reader = LocalBoard(tmp_path / "board.jsonl")
+        writer = LocalBoard(tmp_path / "board.jsonl")
+        writer.append(_record(1, to_agent="Coder-Agent"))
+        reader.refresh()
+
+        assert [r["id"] for r in reader.query("coder-agent")] == ["local-1"]
+
+    def test_partial_line_waits_for_the_rest(self, tmp_path):
+        path = tmp_path / "board.jsonl"
+        board = LocalBoard(path)
+        with open(path, "ab") as f:
+            f.write(b'{"id": "local-1", "to_agent": "x"')
+        assert board.refresh() == []
+        with open(path, "ab") as f:
+            f.write(b', "topic": "general"}\n')
+        assert [r["id"] for r in board.refresh()] == ["local-1"]
+
+    def test_query_filters_by_recipient_and_topic_newest_first(self, tmp_path):
+        board = LocalBoard(tmp_path / "board.jsonl")
+        for i in range(6):
+            board.append(_record(i, to_agent="agent-b" if i % 2 else "agent-c", topic="code" if i < 4 else "general"))
+        board.refresh()
+
+        assert [r["id"] for r in board.query("agent-b", "code")] == ["local-3", "local-1"]
+        assert [r["id"] for r in board.query(topic="general", limit=1)] == ["local-5"]
+
+    def test_rotation_keeps_tailing_and_prunes_segments(self, tmp_path):
+        path = tmp_path / "board.jsonl"
+        board = LocalBoard(path, segment_bytes=200, keep_segments=2)
+        seen = []
+        for i in range(10):
+            if board.needs_rotation(board.append(_record(i))):
+                seen.extend(board.refresh())
+                board.rotate()
+        seen.extend(board.refresh())
+
+        assert [r["id"] for r in seen] == [f"local-{i}" for i in range(10)]
+        assert len(board.segments()) == 2
+
+        reopened = LocalBoard(path, segment_bytes=200, keep_segments=2)
+        assert reopened.query(limit=1)[0]["id"] == "local-9"
+
+    @pytest.mark.asyncio
+    async def test_wait_for_append_wakes_up_on_write(self, tmp_path):
+        board = LocalBoard(tmp_path / "board.jsonl")
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.05, board.append, _record(1))
+
+        started = time.monotonic()
+        await board.wait_for_append(timeout=2)
+
+        assert time.monotonic() - started < 1.5
+        board.close()
+
+
+@pytest.mark.unit
+class TestRAGBoardLocalPoll:
+    """RAGBoardTransport reads its own local board"""
+
+    @pytest.mark.asyncio
+    async def test_sent_message_is_polled_from_local_board(self, tmp_path):
+        doc_manager = Mock()
+        doc_manager.add_runtime_artifact = Mock(return_value="artifact-1")
+        doc_manager.rag_engine.collection.get = Mock(return_value={})
+        transport = RAGBoardTransport(doc_manager, local_board_path=tmp_path / "board.jsonl")
+
+        await transport.send(AgentMessage(to_agent="agent-b", from_agent="agent-a", content="hello", topic="general"))
+        messages = await transport.poll_messages("agent-b", topic="general")
+
+        assert len(messages) == 1
+        assert "hello" in messages[0].content
+        assert messages[0].from_agent == "agent-a"
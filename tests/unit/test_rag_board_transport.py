@@ -4,6 +4,8 @@ Unit tests for RAGBoardTransport.
 Tests RAG-based message persistence and MessageTransport interface.
 """
 
+import time
+
 import pytest
 from unittest.mock import Mock, AsyncMock
 from a2a_communicating_agents.agent_messaging.rag_board_transport import RAGBoardTransport
@@ -33,12 +35,12 @@ class TestRAGBoardTransport:
         assert transport.is_connected() == True
     
     @pytest.mark.asyncio
-    async def test_send_message_persists_to_rag(self):
+    async def test_send_message_persists_to_rag(self, tmp_path):
         """Should persist message to RAG with tags"""
         mock_doc_manager = Mock()
         mock_doc_manager.add_runtime_artifact = Mock(return_value="artifact-123")
         
-        transport = RAGBoardTransport(mock_doc_manager)
+        transport = RAGBoardTransport(mock_doc_manager, local_board_path=tmp_path / "board.jsonl")
         
         message = AgentMessage(
             to_agent="agent-b",
@@ -60,12 +62,12 @@ class TestRAGBoardTransport:
         assert "from:agent-a" in call_kwargs['tags']
     
     @pytest.mark.asyncio
-    async def test_send_message_failure(self):
+    async def test_send_message_failure(self, tmp_path):
         """Should return False on persistence failure"""
         mock_doc_manager = Mock()
         mock_doc_manager.add_runtime_artifact = Mock(side_effect=Exception("DB error"))
         
-        transport = RAGBoardTransport(mock_doc_manager)
+        transport = RAGBoardTransport(mock_doc_manager, local_board_path=tmp_path / "board.jsonl")
         
         message = AgentMessage(
             to_agent="agent-b",
@@ -134,3 +136,263 @@ class TestRAGBoardTransport:
         
         assert len(messages) == 2
         mock_doc_manager.search_artifacts.assert_called_once()
+
+
+class FakeMessageCollection:
+    """Chroma stand-in that applies ``where``, ``limit`` and ``offset`` like get()"""
+
+    def __init__(self):
+        self.rows = []
+        self.calls = []
+
+    def add_message(self, message_id, created_ts, topic="general", content="hi"):
+        self.rows.append((f"{message_id}_chunk_0", content, {
+            "document_id": message_id, "chunk_index": 0, "doc_type": "runtime_artifact",
+            "artifact_type": "message", "to_agent": "board", "from_agent": "agent-b",
+            "topic": topic, "message_id": message_id, "created_ts": created_ts,
+        }))
+
+    @staticmethod
+    def _matches(metadata, where):
+        for clause in where.get("$and", [where]):
+            for key, condition in clause.items():
+                value = metadata.get(key)
+                if isinstance(condition, dict):
+                    if value is None or value < condition["$gte"]:
+                        return False
+                elif value != condition:
+                    return False
+        return True
+
+    def get(self, where=None, include=None, limit=None, offset=0):
+        self.calls.append({"where": where, "limit": limit, "offset": offset})
+        rows = [row for row in self.rows if self._matches(row[2], where or {})]
+        rows = rows[offset or 0:]
+        if limit is not None:
+            rows = rows[:limit]
+        return {
+            "ids": [row[0] for row in rows],
+            "documents": [row[1] for row in rows],
+            "metadatas": [dict(row[2]) for row in rows],
+        }
+
+
+@pytest.mark.unit
+class TestRAGBoardPushDelivery:
+    """Background delivery to subscribed callbacks"""
+
+    @staticmethod
+    def _doc_manager(chroma_response=None):
+        doc_manager = Mock()
+        doc_manager.add_runtime_artifact = Mock(return_value="artifact-1")
+        doc_manager.rag_engine.collection.get = Mock(return_value=chroma_response or {})
+        return doc_manager
+
+    @pytest.mark.asyncio
+    async def test_message_from_another_process_is_pushed(self, tmp_path):
+        import asyncio
+
+        board_path = tmp_path / "board.jsonl"
+        receiver = RAGBoardTransport(self._doc_manager(), local_board_path=board_path)
+        sender = RAGBoardTransport(self._doc_manager(), local_board_path=board_path)
+        received = asyncio.Queue()
+
+        async def callback(msg):
+            await received.put(msg)
+
+        await receiver.subscribe("orchestrator", callback)
+        await sender.send(AgentMessage(to_agent="board", from_agent="coder-agent",
+                                       content="done", topic="orchestrator"))
+        message = await asyncio.wait_for(received.get(), timeout=2)
+
+        assert message.content == "done"
+        assert message.from_agent == "coder-agent"
+        assert message.topic == "orchestrator"
+        await receiver.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_chroma_messages_are_delivered_once(self, tmp_path):
+        import asyncio
+        from datetime import datetime, timedelta
+
+        board_path = tmp_path / "board.jsonl"
+        sender = RAGBoardTransport(self._doc_manager(), local_board_path=board_path)
+        receiver = RAGBoardTransport(self._doc_manager(), local_board_path=board_path)
+        received = []
+
+        async def callback(msg):
+            received.append(msg)
+
+        await receiver.subscribe("general", callback)
+        await sender.send(AgentMessage(to_agent="board", from_agent="agent-a", content="hi", topic="general"))
+        message_id = sender.doc_manager.add_runtime_artifact.call_args[1]["tags"][-1]
+        created_at = (datetime.now() + timedelta(seconds=1)).isoformat()
+        receiver.doc_manager.rag_engine.collection.get.return_value = {
+            "ids": ["doc_chunk_0", "remote_chunk_0"],
+            "documents": [
+                "**From:** agent-a **To:** board **Topic:** general **Priority:** normal "
+                "**Time:** 2025-01-01T00:00:00 hi",
+                "**From:** agent-b **To:** board **Topic:** general **Priority:** normal "
+                "**Time:** 2025-01-01T00:00:01 from another host",
+            ],
+            "metadatas": [
+                {"document_id": "doc", "chunk_index": 0, "created_at": created_at,
+                 "tags": f"message,general,to:board,from:agent-a,{message_id}"},
+                {"document_id": "remote", "chunk_index": 0, "created_at": created_at,
+                 "tags": "message,general,to:board,from:agent-b,msg:remote-id"},
+            ],
+        }
+        await asyncio.sleep(1.0)
+
+        assert [m.content for m in received] == ["hi", "from another host"]
+        await receiver.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_chroma_burst_larger_than_a_page_is_delivered(self, tmp_path):
+        import asyncio
+        from a2a_communicating_agents.agent_messaging import rag_board_transport
+
+        collection = FakeMessageCollection()
+        doc_manager = self._doc_manager()
+        doc_manager.rag_engine.collection = collection
+        receiver = RAGBoardTransport(doc_manager, local_board_path=tmp_path / "board.jsonl")
+        received = []
+
+        async def callback(msg):
+            received.append(msg)
+
+        await receiver.subscribe("general", callback)
+        burst = rag_board_transport.CHROMA_SCAN_LIMIT * 2 + 10
+        for index in range(burst):
+            collection.add_message(f"m{index}", time.time(), content=f"message {index}")
+        await asyncio.sleep(1.0)
+
+        assert [m.content for m in received] == [f"message {index}" for index in range(burst)]
+        assert all(call["limit"] == rag_board_transport.CHROMA_SCAN_LIMIT for call in collection.calls)
+        await receiver.disconnect()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("zone", ["America/New_York", "Asia/Tokyo"])
+    async def test_chroma_mark_is_epoch_time_in_any_timezone(self, tmp_path, monkeypatch, zone):
+        import asyncio
+        from datetime import datetime, timedelta
+
+        monkeypatch.setenv("TZ", zone)
+        time.tzset()
+        try:
+            collection = FakeMessageCollection()
+            doc_manager = self._doc_manager()
+            doc_manager.rag_engine.collection = collection
+            receiver = RAGBoardTransport(doc_manager, local_board_path=tmp_path / "board.jsonl")
+            received = []
+
+            async def callback(msg):
+                received.append(msg)
+
+            # Document.created_at is naive local time
+            collection.add_message("old", (datetime.now() - timedelta(hours=2)).timestamp(),
+                                   content="before subscribe")
+            await receiver.subscribe("general", callback)
+            collection.add_message("new", datetime.now().timestamp(), content="after subscribe")
+            await asyncio.sleep(1.0)
+
+            assert abs(receiver._chroma_mark - time.time()) < 60
+            assert [m.content for m in received] == ["after subscribe"]
+            await receiver.disconnect()
+        finally:
+            monkeypatch.undo()
+            time.tzset()
+
+
+@pytest.mark.unit
+class TestRAGBoardMetadataQueries:
+    """Routing fields stored as Chroma metadata"""
+
+    @pytest.mark.asyncio
+    async def test_send_stores_routing_metadata(self, tmp_path):
+        doc_manager = Mock()
+        doc_manager.add_runtime_artifact = Mock(return_value="artifact-1")
+        transport = RAGBoardTransport(doc_manager, local_board_path=tmp_path / "board.jsonl")
+
+        await transport.send(AgentMessage(to_agent="Coder-Agent", from_agent="orchestrator-agent",
+                                          content="build it", topic="Code"))
+
+        metadata = doc_manager.add_runtime_artifact.call_args[1]["metadata"]
+        assert metadata["to_agent"] == "coder-agent"
+        assert metadata["from_agent"] == "orchestrator-agent"
+        assert metadata["topic"] == "code"
+        assert metadata["message_id"]
+
+    def test_inbox_query_filters_in_chroma(self, tmp_path):
+        doc_manager = Mock()
+        doc_manager.rag_engine.collection.get = Mock(return_value={
+            "ids": ["old_chunk_0", "new_chunk_0"],
+            "documents": ["older", "newer"],
+            "metadatas": [
+                {"document_id": "old", "created_ts": 100.0, "from_agent": "agent-a", "topic": "code"},
+                {"document_id": "new", "created_ts": 200.0, "from_agent": "agent-b", "topic": "code"},
+            ],
+        })
+        transport = RAGBoardTransport(doc_manager, local_board_path=tmp_path / "board.jsonl")
+
+        items = transport._fetch_by_metadata("Coder-Agent", "Code", limit=2)
+
+        where = doc_manager.rag_engine.collection.get.call_args[1]["where"]["$and"]
+        assert {"to_agent": "coder-agent"} in where
+        assert {"topic": "code"} in where
+        assert any("created_ts" in clause for clause in where)
+        assert [item.content for item in items] == ["newer", "older"]
+        assert items[0].from_agent == "agent-b"
+        doc_manager.backfill_message_metadata.assert_called_once()
+
+    def test_inbox_query_widens_window_until_full(self, tmp_path):
+        doc_manager = Mock()
+        doc_manager.rag_engine.collection.get = Mock(return_value={"ids": [], "documents": [], "metadatas": []})
+        transport = RAGBoardTransport(doc_manager, local_board_path=tmp_path / "board.jsonl")
+
+        transport._fetch_by_metadata("coder-agent", None, limit=5)
+        transport._fetch_by_metadata("coder-agent", None, limit=5)
+
+        calls = doc_manager.rag_engine.collection.get.call_args_list
+        # Every window was tried on each query; the last one has no time bound
+        assert len(calls) == 2 * 5
+        assert not any("created_ts" in clause for clause in calls[-1][1]["where"]["$and"])
+        assert all(call[1]["limit"] == 5 for call in calls)
+        doc_manager.backfill_message_metadata.assert_called_once()
+
+    @pytest.mark.parametrize("zone", ["America/New_York", "Asia/Tokyo"])
+    def test_inbox_windows_use_epoch_time(self, tmp_path, monkeypatch, zone):
+        monkeypatch.setenv("TZ", zone)
+        time.tzset()
+        try:
+            collection = FakeMessageCollection()
+            collection.add_message("recent", time.time() - 60, content="a minute ago")
+            collection.add_message("older", time.time() - 7200, content="two hours ago")
+            doc_manager = Mock()
+            doc_manager.rag_engine.collection = collection
+            transport = RAGBoardTransport(doc_manager, local_board_path=tmp_path / "board.jsonl")
+
+            items = transport._fetch_by_metadata("board", None, limit=1)
+
+            # The five minute window already holds the message
+            assert [item.content for item in items] == ["a minute ago"]
+            assert len(collection.calls) == 1
+        finally:
+            monkeypatch.undo()
+            time.tzset()
+
+    def test_inbox_keeps_newest_when_wider_window_is_capped(self, tmp_path):
+        collection = FakeMessageCollection()
+        for index in range(5):
+            collection.add_message(f"old{index}", time.time() - 1800 - index, content=f"old {index}")
+        collection.add_message("new", time.time() - 10, content="new")
+        doc_manager = Mock()
+        doc_manager.rag_engine.collection = collection
+        transport = RAGBoardTransport(doc_manager, local_board_path=tmp_path / "board.jsonl")
+
+        # The capped hour window returns only the older rows
+        items = transport._fetch_by_metadata("board", None, limit=3)
+
+        assert len(collection.calls) == 2
+        assert len(items) == 3
+        assert items[0].content == "new"
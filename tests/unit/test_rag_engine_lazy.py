@@ -0,0 +1,49 @@
+"""
+Unit tests for RAGEngine's lazy initialization.
+"""
+
+import sys
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from rag_system.core.rag_engine import RAGEngine
+
+
+@pytest.mark.unit
+class TestRAGEngineLazyInit:
+    """Heavy resources are created on first use, not in __init__"""
+
+    def test_construction_loads_nothing(self, tmp_path):
+        engine = RAGEngine(storage_path=str(tmp_path))
+
+        assert not engine.model_loaded
+        assert engine._collection is None
+        assert "sentence_transformers" not in sys.modules
+
+    def test_collection_opens_once_on_first_use(self, tmp_path):
+        engine = RAGEngine(storage_path=str(tmp_path))
+        collection = Mock()
+
+        def open_collection():
+            engine._collection = collection
+            return collection
+
+        with patch.object(engine, "_open_collection", side_effect=open_collection) as opened:
+            assert engine.collection is collection
+            assert engine.collection is collection
+
+        opened.assert_called_once()
+
+    def test_warm_up_loads_in_background(self, tmp_path):
+        engine = RAGEngine(storage_path=str(tmp_path))
+        loaded = threading.Event()
+
+        with patch.object(engine, "_open_collection"), \
+                patch.object(engine, "_load_model", side_effect=lambda: loaded.set()):
+            thread = engine.warm_up()
+            thread.join(timeout=5)
+
+        assert loaded.is_set()
+        assert engine.warm_up() is thread
@@ -0,0 +1,135 @@
+"""
+Unit tests for the local RAG service and its client.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from rag_system.core.rag_service import RAGService, RemoteRAGEngine, RAGServiceError, RAGServiceLostError
+from rag_system.models.document import Document, DocumentType, QueryResult
+
+
+class FakeEngine:
+    """Records calls instead of embedding; the first add is slow so others queue up"""
+
+    def __init__(self):
+        self.add_batches = []
+        self.embed_calls = []
+
+    def add_documents(self, documents):
+        if not self.add_batches:
+            time.sleep(0.2)
+        self.add_batches.append([d.title for d in documents])
+        return [f"id-{d.title}" for d in documents]
+
+    def add_document(self, document):
+        return self.add_documents([document])[0]
+
+    def embed(self, texts):
+        self.embed_calls.append(list(texts))
+        return [[float(len(t))] for t in texts]
+
+    def query(self, query_text, n_results=5, filter_dict=None, apply_artifact_boosting=True,
+              query_embedding=None, mode="vector"):
+        return [QueryResult(content=query_text, score=0.5, document_id="d", chunk_id="d_chunk_0",
+                            metadata={"filter": filter_dict, "mode": mode, "embedding": query_embedding})]
+
+    def get_stats(self, recount=False):
+        raise ValueError("stats exploded")
+
+
+@pytest.fixture
+async def service(tmp_path):
+    service = RAGService(FakeEngine(), str(tmp_path / "rag.sock"))
+    await service.start()
+    yield service
+    await service.close()
+
+
+@pytest.mark.unit
+class TestRAGService:
+    """Requests over the Unix socket"""
+
+    @pytest.mark.asyncio
+    async def test_query_round_trip(self, service):
+        client = RemoteRAGEngine(service.path)
+
+        [result] = await asyncio.to_thread(client.query, "deploy error", 3, {"doc_type": "runtime_artifact"})
+
+        assert isinstance(result, QueryResult)
+        assert result.content == "deploy error"
+        assert result.metadata["filter"] == {"doc_type": "runtime_artifact"}
+
+        [result] = await asyncio.to_thread(client.query, "ERR_CONN_RESET", 3, None, True, mode="lexical")
+        assert result.metadata["mode"] == "lexical"
+
+        [result] = await asyncio.to_thread(client.query, "deploy error", 3, None, True, [0.25, 0.5])
+        assert result.metadata["embedding"] == [0.25, 0.5]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_adds_are_batched(self, service):
+        client = RemoteRAGEngine(service.path)
+        results = {}
+
+        def add(title):
+            results[title] = client.add_document(
+                Document(title=title, content="text", doc_type=DocumentType.CONVERSATION))
+
+        threads = [threading.Thread(target=add, args=(f"doc{i}",)) for i in range(5)]
+        await asyncio.to_thread(lambda: [t.start() for t in threads] and [t.join() for t in threads])
+
+        assert results == {f"doc{i}": f"id-doc{i}" for i in range(5)}
+        assert len(service.engine.add_batches) < 5
+        assert sorted(sum(service.engine.add_batches, [])) == sorted(results)
+
+    @pytest.mark.asyncio
+    async def test_errors_are_raised_in_the_client(self, service):
+        client = RemoteRAGEngine(service.path)
+
+        with pytest.raises(RAGServiceError, match="stats exploded"):
+            await asyncio.to_thread(client.get_stats)
+
+
+@pytest.mark.unit
+class TestRemoteFallback:
+    """Only undelivered requests fall back to a local engine"""
+
+    @pytest.mark.asyncio
+    async def test_unreachable_service_falls_back(self, tmp_path, monkeypatch):
+        from rag_system.core import rag_service
+
+        local = FakeEngine()
+        monkeypatch.setattr(rag_service, "RAGEngine", lambda storage_path: local)
+        client = RemoteRAGEngine(str(tmp_path / "missing.sock"), str(tmp_path))
+
+        document = Document(title="doc", content="text", doc_type=DocumentType.CONVERSATION)
+        assert await asyncio.to_thread(client.add_document, document) == "id-doc"
+        assert local.add_batches == [["doc"]]
+
+    @pytest.mark.asyncio
+    async def test_lost_response_is_not_retried_locally(self, tmp_path, monkeypatch):
+        from rag_system.core import rag_service
+
+        local = FakeEngine()
+        monkeypatch.setattr(rag_service, "RAGEngine", lambda storage_path: local)
+        received = []
+
+        async def read_then_hang_up(reader, writer):
+            received.append(await reader.readline())
+            writer.close()
+
+        path = str(tmp_path / "rag.sock")
+        server = await asyncio.start_unix_server(read_then_hang_up, path=path)
+        client = RemoteRAGEngine(path, str(tmp_path))
+        document = Document(title="doc", content="text", doc_type=DocumentType.CONVERSATION)
+
+        with pytest.raises(RAGServiceLostError):
+            await asyncio.to_thread(client.add_document, document)
+
+        server.close()
+        await server.wait_closed()
+        assert len(received) == 1
+        assert local.add_batches == []
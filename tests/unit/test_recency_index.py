@@ -0,0 +1,57 @@
+"""
+Unit tests for the time-ordered recency index.
+"""
+
+import pytest
+
+from rag_system.core.recency_index import RecencyIndex
+
+
+def _chunk(document_id, ts, doc_type="runtime_artifact", artifact_type="error", chunk_index=0):
+    return (f"{document_id}_chunk_{chunk_index}",
+            {"document_id": document_id, "created_ts": ts, "doc_type": doc_type,
+             "artifact_type": artifact_type, "chunk_index": chunk_index})
+
+
+@pytest.mark.unit
+class TestRecencyIndex:
+    """Ordering, filters and sync"""
+
+    def test_latest_is_newest_first_and_one_row_per_document(self, tmp_path):
+        index = RecencyIndex(str(tmp_path / "recency.sqlite3"))
+        index.add([_chunk("old", 100.0), _chunk("new", 300.0), _chunk("mid", 200.0),
+                   _chunk("new", 300.0, chunk_index=1)])
+
+        assert index.latest(2) == ["new_chunk_0", "mid_chunk_0"]
+
+    def test_type_filters_apply_before_the_limit(self, tmp_path):
+        index = RecencyIndex(str(tmp_path / "recency.sqlite3"))
+        index.add([_chunk("fix", 100.0, artifact_type="fix"),
+                   _chunk("err1", 200.0), _chunk("err2", 300.0),
+                   _chunk("note", 400.0, doc_type="meeting_notes", artifact_type="")])
+
+        assert index.latest(1, artifact_type="fix") == ["fix_chunk_0"]
+        assert index.latest(5, doc_type="runtime_artifact") == ["err2_chunk_0", "err1_chunk_0", "fix_chunk_0"]
+
+    def test_remove(self, tmp_path):
+        index = RecencyIndex(str(tmp_path / "recency.sqlite3"))
+        index.add([_chunk("a", 1.0), _chunk("b", 2.0)])
+
+        index.remove("b")
+
+        assert index.latest(5) == ["a_chunk_0"]
+
+    def test_rebuild_pages_through_collection(self, tmp_path):
+        chunks = [_chunk(f"doc{i}", float(i)) for i in range(5)]
+
+        class Collection:
+            def get(self, where, include, limit, offset):
+                page = chunks[offset:offset + limit]
+                return {"ids": [c[0] for c in page], "metadatas": [c[1] for c in page]}
+
+        index = RecencyIndex(str(tmp_path / "recency.sqlite3"))
+        assert not index.built
+
+        assert index.rebuild(Collection(), page_size=2) == 5
+        assert index.built
+        assert RecencyIndex(str(tmp_path / "recency.sqlite3")).latest(2) == ["doc4_chunk_0", "doc3_chunk_0"]
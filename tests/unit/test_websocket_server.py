@@ -0,0 +1,230 @@
+"""
+Unit tests for the WebSocket message board server.
+
+Covers broadcast fan-out through per-client outboxes and the slow client
+policies.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from a2a_communicating_agents.agent_messaging import websocket_server as board
+
+
+class FakeSocket:
+    """Minimal stand-in for a server-side websocket connection"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent = []
+        self.closed = False
+
+    async def send(self, payload):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(payload)
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+async def clean_board():
+    """Reset the module-level board state around each test"""
+    for state in (board.clients, board.subscriptions, board.message_history, board.topic_sequences, board.outboxes):
+        state.clear()
+    yield
+    for agent_id in list(board.clients):
+        await board.unregister_client(agent_id)
+    await asyncio.sleep(0.01)
+    for state in (board.clients, board.subscriptions, board.message_history, board.topic_sequences, board.outboxes):
+        state.clear()
+
+
+async def _subscribe(agent_id: str, websocket: FakeSocket, topic: str = "general"):
+    await board.register_client(websocket, agent_id)
+    await board.subscribe_to_topic(agent_id, topic)
+
+
+@pytest.mark.unit
+class TestBroadcastFanOut:
+    """Broadcasts are serialized once and never wait on a slow subscriber"""
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_does_not_delay_others(self):
+        fast, slow = FakeSocket(), FakeSocket(delay=10)
+        await _subscribe("fast", fast)
+        await _subscribe("slow", slow)
+
+        await asyncio.wait_for(board.broadcast_message({"content": "hi"}, "general", "sender"), timeout=1)
+        await asyncio.sleep(0.01)
+
+        assert len(fast.sent) == 1
+        assert slow.sent == []
+
+    @pytest.mark.asyncio
+    async def test_envelope_is_serialized_once(self):
+        a, b = FakeSocket(), FakeSocket()
+        await _subscribe("a", a)
+        await _subscribe("b", b)
+
+        await board.broadcast_message({"content": "hi"}, "general", "sender")
+        await asyncio.sleep(0.01)
+
+        assert a.sent[0] is b.sent[0]
+
+
+@pytest.mark.unit
+class TestClientOutbox:
+    """Bounded outbox behaviour for slow clients"""
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_keeps_newest_messages(self):
+        outbox = board.ClientOutbox("slow", FakeSocket(delay=10), maxsize=2, policy="drop_oldest")
+        for i in range(5):
+            assert outbox.offer(f"m{i}")
+
+        assert outbox.dropped >= 2
+        assert list(outbox.queue._queue)[-1][0] == "m4"
+        outbox.stop()
+        await asyncio.sleep(0)
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_sends_gap_notice_before_remaining_messages(self):
+        websocket = FakeSocket(delay=0.01)
+        outbox = board.ClientOutbox("slow", websocket, maxsize=2, policy="drop_oldest")
+        for seq in range(1, 6):
+            outbox.offer(f"m{seq}", "general", seq)
+        await asyncio.sleep(0.1)
+
+        assert json.loads(websocket.sent[0]) == {"type": "gap", "topic": "general", "from_seq": 1}
+        assert websocket.sent[1:] == ["m4", "m5"]
+        outbox.stop()
+
+    @pytest.mark.asyncio
+    async def test_disconnect_policy_closes_full_client(self):
+        websocket = FakeSocket(delay=10)
+        outbox = board.ClientOutbox("slow", websocket, maxsize=1, policy="disconnect")
+
+        results = [outbox.offer(f"m{i}") for i in range(3)]
+        await asyncio.sleep(0.01)
+
+        assert results[-1] is False
+        assert outbox.closed
+        assert websocket.closed
+
+    @pytest.mark.asyncio
+    async def test_send_timeout_disconnects_client(self):
+        websocket = FakeSocket(delay=10)
+        outbox = board.ClientOutbox("stuck", websocket, send_timeout=0.05)
+
+        outbox.offer("hello")
+        await asyncio.sleep(0.2)
+
+        assert outbox.closed
+        assert websocket.closed
+        assert outbox.offer("again") is False
+
+
+@pytest.mark.unit
+class TestTopicHistory:
+    """Ring-buffer history and replay by sequence number"""
+
+    @pytest.mark.asyncio
+    async def test_envelopes_are_numbered_per_topic(self):
+        for i in range(3):
+            await board.broadcast_message({"content": f"m{i}"}, "general", "sender")
+        await board.broadcast_message({"content": "other"}, "ops", "sender")
+
+        assert [m["seq"] for m in board.message_history["general"]] == [1, 2, 3]
+        assert [m["seq"] for m in board.message_history["ops"]] == [1]
+
+    @pytest.mark.asyncio
+    async def test_ring_keeps_only_latest_messages(self, monkeypatch):
+        monkeypatch.setattr(board, "MAX_HISTORY", 5)
+        for i in range(12):
+            await board.broadcast_message({"content": f"m{i}"}, "general", "sender")
+
+        assert [m["seq"] for m in board.message_history["general"]] == [8, 9, 10, 11, 12]
+        assert [m["seq"] for m in board.history_since("general", 10)] == [11, 12]
+        assert [m["seq"] for m in board.history_since("general", 2)] == [8, 9, 10, 11, 12]
+        assert board.history_since("general", 12) == []
+
+    @pytest.mark.asyncio
+    async def test_resubscribe_since_seq_replays_only_missed_messages(self):
+        for i in range(4):
+            await board.broadcast_message({"content": f"m{i}"}, "general", "sender")
+
+        websocket = FakeSocket()
+        await _subscribe("late", websocket)
+        await board.unsubscribe_from_topic("late", "general")
+        await board.subscribe_to_topic("late", "general", since_seq=2)
+        await asyncio.sleep(0.01)
+
+        replay = json.loads(websocket.sent[-1])
+        assert replay["type"] == "history"
+        assert [m["seq"] for m in replay["messages"]] == [3, 4]
+        assert "truncated" not in replay
+
+    @pytest.mark.asyncio
+    async def test_since_seq_from_before_a_restart_replays_the_ring(self):
+        # The board restarted without a durable log; the client had seen seq 500
+        for i in range(3):
+            await board.broadcast_message({"content": f"m{i}"}, "general", "sender")
+        websocket = FakeSocket()
+        await board.register_client(websocket, "agent")
+
+        request = {"type": "subscribe", "topic": "general", "since_seq": 500}
+        await board.handle_message(websocket, json.dumps(request), "agent")
+        await asyncio.sleep(0.01)
+
+        replay, ack = (json.loads(frame) for frame in websocket.sent)
+        assert replay["type"] == "history" and replay["reset"] is True
+        assert [m["seq"] for m in replay["messages"]] == [1, 2, 3]
+        # The ack follows the replay it covers
+        assert ack == {"type": "subscribed", "topic": "general", "latest_seq": 3, "reset": True}
+
+
+@pytest.mark.unit
+class TestDirectRouting:
+    """Messages addressed to one agent bypass topic fan-out"""
+
+    @pytest.mark.asyncio
+    async def test_direct_message_reaches_only_addressee(self):
+        sockets = {name: FakeSocket() for name in ("coder-agent", "tester-agent", "orchestrator-agent")}
+        for name, websocket in sockets.items():
+            await _subscribe(name, websocket)
+
+        await board.broadcast_message({"content": "task", "to_agent": "coder-agent"}, "general", "orchestrator-agent")
+        await asyncio.sleep(0.01)
+
+        assert json.loads(sockets["coder-agent"].sent[0])["content"] == "task"
+        assert sockets["tester-agent"].sent == []
+        assert sockets["orchestrator-agent"].sent == []
+
+    @pytest.mark.asyncio
+    async def test_broadcast_addresses_still_fan_out(self):
+        a, b = FakeSocket(), FakeSocket()
+        await _subscribe("a", a)
+        await _subscribe("b", b)
+
+        await board.broadcast_message({"content": "all", "to_agent": "board"}, "general", "sender")
+        await board.broadcast_message({"content": "all", "to_agent": "*"}, "general", "sender")
+        await asyncio.sleep(0.01)
+
+        assert len(a.sent) == len(b.sent) == 2
+
+    @pytest.mark.asyncio
+    async def test_offline_addressee_gets_message_on_subscribe(self):
+        await board.broadcast_message({"content": "for you", "to_agent": "late"}, "general", "sender")
+        await board.broadcast_message({"content": "for someone else", "to_agent": "other"}, "general", "sender")
+        await board.broadcast_message({"content": "everyone"}, "general", "sender")
+
+        websocket = FakeSocket()
+        await _subscribe("late", websocket)
+        await asyncio.sleep(0.01)
+
+        replay = json.loads(websocket.sent[-1])
+        assert [m["content"] for m in replay["messages"]] == ["for you", "everyone"]
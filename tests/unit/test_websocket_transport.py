@@ -5,7 +5,11 @@ These tests define the expected behavior of WebSocketTransport.
 They will fail until we implement the class.
 """
 
+import asyncio
+import json
+
 import pytest
+from unittest.mock import AsyncMock
 from a2a_communicating_agents.agent_messaging.message_models import AgentMessage, MessagePriority, ConnectionConfig
 from a2a_communicating_agents.agent_messaging.websocket_transport import WebSocketTransport
 
@@ -158,3 +162,140 @@ class TestWebSocketTransport:
         
         result = await transport.send(message)
         assert result == False
+
+
+class _RecordingSocket:
+    """Fake client websocket that records outgoing frames"""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, payload):
+        self.sent.append(json.loads(payload))
+
+
+def _connected_transport():
+    transport = WebSocketTransport(ConnectionConfig(url="ws://localhost:3030"))
+    transport.agent_id = "agent-a"
+    transport._websocket = _RecordingSocket()
+    transport._connected = True
+    return transport
+
+
+@pytest.mark.unit
+class TestPipelinedSends:
+    """Acks are correlated to sends by msg_id"""
+
+    @pytest.mark.asyncio
+    async def test_acks_resolve_matching_sends_out_of_order(self, sample_message):
+        transport = _connected_transport()
+
+        first = asyncio.create_task(transport.send(sample_message))
+        second = asyncio.create_task(transport.send(sample_message))
+        await asyncio.sleep(0)
+        ids = [frame["msg_id"] for frame in transport._websocket.sent]
+
+        transport._resolve_ack({"type": "error", "msg_id": ids[0], "message": "boom"})
+        transport._resolve_ack({"type": "sent", "msg_id": ids[1]})
+
+        assert await first is False
+        assert await second is True
+        assert transport._pending == {}
+
+    @pytest.mark.asyncio
+    async def test_send_many_pipelines_and_reports_per_message(self, sample_message):
+        transport = _connected_transport()
+
+        batch = asyncio.create_task(transport.send_many([sample_message] * 3, timeout=0.2))
+        await asyncio.sleep(0)
+        frames = transport._websocket.sent
+        assert len(frames) == 3
+        assert len({frame["msg_id"] for frame in frames}) == 3
+
+        transport._resolve_ack({"type": "sent", "msg_id": frames[2]["msg_id"]})
+        transport._resolve_ack({"type": "sent", "msg_id": frames[0]["msg_id"]})
+
+        assert await batch == [True, False, True]
+        assert transport._pending == {}
+
+    @pytest.mark.asyncio
+    async def test_ack_without_msg_id_resolves_oldest_send(self, sample_message):
+        transport = _connected_transport()
+
+        first = asyncio.create_task(transport.send(sample_message, timeout=0.2))
+        second = asyncio.create_task(transport.send(sample_message, timeout=0.2))
+        await asyncio.sleep(0)
+
+        transport._resolve_ack({"type": "sent", "topic": "general"})
+
+        assert await first is True
+        assert await second is False
+
+
+@pytest.mark.unit
+class TestBoardRestart:
+    """Sequence numbers are reset when the board starts a new epoch"""
+
+    @pytest.mark.asyncio
+    async def test_reset_history_and_live_messages_are_delivered(self):
+        transport = _connected_transport()
+        received = []
+
+        async def callback(message):
+            received.append(message.content)
+
+        transport._subscriptions["general"] = callback
+        transport._last_seq["general"] = 500
+
+        await transport._handle_frame({"type": "history", "topic": "general", "reset": True, "messages": [
+            {"type": "message", "topic": "general", "seq": 1, "content": "one"},
+            {"type": "message", "topic": "general", "seq": 2, "content": "two"},
+        ]})
+        await transport._handle_frame({"type": "subscribed", "topic": "general", "latest_seq": 2, "reset": True})
+        await transport._handle_frame({"type": "message", "topic": "general", "seq": 3, "content": "three"})
+        await asyncio.sleep(0.01)
+
+        assert received == ["one", "two", "three"]
+        assert transport._last_seq["general"] == 3
+
+    @pytest.mark.asyncio
+    async def test_new_epoch_resubscribes_from_the_start(self):
+        transport = _connected_transport()
+        transport._note_epoch("first")
+        transport._last_seq["general"] = 500
+
+        transport._note_epoch("first")
+        assert transport._last_seq["general"] == 500
+
+        transport._note_epoch("second")
+        await transport.subscribe("general", AsyncMock())
+
+        assert transport._websocket.sent[-1] == {"type": "subscribe", "topic": "general", "since_seq": 0}
+
+
+@pytest.mark.unit
+class TestOutboxGap:
+    """A gap notice resubscribes from the first dropped message"""
+
+    @pytest.mark.asyncio
+    async def test_gap_replays_dropped_messages_in_order(self):
+        transport = _connected_transport()
+        received = []
+
+        async def callback(message):
+            received.append(message.content)
+
+        transport._subscriptions["general"] = callback
+        await transport._handle_frame({"type": "message", "topic": "general", "seq": 1, "content": "one"})
+        await transport._handle_frame({"type": "gap", "topic": "general", "from_seq": 2})
+        await transport._handle_frame({"type": "message", "topic": "general", "seq": 4, "content": "four"})
+        await transport._handle_frame({"type": "history", "topic": "general", "messages": [
+            {"type": "message", "topic": "general", "seq": seq, "content": content}
+            for seq, content in ((2, "two"), (3, "three"), (4, "four"))
+        ]})
+        await transport._handle_frame({"type": "subscribed", "topic": "general", "latest_seq": 4})
+        await transport._handle_frame({"type": "message", "topic": "general", "seq": 5, "content": "five"})
+        await asyncio.sleep(0.01)
+
+        assert transport._websocket.sent[-1] == {"type": "subscribe", "topic": "general", "since_seq": 1}
+        assert received == ["one", "two", "three", "four", "five"]
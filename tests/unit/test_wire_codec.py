@@ -0,0 +1,115 @@
+"""
+Unit tests for negotiated wire encodings on the message board.
+"""
+
+import asyncio
+
+import pytest
+
+from a2a_communicating_agents.agent_messaging import websocket_server as board
+from a2a_communicating_agents.agent_messaging.wire_codec import (
+    DEFAULT_COMPRESS_THRESHOLD,
+    MIN_COMPRESS_THRESHOLD,
+    WireCodec,
+    available_encodings,
+    compress_threshold_from,
+    negotiate,
+    offered_encodings,
+)
+
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, payload):
+        self.sent.append(payload)
+
+    async def close(self):
+        pass
+
+
+@pytest.mark.unit
+class TestWireCodec:
+    """Encoding negotiation and frame round trips"""
+
+    def test_old_clients_get_json(self):
+        assert negotiate(None) == "json"
+        assert negotiate(["cbor"]) == "json"
+
+    def test_first_supported_preference_wins(self):
+        assert negotiate(["cbor", "json", "msgpack"]) == "json"
+        assert negotiate(available_encodings()) == available_encodings()[0]
+
+    def test_client_offer_drops_uninstalled_encodings(self):
+        assert offered_encodings(["cbor", "json"]) == ["json"]
+        assert offered_encodings(["cbor"]) == ["json"]
+        assert offered_encodings(None) == available_encodings()
+
+    def test_client_compress_threshold_is_validated(self):
+        assert compress_threshold_from(None) is None
+        assert compress_threshold_from(8192) == 8192
+        assert compress_threshold_from(0) == MIN_COMPRESS_THRESHOLD
+        assert compress_threshold_from(-1) == MIN_COMPRESS_THRESHOLD
+        assert compress_threshold_from("1024") == DEFAULT_COMPRESS_THRESHOLD
+        assert compress_threshold_from(True) == DEFAULT_COMPRESS_THRESHOLD
+
+    def test_json_frames_stay_text(self):
+        codec = WireCodec("json")
+        frame = codec.encode({"type": "ping"})
+
+        assert isinstance(frame, str)
+        assert codec.decode(frame) == {"type": "ping"}
+
+    @pytest.mark.parametrize("encoding", ["msgpack", "orjson"])
+    def test_binary_frames_deflate_above_threshold(self, encoding):
+        if encoding not in available_encodings():
+            pytest.skip(f"{encoding} not installed")
+        codec = WireCodec(encoding, compress_threshold=256)
+        small = {"type": "message", "content": "hi"}
+        large = {"type": "message", "content": "x" * 10_000}
+
+        small_frame, large_frame = codec.encode(small), codec.encode(large)
+
+        assert small_frame[:1] == b"\x00"
+        assert large_frame[:1] == b"\x01"
+        assert len(large_frame) < 1000
+        assert codec.decode(small_frame) == small
+        assert codec.decode(large_frame) == large
+
+    def test_binary_codec_still_accepts_json_text(self):
+        encoding = available_encodings()[0]
+        assert WireCodec(encoding).decode('{"type": "ping"}') == {"type": "ping"}
+
+
+@pytest.mark.unit
+class TestMixedEncodingBroadcast:
+    """Each subscriber receives the broadcast in its negotiated encoding"""
+
+    @pytest.fixture(autouse=True)
+    async def clean_board(self):
+        for state in (board.clients, board.subscriptions, board.message_history, board.topic_sequences, board.outboxes):
+            state.clear()
+        yield
+        for agent_id in list(board.clients):
+            await board.unregister_client(agent_id)
+        await asyncio.sleep(0.01)
+
+    @pytest.mark.asyncio
+    async def test_json_and_binary_subscribers(self):
+        encoding = available_encodings()[0]
+        if encoding == "json":
+            pytest.skip("no binary encoding installed")
+        binary_codec = WireCodec(encoding, compress_threshold=None)
+        old, new = FakeSocket(), FakeSocket()
+        await board.register_client(old, "old-agent")
+        await board.register_client(new, "new-agent", codec=binary_codec)
+        await board.subscribe_to_topic("old-agent", "general")
+        await board.subscribe_to_topic("new-agent", "general")
+
+        await board.broadcast_message({"content": "hello"}, "general", "sender")
+        await asyncio.sleep(0.01)
+
+        assert isinstance(old.sent[0], str)
+        assert isinstance(new.sent[0], bytes)
+        assert binary_codec.decode(new.sent[0])["content"] == "hello"